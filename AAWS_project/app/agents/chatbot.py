@@ -1,7 +1,7 @@
 from datetime import date
 from langgraph.checkpoint.memory import MemorySaver
-from langchain.chat_models import init_chat_model
 from langchain.agents import create_agent
+from app.llm import ModelRoutingMiddleware, TokenBudgetMiddleware, get_chat_model
 from app.tools import tools_basic
 
 # 오늘 날짜
@@ -17,7 +17,7 @@ system_prompt = f"""
 
 def get_agent_executor():
     # LLM (No tools)
-    llm = init_chat_model(model="gpt-4o", model_provider="openai")
+    llm = get_chat_model("gpt-4o", model_provider="openai")
     
     # Memory
     memory = MemorySaver()
@@ -27,6 +27,12 @@ def get_agent_executor():
         model=llm, # No tools bound
         tools=tools_basic, 
         system_prompt=system_prompt,
+        # 긴 스레드의 프롬프트 토큰 예산 관리 (오래된 도구 출력 축약 + 오래된 턴 요약)
+        middleware=[
+            TokenBudgetMiddleware(summary_model="openai:gpt-4o-mini", name="Chatbot"),
+            # 평소엔 gpt-4o-mini, 도구 오류가 반복될 때만 gpt-4o (자신 없는 답변은 기록만 하고 다시 호출하지 않음, 이유는 app/llm/routing.py)
+            ModelRoutingMiddleware.for_model("openai:gpt-4o", name="Chatbot"),
+        ],
         checkpointer=memory
     )
     
@@ -1,7 +1,7 @@
 from datetime import date
 from langgraph.checkpoint.memory import MemorySaver
-from langchain.chat_models import init_chat_model
 from langchain.agents import create_agent
+from app.llm import ModelRoutingMiddleware, TokenBudgetMiddleware, ToolConcurrencyMiddleware, get_chat_model
 
 # Tools 제공 모듈에서 필요한 도구들을 임포트합니다.
 from app.tools import tools_navigator
@@ -25,7 +25,7 @@ system_prompt = f"""
 
 def get_agent_executor():
     # LLM 초기화
-    llm = init_chat_model(model="gpt-4o", model_provider="openai")
+    llm = get_chat_model("gpt-4o", model_provider="openai")
 
     # 간단한 메모리 세이버 (대화 컨텍스트 저장)
     memory = MemorySaver()
@@ -35,6 +35,18 @@ def get_agent_executor():
         model=llm,
         tools=tools_navigator,
         system_prompt=system_prompt,
+        # 긴 스레드의 프롬프트 토큰 예산 관리 (오래된 도구 출력 축약 + 오래된 턴 요약)
+        middleware=[
+            TokenBudgetMiddleware(summary_model="openai:gpt-4o-mini", name="Navigator"),
+            # 평소엔 gpt-4o-mini, 도구 오류가 반복될 때만 gpt-4o (자신 없는 답변은 기록만 하고 다시 호출하지 않음, 이유는 app/llm/routing.py)
+            ModelRoutingMiddleware.for_model("openai:gpt-4o", name="Navigator"),
+            # 이미지 분석/웹 검색은 동시에, 공유 브라우저 세션을 쓰는 browse_web_keep_alive는 1개씩 실행
+            ToolConcurrencyMiddleware(
+                tool_resources={"browse_web_keep_alive": "browser"},
+                tool_limits={"browse_web_keep_alive": 1},
+                name="Navigator",
+            ),
+        ],
         checkpointer=memory,
     )
 
@@ -115,6 +115,10 @@ if __name__ == "__main__":
                         if 'input' in chunk:
                              print(f" Input: {chunk['input']}", end="")
                         print("\n", end="")
+                    elif chunk["type"] == "progress":
+                        data = chunk.get("data") or {}
+                        last_line = (data.get("last_lines") or [""])[-1]
+                        print(f"   ⏳ [{data.get('script', chunk.get('name'))}] {data.get('elapsed', 0)}s, 출력 {data.get('stdout_lines', 0)}줄 | {last_line[:80]}")
                     elif chunk["type"] == "error":
                         print(f"\n❌ Error: {chunk.get('content') or chunk.get('error')}")
                 elif "error" in chunk:
@@ -0,0 +1,42 @@
+from app.crawler.registry import (
+    BlueprintRegistry,
+    dom_fingerprint,
+    url_pattern_of,
+    normalize_goal,
+)
+from app.crawler.engine import (
+    BlueprintExecutor,
+    HttpFetcher,
+    BrowserFetcher,
+    crawl_blueprint,
+    crawl_blueprints,
+)
+from app.crawler.pagination import (
+    paginate_url_param,
+    drive_load_more,
+    drive_infinite_scroll,
+)
+from app.crawler.scheduler import (
+    CrawlScheduler,
+    BloomFilter,
+    canonicalize_url,
+)
+from app.crawler.incremental import (
+    RecrawlStore,
+    content_hash,
+)
+from app.crawler.sinks import (
+    open_sink,
+    JsonlSink,
+    JsonSink,
+    CsvSink,
+    ParquetSink,
+)
+from app.crawler.checkpoint import (
+    CrawlStateStore,
+    crawl_id_for,
+)
+from app.crawler.replay import (
+    ReplayArchive,
+    archive_dir_for,
+)
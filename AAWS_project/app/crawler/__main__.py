@@ -0,0 +1,63 @@
+import os
+import json
+import asyncio
+import argparse
+
+from app.crawler.engine import BlueprintExecutor, _as_dict
+from app.crawler.checkpoint import CrawlStateStore, crawl_id_for
+from app.crawler.incremental import RecrawlStore
+from app.crawler.sinks import open_sink
+
+# =========================================================
+# 🚀 직접 실행: python -m app.crawler code_artifacts/blueprint_x_1.json
+# =========================================================
+parser = argparse.ArgumentParser(description="Blueprint JSON을 코드 생성 없이 바로 실행합니다.")
+parser.add_argument("blueprint", help="blueprint JSON 파일 경로")
+parser.add_argument("--concurrency", type=int, default=4)
+parser.add_argument("--max-pages", type=int, default=5)
+parser.add_argument("--target-items", type=int, default=None, help="목록 계층에서 이만큼 모이면 페이지 이동 중단")
+parser.add_argument("--incremental", action="store_true", help="이전 수집 이후 새로 생기거나 바뀐 상세 페이지만 수집")
+parser.add_argument("--state-db", default=None, help="증분 수집 상태 DB 경로 (기본: code_artifacts/recrawl_state.db)")
+parser.add_argument("--output", default=None, help="결과 저장 파일 (.jsonl/.json/.csv/.parquet). 없으면 표준 출력")
+parser.add_argument("--max-bytes", type=int, default=None, help="결과 파일 하나의 최대 크기 (넘으면 새 파일로 회전)")
+parser.add_argument("--resume", action="store_true", help="체크포인트를 저장하고, 중단된 이전 실행이 있으면 이어서 수집 (--output 필요)")
+args = parser.parse_args()
+if args.resume and not args.output:
+    parser.error("--resume은 --output과 함께 사용해야 합니다.")
+
+
+async def main():
+    blueprint = _as_dict(args.blueprint)
+    store = RecrawlStore(args.state_db) if args.incremental else None
+    sink = open_sink(args.output, max_bytes=args.max_bytes) if args.output else None
+    checkpoint = CrawlStateStore(crawl_id_for(blueprint, os.path.basename(args.output))) if args.resume else None
+    if checkpoint is not None:
+        checkpoint.attach_sink("output", sink)
+    executor = BlueprintExecutor(
+        blueprint,
+        concurrency=args.concurrency,
+        max_pages=args.max_pages,
+        target_items=args.target_items,
+        incremental=store,
+        checkpoint=checkpoint,
+    )
+    records = executor.stream()
+    try:
+        async for record in records:
+            if sink is not None:
+                sink.write(record)
+            else:
+                print(json.dumps(record, ensure_ascii=False))
+    finally:
+        # 엔진 쪽 마무리(체크포인트 커밋)가 결과 파일을 닫기 전에 끝나도록 스트림을 먼저 닫습니다.
+        await records.aclose()
+        if sink is not None:
+            sink.close()
+            print(f"💾 {sink.records_written}개 레코드 저장 → {', '.join(sink.files)}")
+        if store is not None:
+            store.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+
+asyncio.run(main())
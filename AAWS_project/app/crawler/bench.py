@@ -0,0 +1,69 @@
+import os
+import time
+import argparse
+import tempfile
+
+from app.crawler.checkpoint import CrawlStateStore
+
+# =========================================================
+# ⏱️ 크롤링 컴포넌트 벤치마크
+#   python -m app.crawler.bench resume --urls 1000000
+# =========================================================
+
+
+def bench_resume(total_urls: int, done_ratio: float = 0.8, layers: int = 2, db_path: str = None) -> dict:
+    """가상의 대형 frontier로 체크포인트 기록/재개 비용을 측정합니다.
+
+    total_urls개의 URL을 계층별로 나눠 frontier에 넣고, done_ratio만큼 완료 표시한 뒤
+    (=80% 지점에서 죽은 상황) 같은 ID로 다시 열어 남은 URL 목록을 읽어 오는 데 걸리는 시간을 잽니다.
+    """
+    db_path = db_path or os.path.join(tempfile.mkdtemp(), "crawl_state_bench.db")
+    per_layer = total_urls // layers
+    done_count = int(per_layer * done_ratio)
+    result = {"urls": per_layer * layers, "done": done_count * layers}
+
+    with CrawlStateStore("bench", db_path=db_path, commit_interval=1.0) as state:
+        start = time.perf_counter()
+        for layer in range(layers):
+            state.add(layer, (f"https://example.com/{layer}/item/{i}?ref=list" for i in range(per_layer)), {"layer": layer})
+        state.commit()
+        result["add_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for layer in range(layers):
+            for i in range(done_count):
+                state.mark_done(layer, f"https://example.com/{layer}/item/{i}?ref=list")
+        state.commit()
+        result["mark_done_us"] = (time.perf_counter() - start) / max(1, result["done"]) * 1e6
+
+    # 재개: 다시 열기(완료 집합 로드) + 남은 frontier 읽기
+    start = time.perf_counter()
+    with CrawlStateStore("bench", db_path=db_path) as state:
+        opened = time.perf_counter()
+        remaining = state.pending()
+        result["resume_open_seconds"] = opened - start
+        result["resume_pending_seconds"] = time.perf_counter() - opened
+        result["remaining"] = len(remaining)
+        start = time.perf_counter()
+        skipped = sum(state.is_done(0, f"https://example.com/0/item/{i}?ref=list") for i in range(per_layer))
+        result["is_done_us"] = (time.perf_counter() - start) / per_layer * 1e6
+        result["skipped_check"] = skipped
+
+    result["db_mb"] = os.path.getsize(db_path) / 1024 / 1024
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤링 컴포넌트 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+    resume = sub.add_parser("resume", help="체크포인트 재개 비용 측정")
+    resume.add_argument("--urls", type=int, default=200_000)
+    resume.add_argument("--done-ratio", type=float, default=0.8)
+    args = parser.parse_args()
+
+    if args.command == "resume":
+        r = bench_resume(args.urls, args.done_ratio)
+        print(f"📦 frontier {r['urls']:,}개 (완료 {r['done']:,}개), DB {r['db_mb']:.1f}MB")
+        print(f"   기록: frontier 추가 {r['add_seconds']:.2f}초, 완료 표시 {r['mark_done_us']:.1f}µs/건")
+        print(f"♻️ 재개: 열기(완료 집합 로드) {r['resume_open_seconds']:.2f}초 + 남은 URL {r['remaining']:,}개 읽기 "
+              f"{r['resume_pending_seconds']:.2f}초, 완료 여부 확인 {r['is_done_us']:.2f}µs/건")
@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from typing import Iterable, Optional
+
+from app.crawler.registry import ARTIFACT_DIR
+from app.crawler.scheduler import canonicalize_url
+
+# ==========================================
+# 💽 Crawl Checkpoint (중단 후 재개)
+# ==========================================
+# 몇 시간짜리 크롤링이 80%에서 죽어도(OOM, 실행 시간 초과, 브라우저 크래시) 처음부터 다시 돌지 않도록
+# 크롤링 상태를 SQLite(code_artifacts/crawl_state.db)에 주기적으로 저장합니다.
+#   - frontier : 계층별로 방문할 URL(+ 상위 계층에서 물려받은 필드)과 완료 여부
+#   - sinks    : 결과 파일에 어디까지 썼는지 (파일 목록, 현재 파일 크기, 레코드 수)
+#
+# 완료 표시와 Sink 위치는 같은 트랜잭션으로 커밋됩니다.
+# 재개 시 Sink는 마지막 커밋 위치로 잘라낸 뒤 이어 쓰고, 그 뒤에 쓰였던 페이지는 다시 수집하므로
+# 결과가 빠지거나 중복되지 않습니다.
+
+CRAWL_STATE_FILENAME = "crawl_state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    crawl_id TEXT PRIMARY KEY,
+    started_at REAL,
+    updated_at REAL,
+    finished INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    crawl_id TEXT,
+    layer INTEGER,
+    url_key TEXT,
+    url TEXT,
+    context TEXT,
+    done INTEGER DEFAULT 0,
+    PRIMARY KEY (crawl_id, layer, url_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sinks (
+    crawl_id TEXT,
+    name TEXT,
+    state TEXT,
+    PRIMARY KEY (crawl_id, name)
+);
+"""
+
+
+def crawl_id_for(blueprint: dict, name: str = "") -> str:
+    """Blueprint 내용(+ 선택적 이름)으로 크롤링 ID를 만듭니다. 같은 Blueprint를 다시 돌리면 같은 ID가 나옵니다."""
+    payload = json.dumps(blueprint, ensure_ascii=False, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+    return f"{name}-{digest}" if name else digest
+
+
+class CrawlStateStore:
+    """크롤링 하나의 frontier / 완료 URL / Sink 위치를 저장하고 복원합니다.
+
+    엔진에서의 사용 예)
+        with CrawlStateStore(crawl_id_for(blueprint)) as state, open_sink("result.jsonl") as sink:
+            state.attach_sink("result", sink)          # 이전 실행이 있었다면 여기서 Sink 위치가 복원됨
+            executor = BlueprintExecutor(blueprint, checkpoint=state)
+            async for record in executor.stream():
+                sink.write(record)
+
+    직접 작성한 크롤러 스크립트에서의 사용 예)
+        with CrawlStateStore("my_news_crawl") as state:
+            state.add(0, seed_urls)
+            for layer, url, context in state.pending():
+                ...
+                state.mark_done(layer, url)
+    """
+
+    def __init__(
+        self,
+        crawl_id: str,
+        db_path: Optional[str] = None,
+        commit_interval: float = 2.0,
+        commit_every: int = 500,
+    ):
+        """
+        Args:
+            crawl_id: 크롤링 식별자 (같은 ID로 다시 열면 이어서 진행)
+            db_path: SQLite 파일 경로 (기본: code_artifacts/crawl_state.db)
+            commit_interval: 최소 이 간격(초)마다 커밋
+            commit_every: 완료 표시가 이만큼 쌓이면 간격과 관계없이 커밋
+        """
+        self.crawl_id = crawl_id
+        self.db_path = db_path or os.path.join(ARTIFACT_DIR, CRAWL_STATE_FILENAME)
+        self.commit_interval = commit_interval
+        self.commit_every = commit_every
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._sinks: dict[str, object] = {}
+        self._new_pending: list[tuple] = []
+        self._new_done: list[tuple] = []
+        self._last_commit = time.monotonic()
+
+        row = self._conn.execute("SELECT finished FROM crawls WHERE crawl_id = ?", (crawl_id,)).fetchone()
+        if row and row[0]:
+            # 끝까지 완료된 크롤링을 같은 ID로 다시 열면 새로 시작합니다.
+            self.reset()
+            row = None
+        self.resumed = row is not None
+        if row is None:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawls (crawl_id, started_at, updated_at, finished) VALUES (?, ?, ?, 0)",
+                (crawl_id, now, now),
+            )
+            self._conn.commit()
+
+        self._done: set[tuple[int, str]] = {
+            (layer, key) for layer, key in self._conn.execute(
+                "SELECT layer, url_key FROM frontier WHERE crawl_id = ? AND done = 1", (crawl_id,)
+            )
+        }
+        self._known: set[tuple[int, str]] = set(self._done)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- frontier ----------
+    def add(self, layer: int, urls: Iterable[str], context: Optional[dict] = None):
+        for url in urls:
+            self.add_pending(layer, url, context)
+
+    def add_pending(self, layer: int, url: str, context: Optional[dict] = None) -> bool:
+        """방문할 URL을 frontier에 넣습니다. 이미 알고 있는(대기/완료) URL이면 False."""
+        key = (layer, canonicalize_url(url))
+        if key in self._known:
+            return False
+        self._known.add(key)
+        self._new_pending.append((self.crawl_id, layer, key[1], url, json.dumps(context or {}, ensure_ascii=False, default=str)))
+        return True
+
+    def is_done(self, layer: int, url: str) -> bool:
+        return (layer, canonicalize_url(url)) in self._done
+
+    def mark_done(self, layer: int, url: str):
+        key = (layer, canonicalize_url(url))
+        if key in self._done:
+            return
+        self._done.add(key)
+        self._known.add(key)
+        self._new_done.append((self.crawl_id, layer, key[1], url))
+        self.maybe_commit()
+
+    def pending(self, layer: Optional[int] = None) -> list[tuple[int, str, dict]]:
+        """아직 완료되지 않은 (계층, URL, 물려받은 필드) 목록. 커밋되지 않은 항목도 포함합니다."""
+        self.commit()
+        query = "SELECT layer, url, context FROM frontier WHERE crawl_id = ? AND done = 0"
+        params: tuple = (self.crawl_id,)
+        if layer is not None:
+            query += " AND layer = ?"
+            params += (layer,)
+        return [(l, url, json.loads(ctx)) for l, url, ctx in self._conn.execute(query + " ORDER BY layer", params)]
+
+    def counts(self) -> dict:
+        rows = self._conn.execute(
+            "SELECT layer, SUM(done), COUNT(*) FROM frontier WHERE crawl_id = ? GROUP BY layer", (self.crawl_id,)
+        ).fetchall()
+        return {layer: {"done": done or 0, "total": total} for layer, done, total in rows}
+
+    # ---------- Sink 위치 ----------
+    def attach_sink(self, name: str, sink):
+        """Sink를 체크포인트에 연결합니다. 이전 실행의 위치가 저장되어 있으면 그 위치로 되돌립니다."""
+        row = self._conn.execute(
+            "SELECT state FROM sinks WHERE crawl_id = ? AND name = ?", (self.crawl_id, name)
+        ).fetchone()
+        if row:
+            sink.restore(json.loads(row[0]))
+            print(f"♻️ [Checkpoint] '{name}' 결과 파일을 레코드 {sink.records_written}개 지점부터 이어 씁니다.")
+        self._sinks[name] = sink
+
+    # ---------- 커밋 ----------
+    def maybe_commit(self):
+        if len(self._new_done) >= self.commit_every or time.monotonic() - self._last_commit >= self.commit_interval:
+            self.commit()
+
+    def commit(self):
+        """대기 중인 frontier/완료 표시와 연결된 Sink 위치를 한 트랜잭션으로 기록합니다.
+        Sink에 쓴 레코드가 모두 완료 표시된 페이지의 것일 때(페이지 경계)에만 호출해야 합니다.
+        """
+        if self._conn is None:
+            return
+        sink_states = [
+            (self.crawl_id, name, json.dumps(sink.state(), ensure_ascii=False))
+            for name, sink in self._sinks.items()
+        ]
+        with self._conn:
+            if self._new_pending:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO frontier (crawl_id, layer, url_key, url, context, done) VALUES (?, ?, ?, ?, ?, 0)",
+                    self._new_pending,
+                )
+            if self._new_done:
+                self._conn.executemany(
+                    "INSERT INTO frontier (crawl_id, layer, url_key, url, context, done) VALUES (?, ?, ?, ?, '{}', 1) "
+                    "ON CONFLICT (crawl_id, layer, url_key) DO UPDATE SET done = 1",
+                    self._new_done,
+                )
+            if sink_states:
+                self._conn.executemany("INSERT OR REPLACE INTO sinks (crawl_id, name, state) VALUES (?, ?, ?)", sink_states)
+            self._conn.execute("UPDATE crawls SET updated_at = ? WHERE crawl_id = ?", (time.time(), self.crawl_id))
+        self._new_pending.clear()
+        self._new_done.clear()
+        self._last_commit = time.monotonic()
+
+    def finish(self):
+        """크롤링이 끝까지 완료되었음을 기록합니다. 같은 ID로 다시 열면 처음부터 시작합니다."""
+        if self._conn is None:
+            return
+        self.commit()
+        with self._conn:
+            self._conn.execute("UPDATE crawls SET finished = 1 WHERE crawl_id = ?", (self.crawl_id,))
+
+    def reset(self):
+        with self._conn:
+            for table in ("frontier", "sinks", "crawls"):
+                self._conn.execute(f"DELETE FROM {table} WHERE crawl_id = ?", (self.crawl_id,))
+        self._done = set()
+        self._known = set()
+        self._new_pending.clear()
+        self._new_done.clear()
+
+    def close(self):
+        """Sink가 연결되어 있으면 새 frontier만 기록하고, 마지막 커밋 이후의 완료 표시는 버립니다.
+        (비정상 종료 시 Sink 위치가 완료 표시보다 앞서 있을 수 있어, 그 구간은 재개 때 다시 수집합니다.)
+        """
+        if self._conn is None:
+            return
+        if self._sinks:
+            self._new_done.clear()
+            self._sinks = {}
+        self.commit()
+        self._conn.close()
+        self._conn = None
@@ -0,0 +1,132 @@
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from app.crawler.engine import _as_dict
+
+# ==========================================
+# 🩺 Layer Diagnosis (어느 계층의 어느 셀렉터가 실패했는지)
+# ==========================================
+# 크롤링이 실패하면 지금까지는 "레코드 0개" 같은 결과만 남아서, Navigator를 처음부터 다시 돌려
+# 이미 잘 되는 목록 계층까지 모두 다시 분석/검증했습니다.
+#
+# diagnose_run()은 BlueprintExecutor.stats(계층별 페이지/빈 페이지/링크/필드별 추출 성공 수)를 보고
+# 실패 지점을 계층 번호와 셀렉터 단위로 짚어 줍니다.
+#   - no_links    : 목록 페이지는 받았는데 navigate_to_next로 찾은 링크가 0개 → 그 계층의 navigate_to_next
+#   - no_pages    : 앞 계층은 링크를 넘겼는데 이 계층 페이지를 하나도 받지 못함 → 앞 계층의 navigate_to_next
+#   - empty_pages : 페이지 대부분에서 레코드가 하나도 안 나옴 → 그 계층의 셀렉터 전체
+#   - empty_field : 레코드는 나오는데 특정 필드만 거의 비어 있음 → 그 필드 셀렉터
+#   - errors      : 요청/추출 자체가 예외로 실패
+# 실패한 계층만 다시 검증하고(notebooks/navigator.py repair_failed_layer),
+# 앞 계층 결과는 executor.spawned[k]를 seeds로 넘겨 그대로 재사용합니다. (notebooks/pipeline.py)
+
+# 페이지 중 이 비율 이상에서 레코드가 안 나오면 계층 셀렉터 전체가 실패한 것으로 봅니다.
+EMPTY_PAGE_RATIO = 0.5
+# 필드 값이 채워진 레코드가 이 비율보다 적으면 그 필드 셀렉터가 실패한 것으로 봅니다.
+FIELD_HIT_RATIO = 0.2
+# 오류가 난 URL이 이 비율 이상이면 계층 실패로 봅니다.
+ERROR_RATIO = 0.5
+
+
+@dataclass
+class LayerFailure:
+    """실패한 계층 하나 (layer_index는 다시 검증해야 할 계층)"""
+
+    layer_index: int
+    layer_name: str
+    kind: str
+    field: Optional[str] = None
+    selector: Optional[str] = None
+    sample_url: Optional[str] = None
+    detail: str = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def diagnose_run(blueprint, stats: dict) -> list[LayerFailure]:
+    """BlueprintExecutor.stats로 실패한 계층/셀렉터를 찾습니다. 앞 계층부터 순서대로, 계층당 하나씩 돌려줍니다."""
+    layers = _as_dict(blueprint).get("layers") or []
+    failures: list[LayerFailure] = []
+
+    def get(key, index, default):
+        values = stats.get(key) or []
+        return values[index] if index < len(values) else default
+
+    errors_by_layer: dict[int, list[dict]] = {}
+    for error in stats.get("errors") or []:
+        errors_by_layer.setdefault(error.get("layer", 0), []).append(error)
+
+    for index, layer in enumerate(layers):
+        name = layer.get("layer_name") or f"L{index + 1}"
+        n_pages = get("pages", index, 0)
+        samples = get("sample_urls", index, [])
+        errors = errors_by_layer.get(index, [])
+
+        if errors and len(errors) >= max(1, n_pages) * ERROR_RATIO:
+            failures.append(LayerFailure(
+                index, name, "errors", sample_url=errors[0].get("url"),
+                detail=f"{len(errors)}개 URL 요청/추출 실패 (예: {errors[0].get('error')})",
+            ))
+            continue
+
+        if n_pages == 0:
+            if index == 0:
+                continue
+            prev = layers[index - 1]
+            if get("links", index - 1, 0) == 0 and get("pages", index - 1, 0) > 0:
+                # 앞 계층의 no_links로 이미 보고됨
+                continue
+            if get("pages", index - 1, 0) > 0:
+                failures.append(LayerFailure(
+                    index - 1, prev.get("layer_name") or f"L{index}", "no_pages",
+                    selector=prev.get("navigate_to_next"), sample_url=(get("sample_urls", index - 1, []) or [None])[0],
+                    detail=f"L{index + 1} 페이지를 하나도 받지 못했습니다. (L{index} navigate_to_next가 가리키는 링크 확인 필요)",
+                ))
+            continue
+
+        is_last = index == len(layers) - 1 or not layer.get("navigate_to_next")
+        if not is_last and get("links", index, 0) == 0:
+            failures.append(LayerFailure(
+                index, name, "no_links", selector=layer.get("navigate_to_next"), sample_url=(samples or [None])[0],
+                detail=f"페이지 {n_pages}개에서 다음 계층 링크를 하나도 찾지 못했습니다.",
+            ))
+            continue
+
+        empty = get("empty_pages", index, 0)
+        # 중간 계층은 링크만 넘기면 되므로(필드는 물려줄 값일 뿐) 마지막 계층에서만 봅니다.
+        if is_last and empty >= n_pages * EMPTY_PAGE_RATIO:
+            empty_urls = get("empty_urls", index, [])
+            failures.append(LayerFailure(
+                index, name, "empty_pages", selector=", ".join(f"{k}={v}" for k, v in (layer.get("selectors") or {}).items()),
+                sample_url=(empty_urls or samples or [None])[0],
+                detail=f"페이지 {n_pages}개 중 {empty}개에서 레코드가 하나도 추출되지 않았습니다.",
+            ))
+            continue
+
+        fields = get("fields", index, {})
+        weak = [
+            (field, hits, total) for field, (hits, total) in fields.items()
+            if total and hits / total < FIELD_HIT_RATIO
+        ]
+        if weak:
+            field, hits, total = min(weak, key=lambda w: w[1] / w[2])
+            failures.append(LayerFailure(
+                index, name, "empty_field", field=field, selector=(layer.get("selectors") or {}).get(field),
+                sample_url=(samples or [None])[0],
+                detail=f"'{field}' 값이 레코드 {total}개 중 {hits}개에만 있습니다."
+                       + (f" (함께 약한 필드: {', '.join(w[0] for w in weak if w[0] != field)})" if len(weak) > 1 else ""),
+            ))
+    return failures
+
+
+def format_failures(failures: list[LayerFailure]) -> str:
+    """LLM/사용자에게 보여 줄 실패 보고서"""
+    if not failures:
+        return "🩺 [Diagnose] 실패한 계층이 없습니다."
+    lines = [f"🩺 [Diagnose] 실패한 계층 {len(failures)}개 (이 계층만 다시 검증하면 됩니다)"]
+    for f in failures:
+        target = f"필드 '{f.field}' 셀렉터 `{f.selector}`" if f.field else f"셀렉터 `{f.selector}`" if f.selector else ""
+        lines.append(f"  - L{f.layer_index + 1} '{f.layer_name}' [{f.kind}]{' ' + target if target else ''}: {f.detail}")
+        if f.sample_url:
+            lines.append(f"    예시 URL: {f.sample_url}")
+    return "\n".join(lines)
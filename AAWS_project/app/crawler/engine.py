@@ -0,0 +1,745 @@
+import re
+import json
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+from urllib.parse import urljoin
+
+from app.crawler.pagination import (
+    URL_PARAM,
+    AJAX_BUTTON,
+    INFINITE_SCROLL,
+    normalize_method,
+    paginate_url_param,
+    drive_load_more,
+    drive_infinite_scroll,
+)
+from app.crawler.scheduler import DEFAULT_USER_AGENT, RobotsDisallowed, canonicalize_url
+from app.crawler.incremental import NEW, CHANGED
+
+# ==========================================
+# ⚙️ Native Blueprint Execution Engine
+# ==========================================
+# Coder가 매번 크롤러 스크립트를 새로 짜고 디버깅하는 대신,
+# NavigatorBlueprint(PageLayer 목록)를 그대로 해석해서 직접 수집하는 비동기 엔진입니다.
+#   - Static SSR      → httpx 커넥션 풀 (HttpFetcher)
+#   - Dynamic CSR/JS  → Chromium 1개 + 재사용 페이지 풀 (BrowserFetcher)
+
+
+_URL_ATTRS = {"href", "src", "data-src", "action"}
+
+
+@dataclass
+class _PageDone:
+    """체크포인트 모드에서 한 URL 방문의 레코드를 묶어서 전달합니다.
+    다른 페이지의 레코드와 섞이지 않아야, 소비자가 다 받은 시점에 완료로 표시해도 결과 파일과 어긋나지 않습니다.
+    """
+
+    layer: int
+    url: str
+    records: list = field(default_factory=list)
+    # 증분 수집: 레코드를 다 내보낸 뒤 RecrawlStore.commit()할 URL
+    recrawl_url: Optional[str] = None
+
+    async def put(self, record: dict):
+        self.records.append(record)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    html: str
+    headers: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+# ==========================================
+# Fetcher: HTTP 풀 / 브라우저 페이지 풀
+# ==========================================
+class HttpFetcher:
+    """Static SSR 페이지용. 하나의 httpx.AsyncClient 커넥션 풀을 모든 요청이 공유합니다."""
+
+    def __init__(self, max_connections: int = 20, timeout: float = 15.0, headers: Optional[dict] = None):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.headers = {"User-Agent": DEFAULT_USER_AGENT, **(headers or {})}
+        self._client = None
+
+    async def __aenter__(self):
+        import httpx
+
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+        self._client = None
+
+    async def fetch(self, url: str, headers: Optional[dict] = None, wait_for: Optional[str] = None) -> FetchResult:
+        start = time.perf_counter()
+        resp = await self._client.get(url, headers=headers)
+        return FetchResult(
+            url=str(resp.url),
+            status=resp.status_code,
+            html=resp.text if resp.status_code != 304 else "",
+            headers=dict(resp.headers),
+            elapsed=time.perf_counter() - start,
+        )
+
+
+class BrowserFetcher:
+    """Dynamic CSR/JS 페이지용. Chromium 하나를 띄우고 탭(page)을 풀로 돌려 씁니다."""
+
+    def __init__(self, pool_size: int = 4, headless: bool = True, timeout_ms: int = 15000):
+        self.pool_size = pool_size
+        self.headless = headless
+        self.timeout_ms = timeout_ms
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._pages: Optional[asyncio.Queue] = None
+
+    async def __aenter__(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._context = await self._browser.new_context(user_agent=DEFAULT_USER_AGENT)
+        self._pages = asyncio.Queue()
+        for _ in range(self.pool_size):
+            self._pages.put_nowait(await self._context.new_page())
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._browser.close()
+        await self._playwright.stop()
+        self._browser = self._context = self._playwright = None
+
+    @asynccontextmanager
+    async def page(self):
+        """풀에서 탭 하나를 빌려주고, 사용이 끝나면 돌려받습니다."""
+        page = await self._pages.get()
+        try:
+            yield page
+        finally:
+            self._pages.put_nowait(page)
+
+    async def fetch(self, url: str, headers: Optional[dict] = None, wait_for: Optional[str] = None) -> FetchResult:
+        start = time.perf_counter()
+        async with self.page() as page:
+            resp = await self._goto(page, url, headers)
+            if resp is not None and resp.status == 304:
+                # 조건부 요청에 바뀌지 않았다는 응답 → 렌더링할 본문이 없음
+                html = ""
+            else:
+                await settle_page(page, wait_for)
+                html = await page.content()
+            return FetchResult(
+                url=page.url,
+                status=resp.status if resp else 200,
+                html=html,
+                headers=dict(resp.headers) if resp else {},
+                elapsed=time.perf_counter() - start,
+            )
+
+
+    async def _goto(self, page, url: str, headers: Optional[dict]):
+        """headers(증분 수집의 If-None-Match / If-Modified-Since 등)는 문서 요청에만 붙입니다.
+        set_extra_http_headers는 스크립트/이미지 요청에도 붙어 하위 리소스가 304로 비어 버릴 수 있어 route로 처리합니다.
+        """
+        if not headers:
+            return await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+
+        async def add_headers(route, request):
+            if request.is_navigation_request() and request.frame == page.main_frame:
+                await route.continue_(headers={**request.headers, **headers})
+            else:
+                await route.continue_()
+
+        await page.route("**/*", add_headers)
+        try:
+            return await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+        finally:
+            await page.unroute("**/*", add_headers)
+
+
+async def settle_page(page, wait_for: Optional[str] = None, timeout_ms: int = 5000):
+    """고정 sleep 대신, 목표 셀렉터가 나타나거나 네트워크가 잠잠해질 때까지만 기다립니다."""
+    try:
+        if wait_for:
+            await page.wait_for_selector(wait_for, timeout=timeout_ms)
+        else:
+            await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    except Exception:
+        pass
+
+
+# ==========================================
+# 셀렉터 해석 / 데이터 추출
+# ==========================================
+def split_selector(selector: str) -> tuple[str, Optional[str]]:
+    """'a.title::attr(href)' → ('a.title', 'href'),  'a.title::text' → ('a.title', None)"""
+    match = re.search(r"(.*?)::attr\((.*?)\)\s*$", selector)
+    if match:
+        return match.group(1).strip(), match.group(2).strip().strip("'\"")
+    if selector.endswith("::text"):
+        return selector[: -len("::text")].strip(), None
+    return selector.strip(), None
+
+
+def _element_value(el, attr: Optional[str], base_url: str) -> Optional[str]:
+    if attr:
+        value = el.get(attr)
+        if isinstance(value, list):
+            value = " ".join(value)
+        if value and attr in _URL_ATTRS:
+            value = urljoin(base_url, value)
+        return value
+    text = el.get_text(" ", strip=True)
+    return text or None
+
+
+def extract_records(html: str, selectors: dict[str, str], base_url: str) -> list[dict]:
+    """PageLayer.selectors를 HTML에 적용해 레코드 목록을 만듭니다.
+
+    selectors에 'container' 키가 있으면 컨테이너마다 한 레코드를 만들고,
+    없으면 필드별 매칭 결과를 순서대로 짝지어(zip) 레코드를 만듭니다.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    fields = {k: split_selector(v) for k, v in selectors.items() if k != "container" and v}
+
+    container = selectors.get("container")
+    if container:
+        records = []
+        for box in soup.select(split_selector(container)[0]):
+            record = {}
+            for key, (css, attr) in fields.items():
+                el = box.select_one(css)
+                record[key] = _element_value(el, attr, base_url) if el else None
+            if any(v is not None for v in record.values()):
+                records.append(record)
+        return records
+
+    columns = {
+        key: [_element_value(el, attr, base_url) for el in soup.select(css)]
+        for key, (css, attr) in fields.items()
+    }
+    size = max((len(v) for v in columns.values()), default=0)
+    return [
+        {key: (values[i] if i < len(values) else None) for key, values in columns.items()}
+        for i in range(size)
+    ]
+
+
+def extract_links(html: str, selector: str, base_url: str) -> list[str]:
+    """navigate_to_next 셀렉터로 다음 계층 URL 목록을 뽑습니다. (기본 속성: href)"""
+    from bs4 import BeautifulSoup
+
+    css, attr = split_selector(selector)
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for el in soup.select(css):
+        value = el.get(attr or "href")
+        if not value and el.name != "a":
+            # 컨테이너를 가리킨 경우 내부의 첫 링크를 사용
+            inner = el.select_one("a[href]")
+            value = inner.get("href") if inner else None
+        if value and not value.startswith(("javascript:", "#", "mailto:")):
+            links.append(urljoin(base_url, value))
+    return links
+
+
+def _as_dict(blueprint) -> dict:
+    if hasattr(blueprint, "model_dump"):
+        return blueprint.model_dump()
+    if isinstance(blueprint, str):
+        with open(blueprint, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return dict(blueprint)
+
+
+def _first_field_selector(layer: dict) -> Optional[str]:
+    for key, value in (layer.get("selectors") or {}).items():
+        if value:
+            return split_selector(value)[0]
+    return None
+
+
+def _item_selector(layer: dict) -> Optional[str]:
+    """AJAX/스크롤 목록에서 항목 수를 셀 셀렉터 (컨테이너 우선, 없으면 첫 필드)"""
+    selectors = layer.get("selectors") or {}
+    if selectors.get("container"):
+        return split_selector(selectors["container"])[0]
+    return _first_field_selector(layer)
+
+
+class HttpStatusError(RuntimeError):
+    """4xx/5xx 응답. 정상 페이지처럼 추출되지 않도록 예외로 올려 stats["errors"]에 남깁니다."""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status}: {url}")
+        self.url = url
+        self.status = status
+
+
+# ==========================================
+# 실행 엔진
+# ==========================================
+class BlueprintExecutor:
+    """NavigatorBlueprint를 코드 생성 없이 직접 실행하는 N계층 크롤러
+
+    사용 예)
+        executor = BlueprintExecutor(blueprint, concurrency=4)
+        async for record in executor.stream():
+            print(record)
+    """
+
+    def __init__(
+        self,
+        blueprint,
+        concurrency: int = 4,
+        max_pages: int = 5,
+        max_links_per_page: Optional[int] = None,
+        use_browser: Optional[bool] = None,
+        target_items: Optional[int] = None,
+        scheduler=None,
+        incremental=None,
+        checkpoint=None,
+        fetcher=None,
+        buffer_size: int = 256,
+        open_layers: bool = False,
+        seeds: Optional[list[tuple[int, str, dict]]] = None,
+    ):
+        """
+        Args:
+            blueprint: NavigatorBlueprint, 그 dict, 또는 blueprint JSON 파일 경로
+            concurrency: 계층별 동시 요청 수 상한
+            max_pages: 목록 계층에서 따라갈 최대 페이지 수 (AJAX/스크롤은 최대 로드 회차)
+            max_links_per_page: 한 페이지에서 다음 계층으로 넘길 최대 링크 수 (None이면 전부)
+            use_browser: 브라우저 사용 여부 강제 (None이면 rendering_type으로 판단)
+            target_items: 목록 계층 하나에서 이만큼 모이면 페이지 이동을 멈춤 (None이면 끝까지)
+            scheduler: 여러 크롤링이 공유하는 CrawlScheduler (도메인별 예절 + URL 중복 제거)
+            incremental: RecrawlStore를 주면 마지막 계층을 조건부 요청으로 받고, 새로 생기거나 바뀐 레코드만 내보냄
+            checkpoint: CrawlStateStore를 주면 frontier/완료 URL을 저장하고, 이전에 중단된 지점부터 재개
+            fetcher: 외부에서 열어 둔 Fetcher를 공유할 때 전달
+            buffer_size: 소비자가 느릴 때 쌓아 둘 레코드 수 (스트리밍 backpressure)
+            open_layers: True면 Navigator가 계층을 다 만들기 전에 시작합니다. add_layer()로 계층을 이어 붙이고
+                finish_layers()를 부르기 전까지는 아직 없는 계층으로 가는 링크를 보관해 둡니다. (checkpoint/incremental과 함께 쓰지 않음)
+            seeds: (계층 번호, URL, 물려받을 필드) 목록을 주면 entry_urls 대신 거기서 시작합니다.
+                이전 실행의 spawned[k]를 넘기면 앞 계층은 다시 받지 않고 k계층부터만 다시 수집합니다. (계층 단위 재수집)
+        """
+        if open_layers and (checkpoint is not None or incremental is not None):
+            raise ValueError("open_layers는 checkpoint/incremental과 함께 쓸 수 없습니다.")
+        self.blueprint = _as_dict(blueprint)
+        self.layers: list[dict] = list(self.blueprint.get("layers", []))
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.max_links_per_page = max_links_per_page
+        self.target_items = target_items
+        self.scheduler = scheduler
+        self.incremental = incremental
+        self.checkpoint = checkpoint
+        self.buffer_size = buffer_size
+        self.fetcher = fetcher
+
+        if use_browser is None:
+            use_browser = "static" not in str(self.blueprint.get("rendering_type", "")).lower()
+        self.use_browser = use_browser
+
+        self._semaphores = [asyncio.Semaphore(concurrency) for _ in self.layers]
+        self._visited: set[tuple[int, str]] = set()
+        # 계층이 아직 다 오지 않은 경우: 보관 중인 다음 계층 링크, 실행 중인 stream()의 spawn/종료 신호
+        self.layers_complete = not open_layers
+        self._parked: list[tuple[int, str, dict]] = []
+        self._spawn = None
+        self._signal_done = None
+        self.seeds = list(seeds) if seeds is not None else None
+        # 계층별로 방문하려던 (URL, 물려받은 필드) 목록 → 실패한 계층만 다시 수집할 때 seeds로 재사용
+        self.spawned: list[list[tuple[str, dict]]] = []
+        self.stats = {
+            "pages": [],
+            "empty_pages": [],
+            "records": 0,
+            "errors": [],
+            # 방문하지 않은 URL: robots.txt가 막음 / 공유 스케줄러에서 이미 본 URL (실패가 아니므로 체크포인트 완료를 막지 않음)
+            "skipped": [],
+            "elapsed": 0.0,
+            # 실패 진단용 (app.crawler.diagnose): 필드별 [값이 있던 레코드 수, 전체 레코드 수], 찾은 다음 계층 링크 수, 예시 URL
+            "fields": [],
+            "links": [],
+            "sample_urls": [],
+            "empty_urls": [],
+        }
+        for _ in self.layers:
+            self._grow_stats()
+
+    def _grow_stats(self):
+        self.spawned.append([])
+        for key in ("pages", "empty_pages", "links"):
+            self.stats[key].append(0)
+        for key in ("fields", "sample_urls", "empty_urls"):
+            self.stats[key].append({} if key == "fields" else [])
+
+    def _note_page(self, layer_index: int, url: str, records: list[dict]):
+        """진단용으로 필드별 추출 성공 수와 예시 URL을 기록합니다."""
+        if len(self.stats["sample_urls"][layer_index]) < 3:
+            self.stats["sample_urls"][layer_index].append(url)
+        if not records:
+            self.stats["empty_pages"][layer_index] += 1
+            if len(self.stats["empty_urls"][layer_index]) < 3:
+                self.stats["empty_urls"][layer_index].append(url)
+        fields = self.stats["fields"][layer_index]
+        for record in records:
+            for key, value in record.items():
+                hit = fields.setdefault(key, [0, 0])
+                hit[0] += value not in (None, "")
+                hit[1] += 1
+
+    # ---------- 계층 이어 붙이기 (open_layers) ----------
+    def add_layer(self, layer) -> int:
+        """검증이 끝난 다음 계층을 이어 붙이고, 보관해 둔 그 계층 링크를 바로 방문합니다. 붙인 계층 번호를 돌려줍니다."""
+        if self.layers_complete:
+            raise RuntimeError("이미 finish_layers()가 호출되어 계층을 더 붙일 수 없습니다.")
+        self.layers.append(_as_dict(layer))
+        self._semaphores.append(asyncio.Semaphore(self.concurrency))
+        self._grow_stats()
+        index = len(self.layers) - 1
+        parked, self._parked = self._parked, []
+        for layer_index, url, context in parked:
+            if layer_index == index and self._spawn is not None:
+                self._spawn(layer_index, url, context)
+            else:
+                self._parked.append((layer_index, url, context))
+        print(f"🧩 [Engine] L{index + 1} 계층 추가 (보관 중이던 링크 {len(parked) - len(self._parked)}개 방문 시작)")
+        return index
+
+    def finish_layers(self):
+        """더 붙일 계층이 없음을 알립니다. 보관 중이던 링크는 버리고, 진행 중인 방문이 끝나면 stream()이 끝납니다."""
+        self.layers_complete = True
+        if self._parked:
+            print(f"   ⚠️ [Engine] 다음 계층이 오지 않아 링크 {len(self._parked)}개를 방문하지 않았습니다.")
+        self._parked = []
+        if self._signal_done is not None:
+            self._signal_done()
+
+    def _is_frontier(self, layer_index: int) -> bool:
+        """아직 다음 계층이 오지 않은 마지막 계층 (레코드는 부분 결과로 내보내고 링크는 보관)"""
+        layer = self.layers[layer_index]
+        return not self.layers_complete and layer_index == len(self.layers) - 1 and bool(layer.get("navigate_to_next"))
+
+    def _new_fetcher(self):
+        if self.use_browser:
+            return BrowserFetcher(pool_size=self.concurrency)
+        return HttpFetcher(max_connections=self.concurrency * max(1, len(self.layers)))
+
+    @asynccontextmanager
+    async def _opened_fetcher(self):
+        if self.fetcher is not None:
+            yield self.fetcher
+            return
+        async with self._new_fetcher() as fetcher:
+            self.fetcher = fetcher
+            try:
+                yield fetcher
+            finally:
+                self.fetcher = None
+
+    # ---------- 페이지 단위 ----------
+    @asynccontextmanager
+    async def _polite(self, url: str, layer_index: int):
+        """공유 스케줄러가 있으면 도메인별 동시성/요청 간격 슬롯을 받아서 요청합니다.
+        같은 도메인에서 기다리는 요청 중에는 깊은 계층(상세 페이지)이 먼저 자리를 받아, 목록만 계속 넘기기 전에 레코드가 나옵니다.
+        """
+        if self.scheduler is None:
+            yield
+            return
+        async with self.scheduler.slot(url, priority=-layer_index):
+            yield
+
+    async def _fetch(self, layer_index: int, url: str, headers: Optional[dict] = None, raise_for_status: bool = True) -> FetchResult:
+        layer = self.layers[layer_index]
+        async with self._semaphores[layer_index], self._polite(url, layer_index):
+            result = await self.fetcher.fetch(url, headers=headers, wait_for=_first_field_selector(layer))
+        self.stats["pages"][layer_index] += 1
+        if raise_for_status and result.status >= 400:
+            raise HttpStatusError(url, result.status)
+        return result
+
+    async def _layer_pages(self, layer_index: int, url: str) -> AsyncIterator[tuple[FetchResult, list[dict]]]:
+        """pagination_method에 맞춰 한 계층의 페이지를 (응답, 추출 레코드) 순서로 내보냅니다."""
+        layer = self.layers[layer_index]
+        selectors = layer.get("selectors") or {}
+        method = normalize_method(layer.get("pagination_method"))
+
+        if method == URL_PARAM:
+            collected = 0
+            # 첫 페이지 오류는 계층 실패, 그 뒤 페이지의 4xx/5xx는 (범위를 넘은) 마지막 페이지로 봅니다.
+            async for _, page, records in paginate_url_param(
+                lambda u: self._fetch(layer_index, u, raise_for_status=u == url),
+                url,
+                extract=lambda r: extract_records(r.html, selectors, r.url) if r.status < 400 else [],
+                window=self.concurrency,
+                max_pages=self.max_pages,
+            ):
+                yield page, records
+                collected += len(records)
+                if self.target_items and collected >= self.target_items:
+                    return
+            return
+
+        if method in (AJAX_BUTTON, INFINITE_SCROLL):
+            if not self.use_browser:
+                print(f"   ⚠️ [Engine] L{layer_index + 1} '{method}'은 브라우저 모드에서만 동작합니다. 첫 화면만 수집합니다.")
+            elif _item_selector(layer) is None:
+                print(f"   ⚠️ [Engine] L{layer_index + 1} 항목 셀렉터(container/필드)가 없어 '{method}'을 구동할 수 없습니다. 첫 화면만 수집합니다.")
+            else:
+                async for item in self._driven_pages(layer_index, url, method):
+                    yield item
+                return
+
+        page = await self._fetch(layer_index, url)
+        yield page, extract_records(page.html, selectors, page.url)
+
+    async def _driven_pages(self, layer_index: int, url: str, method: str):
+        """AJAX버튼/무한스크롤 목록을 브라우저 탭 하나로 구동하며, 항목이 늘 때마다 스냅샷을 내보냅니다."""
+        layer = self.layers[layer_index]
+        selectors = layer.get("selectors") or {}
+        item_selector = _item_selector(layer)
+
+        async with self._semaphores[layer_index], self._polite(url, layer_index), self.fetcher.page() as page:
+            resp = await page.goto(url, wait_until="domcontentloaded", timeout=self.fetcher.timeout_ms)
+            if resp is not None and resp.status >= 400:
+                self.stats["pages"][layer_index] += 1
+                raise HttpStatusError(url, resp.status)
+            await settle_page(page, item_selector)
+            if method == AJAX_BUTTON:
+                driver = drive_load_more(
+                    page, item_selector, button_selector=layer.get("more_button"),
+                    target_count=self.target_items, max_rounds=self.max_pages,
+                )
+            else:
+                driver = drive_infinite_scroll(page, item_selector, target_count=self.target_items, max_rounds=self.max_pages)
+
+            async for load_round in driver:
+                self.stats["pages"][layer_index] += 1
+                html = await page.content()
+                print(f"   📜 [Engine] L{layer_index + 1} {method} {load_round.round}회차: 항목 {load_round.total_items}개 (+{load_round.new_items})")
+                yield FetchResult(url=page.url, status=200, html=html), extract_records(html, selectors, page.url)
+
+    async def _visit_incremental(self, layer_index: int, url: str, context: dict, out: asyncio.Queue):
+        """마지막 계층(상세 페이지)을 조건부 요청으로 받고, 바뀌지 않았으면 추출 없이 건너뜁니다."""
+        store = self.incremental
+        page = await self._fetch(layer_index, url, headers=store.conditional_headers(url))
+        change = store.check(url, page)
+        if change not in (NEW, CHANGED):
+            store.commit(url)  # 내보낼 레코드가 없으므로 바로 반영
+            return
+
+        start = time.perf_counter()
+        records = extract_records(page.html, self.layers[layer_index].get("selectors") or {}, page.url)
+        store.note_extract(time.perf_counter() - start)
+        self._note_page(layer_index, page.url, records)
+        # 레코드를 한 묶음으로 보내고, 소비자가 다 받은 뒤에 새 해시/ETag를 기록합니다. (stream()에서 commit)
+        batch = out if isinstance(out, _PageDone) else _PageDone(layer_index, url)
+        batch.recrawl_url = url
+        for record in records:
+            await batch.put({**context, **record, "_source_url": page.url, "_change": change})
+        if batch is not out:
+            await out.put(batch)
+
+    async def _visit(self, layer_index: int, url: str, context: dict, spawn, out: asyncio.Queue):
+        layer = self.layers[layer_index]
+        frontier = self._is_frontier(layer_index)
+        is_last = not frontier and (layer_index == len(self.layers) - 1 or not layer.get("navigate_to_next"))
+        # 목록 계층은 매번 새로 받아야 새 글을 찾을 수 있으므로, 증분 수집은 페이지 이동이 없는 상세 계층에만 적용합니다.
+        if is_last and self.incremental is not None and layer_index > 0 and not normalize_method(layer.get("pagination_method")):
+            await self._visit_incremental(layer_index, url, context, out)
+            return
+        # AJAX/스크롤 목록은 회차마다 앞 항목이 다시 포함되므로 이미 내보낸 레코드는 건너뜁니다.
+        emitted: set[tuple] = set()
+
+        async for page, records in self._layer_pages(layer_index, url):
+            self._note_page(layer_index, page.url, records)
+
+            if is_last:
+                for record in records:
+                    key = tuple(record.items())
+                    if key in emitted:
+                        continue
+                    emitted.add(key)
+                    await out.put({**context, **record, "_source_url": page.url})
+                continue
+
+            if frontier:
+                # 다음 계층이 아직 없으므로 이 계층 레코드를 먼저 내보내고 (첫 데이터까지 시간 단축), 링크는 spawn에서 보관됩니다.
+                for record in records:
+                    await out.put({**context, **record, "_source_url": page.url, "_layer": layer_index, "_partial": True})
+
+            links = extract_links(page.html, layer["navigate_to_next"], page.url)
+            if self.max_links_per_page:
+                links = links[: self.max_links_per_page]
+            self.stats["links"][layer_index] += len(links)
+            # 링크 수와 레코드 수가 같으면 목록의 필드(제목, 날짜 등)를 상세 레코드에 물려줍니다.
+            paired = len(records) == len(links)
+            for i, link in enumerate(links):
+                spawn(layer_index + 1, link, {**context, **records[i]} if paired else dict(context))
+
+    # ---------- 스트리밍 실행 ----------
+    async def stream(self) -> AsyncIterator[dict]:
+        """추출되는 레코드를 수집 즉시 하나씩 내보냅니다."""
+        if not self.layers:
+            return
+
+        out: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+        done = object()
+        inflight = 0
+        tasks: set[asyncio.Task] = set()
+        start = time.perf_counter()
+
+        async def run_visit(layer_index, url, context):
+            nonlocal inflight
+            page_done = _PageDone(layer_index, url) if self.checkpoint is not None else None
+            cancelled = False
+            try:
+                await self._visit(layer_index, url, context, spawn, out if page_done is None else page_done)
+                if page_done is not None:
+                    await out.put(page_done)
+            except RobotsDisallowed:
+                self.stats["skipped"].append({"layer": layer_index, "url": url, "reason": "robots.txt"})
+                print(f"   🚫 [Engine] L{layer_index + 1} robots.txt가 막은 URL 건너뜀: {url}")
+                if page_done is not None:
+                    await out.put(page_done)
+            except Exception as e:
+                self.stats["errors"].append({"layer": layer_index, "url": url, "error": str(e)})
+                print(f"   ⚠️ [Engine] L{layer_index + 1} 실패: {url} ({e})")
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                inflight -= 1
+                # 소비자가 멈춰 취소된 경우엔 아무도 큐를 비우지 않으므로, 가득 찬 큐에 넣으려다 영원히 멈추지 않게 건너뜁니다.
+                if inflight == 0 and self.layers_complete and not cancelled:
+                    await out.put(done)
+
+        def signal_done():
+            if inflight == 0:
+                out.put_nowait(done)
+
+        def spawn(layer_index, url, context):
+            nonlocal inflight
+            if layer_index >= len(self.layers):
+                if not self.layers_complete:
+                    self._parked.append((layer_index, url, context))
+                return
+            key = (layer_index, canonicalize_url(url))
+            if key in self._visited:
+                return
+            self._visited.add(key)
+            self.spawned[layer_index].append((url, context))
+            # 공유 스케줄러가 있으면 다른 Blueprint 크롤링이 이미 방문한 URL도 건너뜁니다.
+            # (Bloom filter 오탐으로 처음 보는 URL이 빠질 수도 있어, 건너뛴 URL은 skipped에 남김)
+            if self.scheduler is not None and not self.scheduler.mark_seen(url):
+                self.stats["skipped"].append({"layer": layer_index, "url": url, "reason": "duplicate"})
+                return
+            if self.checkpoint is not None:
+                if self.checkpoint.is_done(layer_index, url):
+                    return
+                self.checkpoint.add_pending(layer_index, url, context)
+            inflight += 1
+            task = asyncio.create_task(run_visit(layer_index, url, context))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        self._spawn, self._signal_done = spawn, signal_done
+        async with self._opened_fetcher():
+            print(f"🕷️ [Engine] 시작: 진입 URL {len(self.blueprint.get('entry_urls', []))}개, "
+                  f"계층 {len(self.layers)}개, {'Browser' if self.use_browser else 'HTTP'} 모드")
+            if self.seeds is not None:
+                for layer_index, url, context in self.seeds:
+                    spawn(layer_index, url, context)
+            else:
+                for entry_url in self.blueprint.get("entry_urls", []):
+                    spawn(0, entry_url, {})
+            if self.checkpoint is not None and self.checkpoint.resumed:
+                resume_items = self.checkpoint.pending()
+                print(f"♻️ [Engine] 체크포인트에서 재개: 남은 URL {len(resume_items)}개")
+                for layer_index, url, context in resume_items:
+                    spawn(layer_index, url, context)
+            if inflight == 0 and self.layers_complete:
+                if self.checkpoint is not None:
+                    self.checkpoint.finish()
+                self._spawn = self._signal_done = None
+                return
+
+            finished = False
+            in_batch = False
+            try:
+                while True:
+                    item = await out.get()
+                    if item is done:
+                        finished = True
+                        break
+                    if isinstance(item, _PageDone):
+                        in_batch = True
+                        for record in item.records:
+                            self.stats["records"] += 1
+                            yield record
+                        in_batch = False
+                        if item.recrawl_url is not None:
+                            self.incremental.commit(item.recrawl_url)
+                        if self.checkpoint is not None:
+                            self.checkpoint.mark_done(item.layer, item.url)
+                        continue
+                    self.stats["records"] += 1
+                    yield item
+            finally:
+                self._spawn = self._signal_done = None
+                for task in tasks:
+                    task.cancel()
+                # 페이지 묶음 중간에 끊겼다면 그 시점의 결과 파일 위치는 완료 표시와 맞지 않으므로 커밋하지 않습니다.
+                if self.checkpoint is not None and not in_batch:
+                    # 실패한 URL이 있으면 완료로 표시하지 않아, 다음 실행 때 그 URL만 다시 시도합니다.
+                    if finished and not self.stats["errors"]:
+                        self.checkpoint.finish()
+                    else:
+                        self.checkpoint.commit()
+                self.stats["elapsed"] = time.perf_counter() - start
+                print(f"✅ [Engine] 완료: 레코드 {self.stats['records']}개, 페이지 {self.stats['pages']}, "
+                      f"오류 {len(self.stats['errors'])}건, 건너뜀 {len(self.stats['skipped'])}건, {self.stats['elapsed']:.1f}초")
+                if self.incremental is not None:
+                    # 끝까지 수집했을 때만 기록하고, 중단/실패한 수집의 변경은 버려 다음에 다시 비교합니다.
+                    if finished:
+                        self.incremental.flush()
+                    else:
+                        self.incremental.rollback()
+                    self.stats["incremental"] = self.incremental.report()
+                    print(f"🔁 [Engine] 증분 수집: {self.incremental.summary()}")
+
+    async def run(self) -> list[dict]:
+        """스트림을 끝까지 소비해 레코드 리스트로 반환합니다."""
+        return [record async for record in self.stream()]
+
+
+async def crawl_blueprint(blueprint, **kwargs) -> list[dict]:
+    return await BlueprintExecutor(blueprint, **kwargs).run()
+
+
+async def crawl_blueprints(blueprints, scheduler=None, **kwargs) -> list[list[dict]]:
+    """여러 Blueprint를 동시에 실행하되, 하나의 CrawlScheduler를 공유해 도메인별 예절을 지킵니다."""
+    from app.crawler.scheduler import CrawlScheduler
+
+    if scheduler is None:
+        scheduler = CrawlScheduler()
+    return await asyncio.gather(
+        *[BlueprintExecutor(bp, scheduler=scheduler, **kwargs).run() for bp in blueprints]
+    )
@@ -0,0 +1,258 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from app.crawler.registry import ARTIFACT_DIR
+from app.crawler.scheduler import canonicalize_url
+
+# ==========================================
+# 🔁 Incremental Recrawl Store
+# ==========================================
+# 매일 같은 섹션을 다시 수집할 때, 바뀌지 않은 상세 페이지는 내려받지도/파싱하지도 않도록
+# URL별 ETag, Last-Modified, 본문 해시를 SQLite에 보관합니다.
+#   1) 조건부 요청 (If-None-Match / If-Modified-Since) → 304면 본문 전송 자체를 생략
+#      (브라우저로 받는 CSR Blueprint도 문서 요청에만 같은 헤더를 붙임, engine.BrowserFetcher)
+#   2) 200이어도 본문 해시가 같으면 추출 생략
+#   3) 새로 생겼거나 바뀐 페이지의 레코드만 내보냄
+
+RECRAWL_DB_FILENAME = "recrawl_state.db"
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+NOT_MODIFIED = "not_modified"
+
+# 방문할 때마다 달라지는 부분(스크립트, 스타일, 주석, nonce/csrf 토큰)은 해시에서 제외합니다.
+_VOLATILE_PATTERNS = [
+    re.compile(r"<script\b.*?</script>", re.S | re.I),
+    re.compile(r"<style\b.*?</style>", re.S | re.I),
+    re.compile(r"<!--.*?-->", re.S),
+    re.compile(r"\s(?:nonce|data-csrf|csrf-token)=\"[^\"]*\"", re.I),
+]
+
+
+def content_hash(html: str) -> str:
+    """변동성 있는 부분을 제거하고 공백을 정리한 HTML 본문의 해시"""
+    for pattern in _VOLATILE_PATTERNS:
+        html = pattern.sub(" ", html)
+    return hashlib.sha1(" ".join(html.split()).encode("utf-8")).hexdigest()
+
+
+def _header(headers: dict, name: str) -> Optional[str]:
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+@dataclass
+class RecrawlStats:
+    checked: int = 0
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    not_modified: int = 0
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0
+    fetch_seconds_saved: float = 0.0
+    extract_seconds: float = 0.0
+    extract_pages: int = 0
+    extract_seconds_saved: float = 0.0
+
+    @property
+    def skipped(self) -> int:
+        return self.unchanged + self.not_modified
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "skipped": self.skipped}
+
+
+class RecrawlStore:
+    """URL별 마지막 수집 상태(ETag, Last-Modified, 본문 해시, 크기, 소요 시간)를 SQLite에 보관합니다.
+
+    시작할 때 전체 상태를 메모리로 읽고, 변경분은 flush() 때 한 번에 기록합니다.
+    check()는 새 상태를 보류해 두기만 하고, 그 페이지의 레코드가 실제로 전달된 뒤 commit()해야 반영됩니다.
+    (중간에 끊긴 수집에서 바뀐 페이지가 '이미 본 것'으로 기록되어 다시는 나오지 않는 일을 막기 위해)
+
+    사용 예)
+        with RecrawlStore() as store:
+            executor = BlueprintExecutor(blueprint, incremental=store)
+            records = await executor.run()   # 새로 생기거나 바뀐 레코드만
+            print(store.summary())
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(ARTIFACT_DIR, RECRAWL_DB_FILENAME)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                size INTEGER,
+                fetch_seconds REAL,
+                checked_at REAL
+            )"""
+        )
+        self._rows: dict[str, tuple] = {
+            row[0]: row[1:] for row in self._conn.execute(
+                "SELECT url, etag, last_modified, content_hash, size, fetch_seconds, checked_at FROM pages"
+            )
+        }
+        self._dirty: set[str] = set()
+        # check()는 했지만 아직 레코드가 전달되지 않은 페이지의 새 상태
+        self._staged: dict[str, tuple] = {}
+        self.stats = RecrawlStats()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def conditional_headers(self, url: str) -> dict:
+        """이전 수집 기록이 있으면 조건부 요청 헤더를 만들어 줍니다."""
+        row = self._rows.get(canonicalize_url(url))
+        if row is None:
+            return {}
+        etag, last_modified = row[0], row[1]
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def check(self, url: str, result) -> str:
+        """응답(FetchResult)을 이전 기록과 비교해 NEW / CHANGED / UNCHANGED / NOT_MODIFIED 중 하나를 돌려줍니다.
+
+        새 상태는 보류만 해 두므로, 레코드를 내보낸 뒤 commit(url)을 불러야 기록됩니다.
+        2xx/304가 아닌 응답이나 이전 기록 없는 304는 비교할 본문이 없으므로 ValueError를 냅니다. (기록은 그대로)
+        """
+        key = canonicalize_url(url)
+        previous = self._rows.get(key)
+
+        if result.status == 304:
+            if previous is None:
+                raise ValueError(f"이전 기록이 없는 URL에 304 응답을 받았습니다: {url}")
+            self.stats.checked += 1
+            etag, last_modified, digest, size, fetch_seconds, _ = previous
+            self.stats.not_modified += 1
+            self.stats.bytes_saved += size or 0
+            self.stats.fetch_seconds_saved += max(0.0, (fetch_seconds or 0.0) - result.elapsed)
+            self._stage(key, _header(result.headers, "etag") or etag, last_modified, digest, size, fetch_seconds)
+            return NOT_MODIFIED
+        if not 200 <= result.status < 300:
+            raise ValueError(f"HTTP {result.status} 응답은 증분 기록에 남기지 않습니다: {url}")
+
+        self.stats.checked += 1
+        size = len(result.html.encode("utf-8"))
+        self.stats.bytes_downloaded += size
+        digest = content_hash(result.html)
+        self._stage(
+            key,
+            _header(result.headers, "etag"),
+            _header(result.headers, "last-modified"),
+            digest,
+            size,
+            result.elapsed,
+        )
+
+        if previous is None:
+            self.stats.new += 1
+            return NEW
+        if previous[2] == digest:
+            self.stats.unchanged += 1
+            return UNCHANGED
+        self.stats.changed += 1
+        return CHANGED
+
+    def note_extract(self, seconds: float):
+        """실제로 추출한 페이지의 파싱 시간을 기록합니다. (건너뛴 페이지의 절약 시간 추정에 사용)"""
+        self.stats.extract_seconds += seconds
+        self.stats.extract_pages += 1
+
+    def _stage(self, key, etag, last_modified, digest, size, fetch_seconds):
+        self._staged[key] = (etag, last_modified, digest, size, fetch_seconds, time.time())
+
+    def commit(self, url: str):
+        """check()로 보류해 둔 URL의 새 상태를 반영합니다. (그 페이지의 레코드를 모두 내보낸 뒤 호출)"""
+        key = canonicalize_url(url)
+        row = self._staged.pop(key, None)
+        if row is not None:
+            self._rows[key] = row
+            self._dirty.add(key)
+
+    def rollback(self):
+        """flush하지 않은 변경을 모두 버립니다. (중단된 수집: 다음 수집 때 같은 페이지를 다시 비교)"""
+        self._staged.clear()
+        if not self._dirty:
+            return
+        dirty = list(self._dirty)
+        saved = {}
+        # SQLite 변수 개수 한도를 넘지 않도록 500개씩 나눠 조회
+        for start in range(0, len(dirty), 500):
+            chunk = dirty[start:start + 500]
+            for row in self._conn.execute(
+                f"SELECT url, etag, last_modified, content_hash, size, fetch_seconds, checked_at FROM pages "
+                f"WHERE url IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                saved[row[0]] = row[1:]
+        for key in self._dirty:
+            if key in saved:
+                self._rows[key] = saved[key]
+            else:
+                self._rows.pop(key, None)
+        self._dirty.clear()
+
+    def forget(self, url: str):
+        """다음 수집 때 해당 URL을 새 페이지로 취급하도록 기록을 지웁니다."""
+        key = canonicalize_url(url)
+        self._rows.pop(key, None)
+        self._staged.pop(key, None)
+        self._dirty.discard(key)
+        self._conn.execute("DELETE FROM pages WHERE url = ?", (key,))
+        self._conn.commit()
+
+    def flush(self):
+        if not self._dirty:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, size, fetch_seconds, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(key, *self._rows[key]) for key in self._dirty],
+        )
+        self._conn.commit()
+        self._dirty.clear()
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def report(self) -> dict:
+        """절약한 대역폭/시간을 포함한 이번 수집의 통계"""
+        stats = self.stats
+        average_extract = stats.extract_seconds / stats.extract_pages if stats.extract_pages else 0.0
+        stats.extract_seconds_saved = average_extract * stats.skipped
+        return stats.to_dict()
+
+    def summary(self) -> str:
+        report = self.report()
+        saved_seconds = report["fetch_seconds_saved"] + report["extract_seconds_saved"]
+        return (
+            f"확인 {report['checked']}건 → 신규 {report['new']} / 변경 {report['changed']} / "
+            f"동일 {report['unchanged']} / 304 {report['not_modified']} | "
+            f"절약: {report['bytes_saved'] / 1024:.1f}KB, 약 {saved_seconds:.2f}초"
+        )
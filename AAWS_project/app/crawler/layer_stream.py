@@ -0,0 +1,110 @@
+import time
+import asyncio
+import threading
+from typing import AsyncIterator, Optional
+
+# ==========================================
+# 📡 Layer Stream (검증된 계층을 바로 하류로)
+# ==========================================
+# N계층 Blueprint는 Navigator가 마지막 계층까지 검증을 끝내야 Coder/엔진이 시작할 수 있었습니다.
+# 1계층(목록) 셀렉터는 보통 몇 분 먼저 확정되는데도 그동안 아무 데이터도 나오지 않습니다.
+#
+# LayerStream은 Navigator가 검증을 끝낸 PageLayer를 하나씩 발행(publish)하는 채널입니다.
+#   - Navigator 도구(publish_verified_layer)가 현재 thread_id의 스트림에 계층을 발행하고
+#   - 하류(파이프라인)는 layers()로 계층 번호 순서대로 받아 BlueprintExecutor(open_layers=True)에 이어 붙입니다.
+#   - Navigator가 끝나면 close()로 최종 Blueprint를 넘기고, 발행되지 않은 나머지 계층은 거기서 채웁니다.
+#
+# 사용 예)
+#     stream = open_stream(thread_id)                  # 파이프라인 쪽
+#     get_stream(thread_id).publish(0, layer, entry_urls=[...], rendering_type="Static SSR")   # Navigator 도구 쪽
+#     async for index, layer in stream.layers(): executor.add_layer(layer)
+
+
+class LayerStream:
+    """한 Navigator 실행(thread_id)이 발행하는 계층들"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.entry_urls: list[str] = []
+        self.rendering_type: Optional[str] = None
+        self.published: dict[int, dict] = {}
+        self.published_at: dict[int, float] = {}
+        self.final: Optional[dict] = None
+        self.closed = False
+        self.opened_at = time.time()
+        self._changed = asyncio.Event()
+
+    def publish(self, index: int, layer: dict, entry_urls: Optional[list[str]] = None, rendering_type: Optional[str] = None):
+        """index번째 계층을 확정합니다. 같은 번호를 다시 발행하면 무시합니다. (이미 하류에서 쓰고 있을 수 있음)"""
+        if self.closed or index in self.published:
+            return False
+        if entry_urls:
+            self.entry_urls = list(entry_urls)
+        if rendering_type:
+            self.rendering_type = rendering_type
+        self.published[index] = dict(layer)
+        self.published_at[index] = time.time()
+        self._changed.set()
+        return True
+
+    def close(self, final_blueprint: Optional[dict] = None):
+        """발행을 끝냅니다. final_blueprint의 layers 중 발행되지 않은 계층은 이어서 내보냅니다."""
+        if self.closed:
+            return
+        self.final = final_blueprint
+        if final_blueprint:
+            self.entry_urls = self.entry_urls or list(final_blueprint.get("entry_urls") or [])
+            self.rendering_type = self.rendering_type or final_blueprint.get("rendering_type")
+        self.closed = True
+        self._changed.set()
+
+    def next_expected(self) -> int:
+        return len(self.published)
+
+    async def layers(self) -> AsyncIterator[tuple[int, dict]]:
+        """계층을 번호 순서대로 (index, layer) 내보냅니다. 중간 번호가 비면 그 번호가 발행될 때까지 기다립니다."""
+        index = 0
+        while True:
+            if index in self.published:
+                yield index, self.published[index]
+                index += 1
+                continue
+            if self.closed:
+                final_layers = (self.final or {}).get("layers") or []
+                for i in range(index, len(final_layers)):
+                    yield i, final_layers[i]
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+    def changed_layers(self) -> list[int]:
+        """발행한 계층과 최종 Blueprint의 계층이 달라진 번호 (발행 후 Navigator가 셀렉터를 고친 경우)"""
+        final_layers = (self.final or {}).get("layers") or []
+        return [
+            i for i, layer in self.published.items()
+            if i < len(final_layers) and (final_layers[i].get("selectors") != layer.get("selectors")
+                                          or final_layers[i].get("navigate_to_next") != layer.get("navigate_to_next"))
+        ]
+
+
+_streams: dict[str, LayerStream] = {}
+_lock = threading.Lock()
+
+
+def open_stream(key: str) -> LayerStream:
+    """key(보통 Navigator의 thread_id)로 새 스트림을 엽니다. 같은 key의 이전 스트림은 대체됩니다."""
+    with _lock:
+        stream = _streams[key] = LayerStream(key)
+        return stream
+
+
+def get_stream(key: Optional[str]) -> Optional[LayerStream]:
+    """열린 스트림이 없으면 None (스트리밍 없이 Navigator만 실행하는 경우)"""
+    if not key:
+        return None
+    return _streams.get(key)
+
+
+def discard_stream(key: str):
+    with _lock:
+        _streams.pop(key, None)
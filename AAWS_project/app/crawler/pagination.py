@@ -0,0 +1,233 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# ==========================================
+# 📄 Pagination Driver
+# ==========================================
+# PageLayer.pagination_method 별 페이지 이동 전략
+#   - URL파라미터 : 여러 페이지를 미리(speculative) 동시에 요청하고, 빈 페이지가 나오면 즉시 중단
+#   - AJAX버튼   : '더보기' 버튼 클릭 → 새 항목이 붙을 때까지만 대기 (고정 sleep 없음)
+#   - 무한스크롤  : 스크롤 → 새 항목 감지, 더 이상 늘지 않으면 종료
+
+URL_PARAM = "URL파라미터"
+AJAX_BUTTON = "AJAX버튼"
+INFINITE_SCROLL = "무한스크롤"
+
+_METHOD_ALIASES = {
+    URL_PARAM: ("url파라미터", "url", "url_param", "query", "page_param"),
+    AJAX_BUTTON: ("ajax버튼", "ajax", "더보기", "load_more", "button"),
+    INFINITE_SCROLL: ("무한스크롤", "scroll", "infinite_scroll", "infinite"),
+}
+
+# 페이지 번호로 흔히 쓰이는 쿼리 파라미터 이름
+PAGE_PARAM_CANDIDATES = ("page", "p", "pg", "pageNo", "page_no", "pageIndex", "currentPage", "pn")
+
+# 버튼 셀렉터가 Blueprint에 없을 때 시도하는 '더보기' 후보
+DEFAULT_MORE_BUTTON_SELECTORS = (
+    "button:has-text('더보기')",
+    "a:has-text('더보기')",
+    "button:has-text('Load more')",
+    "button:has-text('More')",
+    "a:has-text('More')",
+    ".btn_more",
+    ".more_btn",
+    ".load-more",
+)
+
+
+def normalize_method(method: Optional[str]) -> Optional[str]:
+    """LLM이 적어 준 pagination_method 표기를 세 가지 표준값(또는 None)으로 맞춥니다."""
+    if not method:
+        return None
+    key = method.strip().lower().replace(" ", "")
+    for canonical, aliases in _METHOD_ALIASES.items():
+        if key == canonical.lower() or key in aliases:
+            return canonical
+    return None
+
+
+def with_page_param(url: str, page: int, param: str = "page") -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != param]
+    query.append((param, str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def detect_page_param(url: str, url_pattern: Optional[str] = None) -> tuple[str, int]:
+    """URL(또는 url_pattern)에서 페이지 번호 파라미터 이름과 시작 번호를 찾습니다. 없으면 ('page', 1)."""
+    for candidate_url in (url, url_pattern or ""):
+        query = dict(parse_qsl(urlsplit(candidate_url).query, keep_blank_values=True))
+        for name in PAGE_PARAM_CANDIDATES:
+            if name in query:
+                value = query[name]
+                return name, int(value) if value.isdigit() else 1
+    return "page", 1
+
+
+# ==========================================
+# URL 파라미터: 추측 선행(speculative) 병렬 페이징
+# ==========================================
+async def paginate_url_param(
+    fetch: Callable[[str], Awaitable],
+    first_url: str,
+    extract: Callable[[object], list],
+    *,
+    param: Optional[str] = None,
+    start: Optional[int] = None,
+    window: int = 4,
+    max_pages: int = 50,
+) -> AsyncIterator[tuple[int, object, list]]:
+    """페이지를 window개씩 앞서 요청하고, 순서대로 (페이지 번호, 응답, 추출 항목)을 내보냅니다.
+
+    빈 페이지 또는 직전 페이지와 같은 내용(범위를 넘으면 마지막 페이지를 돌려주는 사이트)이
+    나오면 그 뒤로 미리 보낸 요청은 모두 취소합니다.
+
+    Args:
+        fetch: url → 응답 객체 (예: HttpFetcher.fetch)
+        first_url: 첫 페이지 URL
+        extract: 응답 → 항목 리스트 (빈 리스트면 마지막 페이지로 판단)
+        param: 페이지 번호 쿼리 파라미터 (None이면 자동 감지)
+        start: 시작 페이지 번호 (None이면 URL에서 감지, 없으면 1)
+        window: 동시에 앞서 요청할 페이지 수
+        max_pages: 최대 페이지 수
+    """
+    detected_param, detected_start = detect_page_param(first_url)
+    param = param or detected_param
+    start = detected_start if start is None else start
+    last_page = start + max_pages - 1
+
+    def url_for(page_no: int) -> str:
+        return first_url if page_no == start else with_page_param(first_url, page_no, param)
+
+    tasks: dict[int, asyncio.Task] = {}
+    next_to_schedule = start
+
+    def fill_window(current: int):
+        nonlocal next_to_schedule
+        while next_to_schedule <= last_page and next_to_schedule < current + window:
+            tasks[next_to_schedule] = asyncio.create_task(fetch(url_for(next_to_schedule)))
+            next_to_schedule += 1
+
+    previous_items = None
+    try:
+        for page_no in range(start, last_page + 1):
+            fill_window(page_no)
+            result = await tasks.pop(page_no)
+            items = extract(result)
+            if not items or items == previous_items:
+                break
+            previous_items = items
+            yield page_no, result, items
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+# ==========================================
+# AJAX 버튼 / 무한 스크롤: 브라우저 구동
+# ==========================================
+@dataclass
+class LoadRound:
+    round: int
+    total_items: int
+    new_items: int
+
+
+async def _count(page, item_selector: str) -> int:
+    return await page.locator(item_selector).count()
+
+
+async def _wait_for_more(page, item_selector: str, previous: int, timeout_ms: int) -> bool:
+    """항목 수가 previous보다 늘어날 때까지만 기다립니다. 시간 내에 늘지 않으면 False."""
+    try:
+        await page.wait_for_function(
+            "([sel, n]) => document.querySelectorAll(sel).length > n",
+            arg=[item_selector, previous],
+            timeout=timeout_ms,
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def find_more_button(page, button_selector: Optional[str] = None):
+    """보이는 '더보기' 버튼 locator를 찾습니다. 없으면 None."""
+    for selector in ([button_selector] if button_selector else DEFAULT_MORE_BUTTON_SELECTORS):
+        locator = page.locator(selector).first
+        try:
+            if await locator.count() and await locator.is_visible():
+                return locator
+        except Exception:
+            continue
+    return None
+
+
+async def _drive(page, item_selector: str, step, target_count, max_rounds, idle_timeout_ms, idle_rounds):
+    total = await _count(page, item_selector)
+    yield LoadRound(round=0, total_items=total, new_items=total)
+
+    misses = 0
+    for round_no in range(1, max_rounds + 1):
+        if target_count and total >= target_count:
+            return
+        if not await step():
+            return
+        if await _wait_for_more(page, item_selector, total, idle_timeout_ms):
+            misses = 0
+            current = await _count(page, item_selector)
+            yield LoadRound(round=round_no, total_items=current, new_items=current - total)
+            total = current
+        else:
+            misses += 1
+            if misses >= idle_rounds:
+                return
+
+
+async def drive_load_more(
+    page,
+    item_selector: str,
+    button_selector: Optional[str] = None,
+    target_count: Optional[int] = None,
+    max_rounds: int = 30,
+    idle_timeout_ms: int = 4000,
+) -> AsyncIterator[LoadRound]:
+    """'더보기' 버튼을 반복 클릭하며 새 항목이 붙을 때마다 LoadRound를 내보냅니다.
+    버튼이 사라지거나, 목표 개수에 도달하거나, 클릭해도 항목이 늘지 않으면 멈춥니다.
+    """
+
+    async def click() -> bool:
+        button = await find_more_button(page, button_selector)
+        if button is None:
+            return False
+        try:
+            await button.click(timeout=idle_timeout_ms)
+        except Exception:
+            return False
+        return True
+
+    async for load_round in _drive(page, item_selector, click, target_count, max_rounds, idle_timeout_ms, idle_rounds=1):
+        yield load_round
+
+
+async def drive_infinite_scroll(
+    page,
+    item_selector: str,
+    target_count: Optional[int] = None,
+    max_rounds: int = 30,
+    idle_timeout_ms: int = 3000,
+    idle_rounds: int = 2,
+) -> AsyncIterator[LoadRound]:
+    """페이지 끝까지 스크롤하며 새 항목이 로드될 때마다 LoadRound를 내보냅니다.
+    idle_rounds번 연속으로 항목이 늘지 않으면 끝난 것으로 봅니다.
+    """
+
+    async def scroll() -> bool:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        return True
+
+    async for load_round in _drive(page, item_selector, scroll, target_count, max_rounds, idle_timeout_ms, idle_rounds):
+        yield load_round
@@ -0,0 +1,388 @@
+import os
+import re
+import json
+import asyncio
+import hashlib
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import urlsplit, parse_qsl
+
+from app.crawler.scheduler import DEFAULT_USER_AGENT
+
+# ==========================================
+# 🗂️ Blueprint Registry
+# ==========================================
+# 한 번 분석한 사이트의 Blueprint를 (도메인, URL 패턴, 수집 목표) 기준으로 저장해 두고,
+# 다음 요청 때 페이지 구조 지문(fingerprint)만 빠르게 비교해서 그대로 재사용합니다.
+# 구조가 바뀌지 않았다면 Navigator 에이전트를 다시 돌릴 필요가 없습니다.
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "code_artifacts")
+
+REGISTRY_FILENAME = "blueprint_registry.json"
+
+# 지문 비교 시 허용하는 최대 해밍 거리 (64비트 SimHash 기준)
+DEFAULT_MAX_DISTANCE = 8
+
+# 구조 분석에 의미가 없는 태그 (get_page_structure의 정리 규칙과 동일)
+_IGNORED_TAGS = {"script", "style", "noscript", "svg", "path", "header", "footer"}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+def normalize_goal(scraping_goal: str) -> str:
+    """수집 목표 문장을 비교 가능한 형태(소문자, 공백/구두점 정리)로 정규화합니다."""
+    text = scraping_goal.lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def url_pattern_of(url: str) -> str:
+    """URL에서 변하는 부분(숫자 ID, 쿼리 값)을 지운 구조 패턴을 만듭니다.
+
+    예) https://news.naver.com/section/100?page=3 → news.naver.com/section/{n}?page
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    segments = []
+    for seg in parts.path.split("/"):
+        if not seg:
+            continue
+        if seg.isdigit():
+            segments.append("{n}")
+        elif re.fullmatch(r"[0-9a-fA-F]{12,}|[\w-]*\d{5,}[\w-]*", seg):
+            segments.append("{id}")
+        else:
+            segments.append(seg.lower())
+
+    pattern = host + "/" + "/".join(segments)
+    query_keys = sorted({k for k, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    if query_keys:
+        pattern += "?" + "&".join(query_keys)
+    return pattern
+
+
+def domain_of(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+# ==========================================
+# 구조 지문 (SimHash)
+# ==========================================
+class _StructureParser(HTMLParser):
+    """태그/클래스 경로만 뽑아내는 가벼운 파서 (텍스트 내용은 무시)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.stack: list[str] = []
+        self.skip_depth = 0
+        self.shingles: dict[str, int] = {}
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth or tag in _IGNORED_TAGS:
+            if tag not in _VOID_TAGS:
+                self.skip_depth += 1
+            return
+
+        classes = ""
+        for name, value in attrs:
+            if name == "class" and value:
+                # 숫자가 섞인 동적 클래스(css-1a2b3c 등)는 지문에서 제외
+                classes = ".".join(sorted(c for c in value.split() if not re.search(r"\d", c)))
+                break
+        token = f"{tag}.{classes}" if classes else tag
+
+        parent = self.stack[-1] if self.stack else "#root"
+        shingle = f"{parent}>{token}"
+        self.shingles[shingle] = self.shingles.get(shingle, 0) + 1
+
+        if tag not in _VOID_TAGS:
+            self.stack.append(token)
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> 처럼 스스로 닫히는 태그는 스택에 쌓지 않습니다.
+        if self.skip_depth or tag in _IGNORED_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS and self.stack:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag not in _VOID_TAGS:
+                self.skip_depth -= 1
+            return
+        # 닫는 태그 짝이 맞지 않는 HTML도 흔하므로 가장 가까운 같은 태그까지 되감습니다.
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i].split(".", 1)[0] == tag:
+                del self.stack[i:]
+                break
+
+
+def dom_fingerprint(html: str) -> dict:
+    """HTML의 구조(부모>자식 태그·클래스 쌍)로 64비트 SimHash 지문을 계산합니다.
+
+    텍스트 내용이 바뀌어도(새 기사, 새 상품) 레이아웃이 같으면 지문은 거의 같습니다.
+    """
+    parser = _StructureParser()
+    try:
+        parser.feed(html or "")
+        parser.close()
+    except Exception:
+        pass
+
+    weights = [0] * 64
+    for shingle, count in parser.shingles.items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        # 반복 요소(목록 아이템)가 지문을 독점하지 않도록 가중치를 로그 스케일로 눌러줍니다.
+        w = 1 + count.bit_length()
+        for bit in range(64):
+            weights[bit] += w if (h >> bit) & 1 else -w
+
+    simhash = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            simhash |= 1 << bit
+
+    return {"simhash": f"{simhash:016x}", "shingles": len(parser.shingles)}
+
+
+def fingerprint_distance(a: dict, b: dict) -> int:
+    """두 지문 사이의 해밍 거리 (0이면 구조 동일)"""
+    return bin(int(a["simhash"], 16) ^ int(b["simhash"], 16)).count("1")
+
+
+def needs_browser(rendering_type: Optional[str]) -> bool:
+    """Static SSR이 아니면 원본 HTML은 빈 앱 껍데기라서 브라우저로 렌더링한 DOM으로 지문을 떠야 합니다. (엔진과 같은 기준)"""
+    return "static" not in str(rendering_type or "").lower()
+
+
+async def fetch_fingerprint(url: str, client=None, timeout: float = 10.0, browser=None) -> Optional[dict]:
+    """URL의 HTML을 받아와 구조 지문을 계산합니다. 실패하면 None.
+
+    browser(열려 있는 app.crawler.engine.BrowserFetcher)를 주면 렌더링이 끝난 DOM으로 지문을 뜹니다. (Dynamic CSR/JS)
+    """
+    page = await _fetch_html(url, client, timeout, browser)
+    return dom_fingerprint(page[0]) if page else None
+
+
+async def _fetch_html(url: str, client=None, timeout: float = 10.0, browser=None) -> Optional[tuple[str, str]]:
+    """(HTML, 최종 URL). 실패하면 None"""
+    if browser is not None:
+        try:
+            page = await browser.fetch(url)
+            if page.status >= 400:
+                raise RuntimeError(f"HTTP {page.status}")
+        except Exception as e:
+            print(f"   ⚠️ [Registry] 지문 수집 실패: {url} ({e})")
+            return None
+        return page.html, page.url
+
+    import httpx
+
+    headers = {"User-Agent": DEFAULT_USER_AGENT}
+    try:
+        if client is None:
+            async with httpx.AsyncClient(follow_redirects=True, timeout=timeout, headers=headers) as c:
+                resp = await c.get(url)
+        else:
+            resp = await client.get(url, headers=headers)
+        resp.raise_for_status()
+    except Exception as e:
+        print(f"   ⚠️ [Registry] 지문 수집 실패: {url} ({e})")
+        return None
+    return resp.text, str(resp.url)
+
+
+def layer_sample_urls(blueprint: dict) -> list[Optional[str]]:
+    """각 계층의 지문을 뜰 대표 URL 목록. Blueprint만으로 알 수 없는 계층은 None (fetch_layer_samples가 링크를 따라 채움)"""
+    urls: list[Optional[str]] = []
+    for i, layer in enumerate(blueprint.get("layers", [])):
+        if i == 0 and blueprint.get("entry_urls"):
+            urls.append(blueprint["entry_urls"][0])
+        elif str(layer.get("url_pattern", "")).startswith(("http://", "https://")):
+            urls.append(layer["url_pattern"])
+        else:
+            urls.append(None)
+    return urls
+
+
+# ==========================================
+# Registry 본체
+# ==========================================
+class BlueprintRegistry:
+    """도메인 / URL 패턴 / 정규화된 수집 목표로 색인되는 Blueprint 저장소"""
+
+    def __init__(self, root_dir: str = ARTIFACT_DIR, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.root_dir = root_dir
+        self.path = os.path.join(root_dir, REGISTRY_FILENAME)
+        self.max_distance = max_distance
+        os.makedirs(root_dir, exist_ok=True)
+
+    # ---------- 파일 입출력 ----------
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {"entries": {}}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save(self, data: dict):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def make_key(url: str, scraping_goal: str) -> str:
+        raw = f"{domain_of(url)}|{url_pattern_of(url)}|{normalize_goal(scraping_goal)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    # ---------- 등록 ----------
+    async def register(self, blueprint, scraping_goal: str, layer_urls: Optional[list] = None) -> str:
+        """Blueprint와 각 계층 페이지의 구조 지문을 함께 저장합니다.
+
+        Args:
+            blueprint: NavigatorBlueprint 또는 그 dict
+            scraping_goal: Navigator에게 준 수집 목표 문장
+            layer_urls: 계층별 대표 URL (없으면 entry_urls / url_pattern에서 추정하고, 나머지는 상위 계층 페이지의
+                navigate_to_next 링크를 따라가 찾음)
+        """
+        bp = blueprint.model_dump() if hasattr(blueprint, "model_dump") else dict(blueprint)
+        if not bp.get("entry_urls"):
+            raise ValueError("entry_urls가 비어 있는 Blueprint는 등록할 수 없습니다.")
+
+        if layer_urls:
+            sample_urls, fingerprints = layer_urls, await fetch_fingerprints(layer_urls, bp.get("rendering_type"))
+        else:
+            sample_urls, fingerprints = await fetch_layer_samples(bp)
+
+        entry_url = bp["entry_urls"][0]
+        key = self.make_key(entry_url, scraping_goal)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        data = self._load()
+        data["entries"][key] = {
+            "domain": domain_of(entry_url),
+            "url_patterns": sorted({url_pattern_of(u) for u in bp["entry_urls"]}),
+            "goal": normalize_goal(scraping_goal),
+            "blueprint": bp,
+            "layer_fingerprints": [
+                {"layer_index": i, "url": u, "fingerprint": fp}
+                for i, (u, fp) in enumerate(zip(sample_urls, fingerprints))
+                if u and fp
+            ],
+            "created_at": now,
+            "last_verified": now,
+        }
+        self._save(data)
+        print(f"  🗂️ [Registry] 등록 완료: {key} ({domain_of(entry_url)}, 계층 {len(bp.get('layers', []))}개)")
+        return key
+
+    # ---------- 조회 ----------
+    def candidates(self, url: str, scraping_goal: str) -> list[tuple[str, dict]]:
+        """같은 도메인·URL 패턴·수집 목표를 가진 항목을 최근 검증 순으로 반환합니다."""
+        domain, pattern, goal = domain_of(url), url_pattern_of(url), normalize_goal(scraping_goal)
+        found = [
+            (key, entry)
+            for key, entry in self._load()["entries"].items()
+            if entry["domain"] == domain and entry["goal"] == goal and pattern in entry["url_patterns"]
+        ]
+        return sorted(found, key=lambda kv: kv[1]["last_verified"], reverse=True)
+
+    async def lookup(self, url: str, scraping_goal: str) -> Optional[dict]:
+        """저장된 Blueprint 중 현재 페이지 구조와 지문이 일치하는 것을 찾아 dict로 반환합니다.
+
+        지문이 하나라도 허용 거리를 넘으면 레이아웃이 바뀐 것으로 보고 해당 항목을 건너뜁니다.
+        """
+        for key, entry in self.candidates(url, scraping_goal):
+            stored = entry["layer_fingerprints"]
+            if not stored:
+                continue
+
+            current = await fetch_fingerprints([fp["url"] for fp in stored], entry["blueprint"].get("rendering_type"))
+            distances = [
+                fingerprint_distance(fp["fingerprint"], cur) if cur else None
+                for fp, cur in zip(stored, current)
+            ]
+            if all(d is not None and d <= self.max_distance for d in distances):
+                data = self._load()
+                data["entries"][key]["last_verified"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._save(data)
+                print(f"  ♻️ [Registry] 구조 변화 없음 (거리={distances}) → Blueprint 재사용: {key}")
+                return entry["blueprint"]
+
+            print(f"  🔄 [Registry] 구조 변경 감지 (거리={distances}) → 재분석 필요: {key}")
+        return None
+
+    def remove(self, key: str) -> bool:
+        data = self._load()
+        if data["entries"].pop(key, None) is None:
+            return False
+        self._save(data)
+        return True
+
+
+async def _none():
+    return None
+
+
+async def fetch_fingerprints(urls: list[Optional[str]], rendering_type: Optional[str] = None) -> list[Optional[dict]]:
+    """여러 URL의 지문을 한꺼번에 뜹니다. CSR Blueprint면 브라우저 하나를 띄워 함께 씁니다."""
+    if not needs_browser(rendering_type) or not any(urls):
+        return list(await asyncio.gather(*[fetch_fingerprint(u) if u else _none() for u in urls]))
+
+    from app.crawler.engine import BrowserFetcher
+
+    try:
+        async with BrowserFetcher(pool_size=max(1, min(4, len(urls)))) as browser:
+            return list(await asyncio.gather(*[fetch_fingerprint(u, browser=browser) if u else _none() for u in urls]))
+    except Exception as e:
+        # 브라우저를 띄우지 못하면 지문 없음 → 등록 시엔 지문 없이 저장, 조회 시엔 재분석
+        print(f"   ⚠️ [Registry] 브라우저 지문 수집 실패 ({e})")
+        return [None] * len(urls)
+
+
+async def fetch_layer_samples(blueprint: dict) -> tuple[list[Optional[str]], list[Optional[dict]]]:
+    """계층별 대표 URL과 지문. url_pattern이 실제 URL이 아닌 계층은 바로 위 계층 페이지에서
+    navigate_to_next로 뽑은 첫 링크를 대표 URL로 씁니다. (목록 → 상세처럼 1번 계층 이후도 지문이 남도록)
+    """
+    from app.crawler.engine import extract_links
+
+    layers = blueprint.get("layers", [])
+    urls = layer_sample_urls(blueprint)
+    fingerprints: list[Optional[dict]] = [None] * len(urls)
+
+    async def walk(browser=None):
+        links: list[str] = []
+        for i, layer in enumerate(layers):
+            if urls[i] is None and links:
+                urls[i] = links[0]
+            links = []
+            if urls[i] is None:
+                continue
+            page = await _fetch_html(urls[i], browser=browser)
+            if page is None:
+                continue
+            html, final_url = page
+            fingerprints[i] = dom_fingerprint(html)
+            if layer.get("navigate_to_next"):
+                try:
+                    links = extract_links(html, layer["navigate_to_next"], final_url)
+                except Exception as e:
+                    print(f"   ⚠️ [Registry] {i}번 계층 링크 추출 실패 ({e})")
+
+    if not needs_browser(blueprint.get("rendering_type")):
+        await walk()
+        return urls, fingerprints
+
+    from app.crawler.engine import BrowserFetcher
+
+    try:
+        async with BrowserFetcher(pool_size=1) as browser:
+            await walk(browser)
+    except Exception as e:
+        print(f"   ⚠️ [Registry] 브라우저 지문 수집 실패 ({e})")
+    return urls, fingerprints
@@ -0,0 +1,286 @@
+import os
+import re
+import ast
+import json
+import threading
+from typing import Any, Optional
+
+from app.crawler.engine import split_selector
+from app.crawler.registry import ARTIFACT_DIR
+
+# ==========================================
+# 🩹 Local Blueprint Repair (검증 전 로컬 수리)
+# ==========================================
+# Navigator는 NavigatorBlueprintCollection을 ToolStrategy로 돌려주는데,
+# selectors를 JSON 문자열로 주거나 "None" 문자열, len(layers)와 다른 total_layers, 틀린 total_jobs처럼
+# 사소하게 어긋난 출력이 나오면 검증에 실패해 LLM 왕복을 한 번 더 하거나 그대로 실패합니다.
+#
+# repair_blueprint_collection()은 검증 전에 원본 dict를 로컬에서 고칩니다.
+#   1) JSON 수리: 코드 블록(```json), 뒤쪽 쉼표, 작은따옴표/None/True 같은 파이썬 표기, 문자열로 감싼 dict/list
+#   2) 개수 맞추기: total_layers = len(layers), total_jobs = len(blueprints), 단일 Blueprint/단일 URL은 리스트로
+#   3) 셀렉터 점검: "None"류 값 제거, 따옴표/백틱 제거 후 CSS 문법 확인 (::attr(...) / ::text 접미사는 엔진 규칙대로 허용)
+# 고칠 수 없는 문제(문법이 틀린 셀렉터, 빈 layers 등)가 남으면 BlueprintRepairError → 그때만 LLM에게 다시 요청합니다.
+# 수리/재요청 횟수는 code_artifacts/blueprint_repair_stats.json에 누적됩니다.
+
+REPAIR_STATS_FILENAME = "blueprint_repair_stats.json"
+
+# LLM이 "값 없음"을 문자열로 적는 표기
+NONE_STRINGS = {"none", "null", "없음", "n/a", "na", "-", ""}
+# 선택 필드 중 문자열이 아니라 None이어야 하는 값
+OPTIONAL_LAYER_FIELDS = ("navigate_to_next", "pagination_method", "more_button")
+# 그중 셀렉터라서 CSS 문법까지 확인하는 필드
+OPTIONAL_SELECTOR_FIELDS = ("navigate_to_next", "more_button")
+# 셀렉터를 감싸는 따옴표/백틱
+_QUOTES = "`'\" "
+_CODE_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+class BlueprintRepairError(ValueError):
+    """로컬에서 고칠 수 없는 Blueprint 문제 (LLM에게 다시 요청해야 함)"""
+
+
+def is_none_string(value: Any) -> bool:
+    return isinstance(value, str) and value.strip().lower() in NONE_STRINGS
+
+
+def parse_json_loose(text: str) -> Any:
+    """조금 어긋난 JSON 문자열을 파싱합니다. 실패하면 ValueError."""
+    text = _CODE_FENCE.sub("", text.strip())
+    for candidate in (text, _TRAILING_COMMA.sub(r"\1", text)):
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+    try:
+        # {'title': 'a.t', 'next': None} 처럼 파이썬 표기로 준 경우
+        return ast.literal_eval(_TRAILING_COMMA.sub(r"\1", text))
+    except (ValueError, SyntaxError):
+        raise ValueError(f"JSON으로 해석할 수 없습니다: {text[:80]}")
+
+
+def check_css(selector: str) -> Optional[str]:
+    """CSS 문법 오류 메시지, 문제 없으면 None (엔진이 쓰는 BeautifulSoup/soupsieve 기준)"""
+    import soupsieve
+
+    css, _ = split_selector(selector)
+    if not css:
+        return "빈 셀렉터"
+    try:
+        soupsieve.compile(css)
+    except Exception as e:
+        return str(e).splitlines()[0]
+    return None
+
+
+def _clean_selector(selector: str) -> str:
+    return selector.strip().strip(_QUOTES).strip().rstrip(",;").strip()
+
+
+class _Repair:
+    def __init__(self):
+        self.fixes: list[str] = []
+        self.problems: list[str] = []
+
+    def parsed(self, value: Any, expected: type, where: str) -> Any:
+        """문자열로 감싼 dict/list를 풀어 줍니다."""
+        if isinstance(value, str) and expected in (dict, list):
+            try:
+                parsed = parse_json_loose(value)
+            except ValueError:
+                return value
+            if isinstance(parsed, expected):
+                self.fixes.append(f"{where}: 문자열 JSON을 {expected.__name__}로 변환")
+                return parsed
+        return value
+
+    def selector(self, value: Any, where: str) -> Optional[str]:
+        if isinstance(value, list):
+            value = next((v for v in value if isinstance(v, str) and not is_none_string(v)), None)
+            self.fixes.append(f"{where}: 셀렉터 목록에서 첫 번째 값 사용")
+        if value is None or is_none_string(value):
+            return None
+        if not isinstance(value, str):
+            self.problems.append(f"{where}: 셀렉터가 문자열이 아닙니다 ({type(value).__name__})")
+            return None
+        cleaned = _clean_selector(value)
+        if cleaned != value:
+            self.fixes.append(f"{where}: 셀렉터 앞뒤 따옴표/공백 제거")
+        error = check_css(cleaned)
+        if error:
+            self.problems.append(f"{where}: CSS 문법 오류 '{cleaned}' ({error})")
+        return cleaned
+
+    def layer(self, layer: Any, where: str) -> Any:
+        layer = self.parsed(layer, dict, where)
+        if not isinstance(layer, dict):
+            self.problems.append(f"{where}: 계층이 객체가 아닙니다")
+            return layer
+        layer = dict(layer)
+        selectors = self.parsed(layer.get("selectors"), dict, f"{where}.selectors")
+        if isinstance(selectors, dict):
+            repaired = {}
+            for key, value in selectors.items():
+                selector = self.selector(value, f"{where}.selectors.{key}")
+                if selector is None:
+                    self.fixes.append(f"{where}.selectors.{key}: 값이 없는 셀렉터 제거")
+                    continue
+                repaired[str(key)] = selector
+            if not repaired:
+                self.problems.append(f"{where}.selectors: 유효한 셀렉터가 하나도 없습니다")
+            layer["selectors"] = repaired
+        else:
+            self.problems.append(f"{where}.selectors: 셀렉터 딕셔너리가 아닙니다")
+        for field in OPTIONAL_LAYER_FIELDS:
+            value = layer.get(field)
+            if is_none_string(value):
+                layer[field] = None
+                self.fixes.append(f"{where}.{field}: '{value}' → None")
+        for field in OPTIONAL_SELECTOR_FIELDS:
+            if layer.get(field) is not None:
+                layer[field] = self.selector(layer[field], f"{where}.{field}")
+        return layer
+
+    def blueprint(self, blueprint: Any, where: str) -> Any:
+        if hasattr(blueprint, "model_dump"):
+            # 이미 검증된 Blueprint 객체 (Registry에서 불러온 경우 등)
+            return blueprint
+        blueprint = self.parsed(blueprint, dict, where)
+        if not isinstance(blueprint, dict):
+            self.problems.append(f"{where}: Blueprint가 객체가 아닙니다")
+            return blueprint
+        blueprint = dict(blueprint)
+
+        urls = self.parsed(blueprint.get("entry_urls"), list, f"{where}.entry_urls")
+        if isinstance(urls, str):
+            urls = [u.strip() for u in re.split(r"[,\s]+", urls) if u.strip()]
+            self.fixes.append(f"{where}.entry_urls: 문자열을 URL 목록으로 변환")
+        if isinstance(urls, list):
+            urls = [u for u in urls if isinstance(u, str) and not is_none_string(u)]
+            if not urls:
+                self.problems.append(f"{where}.entry_urls: 시작 URL이 없습니다")
+            blueprint["entry_urls"] = urls
+
+        layers = self.parsed(blueprint.get("layers"), list, f"{where}.layers")
+        if isinstance(layers, dict):
+            layers = [layers]
+            self.fixes.append(f"{where}.layers: 단일 계층을 목록으로 변환")
+        if isinstance(layers, list) and layers:
+            layers = [self.layer(layer, f"{where}.layers[{i}]") for i, layer in enumerate(layers)]
+            blueprint["layers"] = layers
+            last = layers[-1]
+            if isinstance(last, dict) and last.get("navigate_to_next"):
+                last["navigate_to_next"] = None
+                self.fixes.append(f"{where}.layers[{len(layers) - 1}].navigate_to_next: 마지막 계층이므로 None")
+            if blueprint.get("total_layers") != len(layers):
+                self.fixes.append(f"{where}.total_layers: {blueprint.get('total_layers')!r} → {len(layers)}")
+                blueprint["total_layers"] = len(layers)
+        else:
+            self.problems.append(f"{where}.layers: 계층이 없습니다")
+
+        notes = blueprint.get("anti_bot_notes")
+        if notes != "없음" and (notes is None or is_none_string(notes)):
+            blueprint["anti_bot_notes"] = "없음"
+            self.fixes.append(f"{where}.anti_bot_notes: 빈 값 → '없음'")
+        return blueprint
+
+
+def repair_blueprint_collection(data: Any) -> tuple[Any, list[str]]:
+    """NavigatorBlueprintCollection 원본(dict 또는 JSON 문자열)을 고쳐 (고친 값, 수리 내역)을 돌려줍니다.
+    고칠 수 없는 문제가 있으면 BlueprintRepairError (메시지는 LLM에게 그대로 전달됨)
+    """
+    repair = _Repair()
+    if isinstance(data, str):
+        try:
+            data = parse_json_loose(data)
+            repair.fixes.append("전체 응답: 문자열 JSON 파싱")
+        except ValueError as e:
+            raise BlueprintRepairError(str(e))
+    if not isinstance(data, dict):
+        return data, []
+    data = dict(data)
+
+    if "blueprints" not in data and "layers" in data:
+        # Blueprint 하나를 모음으로 감싸지 않고 바로 준 경우
+        data = {"blueprints": [data]}
+        repair.fixes.append("전체 응답: 단일 Blueprint를 모음으로 감쌈")
+    blueprints = repair.parsed(data.get("blueprints"), list, "blueprints")
+    if isinstance(blueprints, dict):
+        blueprints = [blueprints]
+        repair.fixes.append("blueprints: 단일 Blueprint를 목록으로 변환")
+    if isinstance(blueprints, list) and blueprints:
+        data["blueprints"] = [repair.blueprint(bp, f"blueprints[{i}]") for i, bp in enumerate(blueprints)]
+        if data.get("total_jobs") != len(blueprints):
+            repair.fixes.append(f"total_jobs: {data.get('total_jobs')!r} → {len(blueprints)}")
+            data["total_jobs"] = len(blueprints)
+    else:
+        repair.problems.append("blueprints: Blueprint가 하나도 없습니다")
+
+    if repair.problems:
+        raise BlueprintRepairError(
+            "로컬에서 고칠 수 없는 문제가 있습니다. 아래 항목만 고쳐서 다시 응답하세요.\n- " + "\n- ".join(repair.problems)
+        )
+    return data, repair.fixes
+
+
+def repair_layer(data: Any) -> tuple[dict, list[str]]:
+    """PageLayer 하나(dict 또는 JSON 문자열)만 고칩니다. 계층을 하나씩 발행할 때 사용. 고칠 수 없으면 BlueprintRepairError"""
+    repair = _Repair()
+    layer = repair.layer(data, "layer")
+    if repair.problems:
+        raise BlueprintRepairError("계층에 고칠 수 없는 문제가 있습니다.\n- " + "\n- ".join(repair.problems))
+    return layer, repair.fixes
+
+
+class RepairStats:
+    """검증 횟수를 그대로 통과(clean) / 로컬 수리(repaired) / LLM 재요청(retried)으로 나눠 JSON 파일에 누적합니다.
+    여러 Navigator가 동시에 검증해도 횟수가 빠지지 않도록 메모리에서 락을 잡고 세고, 파일은 통째로 바꿔 씁니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stats: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"validations": 0, "clean": 0, "repaired": 0, "retried": 0, "fixes": 0}
+
+    def load(self) -> dict:
+        with self._lock:
+            if self._stats is None:
+                self._stats = self._read()
+            return dict(self._stats)
+
+    def record(self, outcome: str, fixes: int = 0) -> dict:
+        with self._lock:
+            if self._stats is None:
+                self._stats = self._read()
+            stats = self._stats
+            stats["validations"] += 1
+            stats[outcome] += 1
+            stats["fixes"] += fixes
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(stats, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+            return dict(stats)
+
+    def summary(self) -> str:
+        s = self.load()
+        total = s["validations"] or 1
+        return (
+            f"🩹 [Blueprint Repair] 검증 {s['validations']}회: 그대로 통과 {s['clean']}회, "
+            f"로컬 수리 {s['repaired']}회 ({s['repaired'] / total:.0%}, 수리 {s['fixes']}건), "
+            f"LLM 재요청 {s['retried']}회 ({s['retried'] / total:.0%})"
+        )
+
+
+REPAIR_STATS = RepairStats(os.path.join(ARTIFACT_DIR, REPAIR_STATS_FILENAME))
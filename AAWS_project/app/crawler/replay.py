@@ -0,0 +1,361 @@
+import io
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+
+from app.crawler.registry import ARTIFACT_DIR
+from app.crawler.scheduler import canonicalize_url
+
+# ==========================================
+# 📼 Network Record / Replay (오프라인 디버깅)
+# ==========================================
+# Coder가 크롤러를 디버깅하며 실행할 때마다 실제 사이트에 다시 접속하면 느리고, 차단(rate limit)되기 쉽고,
+# 매번 응답이 달라 같은 버그를 재현하기도 어렵습니다.
+#   - record : 실제 사이트에 접속하면서 응답(HTML, XHR JSON 등)을 code_artifacts/replay/<스크립트>/에 저장
+#   - replay : 저장된 응답을 그대로 돌려줌 (없는 요청만 실제로 받아서 추가 저장)
+#   - live   : 훅 없이 실제 사이트에 접속 (최종 확인용)
+#
+# 별도 프록시 서버 대신, 샌드박스 작업자가 스크립트를 실행하기 직전에 아래 라이브러리에 훅을 겁니다.
+# (HTTPS 프록시는 인증서 가로채기가 필요해 스크립트마다 설정이 달라지므로)
+#   - requests : HTTPAdapter.send
+#   - httpx    : HTTPTransport / AsyncHTTPTransport
+#   - Playwright : 새 브라우저 컨텍스트마다 route_from_har (컨텍스트 생성 순서대로 playwright-<n>.har)
+# 스크립트 코드는 바꿀 필요가 없습니다.
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+
+MODE_ENV = "AAWS_NET_MODE"
+ARCHIVE_ENV = "AAWS_NET_ARCHIVE"
+STARTUP_HOOK = "app.crawler.replay:install"
+
+REPLAY_DIRNAME = "replay"
+REPLAY_DIR = os.path.join(ARTIFACT_DIR, REPLAY_DIRNAME)
+HTTP_ARCHIVE_FILENAME = "http.db"
+RUN_STATS_FILENAME = "last_run.json"
+
+# 이보다 큰 응답(파일 다운로드 등)은 저장하지 않음
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+# 저장된 본문은 이미 압축이 풀려 있으므로, 재생 시 본문 길이/인코딩 관련 헤더는 빼고 돌려줍니다.
+_STRIP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive"}
+
+
+def archive_dir_for(script_name: str, root: str = REPLAY_DIR) -> str:
+    return os.path.join(root, os.path.splitext(os.path.basename(script_name))[0])
+
+
+def has_archive(archive_dir: str) -> bool:
+    return os.path.isdir(archive_dir) and any(
+        name == HTTP_ARCHIVE_FILENAME or name.endswith(".har") for name in os.listdir(archive_dir)
+    )
+
+
+def resolve_mode(network: str, archive_dir: str) -> str:
+    """'auto'는 저장된 응답이 있으면 replay, 없으면 record로 바꿉니다."""
+    network = (network or LIVE).lower()
+    if network == "auto":
+        return REPLAY if has_archive(archive_dir) else RECORD
+    if network not in (LIVE, RECORD, REPLAY):
+        raise ValueError(f"network는 auto / record / replay / live 중 하나여야 합니다: '{network}'")
+    return network
+
+
+def prepare_run(mode: str, archive_dir: str) -> dict:
+    """이번 실행에 더할 환경 변수. record는 이전 기록을 지우고 새로 저장합니다."""
+    if mode == LIVE:
+        return {}
+    if mode == RECORD and os.path.isdir(archive_dir):
+        shutil.rmtree(archive_dir, ignore_errors=True)
+    os.makedirs(archive_dir, exist_ok=True)
+    try:
+        os.remove(os.path.join(archive_dir, RUN_STATS_FILENAME))
+    except OSError:
+        pass
+    from app.sandbox.pool import STARTUP_ENV
+
+    return {MODE_ENV: mode, ARCHIVE_ENV: archive_dir, STARTUP_ENV: STARTUP_HOOK}
+
+
+def describe_run(mode: str, archive_dir: str) -> str:
+    """실행이 끝난 뒤 도구 응답에 덧붙일 한 줄 요약"""
+    if mode == LIVE:
+        return "🌐 [Network] 실제 사이트에 접속해 실행했습니다. (live)"
+    try:
+        with open(os.path.join(archive_dir, RUN_STATS_FILENAME), "r", encoding="utf-8") as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return f"📼 [Network:{mode}] 이번 실행에서 가로챈 HTTP 요청이 없습니다."
+    har = f", 브라우저 컨텍스트 {stats['contexts']}개(HAR)" if stats.get("contexts") else ""
+    if mode == RECORD:
+        return (
+            f"📼 [Network:record] 응답 {stats['recorded']}건을 저장했습니다{har}. "
+            "다음 실행부터는 저장된 응답으로 빠르게 재실행됩니다."
+        )
+    return (
+        f"📼 [Network:replay] 저장된 응답 {stats['hits']}건 재사용, 새로 받아 저장 {stats['misses']}건{har}. "
+        "코드가 완성되면 network='live'로 실제 사이트에서 최종 확인하세요."
+    )
+
+
+# =========================================================
+# 1. HTTP 응답 저장소 (SQLite)
+# =========================================================
+class ReplayArchive:
+    """(메서드, 정규화한 URL, 요청 본문 해시)를 키로 응답을 저장합니다."""
+
+    def __init__(self, archive_dir: str):
+        os.makedirs(archive_dir, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(archive_dir, HTTP_ARCHIVE_FILENAME), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT,
+                url TEXT,
+                status INTEGER,
+                reason TEXT,
+                headers TEXT,
+                body BLOB,
+                recorded_at REAL
+            )"""
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, url: str, body: Optional[bytes]) -> str:
+        digest = hashlib.sha1(body).hexdigest() if body else ""
+        return f"{method.upper()} {canonicalize_url(url)} {digest}"
+
+    def get(self, method: str, url: str, body: Optional[bytes]) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, reason, headers, body FROM responses WHERE key = ?", (self.key(method, url, body),)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"status": row[0], "reason": row[1], "headers": json.loads(row[2]), "body": row[3]}
+
+    def put(self, method: str, url: str, body: Optional[bytes], status: int, reason: str, headers: dict, content: bytes):
+        headers = {k: v for k, v in headers.items() if k.lower() not in _STRIP_HEADERS}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, method, url, status, reason, headers, body, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.key(method, url, body), method.upper(), url, status, reason or "", json.dumps(headers), content, time.time()),
+            )
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+# =========================================================
+# 2. 작업자 안에서 거는 훅
+# =========================================================
+class _Recorder:
+    def __init__(self, mode: str, archive_dir: str):
+        self.mode = mode
+        self.archive_dir = archive_dir
+        self.archive = ReplayArchive(archive_dir)
+        self.stats = {"mode": mode, "hits": 0, "misses": 0, "recorded": 0, "contexts": 0}
+        self._contexts = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, method: str, url: str, body: Optional[bytes]) -> Optional[dict]:
+        if self.mode != REPLAY:
+            return None
+        entry = self.archive.get(method, url, body)
+        self._count("hits" if entry is not None else "misses")
+        return entry
+
+    def save(self, method: str, url: str, body: Optional[bytes], status: int, reason: str, headers: dict, content: bytes):
+        if content is not None and len(content) > MAX_BODY_BYTES:
+            return
+        self.archive.put(method, url, body, status, reason, headers, content or b"")
+        self._count("recorded")
+
+    def next_har(self) -> tuple[str, bool]:
+        """컨텍스트 생성 순서대로 HAR 경로와 '새로 기록할지' 여부"""
+        with self._lock:
+            self._contexts += 1
+            path = os.path.join(self.archive_dir, f"playwright-{self._contexts}.har")
+        self._count("contexts")
+        return path, self.mode == RECORD or not os.path.exists(path)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+            # 작업자는 os._exit로 끝나므로(atexit 없음) 바뀔 때마다 기록합니다.
+            try:
+                with open(os.path.join(self.archive_dir, RUN_STATS_FILENAME), "w", encoding="utf-8") as f:
+                    json.dump(self.stats, f)
+            except OSError:
+                pass
+
+
+def install():
+    """샌드박스 시작 훅: MODE_ENV가 record/replay이면 requests / httpx / Playwright에 기록·재생 훅을 겁니다."""
+    mode = os.environ.get(MODE_ENV, LIVE)
+    archive_dir = os.environ.get(ARCHIVE_ENV)
+    if mode not in (RECORD, REPLAY) or not archive_dir:
+        return
+    recorder = _Recorder(mode, archive_dir)
+    _patch_requests(recorder)
+    _patch_httpx(recorder)
+    _patch_playwright(recorder)
+
+
+def _body_bytes(body) -> Optional[bytes]:
+    if body is None or isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    raise TypeError("stream body")
+
+
+def _patch_requests(recorder: _Recorder):
+    try:
+        from requests.adapters import HTTPAdapter
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+    except ImportError:
+        return
+    original_send = HTTPAdapter.send
+
+    def send(self, request, stream=False, **kwargs):
+        try:
+            body = _body_bytes(request.body)
+        except TypeError:
+            # 파일/제너레이터 업로드는 기록하지 않고 그대로 보냄
+            return original_send(self, request, stream=stream, **kwargs)
+
+        entry = recorder.lookup(request.method, request.url, body)
+        if entry is not None:
+            response = Response()
+            response.status_code = entry["status"]
+            response.reason = entry["reason"]
+            response.headers = CaseInsensitiveDict(entry["headers"])
+            response.encoding = get_encoding_from_headers(response.headers)
+            response._content = entry["body"]
+            response._content_consumed = True
+            response.raw = io.BytesIO(entry["body"])
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            return response
+
+        response = original_send(self, request, stream=stream, **kwargs)
+        length = response.headers.get("Content-Length")
+        if not stream or (length and length.isdigit() and int(length) <= MAX_BODY_BYTES):
+            recorder.save(
+                request.method, request.url, body, response.status_code, response.reason,
+                dict(response.headers), response.content,
+            )
+        return response
+
+    HTTPAdapter.send = send
+
+
+def _patch_httpx(recorder: _Recorder):
+    try:
+        import httpx
+    except ImportError:
+        return
+
+    def replayed(entry: dict, request):
+        return httpx.Response(entry["status"], headers=entry["headers"], content=entry["body"], request=request)
+
+    def recorded(response, request, content: bytes):
+        recorder.save(
+            request.method, str(request.url), request.content, response.status_code, response.reason_phrase,
+            dict(response.headers), content,
+        )
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _STRIP_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request, extensions=response.extensions)
+
+    original_handle = httpx.HTTPTransport.handle_request
+    original_async_handle = httpx.AsyncHTTPTransport.handle_async_request
+
+    def handle_request(self, request):
+        body = request.read()
+        entry = recorder.lookup(request.method, str(request.url), body)
+        if entry is not None:
+            return replayed(entry, request)
+        response = original_handle(self, request)
+        return recorded(response, request, response.read())
+
+    async def handle_async_request(self, request):
+        body = await request.aread()
+        entry = recorder.lookup(request.method, str(request.url), body)
+        if entry is not None:
+            return replayed(entry, request)
+        response = await original_async_handle(self, request)
+        return recorded(response, request, await response.aread())
+
+    httpx.HTTPTransport.handle_request = handle_request
+    httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+
+
+def _patch_playwright(recorder: _Recorder):
+    """새 컨텍스트마다 route_from_har를 겁니다. (record: 기록, replay: HAR에 있는 요청은 재생 / 없으면 실제 접속)
+    HAR 파일은 컨텍스트(또는 브라우저)를 close할 때 기록됩니다.
+    """
+    try:
+        from playwright.sync_api import Browser, BrowserType
+        from playwright.async_api import Browser as AsyncBrowser, BrowserType as AsyncBrowserType
+    except ImportError:
+        return
+
+    def har_options() -> tuple[str, dict]:
+        path, update = recorder.next_har()
+        options = {"not_found": "fallback", "update": update}
+        if update:
+            options["update_content"] = "embed"
+        return path, options
+
+    def attach(context):
+        path, options = har_options()
+        context.route_from_har(path, **options)
+        return context
+
+    async def attach_async(context):
+        path, options = har_options()
+        await context.route_from_har(path, **options)
+        return context
+
+    def wrap_context(cls, name, page=False):
+        original = getattr(cls, name)
+
+        def wrapper(self, *args, **kwargs):
+            result = original(self, *args, **kwargs)
+            attach(result.context if page else result)
+            return result
+
+        setattr(cls, name, wrapper)
+
+    def wrap_context_async(cls, name, page=False):
+        original = getattr(cls, name)
+
+        async def wrapper(self, *args, **kwargs):
+            result = await original(self, *args, **kwargs)
+            await attach_async(result.context if page else result)
+            return result
+
+        setattr(cls, name, wrapper)
+
+    wrap_context(Browser, "new_context")
+    wrap_context(Browser, "new_page", page=True)
+    wrap_context(BrowserType, "launch_persistent_context")
+    wrap_context_async(AsyncBrowser, "new_context")
+    wrap_context_async(AsyncBrowser, "new_page", page=True)
+    wrap_context_async(AsyncBrowserType, "launch_persistent_context")
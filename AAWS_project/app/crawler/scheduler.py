@@ -0,0 +1,381 @@
+import math
+import time
+import heapq
+import asyncio
+import hashlib
+import itertools
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote, unquote
+from urllib.robotparser import RobotFileParser
+
+# ==========================================
+# 🚦 Polite Crawl Scheduler
+# ==========================================
+# 여러 Blueprint 크롤링이 하나의 스케줄러를 공유하면서
+#   - 우선순위 frontier (priority 숫자가 작을수록 먼저, slot()으로 기다리는 요청에도 같은 순서 적용)
+#   - 도메인별 동시 요청 수 / 요청 간격 제한 (robots.txt Crawl-delay 반영)
+#   - robots.txt 캐시
+#   - URL 정규화 + Bloom filter 중복 제거 (URL 수가 늘어도 메모리 고정)
+# 를 한 곳에서 처리합니다.
+
+# 실제 요청(engine의 HTTP/브라우저 fetcher)과 robots.txt 판정에 같은 UA를 씁니다.
+# robots.txt 그룹은 첫 토큰(AAWS-Crawler)으로 매칭되고, 뒤의 브라우저 토큰은 UA로 분기하는 사이트를 위한 것입니다.
+CRAWLER_NAME = "AAWS-Crawler"
+DEFAULT_USER_AGENT = (
+    f"{CRAWLER_NAME}/1.0 (compatible; Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36)"
+)
+
+# 추적용 쿼리 파라미터는 같은 페이지로 간주하기 위해 제거
+_TRACKING_PARAMS = {"fbclid", "gclid", "yclid", "msclkid", "igshid", "mc_cid", "mc_eid", "ref_src"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """같은 페이지를 가리키는 URL 표기를 하나로 맞춥니다.
+
+    - scheme/host 소문자, 기본 포트 제거, fragment(#...) 제거
+    - 경로의 퍼센트 인코딩 정규화, 빈 경로는 '/'
+    - utm_* 등 추적 파라미터 제거 후 쿼리 정렬
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = quote(unquote(parts.path or "/"), safe="/:@!$&'()*+,;=-._~")
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def domain_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+# ==========================================
+# Bloom Filter: 확률적 중복 제거
+# ==========================================
+class BloomFilter:
+    """고정 크기 비트 배열로 '이미 본 URL'을 기억합니다.
+
+    capacity개를 넣었을 때 오탐률(처음 본 URL을 본 것으로 착각)이 error_rate 이하가 되도록
+    크기를 정하며, 100만 URL / 0.01% 기준 약 2.4MB로 고정됩니다. (미탐은 없음)
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """새로 추가했으면 True, 이미 있었으면(또는 오탐이면) False"""
+        added = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+
+# ==========================================
+# robots.txt 캐시
+# ==========================================
+class RobotsCache:
+    """도메인별 robots.txt를 한 번만 받아 TTL 동안 재사용합니다."""
+
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT, ttl: float = 3600.0, timeout: float = 10.0):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.timeout = timeout
+        self._parsers: dict[str, tuple[float, Optional[RobotFileParser]]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+
+    async def _download(self, origin: str) -> Optional[RobotFileParser]:
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+                resp = await client.get(f"{origin}/robots.txt", headers={"User-Agent": self.user_agent})
+        except Exception:
+            return None  # 받을 수 없으면 제한 없음으로 간주
+        if resp.status_code >= 400:
+            return None
+        parser = RobotFileParser()
+        parser.parse(resp.text.splitlines())
+        return parser
+
+    async def get(self, url: str) -> Optional[RobotFileParser]:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        cached = self._parsers.get(origin)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        # 같은 도메인에 대한 동시 요청은 하나의 다운로드를 기다립니다.
+        pending = self._pending.get(origin)
+        if pending is not None:
+            await asyncio.wait([pending])  # 기다리던 쪽이 취소돼도 다운로드는 그대로 둠
+            if pending.cancelled():
+                # 먼저 받던 호출자가 취소됨 → 이 호출자가 다시 받음
+                return await self.get(url)
+            return pending.result()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[origin] = future
+        try:
+            parser = await self._download(origin)
+            self._parsers[origin] = (time.monotonic(), parser)
+            future.set_result(parser)
+            return parser
+        except asyncio.CancelledError:
+            # 첫 호출자가 취소돼도 기다리던 호출자들이 멈추지 않도록 깨웁니다. (다시 받기는 그쪽에서)
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 호출자가 없어도 "never retrieved" 경고가 나지 않게
+            raise
+        finally:
+            del self._pending[origin]
+
+    async def allowed(self, url: str) -> bool:
+        parser = await self.get(url)
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        parser = await self.get(url)
+        if parser is None:
+            return None
+        delay = parser.crawl_delay(self.user_agent)
+        return float(delay) if delay else None
+
+
+class RobotsDisallowed(Exception):
+    pass
+
+
+# ==========================================
+# Scheduler
+# ==========================================
+@dataclass(order=True)
+class CrawlRequest:
+    priority: int
+    seq: int
+    url: str = field(compare=False)
+    meta: dict = field(default_factory=dict, compare=False)
+
+
+@dataclass
+class _DomainState:
+    frontier: list = field(default_factory=list)
+    waiting: list = field(default_factory=list)  # slot()에서 차례를 기다리는 요청 (우선순위 힙)
+    active: int = 0
+    next_time: float = 0.0
+    delay: Optional[float] = None
+
+
+class CrawlScheduler:
+    """여러 크롤링 작업이 공유하는 우선순위 frontier + 도메인별 예절(politeness) 관리자
+
+    두 가지 방식으로 쓸 수 있습니다.
+      1) frontier 방식:  add(url) → request = await next() → ... → done(request)
+      2) 슬롯 방식:      async with scheduler.slot(url, priority): 요청 보내기   (BlueprintExecutor가 사용)
+    슬롯 방식도 같은 도메인에서 기다리는 요청끼리는 priority가 작은 것부터 자리를 받습니다.
+    """
+
+    def __init__(
+        self,
+        per_domain_concurrency: int = 2,
+        per_domain_delay: float = 0.5,
+        respect_robots: bool = True,
+        capacity: int = 1_000_000,
+        error_rate: float = 1e-4,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ):
+        self.per_domain_concurrency = per_domain_concurrency
+        self.per_domain_delay = per_domain_delay
+        self.respect_robots = respect_robots
+        self.robots = RobotsCache(user_agent=user_agent)
+        self.seen_urls = BloomFilter(capacity=capacity, error_rate=error_rate)
+        self._domains: dict[str, _DomainState] = {}
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+        self.stats = {"added": 0, "duplicates": 0, "disallowed": 0, "dispatched": 0}
+
+    # ---------- 중복 제거 ----------
+    def mark_seen(self, url: str) -> bool:
+        """처음 보는 URL이면 기록하고 True. 이미 본 URL이면 False."""
+        if self.seen_urls.add(canonicalize_url(url)):
+            return True
+        self.stats["duplicates"] += 1
+        return False
+
+    # ---------- frontier ----------
+    def add(self, url: str, priority: int = 0, **meta) -> bool:
+        """frontier에 URL을 넣습니다. 이미 본 URL이면 넣지 않고 False."""
+        if not self.mark_seen(url):
+            return False
+        url = canonicalize_url(url)
+        state = self._domains.setdefault(domain_of(url), _DomainState())
+        heapq.heappush(state.frontier, CrawlRequest(priority, next(self._seq), url, meta))
+        self.stats["added"] += 1
+        self._notify()
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(s.frontier) for s in self._domains.values())
+
+    def _notify(self):
+        async def notify():
+            async with self._cond:
+                self._cond.notify_all()
+
+        try:
+            asyncio.get_running_loop().create_task(notify())
+        except RuntimeError:
+            pass  # 이벤트 루프 밖에서 add()한 경우: next()가 시작할 때 어차피 frontier를 확인합니다.
+
+    async def _domain_delay(self, url: str, state: _DomainState) -> float:
+        if state.delay is None:
+            robots_delay = await self.robots.crawl_delay(url) if self.respect_robots else None
+            state.delay = max(self.per_domain_delay, robots_delay or 0.0)
+        return state.delay
+
+    async def _wait(self, timeout: Optional[float]):
+        try:
+            await asyncio.wait_for(self._cond.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def next(self) -> Optional[CrawlRequest]:
+        """지금 요청을 보내도 되는 도메인 중 우선순위가 가장 높은 요청을 꺼냅니다.
+        frontier가 비었고 진행 중인 요청도 없으면 None (크롤링 종료).
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self._cond:
+                while True:
+                    now = loop.time()
+                    best, best_domain, soonest = None, None, None
+                    for domain, state in self._domains.items():
+                        if not state.frontier or state.active >= self.per_domain_concurrency:
+                            continue
+                        if now >= state.next_time:
+                            if best is None or state.frontier[0] < best:
+                                best, best_domain = state.frontier[0], domain
+                        else:
+                            soonest = state.next_time if soonest is None else min(soonest, state.next_time)
+
+                    if best is not None:
+                        state = self._domains[best_domain]
+                        heapq.heappop(state.frontier)
+                        state.active += 1
+                        state.next_time = now + (state.delay or self.per_domain_delay)
+                        break
+
+                    active = sum(s.active for s in self._domains.values())
+                    if active == 0 and len(self) == 0:
+                        return None
+                    await self._wait(None if soonest is None else soonest - now)
+
+            # robots 확인은 락 밖에서 (네트워크 요청이 필요할 수 있음)
+            state.delay = await self._domain_delay(best.url, state)
+            if not self.respect_robots or await self.robots.allowed(best.url):
+                self.stats["dispatched"] += 1
+                return best
+            self.stats["disallowed"] += 1
+            await self.done(best)
+
+    async def done(self, request: CrawlRequest):
+        """요청 처리가 끝났음을 알려 도메인 슬롯을 반납합니다."""
+        async with self._cond:
+            self._domains[domain_of(request.url)].active -= 1
+            self._cond.notify_all()
+
+    # ---------- 슬롯 방식 ----------
+    @asynccontextmanager
+    async def slot(self, url: str, priority: int = 0):
+        """frontier에 넣지 않는 요청에 도메인별 동시성/간격 제한을 적용합니다.
+        자리가 날 때까지 기다리는 요청이 여럿이면 priority가 작은 것(같으면 먼저 온 것)부터 보냅니다.
+        """
+        if self.respect_robots and not await self.robots.allowed(url):
+            self.stats["disallowed"] += 1
+            raise RobotsDisallowed(f"robots.txt가 허용하지 않는 URL입니다: {url}")
+
+        loop = asyncio.get_running_loop()
+        state = self._domains.setdefault(domain_of(url), _DomainState())
+        delay = await self._domain_delay(url, state)
+        request = CrawlRequest(priority, next(self._seq), url)
+        async with self._cond:
+            heapq.heappush(state.waiting, request)
+            try:
+                while True:
+                    now = loop.time()
+                    free = state.active < self.per_domain_concurrency
+                    if state.waiting[0] is request and free and now >= state.next_time:
+                        heapq.heappop(state.waiting)
+                        state.active += 1
+                        state.next_time = now + delay
+                        # 다음 순서의 요청이 간격을 계산하도록 깨움
+                        self._cond.notify_all()
+                        break
+                    wait = state.next_time - now if free and state.waiting[0] is request else None
+                    await self._wait(wait)
+            except BaseException:
+                # 기다리다 취소되면 줄에서 빼고, 뒤 순서가 막히지 않게 깨움
+                state.waiting.remove(request)
+                heapq.heapify(state.waiting)
+                self._cond.notify_all()
+                raise
+        self.stats["dispatched"] += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                state.active -= 1
+                self._cond.notify_all()
+
+    # ---------- 워커 실행 ----------
+    async def run(self, handler: Callable[[CrawlRequest], Awaitable[None]], workers: int = 8):
+        """frontier가 빌 때까지 workers개의 워커로 handler(request)를 실행합니다.
+        handler 안에서 scheduler.add()로 새 URL을 넣을 수 있습니다.
+        """
+
+        async def worker():
+            while (request := await self.next()) is not None:
+                try:
+                    await handler(request)
+                except Exception as e:
+                    print(f"   ⚠️ [Scheduler] 처리 실패: {request.url} ({e})")
+                finally:
+                    await self.done(request)
+
+        await asyncio.gather(*[worker() for _ in range(workers)])
@@ -0,0 +1,454 @@
+import os
+import csv
+import base64
+import json
+from typing import Iterable, Optional
+
+# ==========================================
+# 💾 Streaming Result Sinks
+# ==========================================
+# 수집 결과를 리스트로 모았다가 마지막에 한 번에 저장하면, 큰 크롤링은 메모리가 터지고
+# 중간에 죽으면 전부 날아갑니다. Sink는 레코드를 하나씩 받아 batch_size마다 파일에 씁니다.
+#   - JSONL   : 한 줄에 레코드 하나 (가장 안전, 기본 추천)
+#   - JSON    : 배열 형식 (기존 결과 파일과 호환, close() 때 배열이 닫힘)
+#   - CSV     : 첫 배치의 키로 헤더 고정, 이후 새로 나온 키는 `_extra` 열에 JSON으로 보관
+#   - Parquet : 첫 배치로 스키마 추론, 파일을 넘길 때(max_rows/max_bytes) 또는 close 때 배치마다 row group 기록 (pyarrow 필요)
+#
+# 생성된 크롤러 스크립트에서의 사용 예)
+#     from app.crawler.sinks import open_sink
+#
+#     with open_sink("news.jsonl", batch_size=200, max_bytes=50_000_000) as sink:
+#         for item in crawl():
+#             sink.write(item)
+
+EXTRA_COLUMN = "_extra"
+
+
+class BaseSink:
+    """레코드를 버퍼에 모았다가 batch_size마다 파일에 쓰는 공통 베이스
+
+    Args:
+        path: 결과 파일 경로 (상대 경로면 현재 작업 디렉토리 기준)
+        batch_size: 버퍼에 모을 최대 레코드 수. 이 수를 넘으면 즉시 파일에 씁니다.
+        max_bytes: 파일 하나의 최대 크기. 넘으면 `name-0001.ext`, `name-0002.ext`...로 새 파일을 엽니다.
+    """
+
+    extension = ""
+
+    def __init__(self, path: str, batch_size: int = 500, max_bytes: Optional[int] = None):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.max_bytes = max_bytes
+        self.records_written = 0
+        self.files: list[str] = []
+        self._buffer: list[dict] = []
+        self._part = 0
+        self._current: Optional[str] = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- 공개 API ----------
+    def write(self, record: dict):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[dict]):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        if self._current is None:
+            self._open_part()
+        self._write_batch(batch)
+        self.records_written += len(batch)
+        if self._should_roll():
+            self._close_part()
+
+    def close(self):
+        self.flush()
+        if self._current is not None:
+            self._close_part()
+
+    # ---------- 체크포인트 / 재개 ----------
+    def state(self) -> dict:
+        """버퍼를 비우고 현재까지 기록한 위치(파일 목록, 현재 파일 크기, 레코드 수)를 돌려줍니다."""
+        self.flush()
+        return {
+            "part": self._part,
+            "files": list(self.files),
+            "current": self._current,
+            "size": self._size(),
+            "records_written": self.records_written,
+        }
+
+    def restore(self, state: dict):
+        """state() 시점으로 되돌립니다. 그 뒤에 쓰였던 내용은 잘라내고 이어서 씁니다."""
+        self._buffer = []
+        self._part = state["part"]
+        self.files = list(state["files"])
+        self.records_written = state["records_written"]
+        self._current = state["current"]
+        if self._current is None:
+            return
+        with open(self._current, "r+b") as f:
+            f.truncate(state["size"])
+        self._open(self._current, append=True)
+
+    # ---------- 파일 회전 ----------
+    def _rolls(self) -> bool:
+        """파일을 여러 개로 나눠 쓸 수 있는 설정인지. 나눠 쓰면 첫 파일부터 `name-0001.ext`로 이름을 맞춥니다."""
+        return bool(self.max_bytes)
+
+    def _should_roll(self) -> bool:
+        return bool(self.max_bytes) and self._size() >= self.max_bytes
+
+    def _part_path(self) -> str:
+        if not self._rolls() and self._part == 1:
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}-{self._part:04d}{ext or self.extension}"
+
+    def _open_part(self):
+        self._part += 1
+        self._current = self._part_path()
+        self.files.append(self._current)
+        self._open(self._current)
+
+    def _close_part(self):
+        self._close()
+        self._current = None
+
+    def _size(self) -> int:
+        return os.path.getsize(self._current) if self._current and os.path.exists(self._current) else 0
+
+    # ---------- 형식별 구현 ----------
+    def _open(self, path: str, append: bool = False):
+        raise NotImplementedError
+
+    def _write_batch(self, batch: list[dict]):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class JsonlSink(BaseSink):
+    extension = ".jsonl"
+
+    def _open(self, path: str, append: bool = False):
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def _write_batch(self, batch: list[dict]):
+        self._file.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in batch))
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class JsonSink(BaseSink):
+    """기존 `json.dump(results, f)` 결과와 같은 배열 형식. 파일마다 close 시점에 배열을 닫습니다."""
+
+    extension = ".json"
+
+    def _open(self, path: str, append: bool = False):
+        if append:
+            self._file = open(path, "a", encoding="utf-8")
+            self._first = self._file.tell() <= len("[\n")
+            return
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("[\n")
+        self._first = True
+
+    def _write_batch(self, batch: list[dict]):
+        chunks = []
+        for record in batch:
+            chunks.append(("" if self._first else ",\n") + json.dumps(record, ensure_ascii=False, default=str))
+            self._first = False
+        self._file.write("".join(chunks))
+        self._file.flush()
+
+    def _close(self):
+        self._file.write("\n]\n")
+        self._file.close()
+
+
+class CsvSink(BaseSink):
+    extension = ".csv"
+
+    def __init__(self, path: str, batch_size: int = 500, max_bytes: Optional[int] = None, columns: Optional[list[str]] = None):
+        super().__init__(path, batch_size, max_bytes)
+        self.columns = list(columns) if columns else None
+
+    def _open(self, path: str, append: bool = False):
+        if append:
+            self._file = open(path, "a", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            return
+        # utf-8-sig: 엑셀에서 열어도 한글이 깨지지 않도록 BOM을 붙입니다.
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = None
+
+    def _write_batch(self, batch: list[dict]):
+        if self.columns is None:
+            self.columns = list(dict.fromkeys(key for record in batch for key in record))
+        if self._writer is None:
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns + [EXTRA_COLUMN])
+
+        known = set(self.columns)
+        rows = []
+        for record in batch:
+            extra = {k: v for k, v in record.items() if k not in known}
+            row = [_cell(record.get(column)) for column in self.columns]
+            row.append(json.dumps(extra, ensure_ascii=False, default=str) if extra else "")
+            rows.append(row)
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+    def state(self) -> dict:
+        return {**super().state(), "columns": self.columns}
+
+    def restore(self, state: dict):
+        self.columns = state.get("columns")
+        super().restore(state)
+
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return "" if value is None else value
+
+
+class ParquetSink(BaseSink):
+    """Parquet 파일을 part 단위로 씁니다. 스키마는 첫 배치에서 추론하고 이후 배치를 그 스키마로 맞춥니다.
+
+    Parquet 파일은 footer를 써야(close) 읽을 수 있고, 닫은 파일에는 이어 쓸 수 없습니다.
+    그래서 part가 열려 있는 동안 배치는 옆의 스풀 파일(`<part>.spool.jsonl`)에 이어 쓰고,
+    part를 넘길 때(max_rows / max_bytes) 또는 close() 때 스풀을 batch_size 단위 row group으로 옮겨 Parquet 파일을 완성합니다.
+    체크포인트에는 현재 part에 커밋된 행 수와 스풀 위치가 기록되므로, 체크포인트마다 파일이 잘게 쪼개지지 않습니다.
+    다 옮긴 스풀은 그 part가 완료로 기록된 체크포인트가 저장된 뒤(다음 state() 호출 또는 close())에 지웁니다.
+
+    Args:
+        max_rows: part 하나의 최대 행 수. max_bytes(스풀 크기 기준)와 함께 둘 중 먼저 넘는 쪽에서 다음 part로 넘어갑니다.
+    """
+
+    extension = ".parquet"
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 2000,
+        max_bytes: Optional[int] = None,
+        compression: str = "snappy",
+        max_rows: Optional[int] = None,
+    ):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("ParquetSink를 쓰려면 pyarrow가 필요합니다: pip install pyarrow") from e
+        super().__init__(path, batch_size, max_bytes)
+        self.compression = compression
+        self.max_rows = max_rows
+        self.schema = None
+        self._spool = None
+        self._part_rows = 0
+        self._finished_spools: list[str] = []  # 마지막 state() 이후 Parquet으로 옮긴 스풀
+        self._committed_spools: list[str] = []  # 완료로 기록된 state()를 이미 돌려준 스풀
+
+    def close(self):
+        super().close()
+        self._remove_spools(self._committed_spools)
+        self._remove_spools(self._finished_spools)
+
+    # ---------- 파일 회전 ----------
+    def _rolls(self) -> bool:
+        return bool(self.max_bytes or self.max_rows)
+
+    def _should_roll(self) -> bool:
+        return super()._should_roll() or bool(self.max_rows) and self._part_rows >= self.max_rows
+
+    def _size(self) -> int:
+        spool = _spool_path(self._current) if self._current else None
+        return os.path.getsize(spool) if spool and os.path.exists(spool) else 0
+
+    # ---------- 체크포인트 / 재개 ----------
+    def state(self) -> dict:
+        # 이전 state()가 돌려준 위치는 이미 저장되었으므로, 그때 완료로 기록된 part의 스풀은 더 필요 없습니다.
+        self._remove_spools(self._committed_spools)
+        state = {**super().state(), "rows": self._part_rows, "schema": _dump_schema(self.schema)}
+        self._committed_spools, self._finished_spools = self._finished_spools, []
+        return state
+
+    def restore(self, state: dict):
+        self.schema = _load_schema(state.get("schema"))
+        current = state["current"]
+        if current is not None:
+            with open(_spool_path(current), "r+b") as f:
+                f.truncate(state["size"])
+        super().restore({**state, "current": None})
+        self._current = current
+        if current is not None:
+            self._open(current, append=True)
+            self._part_rows = state.get("rows", 0)
+
+    # ---------- 형식별 구현 ----------
+    def _open(self, path: str, append: bool = False):
+        self._spool = open(_spool_path(path), "a" if append else "w", encoding="utf-8")
+        self._part_rows = 0
+
+    def _write_batch(self, batch: list[dict]):
+        self._spool.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in batch))
+        self._spool.flush()
+        self._part_rows += len(batch)
+
+    def _close(self):
+        import pyarrow.parquet as pq
+
+        spool_path = self._spool.name
+        self._spool.close()
+        self._spool = None
+        writer = None
+        with open(spool_path, "r", encoding="utf-8") as f:
+            for batch in _read_batches(f, self.batch_size):
+                table = self._to_table(batch)
+                if writer is None:
+                    writer = pq.ParquetWriter(self._current, self.schema, compression=self.compression)
+                writer.write_table(table)
+        if writer is not None:
+            writer.close()
+        elif self._current in self.files:
+            # 레코드 없이 열렸다 닫힌 part (재개 직후 등)는 파일을 만들지 않습니다.
+            self.files.remove(self._current)
+        self._finished_spools.append(spool_path)
+        self._part_rows = 0
+
+    def _remove_spools(self, paths: list[str]):
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        paths.clear()
+
+    def _infer_schema(self, batch: list[dict]):
+        import pyarrow as pa
+
+        rows = [_flatten(r) for r in batch]
+        names = [name for name in dict.fromkeys(k for r in rows for k in r) if name != EXTRA_COLUMN]
+        fields = []
+        for name in names:
+            try:
+                field_type = pa.array([r.get(name) for r in rows]).type
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # 첫 배치 안에서 타입이 섞인 필드(예: 숫자와 문자열)는 문자열 열로 둡니다.
+                field_type = pa.string()
+            fields.append(pa.field(name, pa.string() if pa.types.is_null(field_type) else field_type, nullable=True))
+        return pa.schema(fields + [pa.field(EXTRA_COLUMN, pa.string(), nullable=True)])
+
+    def _to_table(self, batch: list[dict]):
+        import pyarrow as pa
+
+        if self.schema is None:
+            self.schema = self._infer_schema(batch)
+
+        known = [name for name in self.schema.names if name != EXTRA_COLUMN]
+        known_set = set(known)
+        columns = {name: [] for name in known}
+        extras = []
+        for record in batch:
+            record = _flatten(record)
+            for name in known:
+                columns[name].append(record.get(name))
+            extra = {k: v for k, v in record.items() if k not in known_set}
+            extras.append(json.dumps(extra, ensure_ascii=False, default=str) if extra else None)
+
+        arrays = []
+        for name in known:
+            field_type = self.schema.field(name).type
+            try:
+                arrays.append(pa.array(columns[name], type=field_type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # 추론한 타입과 맞지 않는 값(예: 숫자 열에 문자열)은 변환하고, 변환이 안 되면 비워 둡니다.
+                arrays.append(pa.array([_coerce(v, field_type) for v in columns[name]], type=field_type))
+        arrays.append(pa.array(extras, type=pa.string()))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+
+def _spool_path(part_path: str) -> str:
+    return part_path + ".spool.jsonl"
+
+
+def _read_batches(f, batch_size: int):
+    batch = []
+    for line in f:
+        if line.strip():
+            batch.append(json.loads(line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _dump_schema(schema) -> Optional[str]:
+    """재개 후에도 다음 part가 같은 스키마를 쓰도록 체크포인트에 스키마를 함께 저장합니다."""
+    if schema is None:
+        return None
+    return base64.b64encode(schema.serialize().to_pybytes()).decode("ascii")
+
+
+def _load_schema(data: Optional[str]):
+    if not data:
+        return None
+    import pyarrow as pa
+
+    return pa.ipc.read_schema(pa.py_buffer(base64.b64decode(data)))
+
+
+def _flatten(record: dict) -> dict:
+    """중첩 dict/list 값은 JSON 문자열로 바꿔 열 하나에 담습니다."""
+    return {
+        k: json.dumps(v, ensure_ascii=False, default=str) if isinstance(v, (dict, list)) else v
+        for k, v in record.items()
+    }
+
+
+def _coerce(value, field_type):
+    import pyarrow as pa
+
+    if value is None:
+        return None
+    if pa.types.is_string(field_type):
+        return str(value)
+    try:
+        return pa.scalar(value, type=field_type).as_py()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return None
+
+
+_SINKS = {
+    ".jsonl": JsonlSink,
+    ".ndjson": JsonlSink,
+    ".json": JsonSink,
+    ".csv": CsvSink,
+    ".parquet": ParquetSink,
+}
+
+
+def open_sink(path: str, **kwargs) -> BaseSink:
+    """파일 확장자(.jsonl / .json / .csv / .parquet)에 맞는 Sink를 엽니다."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _SINKS:
+        raise ValueError(f"지원하지 않는 결과 형식입니다: '{ext}' (가능: {', '.join(_SINKS)})")
+    return _SINKS[ext](path, **kwargs)
@@ -0,0 +1,33 @@
+from app.llm.registry import (
+    ModelRegistry,
+    get_registry,
+    get_chat_model,
+    get_embeddings,
+    get_browser_use_llm,
+    close_all,
+    aclose_all,
+)
+from app.llm.budget import TokenBudgetMiddleware
+from app.llm.routing import ModelRoutingMiddleware, routing_summary
+from app.llm.concurrency import ToolConcurrencyMiddleware, resource_pool
+from app.llm.cache import (
+    LLMResponseCache,
+    ResponseStore,
+    get_response_cache,
+    get_store,
+)
+from app.llm.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingStore,
+    get_embedding_store,
+)
+from app.llm.fixtures import (
+    FixtureMissingError,
+    FixtureStore,
+    install as install_fixtures,
+    uninstall as uninstall_fixtures,
+    install_from_env,
+)
+
+# AAWS_LLM_MODE=record/replay로 띄운 프로세스(서버, 벤치마크 등)는 import 시점부터 기록/재생
+install_from_env()
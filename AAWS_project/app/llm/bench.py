@@ -0,0 +1,177 @@
+import os
+import time
+import json
+import shutil
+import asyncio
+import argparse
+import statistics
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.llm.fixtures import RECORD, REPLAY, fixtures_dir_for, install, uninstall
+
+# =========================================================
+# ⏱️ 오프라인 파이프라인 벤치마크 (LLM 응답은 기록된 fixture로 재생)
+#   1) 기록 (API 키 필요, 1회):  python -m app.llm.bench coder --record
+#   2) 측정 (키/네트워크 불필요): python -m app.llm.bench coder --iterations 5
+#   서버:  AAWS_LLM_MODE=replay AAWS_LLM_FIXTURES=<dir> 로 서버를 띄운 뒤
+#          python -m app.llm.bench server --server-url http://localhost:8000 --endpoint /coder/stream
+#
+# 네트워크 지연이 빠진 상태에서 에이전트 루프(도구 실행, 파싱, 상태 처리)의 CPU 쪽 시간을 잽니다.
+# Navigator 단계는 실제 브라우저/페이지가 필요해 여기서는 다루지 않습니다.
+# =========================================================
+
+CODER_MISSION = (
+    "1. 'calculator.py'를 파이썬으로 만들어줘. 내용으로는 add, subtract 함수를 가진 평범한 Calculator 클래스를 짜고 "
+    "출력으로 'Calculator Created'를 찍게 한 뒤 실행해봐.\n"
+    "2. 실행을 확인한 뒤에는 calculator.py의 특정 라인을 수정(edit_code_file 사용)해서 multiply와 divide 함수를 추가해 봐.\n"
+    "3. 마지막으로 수정된 파일을 다시 한번 실행해보고 오류가 없으면 결과를 보고해줘."
+)
+BENCH_THREAD = "llm_bench"
+
+
+class ToolTimer(BaseCallbackHandler):
+    """도구 실행 시간과 모델 호출 횟수를 모읍니다."""
+
+    def __init__(self):
+        self.tool_seconds = 0.0
+        self.tool_calls = 0
+        self.model_calls = 0
+        self._started: dict = {}
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.model_calls += 1
+
+    def _finish(self, run_id):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.tool_seconds += time.perf_counter() - started
+            self.tool_calls += 1
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean": statistics.mean(samples),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+
+
+# ---------- 시나리오 ----------
+def _fresh_coder(model_name: Optional[str]):
+    """매 반복을 같은 조건(빈 작업 공간, 빈 대화 기록)에서 시작합니다."""
+    from notebooks.coder import WORKSPACES, create_senior_coder
+    from app.crawler.replay import REPLAY_DIRNAME
+
+    # 스크립트가 보낸 HTTP 기록(replay/)은 남겨 둬서 두 번째 반복부터는 네트워크 없이 재생
+    workspace = WORKSPACES.path_for(BENCH_THREAD)
+    for name in os.listdir(workspace):
+        if name != REPLAY_DIRNAME:
+            path = os.path.join(workspace, name)
+            shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+    return create_senior_coder(model_name) if model_name else create_senior_coder()
+
+
+async def run_coder(timer: ToolTimer, model_name: Optional[str] = None, events: bool = False) -> dict:
+    agent = _fresh_coder(model_name)
+    config = {"configurable": {"thread_id": BENCH_THREAD}, "callbacks": [timer]}
+    inputs = {"messages": [("user", CODER_MISSION)]}
+    if not events:
+        result = await agent.ainvoke(inputs, config=config)
+        return {"messages": len(result["messages"])}
+    # 서버의 /stream과 같은 방식으로 이벤트를 소비
+    count = 0
+    async for _ in agent.astream_events(inputs, config=config, version="v2"):
+        count += 1
+    return {"events": count}
+
+
+async def run_server(server_url: str, endpoint: str) -> dict:
+    import httpx
+
+    events = 0
+    async with httpx.AsyncClient(base_url=server_url, timeout=None) as client:
+        payload = {"message": CODER_MISSION, "thread_id": f"{BENCH_THREAD}_{time.time_ns()}"}
+        async with client.stream("POST", endpoint, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data: ") and line[6:].strip():
+                    events += 1
+                    if "error" in json.loads(line[6:]):
+                        raise RuntimeError(line[6:])
+    return {"events": events}
+
+
+async def run_ragas(dataset_path: str, agent_module: str) -> dict:
+    import importlib
+    import tempfile
+    from app.utils.evaluator import run_ragas_evaluation
+
+    agent = importlib.import_module(agent_module).agent_executor
+    output = os.path.join(tempfile.mkdtemp(prefix="aaws_llm_bench_"), "ragas_results.csv")
+    await run_ragas_evaluation(agent, dataset_path, output_file=output, project_name="llm_bench")
+    return {"output": output}
+
+
+async def bench(scenario: str, iterations: int, args) -> dict:
+    durations, tool_seconds, extra = [], [], {}
+    for _ in range(iterations):
+        timer = ToolTimer()
+        start = time.perf_counter()
+        if scenario in ("coder", "coder_events"):
+            extra = await run_coder(timer, args.model, events=scenario == "coder_events")
+        elif scenario == "server":
+            extra = await run_server(args.server_url, args.endpoint)
+        elif scenario == "ragas":
+            extra = await run_ragas(args.ragas_dataset, args.ragas_agent)
+        durations.append(time.perf_counter() - start)
+        tool_seconds.append(timer.tool_seconds)
+        extra.update({"tool_calls": timer.tool_calls, "model_calls": timer.model_calls})
+    return {"total": _summary(durations), "tools": _summary(tool_seconds), "last": extra}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM 응답을 재생하는 오프라인 파이프라인 벤치마크")
+    parser.add_argument("scenario", choices=["coder", "coder_events", "server", "ragas"])
+    parser.add_argument("--record", action="store_true", help="실제 API로 1회 실행하며 fixture를 새로 기록")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--fixtures", default=None, help="fixture 디렉토리 (기본: code_artifacts/llm_fixtures/<scenario>)")
+    parser.add_argument("--model", default=None, help="Coder 모델 (기본: create_senior_coder 기본값)")
+    parser.add_argument("--server-url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", default="/coder/stream")
+    parser.add_argument("--ragas-dataset", default=None)
+    parser.add_argument("--ragas-agent", default="app.agents.multimodal_agent")
+    args = parser.parse_args()
+
+    if args.scenario == "ragas" and not args.ragas_dataset:
+        parser.error("ragas 시나리오는 --ragas-dataset이 필요합니다.")
+
+    # server 시나리오는 서버 프로세스 쪽에서 AAWS_LLM_MODE로 재생하므로 여기서는 가로채지 않음
+    store = None
+    if args.scenario != "server":
+        fixtures = args.fixtures or fixtures_dir_for("coder" if args.scenario == "coder_events" else args.scenario)
+        store = install(RECORD if args.record else REPLAY, fixtures)
+    iterations = 1 if args.record else args.iterations
+
+    try:
+        r = asyncio.run(bench(args.scenario, iterations, args))
+    finally:
+        if store is not None:
+            print(store.summary())
+        uninstall()
+
+    t, tools = r["total"], r["tools"]
+    print(f"⏱️ [{args.scenario}] {iterations}회: 평균 {t['mean'] * 1000:.0f}ms / p50 {t['p50'] * 1000:.0f}ms / p95 {t['p95'] * 1000:.0f}ms")
+    print(f"   도구 실행 평균 {tools['mean'] * 1000:.0f}ms, 나머지(파싱/상태 처리/재생) 평균 {(t['mean'] - tools['mean']) * 1000:.0f}ms")
+    print(f"   마지막 실행: {r['last']}")
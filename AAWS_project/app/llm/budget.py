@@ -0,0 +1,249 @@
+import os
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Optional
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, RemoveMessage, ToolMessage, get_buffer_string
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+# ==========================================
+# 🧮 Prompt Token Budget Middleware
+# ==========================================
+# Navigator/Coder 스레드는 검증 샘플, 웹 검색 결과, 스크립트 로그 같은 도구 출력을 모두 체크포인트에 쌓아 두고
+# 매 턴 전체 기록을 다시 보냅니다. 스레드가 길어질수록 지연과 비용이 계속 늘어납니다.
+#
+# create_agent(middleware=[TokenBudgetMiddleware()])로 붙이면 모델 호출마다
+#   1) 최근 메시지(keep_recent개)는 그대로 두고, 그보다 오래된 도구 출력은 앞/뒷부분만 남겨 줄이고 (프롬프트에서만, 기록은 유지)
+#   2) 그래도 예산(max_tokens)을 넘으면 오래된 메시지를 요약 메시지 하나로 바꿉니다.
+#      이미 요약이 있으면 "이전 요약 + 새로 밀려난 메시지"만 다시 요약합니다. (점진 요약, 스레드 기록도 줄어듦)
+#   3) 턴마다 프롬프트 토큰 수(추정치와 모델이 보고한 실제 입력 토큰)를 출력/기록합니다.
+#
+# 환경 변수: AAWS_PROMPT_TOKEN_BUDGET=24000  AAWS_KEEP_RECENT_MESSAGES=12  AAWS_OLD_TOOL_OUTPUT_TOKENS=600
+
+DEFAULT_MAX_TOKENS = int(os.getenv("AAWS_PROMPT_TOKEN_BUDGET", "24000"))
+DEFAULT_KEEP_RECENT = int(os.getenv("AAWS_KEEP_RECENT_MESSAGES", "12"))
+DEFAULT_OLD_TOOL_TOKENS = int(os.getenv("AAWS_OLD_TOOL_OUTPUT_TOKENS", "600"))
+DEFAULT_SUMMARY_MODEL = "google_genai:gemini-flash-latest"
+# 요약에 넣을 오래된 메시지의 최대 토큰 (요약 호출 자체가 너무 커지지 않도록)
+MAX_SUMMARY_INPUT_TOKENS = 30000
+# 턴 기록은 스레드마다 최근 KEEP_TURNS개, 최근에 쓴 스레드 KEEP_THREADS개만 보관 (서버가 오래 떠 있어도 메모리 고정)
+KEEP_TURNS = 50
+KEEP_THREADS = 256
+
+# count_tokens_approximately와 같은 기준 (토큰당 약 4자)
+CHARS_PER_TOKEN = 4
+
+SUMMARY_ID_PREFIX = "context_summary_"
+SUMMARY_HEADER = "[이전 대화 요약] 아래는 앞선 대화와 도구 실행 결과를 요약한 내용입니다."
+
+SUMMARY_PROMPT = """당신은 에이전트의 작업 기록을 압축하는 도우미입니다.
+[이전 요약]과 그 뒤에 이어진 [새 메시지]를 합쳐, 앞으로의 작업에 필요한 정보만 담은 갱신된 요약을 작성하세요.
+
+반드시 유지할 것:
+- 사용자의 원래 요청과 목표, 제약 조건
+- 이미 끝낸 작업 (같은 일을 반복하지 않도록), 만들거나 수정한 파일명, 확정된 URL/CSS 셀렉터/설정 값
+- 발생한 에러와 해결 방법, 아직 해결하지 못한 문제
+- 남은 작업
+
+도구 출력의 원문(HTML, 로그, 샘플 데이터)은 결론만 남기고 요약 텍스트만 답하세요.
+
+[이전 요약]
+{previous}
+
+[새 메시지]
+{messages}"""
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """토큰 예산을 넘는 텍스트는 앞 2/3, 뒤 1/3만 남깁니다."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    head, tail = limit * 2 // 3, limit // 3
+    return f"{text[:head]}\n... (오래된 도구 출력이라 중간 {len(text) - head - tail:,}자 생략) ...\n{text[-tail:]}"
+
+
+def is_summary(message: AnyMessage) -> bool:
+    return bool(message.id) and str(message.id).startswith(SUMMARY_ID_PREFIX)
+
+
+def _safe_cutoff(messages: list[AnyMessage], index: int) -> int:
+    """도구 호출(AIMessage)과 그 결과(ToolMessage)가 갈라지지 않는 위치로 자르는 지점을 앞당깁니다."""
+    index = max(0, min(index, len(messages)))
+    while 0 < index < len(messages) and isinstance(messages[index], ToolMessage):
+        index -= 1
+    return index
+
+
+class TokenBudgetMiddleware(AgentMiddleware):
+    """프롬프트 토큰 예산을 지키도록 오래된 도구 출력을 줄이고 오래된 턴을 점진적으로 요약합니다."""
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        keep_recent: int = DEFAULT_KEEP_RECENT,
+        old_tool_tokens: int = DEFAULT_OLD_TOOL_TOKENS,
+        summary_model: Any = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_tokens: 모델 한 번 호출에 보낼 프롬프트 토큰 예산 (시스템 프롬프트 포함, 추정치)
+            keep_recent: 그대로 보낼 최근 메시지 수
+            old_tool_tokens: 최근 메시지가 아닌 도구 출력 하나에 남길 최대 토큰
+            summary_model: 요약에 쓸 모델 (모델 이름 문자열 또는 BaseChatModel, 기본: gemini-flash)
+            name: 출력에 표시할 에이전트 이름
+        """
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.old_tool_tokens = old_tool_tokens
+        self._summary_model = summary_model or DEFAULT_SUMMARY_MODEL
+        self.label = name or "Agent"
+        # thread_id별 최근 턴 기록 (최근에 쓴 스레드 순)
+        self.turns: OrderedDict[str, deque[dict]] = OrderedDict()
+
+    # ---------- 프롬프트 준비 ----------
+    def _recent_start(self, messages: list[AnyMessage]) -> int:
+        return _safe_cutoff(messages, len(messages) - self.keep_recent)
+
+    def _compact(self, messages: list[AnyMessage]) -> tuple[list[AnyMessage], int]:
+        """최근 메시지 이전의 긴 도구 출력을 줄인 사본 (원본 메시지는 건드리지 않음)"""
+        recent = self._recent_start(messages)
+        compacted, truncated = [], 0
+        for i, message in enumerate(messages):
+            if i < recent and isinstance(message, ToolMessage) and isinstance(message.content, str):
+                short = truncate_text(message.content, self.old_tool_tokens)
+                if short is not message.content:
+                    message = message.model_copy(update={"content": short})
+                    truncated += 1
+            compacted.append(message)
+        return compacted, truncated
+
+    def _count(self, messages: list[AnyMessage], system_prompt: Optional[str] = None) -> int:
+        tokens = count_tokens_approximately(messages)
+        if system_prompt:
+            tokens += len(system_prompt) // CHARS_PER_TOKEN
+        return tokens
+
+    # ---------- 요약 ----------
+    def _summary_plan(self, state: dict) -> Optional[tuple[str, list[AnyMessage], list[AnyMessage]]]:
+        """예산을 넘으면 (이전 요약, 새로 요약할 메시지, 남길 메시지), 아니면 None"""
+        messages = state["messages"]
+        compacted, _ = self._compact(messages)
+        if self._count(compacted) <= self.max_tokens:
+            return None
+        start = 1 if messages and is_summary(messages[0]) else 0
+        cutoff = self._recent_start(messages)
+        if cutoff <= start:
+            return None
+        # 밀려난 부분이 작으면 최근 메시지만으로 예산을 넘는 상황이므로 매 턴 요약을 다시 돌리지 않음
+        if self._count(compacted[start:cutoff]) < self.max_tokens // 4:
+            return None
+        previous = _summary_body(messages[0]) if start else ""
+        return previous, compacted[start:cutoff], messages[cutoff:]
+
+    def _summary_request(self, previous: str, to_summarize: list[AnyMessage]) -> str:
+        # 요약 입력도 예산 안에서: 가장 최근 쪽 메시지를 우선
+        text = get_buffer_string(to_summarize)
+        limit = MAX_SUMMARY_INPUT_TOKENS * CHARS_PER_TOKEN
+        if len(text) > limit:
+            text = "... (앞부분 생략) ...\n" + text[-limit:]
+        return SUMMARY_PROMPT.format(previous=previous or "(없음)", messages=text)
+
+    def _summary_update(self, summary: str, kept: list[AnyMessage], summarized: int) -> dict:
+        print(f"🗜️ [{self.label}] 오래된 메시지 {summarized}개를 요약으로 합쳤습니다. (요약 {len(summary):,}자, 유지 {len(kept)}개)")
+        summary_message = HumanMessage(content=f"{SUMMARY_HEADER}\n\n{summary}", id=f"{SUMMARY_ID_PREFIX}{uuid.uuid4().hex}")
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), summary_message, *kept]}
+
+    def _model(self):
+        if isinstance(self._summary_model, str):
+            from app.llm.registry import get_chat_model
+
+            self._summary_model = get_chat_model(self._summary_model, temperature=0)
+        # 서버 스트리밍에 요약 토큰이 섞이지 않도록
+        return self._summary_model.with_config({"tags": ["exclude_from_stream"]})
+
+    def before_model(self, state, runtime) -> Optional[dict[str, Any]]:
+        plan = self._summary_plan(state)
+        if plan is None:
+            return None
+        previous, to_summarize, kept = plan
+        try:
+            summary = self._model().invoke(self._summary_request(previous, to_summarize)).text.strip()
+        except Exception as e:
+            print(f"⚠️ [{self.label}] 대화 요약 실패, 오래된 도구 출력 줄이기만 적용합니다: {e}")
+            return None
+        return self._summary_update(summary, kept, len(to_summarize))
+
+    async def abefore_model(self, state, runtime) -> Optional[dict[str, Any]]:
+        plan = self._summary_plan(state)
+        if plan is None:
+            return None
+        previous, to_summarize, kept = plan
+        try:
+            summary = (await self._model().ainvoke(self._summary_request(previous, to_summarize))).text.strip()
+        except Exception as e:
+            print(f"⚠️ [{self.label}] 대화 요약 실패, 오래된 도구 출력 줄이기만 적용합니다: {e}")
+            return None
+        return self._summary_update(summary, kept, len(to_summarize))
+
+    # ---------- 모델 호출 ----------
+    def _prepare(self, request):
+        messages, truncated = self._compact(request.messages)
+        system_prompt = request.system_message.text if request.system_message is not None else None
+        turn = {
+            "estimated_tokens": self._count(messages, system_prompt),
+            "messages": len(messages),
+            "truncated_tool_outputs": truncated,
+            "summarized": bool(messages) and is_summary(messages[0]),
+        }
+        return request.override(messages=messages), turn
+
+    def _report(self, turn: dict, response) -> None:
+        result = getattr(response, "result", None) or [response]
+        usage = next((m.usage_metadata for m in result if isinstance(m, AIMessage) and m.usage_metadata), None)
+        turn["input_tokens"] = usage.get("input_tokens") if usage else None
+        thread_id = _thread_id()
+        turns = self.turns.get(thread_id)
+        if turns is None:
+            turns = self.turns[thread_id] = deque(maxlen=KEEP_TURNS)
+            while len(self.turns) > KEEP_THREADS:
+                self.turns.popitem(last=False)
+        self.turns.move_to_end(thread_id)
+        turn["turn"] = turns[-1]["turn"] + 1 if turns else 1
+        turns.append(turn)
+        actual = f", 실제 입력 {turn['input_tokens']:,}" if turn["input_tokens"] else ""
+        over = " ⚠️ 예산 초과" if turn["estimated_tokens"] > self.max_tokens else ""
+        print(
+            f"🧮 [{self.label}] 턴 {turn['turn']}: 프롬프트 약 {turn['estimated_tokens']:,} 토큰{actual} "
+            f"(예산 {self.max_tokens:,}, 메시지 {turn['messages']}개, 줄인 도구 출력 {turn['truncated_tool_outputs']}개){over}"
+        )
+
+    def wrap_model_call(self, request, handler):
+        request, turn = self._prepare(request)
+        response = handler(request)
+        self._report(turn, response)
+        return response
+
+    async def awrap_model_call(self, request, handler):
+        request, turn = self._prepare(request)
+        response = await handler(request)
+        self._report(turn, response)
+        return response
+
+
+def _thread_id() -> str:
+    try:
+        from langgraph.config import get_config
+
+        return str((get_config().get("configurable") or {}).get("thread_id") or "default")
+    except RuntimeError:
+        return "default"
+
+
+def _summary_body(message: AnyMessage) -> str:
+    text = message.content if isinstance(message.content, str) else get_buffer_string([message])
+    return text.replace(SUMMARY_HEADER, "", 1).strip()
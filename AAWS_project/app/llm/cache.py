@@ -0,0 +1,234 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import warnings
+import threading
+from typing import Any, Optional, Sequence
+
+from langchain_core._api.beta_decorator import LangChainBetaWarning
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from app.crawler.registry import ARTIFACT_DIR
+
+# ==========================================
+# 💾 Persistent LLM Response Cache
+# ==========================================
+# temperature 0 호출은 같은 입력이면 같은 답을 기대하는데도 매번 API를 다시 부릅니다.
+# (get_page_structure의 셀렉터 분석, Self-Query 질의 생성, RAGAS 판정 LLM 등)
+#
+# (모델 + 파라미터 + 전체 프롬프트)의 해시를 키로 응답을 SQLite에 저장해 두고, 같은 호출이면 저장된 응답을 돌려줍니다.
+#   - LangChain 모델의 cache= 인자로 붙습니다. 키에는 도구 바인딩, 구조화 출력 스키마 등 호출 파라미터가 모두 포함됩니다.
+#   - temperature가 0이 아닌 호출은 저장/조회하지 않습니다. (같은 모델을 다른 온도로 호출해도 안전)
+#   - 전체 항목 수/크기 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다. (LRU)
+#   - 호출 위치(site)별로 적중/실패 횟수를 기록해 어디서 캐시가 효과가 있는지 볼 수 있습니다.
+#
+# 사용 예)
+#     llm = get_chat_model("openai:gpt-4o", temperature=0, cache_site="self_query")
+#     print(get_store().summary())
+#
+# 환경 변수
+#   AAWS_LLM_CACHE=0                 캐시 끄기
+#   AAWS_LLM_CACHE_MAX_MB=200        저장 크기 한도
+#   AAWS_LLM_CACHE_MAX_ENTRIES=20000 저장 항목 수 한도
+
+LLM_CACHE_FILENAME = "llm_cache.db"
+CACHE_ENABLED = os.getenv("AAWS_LLM_CACHE", "1").lower() not in ("0", "false", "off")
+DEFAULT_MAX_MB = int(os.getenv("AAWS_LLM_CACHE_MAX_MB", "200"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("AAWS_LLM_CACHE_MAX_ENTRIES", "20000"))
+
+# llm_string에 들어 있는 temperature 값 (예: "('temperature', 0.0)" / '"temperature": 0')
+_TEMPERATURE = re.compile(r"""['"]temperature['"]\s*[,:]\s*([0-9.]+)""")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    site TEXT,
+    generations TEXT,
+    size INTEGER,
+    created_at REAL,
+    last_used REAL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS site_stats (
+    site TEXT PRIMARY KEY,
+    hits INTEGER DEFAULT 0,
+    misses INTEGER DEFAULT 0,
+    writes INTEGER DEFAULT 0,
+    evictions INTEGER DEFAULT 0
+);
+"""
+
+
+def is_deterministic(llm_string: str) -> bool:
+    """호출 파라미터에 0보다 큰 temperature가 있으면 False (temperature가 안 보이면 호출한 쪽 설정을 믿음)"""
+    match = _TEMPERATURE.search(llm_string)
+    if match is None:
+        return True
+    try:
+        return float(match.group(1)) == 0
+    except ValueError:
+        return False
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResponseStore:
+    """여러 호출 위치가 함께 쓰는 SQLite 응답 저장소 (크기 한도 + LRU 정리 + 위치별 통계)"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_mb: int = DEFAULT_MAX_MB,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.db_path = db_path or os.path.join(ARTIFACT_DIR, LLM_CACHE_FILENAME)
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, site: str) -> Optional[str]:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT generations FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._bump(site, "hits" if row is not None else "misses")
+        return row[0] if row is not None else None
+
+    def put(self, key: str, site: str, generations: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, site, generations, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, site, generations, len(generations.encode("utf-8")), now, now),
+            )
+            self._bump(site, "writes")
+            self._evict()
+
+    def _bump(self, site: str, column: str, amount: int = 1):
+        self._conn.execute("INSERT OR IGNORE INTO site_stats (site) VALUES (?)", (site,))
+        self._conn.execute(f"UPDATE site_stats SET {column} = {column} + ? WHERE site = ?", (amount, site))
+
+    def _evict(self):
+        count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if (not self.max_entries or count <= self.max_entries) and (not self.max_bytes or size <= self.max_bytes):
+            return
+        evicted: dict[str, int] = {}
+        rows = self._conn.execute("SELECT key, site, size FROM entries ORDER BY last_used").fetchall()
+        for key, site, entry_size in rows:
+            if (not self.max_entries or count <= self.max_entries) and (not self.max_bytes or size <= self.max_bytes):
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1
+            size -= entry_size
+            evicted[site] = evicted.get(site, 0) + 1
+        for site, amount in evicted.items():
+            self._bump(site, "evictions", amount)
+
+    def clear(self, site: Optional[str] = None):
+        with self._lock, self._conn:
+            if site is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE site = ?", (site,))
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT site, hits, misses, writes, evictions FROM site_stats ORDER BY site").fetchall()
+            sizes = dict(self._conn.execute("SELECT site, COUNT(*) FROM entries GROUP BY site").fetchall())
+        stats = {}
+        for site, hits, misses, writes, evictions in rows:
+            total = hits + misses
+            stats[site] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+                "writes": writes,
+                "evictions": evictions,
+                "entries": sizes.get(site, 0),
+            }
+        return stats
+
+    def summary(self) -> str:
+        stats = self.stats()
+        if not stats:
+            return "💾 [LLM Cache] 기록된 호출이 없습니다."
+        lines = ["💾 [LLM Cache] 호출 위치별 적중률"]
+        for site, s in stats.items():
+            lines.append(
+                f"   - {site}: {s['hit_rate']:.0%} (적중 {s['hits']} / 실패 {s['misses']}, 저장 {s['entries']}개, 정리 {s['evictions']}개)"
+            )
+        return "\n".join(lines)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache(BaseCache):
+    """한 호출 위치(site)에 붙이는 LangChain 캐시. 저장소는 모든 위치가 함께 씁니다."""
+
+    def __init__(self, site: str, store: Optional[ResponseStore] = None):
+        self.site = site
+        self.store = store or get_store()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        if not is_deterministic(llm_string):
+            return None
+        payload = self.store.get(cache_key(prompt, llm_string), self.site)
+        if payload is None:
+            return None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LangChainBetaWarning)
+                return [loads(item) for item in json.loads(payload)]
+        except Exception:
+            # LangChain 버전이 바뀌어 역직렬화가 안 되면 캐시 실패로 보고 새로 호출합니다.
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if not is_deterministic(llm_string):
+            return
+        self.store.put(cache_key(prompt, llm_string), self.site, json.dumps([dumps(gen) for gen in return_val], ensure_ascii=False))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear(self.site)
+
+
+_store: Optional[ResponseStore] = None
+_caches: dict[str, LLMResponseCache] = {}
+_cache_lock = threading.Lock()
+
+
+def get_store() -> ResponseStore:
+    global _store
+    with _cache_lock:
+        if _store is None:
+            _store = ResponseStore()
+        return _store
+
+
+def get_response_cache(site: str) -> Optional[LLMResponseCache]:
+    """호출 위치별 캐시 (AAWS_LLM_CACHE=0이면 None → 캐시 없이 호출)"""
+    if not CACHE_ENABLED:
+        return None
+    store = get_store()
+    with _cache_lock:
+        if site not in _caches:
+            _caches[site] = LLMResponseCache(site, store)
+        return _caches[site]
+
+
+if __name__ == "__main__":
+    print(get_store().summary())
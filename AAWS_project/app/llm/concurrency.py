@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Optional
+
+from langchain.agents.middleware import AgentMiddleware
+
+from app.crawler.registry import ARTIFACT_DIR
+from app.sandbox.workspace import current_thread_id
+
+# ==========================================
+# 🔀 Concurrent Tool Calls (동시 실행 한도 + 자원 슬롯)
+# ==========================================
+# create_agent는 한 턴의 여러 tool_call을 각각 따로 실행(Send)하므로 async 도구는 실제로 동시에 돌 수 있습니다.
+# 그런데 한도가 없으면 Navigator가 entry_urls 10개에 get_page_structure를 한꺼번에 부르는 순간
+# 헤드리스 브라우저 10개가 동시에 뜨고, 공유 브라우저를 쓰는 browse_web끼리는 같은 탭을 두고 다툽니다.
+#
+# create_agent(middleware=[ToolConcurrencyMiddleware(...)])로 붙이면 도구 호출마다
+#   1) 자원 슬롯: 도구가 쓰는 자원(예: "browser")의 프로세스 전체 슬롯을 잡고 (모든 에이전트 공용)
+#   2) 도구별 한도: 같은 도구를 동시에 몇 개까지 돌릴지 (예: 공유 브라우저를 쓰는 browse_web은 1개)
+#   3) 에이전트 한도: 이 에이전트의 도구를 동시에 최대 max_concurrent개까지
+#   순서로 자리를 잡은 뒤 실행합니다. (잡는 순서가 항상 같아서 서로 기다리다 멈추지 않음)
+#   4) 한 턴의 도구 호출들이 모두 끝나면 "도구 시간 합계 / 실제 걸린 시간 = 겹침 배수"를 출력/기록합니다.
+#
+# 환경 변수: AAWS_MAX_CONCURRENT_TOOLS=4  AAWS_BROWSER_SLOTS=2
+
+DEFAULT_MAX_CONCURRENT_TOOLS = int(os.getenv("AAWS_MAX_CONCURRENT_TOOLS", "4"))
+# 자원 이름 → 프로세스 전체 동시 사용 한도
+RESOURCE_LIMITS = {
+    "browser": int(os.getenv("AAWS_BROWSER_SLOTS", "2")),
+}
+TOOL_TIMING_FILENAME = "tool_timing_log.jsonl"
+# 비동기 대기 중 빈 자리를 다시 확인하는 간격(초)
+POLL_INTERVAL = 0.05
+
+
+class SlotPool:
+    """스레드(동기 도구)와 이벤트 루프(async 도구)가 함께 쓰는 동시 사용 한도"""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = max(1, limit)
+        self._sem = threading.BoundedSemaphore(self.limit)
+
+    @contextmanager
+    def hold(self):
+        self._sem.acquire()
+        try:
+            yield
+        finally:
+            self._sem.release()
+
+    @asynccontextmanager
+    async def ahold(self):
+        # 루프마다 따로 asyncio.Semaphore를 두면 서버/노트북/동기 호출이 한도를 나눠 갖지 못하므로 같은 세마포어를 폴링합니다.
+        while not self._sem.acquire(blocking=False):
+            await asyncio.sleep(POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            self._sem.release()
+
+
+_resource_pools: dict[str, SlotPool] = {}
+_resource_lock = threading.Lock()
+
+
+def resource_pool(name: str) -> SlotPool:
+    """프로세스 전체에서 공유하는 자원 슬롯 (RESOURCE_LIMITS에 없는 자원은 에이전트 한도만큼)"""
+    with _resource_lock:
+        if name not in _resource_pools:
+            _resource_pools[name] = SlotPool(name, RESOURCE_LIMITS.get(name, DEFAULT_MAX_CONCURRENT_TOOLS))
+        return _resource_pools[name]
+
+
+class _Batch:
+    """한 스레드에서 겹쳐 실행된 도구 호출 묶음 (첫 호출 시작 ~ 마지막 호출 종료)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.in_flight = 0
+        self.calls: list[dict] = []
+
+
+class ToolConcurrencyMiddleware(AgentMiddleware):
+    """한 턴의 독립적인 도구 호출을 한도 안에서 동시에 실행하고, 실제로 얼마나 겹쳤는지 기록합니다."""
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_TOOLS,
+        tool_resources: Optional[dict[str, str]] = None,
+        tool_limits: Optional[dict[str, int]] = None,
+        name: Optional[str] = None,
+        log_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_concurrent: 이 에이전트에서 동시에 실행할 도구 호출 수
+            tool_resources: 도구 이름 → 쓰는 자원 이름 (예: {"get_page_structure": "browser"})
+            tool_limits: 도구 이름 → 그 도구의 동시 실행 수 (예: {"browse_web": 1})
+            name: 로그에 남길 에이전트 이름
+            log_path: 도구 시간 로그 파일 (기본: code_artifacts/tool_timing_log.jsonl)
+        """
+        super().__init__()
+        self.label = name or "Agent"
+        self.agent_slots = SlotPool(self.label, max_concurrent)
+        self.tool_resources = dict(tool_resources or {})
+        self.tool_slots = {tool: SlotPool(tool, limit) for tool, limit in (tool_limits or {}).items()}
+        self.log_path = log_path or os.path.join(ARTIFACT_DIR, TOOL_TIMING_FILENAME)
+        self.stats = {"batches": 0, "calls": 0, "tool_seconds": 0.0, "wall_seconds": 0.0, "wait_seconds": 0.0}
+        self._batches: dict[Optional[str], _Batch] = {}
+        self._lock = threading.Lock()
+
+    def _pools(self, tool_name: str) -> list[SlotPool]:
+        """잡는 순서: 자원 → 도구 → 에이전트"""
+        pools = []
+        if tool_name in self.tool_resources:
+            pools.append(resource_pool(self.tool_resources[tool_name]))
+        if tool_name in self.tool_slots:
+            pools.append(self.tool_slots[tool_name])
+        pools.append(self.agent_slots)
+        return pools
+
+    # ---------- 시간 기록 ----------
+    def _enter(self, thread_id: Optional[str]):
+        with self._lock:
+            batch = self._batches.get(thread_id)
+            if batch is None:
+                batch = self._batches[thread_id] = _Batch()
+            batch.in_flight += 1
+
+    def _exit(self, thread_id: Optional[str], call: dict):
+        with self._lock:
+            batch = self._batches[thread_id]
+            batch.calls.append(call)
+            batch.in_flight -= 1
+            if batch.in_flight:
+                return
+            del self._batches[thread_id]
+            wall = time.perf_counter() - batch.started
+            self._finish(thread_id, batch, wall)
+
+    def _finish(self, thread_id: Optional[str], batch: _Batch, wall: float):
+        tool_seconds = sum(c["seconds"] for c in batch.calls)
+        wait_seconds = sum(c["wait"] for c in batch.calls)
+        overlap = tool_seconds / wall if wall > 0 else 1.0
+        self.stats["batches"] += 1
+        self.stats["calls"] += len(batch.calls)
+        self.stats["tool_seconds"] += tool_seconds
+        self.stats["wall_seconds"] += wall
+        self.stats["wait_seconds"] += wait_seconds
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "agent": self.label,
+            "thread_id": thread_id,
+            "calls": batch.calls,
+            "tool_seconds": round(tool_seconds, 3),
+            "wall_seconds": round(wall, 3),
+            "overlap": round(overlap, 2),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+        if len(batch.calls) > 1:
+            names = ", ".join(c["tool"] for c in batch.calls)
+            print(
+                f"🔀 [{self.label}] 도구 {len(batch.calls)}개 ({names}): 합계 {tool_seconds:.1f}초 / 실제 {wall:.1f}초 "
+                f"(겹침 {overlap:.1f}배, 자리 대기 {wait_seconds:.1f}초)"
+            )
+
+    def summary(self) -> str:
+        s = self.stats
+        overlap = s["tool_seconds"] / s["wall_seconds"] if s["wall_seconds"] else 1.0
+        return (
+            f"🔀 [{self.label}] 도구 호출 {s['calls']}회 ({s['batches']}묶음): "
+            f"도구 시간 합계 {s['tool_seconds']:.1f}초 / 실제 {s['wall_seconds']:.1f}초 (평균 겹침 {overlap:.1f}배), "
+            f"자리 대기 {s['wait_seconds']:.1f}초"
+        )
+
+    # ---------- 도구 호출 ----------
+    def wrap_tool_call(self, request, handler):
+        name = request.tool_call["name"]
+        thread_id = current_thread_id()
+        self._enter(thread_id)
+        queued = time.perf_counter()
+        started = None
+        try:
+            with _hold_all(self._pools(name)):
+                started = time.perf_counter()
+                return handler(request)
+        finally:
+            self._exit(thread_id, _call_timing(name, queued, started))
+
+    async def awrap_tool_call(self, request, handler):
+        name = request.tool_call["name"]
+        thread_id = current_thread_id()
+        self._enter(thread_id)
+        queued = time.perf_counter()
+        started = None
+        try:
+            async with _ahold_all(self._pools(name)):
+                started = time.perf_counter()
+                return await handler(request)
+        finally:
+            self._exit(thread_id, _call_timing(name, queued, started))
+
+
+def _call_timing(tool_name: str, queued: float, started: Optional[float]) -> dict:
+    now = time.perf_counter()
+    started = started or now
+    return {"tool": tool_name, "wait": round(started - queued, 3), "seconds": round(now - started, 3)}
+
+
+@contextmanager
+def _hold_all(pools: list[SlotPool]):
+    if not pools:
+        yield
+        return
+    with pools[0].hold(), _hold_all(pools[1:]):
+        yield
+
+
+@asynccontextmanager
+async def _ahold_all(pools: list[SlotPool]):
+    if not pools:
+        yield
+        return
+    async with pools[0].ahold(), _ahold_all(pools[1:]):
+        yield
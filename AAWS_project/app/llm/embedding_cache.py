@@ -0,0 +1,279 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables.config import run_in_executor
+
+from app.crawler.registry import ARTIFACT_DIR
+
+# ==========================================
+# 🧮 Embedding Cache (메모리 LRU + 디스크)
+# ==========================================
+# Retriever는 질문이 같아도 매번 text-embedding-3-large로 질의를 다시 임베딩합니다.
+# (RAGAS 평가에서 같은 질문 세트를 반복하거나, 채팅에서 비슷한 질문을 다시 할 때)
+#
+# (모델 + 정규화한 텍스트)의 해시를 키로 벡터를 두 단계에 저장합니다.
+#   1) 메모리 LRU: 같은 프로세스에서 반복되는 질의는 디스크도 건드리지 않음
+#   2) 디스크(SQLite): 서버 재시작/평가 재실행에도 재사용. 크기 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지움
+# 정규화는 유니코드(NFKC) + 앞뒤 공백 제거 + 연속 공백 하나로. (대소문자는 임베딩 결과가 달라질 수 있어 그대로 둠)
+# 벡터는 float32로 저장합니다. (API가 돌려주는 값과의 차이는 1e-7 수준이라 검색 순위에 영향 없음)
+#
+# 사용 예)
+#     embeddings = get_embeddings("openai:text-embedding-3-large", cache_site="retrieval")
+#     print(get_embedding_store().summary())
+#
+# 환경 변수
+#   AAWS_EMBED_CACHE=0               캐시 끄기
+#   AAWS_EMBED_CACHE_MEMORY=2048     메모리 LRU 항목 수
+#   AAWS_EMBED_CACHE_MAX_MB=300      디스크 저장 크기 한도
+
+EMBED_CACHE_FILENAME = "embedding_cache.db"
+CACHE_ENABLED = os.getenv("AAWS_EMBED_CACHE", "1").lower() not in ("0", "false", "off")
+DEFAULT_MEMORY_ITEMS = int(os.getenv("AAWS_EMBED_CACHE_MEMORY", "2048"))
+DEFAULT_MAX_MB = int(os.getenv("AAWS_EMBED_CACHE_MAX_MB", "300"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    vector BLOB,
+    size INTEGER,
+    created_at REAL,
+    last_used REAL
+);
+CREATE INDEX IF NOT EXISTS idx_vectors_last_used ON vectors (last_used);
+CREATE TABLE IF NOT EXISTS site_stats (
+    site TEXT PRIMARY KEY,
+    memory_hits INTEGER DEFAULT 0,
+    disk_hits INTEGER DEFAULT 0,
+    misses INTEGER DEFAULT 0
+);
+"""
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """임베딩 벡터 디스크 저장소 (크기 한도 + LRU 정리 + 호출 위치별 적중 통계)"""
+
+    def __init__(self, db_path: Optional[str] = None, max_mb: int = DEFAULT_MAX_MB):
+        self.db_path = db_path or os.path.join(ARTIFACT_DIR, EMBED_CACHE_FILENAME)
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        if not keys:
+            return {}
+        found = {}
+        with self._lock, self._conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            if found:
+                now = time.time()
+                self._conn.executemany("UPDATE vectors SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+        return found
+
+    def put_many(self, model: str, items: dict[str, list[float]]):
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vector in items.items():
+            blob = array("f", vector).tobytes()
+            rows.append((key, model, blob, len(blob), now, now))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (key, model, vector, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+
+    def _evict(self):
+        (size,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM vectors").fetchone()
+        if not self.max_bytes or size <= self.max_bytes:
+            return
+        for key, entry_size in self._conn.execute("SELECT key, size FROM vectors ORDER BY last_used").fetchall():
+            if size <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM vectors WHERE key = ?", (key,))
+            size -= entry_size
+
+    def record(self, site: str, memory_hits: int = 0, disk_hits: int = 0, misses: int = 0):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO site_stats (site) VALUES (?)", (site,))
+            self._conn.execute(
+                "UPDATE site_stats SET memory_hits = memory_hits + ?, disk_hits = disk_hits + ?, misses = misses + ? WHERE site = ?",
+                (memory_hits, disk_hits, misses, site),
+            )
+
+    def clear(self, model: Optional[str] = None):
+        with self._lock, self._conn:
+            if model is None:
+                self._conn.execute("DELETE FROM vectors")
+            else:
+                self._conn.execute("DELETE FROM vectors WHERE model = ?", (model,))
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT site, memory_hits, disk_hits, misses FROM site_stats ORDER BY site").fetchall()
+        stats = {}
+        for site, memory_hits, disk_hits, misses in rows:
+            total = memory_hits + disk_hits + misses
+            stats[site] = {
+                "memory_hits": memory_hits,
+                "disk_hits": disk_hits,
+                "misses": misses,
+                "hit_rate": round((memory_hits + disk_hits) / total, 3) if total else 0.0,
+            }
+        return stats
+
+    def summary(self) -> str:
+        stats = self.stats()
+        if not stats:
+            return "🧮 [Embedding Cache] 기록된 호출이 없습니다."
+        lines = ["🧮 [Embedding Cache] 호출 위치별 적중률"]
+        for site, s in stats.items():
+            lines.append(
+                f"   - {site}: {s['hit_rate']:.0%} (메모리 {s['memory_hits']} / 디스크 {s['disk_hits']} / 새로 임베딩 {s['misses']})"
+            )
+        return "\n".join(lines)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 클라이언트를 감싸 같은 텍스트는 메모리 → 디스크 순으로 찾고, 없는 것만 한 번에 임베딩합니다."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        site: str = "default",
+        store: Optional[EmbeddingStore] = None,
+        memory_items: int = DEFAULT_MEMORY_ITEMS,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.site = site
+        self.store = store or get_embedding_store()
+        self.memory_items = memory_items
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, keys: list[str]) -> tuple[dict[str, list[float]], int, int]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+        memory_hits = len(found)
+        on_disk = self.store.get_many([key for key in dict.fromkeys(keys) if key not in found])
+        self._remember(on_disk)
+        found.update(on_disk)
+        return found, memory_hits, len(on_disk)
+
+    def _remember(self, items: dict[str, list[float]]):
+        with self._lock:
+            for key, vector in items.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _finish(self, keys: list[str], found: dict, new: dict, memory_hits: int, disk_hits: int):
+        self.store.put_many(self.model, new)
+        self._remember(new)
+        self.store.record(self.site, memory_hits=memory_hits, disk_hits=disk_hits, misses=len(new))
+        found.update(new)
+        return [found[key] for key in keys]
+
+    def _missing(self, texts: list[str], keys: list[str], found: dict) -> tuple[list[str], list[str]]:
+        # 같은 텍스트가 여러 번 있어도 한 번만 임베딩
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        return list(missing), list(missing.values())
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [embedding_key(self.model, text) for text in texts]
+        found, memory_hits, disk_hits = self._lookup(keys)
+        missing_keys, missing_texts = self._missing(texts, keys, found)
+        new = dict(zip(missing_keys, self.embeddings.embed_documents(missing_texts))) if missing_texts else {}
+        return self._finish(keys, found, new, memory_hits, disk_hits)
+
+    def embed_query(self, text: str) -> list[float]:
+        key = embedding_key(self.model, text)
+        found, memory_hits, disk_hits = self._lookup([key])
+        new = {} if found else {key: self.embeddings.embed_query(text)}
+        return self._finish([key], found, new, memory_hits, disk_hits)[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [embedding_key(self.model, text) for text in texts]
+        found, memory_hits, disk_hits = await run_in_executor(None, self._lookup, keys)
+        missing_keys, missing_texts = self._missing(texts, keys, found)
+        new = dict(zip(missing_keys, await self.embeddings.aembed_documents(missing_texts))) if missing_texts else {}
+        return await run_in_executor(None, self._finish, keys, found, new, memory_hits, disk_hits)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = embedding_key(self.model, text)
+        found, memory_hits, disk_hits = await run_in_executor(None, self._lookup, [key])
+        new = {} if found else {key: await self.embeddings.aembed_query(text)}
+        return (await run_in_executor(None, self._finish, [key], found, new, memory_hits, disk_hits))[0]
+
+
+_store: Optional[EmbeddingStore] = None
+_cached: dict[tuple, CachedEmbeddings] = {}
+_cache_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    global _store
+    with _cache_lock:
+        if _store is None:
+            _store = EmbeddingStore()
+        return _store
+
+
+def cached_embeddings(embeddings: Embeddings, model: str, site: str) -> Embeddings:
+    """호출 위치별 캐시 래퍼 (AAWS_EMBED_CACHE=0이면 원래 클라이언트 그대로)"""
+    if not CACHE_ENABLED:
+        return embeddings
+    store = get_embedding_store()
+    key = (model, site)
+    with _cache_lock:
+        # close_all() 뒤에 새로 만든 클라이언트면 래퍼도 새로 (메모리 LRU는 버려지고 디스크는 그대로 재사용)
+        if key not in _cached or _cached[key].embeddings is not embeddings:
+            _cached[key] = CachedEmbeddings(embeddings, model, site=site, store=store)
+        return _cached[key]
+
+
+if __name__ == "__main__":
+    print(get_embedding_store().summary())
@@ -0,0 +1,351 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import warnings
+import threading
+from typing import Any, Optional
+
+from langchain_core._api.beta_decorator import LangChainBetaWarning
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatResult
+
+from app.crawler.registry import ARTIFACT_DIR
+
+# ==========================================
+# 🎞️ LLM Record / Replay Fixtures
+# ==========================================
+# Gemini/OpenAI 키 없이도 Navigator→Coder 파이프라인, RAGAS 평가, 서버를 돌려 보고 성능을 잴 수 있도록
+# 채팅 모델과 임베딩 호출을 로컬 파일(fixtures.db)에 기록했다가 그대로 재생합니다.
+#   - record : 실제 API를 호출하고 요청/응답을 기록 (기존 기록은 지움)
+#   - replay : 기록된 응답만 돌려줌 (네트워크 호출 없음, 기록에 없는 호출은 FixtureMissingError)
+#   - live   : 아무것도 하지 않음
+#
+# 채팅 모델은 BaseChatModel 단에서 가로채므로 init_chat_model, ChatOpenAI(상속 클래스 포함), get_chat_model 모두 적용되고,
+# 임베딩은 OpenAIEmbeddings(및 설치되어 있으면 GoogleGenerativeAIEmbeddings)의 embed_* 메서드를 가로챕니다.
+#
+# 채팅 호출의 키는 (모델/파라미터/도구 바인딩, 메시지 종류/내용/도구 호출)입니다. 메시지 ID처럼 실행마다 바뀌는 값은 뺍니다.
+# 재생 시 정확히 같은 키가 없으면(도구 출력의 경과 시간처럼 조금 달라진 프롬프트) 같은 모델 설정으로 기록된 호출을
+# 기록 순서대로 돌려줍니다. 같은 시나리오를 다시 돌리는 벤치마크에서는 이 순서가 실제 호출 순서와 같습니다.
+#
+# 사용 예)
+#     AAWS_LLM_MODE=record AAWS_LLM_FIXTURES=code_artifacts/llm_fixtures/coder python -m app.llm.bench
+#     AAWS_LLM_MODE=replay AAWS_LLM_FIXTURES=code_artifacts/llm_fixtures/coder uvicorn app.server:app
+#     또는 코드에서: install("replay", fixtures_dir) ... uninstall()
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+
+MODE_ENV = "AAWS_LLM_MODE"
+FIXTURES_ENV = "AAWS_LLM_FIXTURES"
+
+FIXTURES_ROOT = os.path.join(ARTIFACT_DIR, "llm_fixtures")
+FIXTURES_FILENAME = "fixtures.db"
+
+# 재생 모드에서 모델 클래스가 생성 시점에 API 키를 요구하지 않도록 채워 둘 환경 변수
+_API_KEY_ENVS = ("OPENAI_API_KEY", "GOOGLE_API_KEY", "ANTHROPIC_API_KEY")
+
+# 가로챌 임베딩 클래스 (설치된 것만)
+_EMBEDDING_CLASSES = (
+    ("langchain_openai", "OpenAIEmbeddings"),
+    ("langchain_google_genai", "GoogleGenerativeAIEmbeddings"),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT,
+    llm_key TEXT,
+    generations TEXT,
+    llm_output TEXT,
+    recorded_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_key ON chat (key);
+CREATE INDEX IF NOT EXISTS idx_chat_llm_key ON chat (llm_key, seq);
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    vector TEXT,
+    recorded_at REAL
+);
+"""
+
+
+class FixtureMissingError(RuntimeError):
+    """재생 모드에서 기록에 없는 호출"""
+
+
+def fixtures_dir_for(name: str, root: str = FIXTURES_ROOT) -> str:
+    return os.path.join(root, name)
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _message_fingerprint(message: Any) -> dict:
+    """메시지에서 실행마다 바뀌는 값(id, 응답 메타데이터 등)을 뺀 비교용 내용"""
+    return {
+        "type": getattr(message, "type", type(message).__name__),
+        "content": getattr(message, "content", str(message)),
+        "name": getattr(message, "name", None),
+        "tool_calls": [
+            {"name": call.get("name"), "args": call.get("args")} for call in getattr(message, "tool_calls", None) or []
+        ],
+    }
+
+
+class FixtureStore:
+    """기록된 채팅/임베딩 응답 저장소 (SQLite)"""
+
+    def __init__(self, fixtures_dir: str, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"mode는 {RECORD} 또는 {REPLAY}여야 합니다: {mode}")
+        if mode == RECORD:
+            # 새로 기록: 이전 기록 파일만 지웁니다. (폴더 안의 다른 파일은 건드리지 않음)
+            db_path = os.path.join(fixtures_dir, FIXTURES_FILENAME)
+            for path in (db_path, db_path + "-journal", db_path + "-wal", db_path + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+        if mode == REPLAY and not os.path.exists(os.path.join(fixtures_dir, FIXTURES_FILENAME)):
+            raise FileNotFoundError(f"기록된 LLM fixture가 없습니다: {fixtures_dir} (먼저 {MODE_ENV}={RECORD}로 실행하세요)")
+        os.makedirs(fixtures_dir, exist_ok=True)
+        self.fixtures_dir = fixtures_dir
+        self.mode = mode
+        self._conn = sqlite3.connect(os.path.join(fixtures_dir, FIXTURES_FILENAME), timeout=30, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._served: set[int] = set()
+        self.stats = {"recorded": 0, "replayed": 0, "replayed_in_order": 0, "embeddings": 0, "missing": 0}
+
+    # ---------- 채팅 ----------
+    @staticmethod
+    def chat_keys(model: Any, messages: list, stop: Optional[list], kwargs: dict) -> tuple[str, str]:
+        llm_string = model._get_llm_string(stop=stop, **kwargs)
+        prompt = json.dumps([_message_fingerprint(m) for m in messages], ensure_ascii=False, sort_keys=True, default=str)
+        return _sha(f"{llm_string}\x00{prompt}"), _sha(llm_string)
+
+    def lookup_chat(self, key: str, llm_key: str) -> ChatResult:
+        with self._lock:
+            # 같은 키가 여러 번 기록됐으면 아직 안 쓴 것부터, 다 썼으면 마지막 기록을 다시 사용
+            rows = self._conn.execute(
+                "SELECT seq, generations, llm_output FROM chat WHERE key = ? ORDER BY seq", (key,)
+            ).fetchall()
+            row = next((r for r in rows if r[0] not in self._served), rows[-1] if rows else None)
+            exact = row is not None
+            if row is None:
+                row = next(
+                    (
+                        r for r in self._conn.execute(
+                            "SELECT seq, generations, llm_output FROM chat WHERE llm_key = ? ORDER BY seq", (llm_key,)
+                        )
+                        if r[0] not in self._served
+                    ),
+                    None,
+                )
+            if row is None:
+                self.stats["missing"] += 1
+                raise FixtureMissingError(
+                    f"기록에 없는 LLM 호출입니다. ({self.fixtures_dir}) 시나리오가 바뀌었다면 {MODE_ENV}={RECORD}로 다시 기록하세요."
+                )
+            self._served.add(row[0])
+            self.stats["replayed" if exact else "replayed_in_order"] += 1
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            generations = [loads(item) for item in json.loads(row[1])]
+        return ChatResult(generations=generations, llm_output=json.loads(row[2]) if row[2] else None)
+
+    def save_chat(self, key: str, llm_key: str, result: ChatResult):
+        generations = json.dumps([dumps(gen) for gen in result.generations], ensure_ascii=False)
+        llm_output = json.dumps(result.llm_output, ensure_ascii=False, default=str) if result.llm_output else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO chat (key, llm_key, generations, llm_output, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                (key, llm_key, generations, llm_output, time.time()),
+            )
+            self.stats["recorded"] += 1
+
+    # ---------- 임베딩 ----------
+    @staticmethod
+    def embedding_key(model: Any, text: str) -> str:
+        name = getattr(model, "model", None) or getattr(model, "model_name", None) or ""
+        return _sha(f"{type(model).__name__}\x00{name}\x00{text}")
+
+    def lookup_embeddings(self, model: Any, texts: list[str]) -> list[list[float]]:
+        keys = [self.embedding_key(model, t) for t in texts]
+        with self._lock:
+            rows = dict(
+                self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(keys))})", keys
+                ).fetchall()
+            ) if keys else {}
+            missing = [t for t, k in zip(texts, keys) if k not in rows]
+            if missing:
+                self.stats["missing"] += len(missing)
+                raise FixtureMissingError(
+                    f"기록에 없는 임베딩 요청 {len(missing)}건 (예: {missing[0][:40]!r}). {MODE_ENV}={RECORD}로 다시 기록하세요."
+                )
+            self.stats["embeddings"] += len(texts)
+        return [json.loads(rows[k]) for k in keys]
+
+    def save_embeddings(self, model: Any, texts: list[str], vectors: list[list[float]]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, recorded_at) VALUES (?, ?, ?)",
+                [(self.embedding_key(model, t), json.dumps(list(v)), now) for t, v in zip(texts, vectors)],
+            )
+            self.stats["recorded"] += len(texts)
+
+    def summary(self) -> str:
+        s = self.stats
+        if self.mode == RECORD:
+            return f"🎞️ [LLM Fixtures] {s['recorded']}건 기록 → {self.fixtures_dir}"
+        return (
+            f"🎞️ [LLM Fixtures] 재생 {s['replayed']}건 (순서 대체 {s['replayed_in_order']}건), "
+            f"임베딩 {s['embeddings']}건, 누락 {s['missing']}건"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# =========================================================
+# 모델 클래스 가로채기
+# =========================================================
+_active: Optional[FixtureStore] = None
+_originals: list[tuple[type, str, Any]] = []
+
+
+def active_store() -> Optional[FixtureStore]:
+    return _active
+
+
+def _patch(cls: type, name: str, make):
+    original = cls.__dict__.get(name)
+    if original is None:
+        return
+    _originals.append((cls, name, original))
+    setattr(cls, name, make(original))
+
+
+def _patch_chat_models():
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+    def make_sync(original):
+        def _generate_with_cache(self, messages, stop=None, run_manager=None, **kwargs):
+            store = _active
+            if store is None:
+                return original(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            key, llm_key = store.chat_keys(self, messages, stop, kwargs)
+            if store.mode == REPLAY:
+                return store.lookup_chat(key, llm_key)
+            result = original(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            store.save_chat(key, llm_key, result)
+            return result
+
+        return _generate_with_cache
+
+    def make_async(original):
+        async def _agenerate_with_cache(self, messages, stop=None, run_manager=None, **kwargs):
+            store = _active
+            if store is None:
+                return await original(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            key, llm_key = store.chat_keys(self, messages, stop, kwargs)
+            if store.mode == REPLAY:
+                return store.lookup_chat(key, llm_key)
+            result = await original(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+            store.save_chat(key, llm_key, result)
+            return result
+
+        return _agenerate_with_cache
+
+    _patch(BaseChatModel, "_generate_with_cache", make_sync)
+    _patch(BaseChatModel, "_agenerate_with_cache", make_async)
+
+
+def _patch_embeddings():
+    import importlib
+
+    def make_sync(original, single: bool):
+        def embed(self, texts_or_text, *args, **kwargs):
+            store = _active
+            if store is None:
+                return original(self, texts_or_text, *args, **kwargs)
+            texts = [texts_or_text] if single else list(texts_or_text)
+            if store.mode == REPLAY:
+                vectors = store.lookup_embeddings(self, texts)
+            else:
+                result = original(self, texts_or_text, *args, **kwargs)
+                vectors = [result] if single else result
+                store.save_embeddings(self, texts, vectors)
+            return vectors[0] if single else vectors
+
+        return embed
+
+    def make_async(original, single: bool):
+        async def aembed(self, texts_or_text, *args, **kwargs):
+            store = _active
+            if store is None:
+                return await original(self, texts_or_text, *args, **kwargs)
+            texts = [texts_or_text] if single else list(texts_or_text)
+            if store.mode == REPLAY:
+                vectors = store.lookup_embeddings(self, texts)
+            else:
+                result = await original(self, texts_or_text, *args, **kwargs)
+                vectors = [result] if single else result
+                store.save_embeddings(self, texts, vectors)
+            return vectors[0] if single else vectors
+
+        return aembed
+
+    for module_name, class_name in _EMBEDDING_CLASSES:
+        try:
+            cls = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError):
+            continue
+        _patch(cls, "embed_documents", lambda o: make_sync(o, single=False))
+        _patch(cls, "embed_query", lambda o: make_sync(o, single=True))
+        _patch(cls, "aembed_documents", lambda o: make_async(o, single=False))
+        _patch(cls, "aembed_query", lambda o: make_async(o, single=True))
+
+
+def install(mode: str, fixtures_dir: Optional[str] = None) -> Optional[FixtureStore]:
+    """record/replay 모드를 켭니다. live면 아무것도 하지 않고 None."""
+    global _active
+    if mode == LIVE:
+        return None
+    store = FixtureStore(fixtures_dir or fixtures_dir_for("default"), mode)
+    if mode == REPLAY:
+        for env in _API_KEY_ENVS:
+            os.environ.setdefault(env, "replay-fixture")
+    if not _originals:
+        _patch_chat_models()
+        _patch_embeddings()
+    if _active is not None:
+        _active.close()
+    _active = store
+    print(f"🎞️ [LLM Fixtures] {mode} 모드: {store.fixtures_dir}")
+    return store
+
+
+def uninstall():
+    """가로챈 메서드를 원래대로 되돌립니다."""
+    global _active
+    while _originals:
+        cls, name, original = _originals.pop()
+        setattr(cls, name, original)
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def install_from_env() -> Optional[FixtureStore]:
+    """AAWS_LLM_MODE / AAWS_LLM_FIXTURES 환경 변수로 설정된 경우 켭니다. (app.llm import 시 자동 호출)"""
+    mode = os.getenv(MODE_ENV, LIVE).lower()
+    if mode == LIVE or _active is not None:
+        return _active
+    return install(mode, os.getenv(FIXTURES_ENV) or None)
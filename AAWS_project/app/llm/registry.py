@@ -0,0 +1,233 @@
+import atexit
+import inspect
+import threading
+from typing import Any, Callable, Optional
+
+# ==========================================
+# 🔌 Shared Model Client Registry
+# ==========================================
+# 도구/에이전트가 호출될 때마다 init_chat_model / ChatGoogle / ChatOpenAI를 새로 만들면
+# 매번 클라이언트 초기화 비용을 내고 HTTP 연결(TLS 핸드셰이크 포함)도 새로 엽니다.
+#
+# 레지스트리는 (provider, model, 파라미터)가 같은 모델/임베딩 클라이언트를 프로세스 전체에서 하나만 만들어
+# 모든 에이전트와 도구가 같은 인스턴스(= 같은 연결 풀)를 재사용하게 합니다.
+# 체인/에이전트에서 쓰는 bind_tools, with_config 등은 새 Runnable을 돌려주므로 공유해도 안전합니다.
+#
+# 사용 예)
+#     llm = get_chat_model("openai:gpt-4o", temperature=0)
+#     llm = get_chat_model("openai:gpt-4o", temperature=0, cache_site="self_query")   # 응답 디스크 캐시 (app.llm.cache)
+#     embeddings = get_embeddings("openai:text-embedding-3-large")
+#     embeddings = get_embeddings("openai:text-embedding-3-large", cache_site="retrieval")   # 질의 벡터 캐시 (app.llm.embedding_cache)
+#     bu_llm = get_browser_use_llm("gemini-flash-latest")
+#     await aclose_all()   # 서버 종료 시 (연결 풀 정리)
+
+CHAT = "chat"
+EMBEDDINGS = "embeddings"
+BROWSER_USE = "browser_use"
+
+# provider를 생략했을 때 init_chat_model과 같은 규칙으로 추론하기 위한 접두어
+_PROVIDER_PREFIXES = {
+    "gpt-": "openai",
+    "o1": "openai",
+    "o3": "openai",
+    "text-embedding-": "openai",
+    "claude": "anthropic",
+    "gemini": "google_genai",
+}
+
+
+def _split_model(model: str, provider: Optional[str]) -> tuple[str, str]:
+    """'openai:gpt-4o' 또는 (model='gpt-4o', provider='openai')를 (provider, model)로 정규화"""
+    if provider is None and ":" in model:
+        provider, model = model.split(":", 1)
+    if provider is None:
+        provider = next((p for prefix, p in _PROVIDER_PREFIXES.items() if model.startswith(prefix)), "")
+    return provider, model
+
+
+def _freeze(value: Any) -> Any:
+    """dict/list 파라미터도 캐시 키로 쓸 수 있게 해시 가능한 형태로 바꿉니다."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class ModelRegistry:
+    """키가 같은 클라이언트를 한 번만 만들어 재사용하고, 종료 시 연결을 한꺼번에 닫습니다."""
+
+    def __init__(self):
+        self._clients: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
+            # 생성은 드물고 빨라서 잠금 안에서 만들어 같은 키가 두 번 만들어지지 않게 합니다.
+            client = factory()
+            self._clients[key] = client
+            return client
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def summary(self) -> str:
+        kinds = {}
+        for kind, *_ in self._clients:
+            kinds[kind] = kinds.get(kind, 0) + 1
+        detail = ", ".join(f"{k} {v}개" for k, v in sorted(kinds.items())) or "없음"
+        return f"🔌 [Models] 공유 클라이언트 {len(self)}개 ({detail}) / 재사용 {self.hits}회, 생성 {self.misses}회"
+
+    def _drain(self) -> list[Any]:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        _reset_provider_caches()
+        return clients
+
+    def close_all(self):
+        """동기 HTTP 클라이언트를 닫습니다. (비동기 클라이언트는 aclose_all에서 닫음)"""
+        for client in self._drain():
+            for resource in _http_resources(client):
+                close = getattr(resource, "close", None)
+                if close is not None and not inspect.iscoroutinefunction(close):
+                    _quietly(close)
+
+    async def aclose_all(self):
+        """동기/비동기 HTTP 클라이언트를 모두 닫습니다. 서버 종료(shutdown) 시 호출하세요."""
+        for client in self._drain():
+            for resource in _http_resources(client):
+                close = getattr(resource, "aclose", None) or getattr(resource, "close", None)
+                if close is None:
+                    continue
+                try:
+                    result = close()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    pass
+
+
+def _http_resources(client: Any) -> list[Any]:
+    """모델 래퍼가 들고 있는 실제 HTTP 클라이언트들 (OpenAI SDK, httpx 등). 모르는 구조면 빈 목록."""
+    resources = []
+    for name in ("root_client", "root_async_client", "http_client", "http_async_client", "client", "async_client"):
+        resource = getattr(client, name, None)
+        if resource is not None and resource not in resources and (
+            hasattr(resource, "close") or hasattr(resource, "aclose")
+        ):
+            resources.append(resource)
+    return resources
+
+
+def _reset_provider_caches():
+    """langchain_openai는 기본 httpx 클라이언트를 모듈 전역에 캐시하므로, 닫은 뒤 새 모델이 닫힌 연결을 물려받지 않게 비웁니다."""
+    try:
+        from langchain_openai.chat_models import _client_utils
+    except ImportError:
+        return
+    for name in ("_cached_sync_httpx_client", "_cached_async_httpx_client"):
+        cache_clear = getattr(getattr(_client_utils, name, None), "cache_clear", None)
+        if cache_clear is not None:
+            cache_clear()
+
+
+def _quietly(fn: Callable[[], Any]):
+    try:
+        fn()
+    except Exception:
+        pass
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
+
+
+def get_chat_model(model: str, *, model_provider: Optional[str] = None, cache_site: Optional[str] = None, **kwargs):
+    """init_chat_model과 같은 인자로 공유 채팅 모델을 돌려줍니다. (같은 인자면 같은 인스턴스)
+
+    cache_site를 주고 temperature=0이면 응답을 디스크 캐시(app.llm.cache)에 저장/재사용하며, 적중률은 위치별로 집계됩니다.
+    """
+    provider, model = _split_model(model, model_provider)
+    key = (CHAT, provider, model, cache_site, _freeze(kwargs))
+    if cache_site and kwargs.get("temperature") == 0 and "cache" not in kwargs:
+        from app.llm.cache import get_response_cache
+
+        cache = get_response_cache(cache_site)
+        if cache is not None:
+            kwargs = {**kwargs, "cache": cache}
+
+    def factory():
+        from langchain.chat_models import init_chat_model
+
+        return init_chat_model(model, model_provider=provider or None, **kwargs)
+
+    return _registry.get(key, factory)
+
+
+def get_embeddings(model: str, *, provider: Optional[str] = None, cache_site: Optional[str] = None, **kwargs):
+    """init_embeddings와 같은 인자로 공유 임베딩 클라이언트를 돌려줍니다.
+
+    cache_site를 주면 같은 텍스트의 벡터를 메모리/디스크 캐시(app.llm.embedding_cache)에서 재사용하며, 적중률은 위치별로 집계됩니다.
+    """
+    provider, model = _split_model(model, provider)
+    key = (EMBEDDINGS, provider, model, _freeze(kwargs))
+
+    def factory():
+        from langchain.embeddings import init_embeddings
+
+        return init_embeddings(model, provider=provider or None, **kwargs)
+
+    embeddings = _registry.get(key, factory)
+    if cache_site:
+        from app.llm.embedding_cache import cached_embeddings
+
+        return cached_embeddings(embeddings, f"{provider}:{model}" if provider else model, cache_site)
+    return embeddings
+
+
+def get_browser_use_llm(model: str = "gemini-flash-latest", provider: str = "google", **kwargs):
+    """browser_use Agent에 넘길 공유 LLM (ChatGoogle / ChatOpenAI / ChatAnthropic)"""
+    key = (BROWSER_USE, provider, model, _freeze(kwargs))
+
+    def factory():
+        import browser_use
+
+        cls = {
+            "google": browser_use.ChatGoogle,
+            "openai": browser_use.ChatOpenAI,
+            "anthropic": browser_use.ChatAnthropic,
+        }[provider]
+        return cls(model=model, **kwargs)
+
+    return _registry.get(key, factory)
+
+
+def close_all():
+    _registry.close_all()
+
+
+async def aclose_all():
+    await _registry.aclose_all()
+
+
+def _close_at_exit():
+    # 이벤트 루프가 이미 닫힌 뒤라 비동기 클라이언트는 건드리지 않고 동기 연결만 정리합니다.
+    _registry.close_all()
+
+
+atexit.register(_close_at_exit)
@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import threading
+import weakref
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain.agents.structured_output import StructuredOutputError
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.crawler.registry import ARTIFACT_DIR
+from app.sandbox.workspace import current_thread_id
+
+# ==========================================
+# 🧭 Cost / Difficulty-aware Model Routing
+# ==========================================
+# 모든 에이전트가 한 모델(gpt-4o / gemini-flash)에 고정되어 있어 쉬운 단계도 어려운 단계와 같은 비용을 냅니다.
+#
+# create_agent(middleware=[ModelRoutingMiddleware.for_model("openai:gpt-4o")])로 붙이면
+#   - 기본은 싼/빠른 모델(tier 0)로 호출하고
+#   - 다음 경우 더 강한 모델로 올립니다. (에스컬레이션)
+#       · 구조화 출력(response_format) 검증 실패 → 그 자리에서 가장 강한 모델로 다시 호출
+#       · 마지막 사용자 메시지 이후 도구 오류가 error_threshold번 이상 → 이후 호출은 다음 단계 모델
+#       · 자신 없는 결과 (빈 답변, 길이 제한으로 잘림, "잘 모르겠습니다" 류 표현) → 다음 단계 모델로 다시 호출
+#         (retry_low_confidence=True일 때만. 토큰을 스트리밍하는 채팅 에이전트에서 다시 호출하면 싼 모델의 답이
+#          이미 화면에 나간 뒤라 답이 두 번 붙으므로, 서버 에이전트는 기록만 하고 다시 호출하지 않습니다.)
+#       · 싼 모델 호출 자체가 실패 → 다음 단계 모델로 다시 호출
+#   - 호출마다 (단계, 모델, 사유, 지연, 토큰, 추정 비용)을 code_artifacts/model_routing_log.jsonl에 기록합니다.
+#
+# 환경 변수: AAWS_MODEL_ROUTING=0 이면 라우팅 없이 원래 모델만 사용
+
+ROUTING_ENABLED = os.getenv("AAWS_MODEL_ROUTING", "1").lower() not in ("0", "false", "off")
+ROUTING_LOG_FILENAME = "model_routing_log.jsonl"
+
+# 강한 모델 → 같은 계열의 싼/빠른 모델
+CHEAPER_MODEL = {
+    "openai:gpt-4o": "openai:gpt-4o-mini",
+    "openai:gpt-4.1": "openai:gpt-4.1-mini",
+    "google_genai:gemini-flash-latest": "google_genai:gemini-flash-lite-latest",
+    "google_genai:gemini-pro-latest": "google_genai:gemini-flash-latest",
+}
+
+# 100만 토큰당 USD (입력, 출력). 추정 비용 계산용 대략값이며 요금이 바뀌면 여기만 고치면 됩니다.
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gemini-flash-latest": (0.30, 2.50),
+    "gemini-flash-lite-latest": (0.10, 0.40),
+    "gemini-pro-latest": (1.25, 10.00),
+}
+
+# 자신 없는 답변으로 볼 표현 ("알 수 없습니다", "정보가 부족" 같은 표현은 RAG 답변에서 정상적으로 쓰여 넣지 않음)
+LOW_CONFIDENCE_PHRASES = (
+    "잘 모르겠", "확실하지 않", "판단하기 어렵",
+    "i'm not sure", "i am not sure", "not certain", "cannot determine", "unable to determine",
+)
+# 길이 제한으로 잘린 응답의 finish_reason
+TRUNCATED_FINISH_REASONS = {"length", "MAX_TOKENS", "max_tokens"}
+# 도구 오류로 볼 도구 응답 (프로젝트 도구들은 실패를 "[Error]" 문자열로 돌려줌)
+TOOL_ERROR_PREFIXES = ("[Error]", "[System Error]", "Error:", "Error ")
+
+# 서버 종료 시 요약을 남기기 위해 만들어진 미들웨어를 추적
+_instances: "weakref.WeakSet[ModelRoutingMiddleware]" = weakref.WeakSet()
+
+
+def _model_name(spec: str) -> str:
+    return spec.split(":", 1)[-1]
+
+
+def estimate_cost(spec: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    price = MODEL_PRICES.get(_model_name(spec))
+    if price is None:
+        return None
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+
+def _since_last_human(messages: list) -> list:
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            return messages[i + 1:]
+    return messages
+
+
+def _is_tool_error(message: Any) -> bool:
+    if not isinstance(message, ToolMessage):
+        return False
+    if getattr(message, "status", None) == "error":
+        return True
+    return isinstance(message.content, str) and message.content.lstrip().startswith(TOOL_ERROR_PREFIXES)
+
+
+def _structured_output_failed(response: Any, has_response_format: bool) -> bool:
+    """ToolStrategy가 검증 실패를 "Error: ... Please fix your mistakes." 도구 메시지로 돌려준 경우"""
+    if not has_response_format or getattr(response, "structured_response", None) is not None:
+        return False
+    return any(
+        isinstance(m, ToolMessage) and isinstance(m.content, str) and m.content.startswith("Error:")
+        for m in getattr(response, "result", None) or []
+    )
+
+
+def _low_confidence(response: Any) -> bool:
+    messages = getattr(response, "result", None) or []
+    final = next((m for m in reversed(messages) if isinstance(m, AIMessage)), None)
+    if final is None or final.tool_calls:
+        return False
+    metadata = final.response_metadata or {}
+    if metadata.get("finish_reason") in TRUNCATED_FINISH_REASONS:
+        return True
+    text = (final.text or "").strip().lower()
+    return not text or any(phrase in text for phrase in LOW_CONFIDENCE_PHRASES)
+
+
+class ModelRoutingMiddleware(AgentMiddleware):
+    """호출마다 싼 모델부터 쓰고, 어려운 상황에서만 강한 모델로 올립니다."""
+
+    def __init__(
+        self,
+        tiers: Sequence[str],
+        model_kwargs: Optional[dict] = None,
+        error_threshold: int = 2,
+        name: Optional[str] = None,
+        log_path: Optional[str] = None,
+        retry_low_confidence: bool = False,
+    ):
+        """
+        Args:
+            tiers: 싼 것부터 강한 것 순서의 모델 이름 (예: ["openai:gpt-4o-mini", "openai:gpt-4o"])
+            model_kwargs: 모든 단계 모델에 공통으로 줄 인자 (예: temperature)
+            error_threshold: 마지막 사용자 메시지 이후 이만큼 도구 오류가 나면 한 단계 올림
+            name: 로그에 남길 에이전트 이름
+            log_path: 라우팅 로그 파일 (기본: code_artifacts/model_routing_log.jsonl)
+            retry_low_confidence: 자신 없는 답변이면 다음 단계 모델로 다시 호출 (토큰을 스트리밍하지 않는 에이전트에서만 켜세요)
+        """
+        super().__init__()
+        if not tiers:
+            raise ValueError("tiers에는 모델이 하나 이상 있어야 합니다.")
+        self.tiers = list(tiers)
+        self.model_kwargs = model_kwargs or {}
+        self.error_threshold = max(1, error_threshold)
+        self.retry_low_confidence = retry_low_confidence
+        self.label = name or "Agent"
+        self.log_path = log_path or os.path.join(ARTIFACT_DIR, ROUTING_LOG_FILENAME)
+        self.stats = {spec: {"calls": 0, "escalated_to": 0, "seconds": 0.0, "cost": 0.0} for spec in self.tiers}
+        self._lock = threading.Lock()
+        _instances.add(self)
+
+    @classmethod
+    def for_model(cls, model: str, **kwargs) -> "ModelRoutingMiddleware":
+        """원래 쓰던 모델을 가장 강한 단계로, 같은 계열의 싼 모델을 기본 단계로 둡니다."""
+        cheaper = CHEAPER_MODEL.get(model)
+        tiers = [cheaper, model] if cheaper and ROUTING_ENABLED else [model]
+        return cls(tiers, **kwargs)
+
+    @property
+    def top(self) -> int:
+        return len(self.tiers) - 1
+
+    def _model(self, tier: int):
+        from app.llm.registry import get_chat_model
+
+        return get_chat_model(self.tiers[tier], **self.model_kwargs)
+
+    # ---------- 단계 결정 ----------
+    def choose_tier(self, messages: list, has_response_format: bool = False) -> tuple[int, str]:
+        recent = _since_last_human(messages)
+        if has_response_format and any(
+            isinstance(m, ToolMessage) and isinstance(m.content, str) and m.content.startswith("Error:") for m in recent
+        ):
+            return self.top, "structured_output"
+        errors = sum(_is_tool_error(m) for m in recent)
+        if errors >= self.error_threshold:
+            return min(self.top, errors // self.error_threshold), f"tool_errors={errors}"
+        return 0, "default"
+
+    # ---------- 기록 ----------
+    def _record(self, tier: int, reason: str, seconds: float, response: Any, outcome: str):
+        spec = self.tiers[tier]
+        messages = getattr(response, "result", None) or []
+        usage = next((m.usage_metadata for m in messages if isinstance(m, AIMessage) and m.usage_metadata), None) or {}
+        input_tokens, output_tokens = usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+        cost = estimate_cost(spec, input_tokens, output_tokens)
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "agent": self.label,
+            "thread_id": current_thread_id(),
+            "tier": tier,
+            "model": spec,
+            "reason": reason,
+            "outcome": outcome,
+            "latency": round(seconds, 3),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost": cost,
+        }
+        with self._lock:
+            stat = self.stats[spec]
+            stat["calls"] += 1
+            stat["seconds"] += seconds
+            stat["cost"] += cost or 0.0
+            if tier > 0 and reason != "default":
+                stat["escalated_to"] += 1
+            try:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError:
+                pass
+        if tier > 0:
+            print(f"🧭 [{self.label}] {spec}로 올려 호출 ({reason}) - {seconds:.1f}초, {outcome}")
+
+    def summary(self) -> str:
+        lines = [f"🧭 [{self.label}] 모델 단계별 호출"]
+        for tier, spec in enumerate(self.tiers):
+            s = self.stats[spec]
+            mean = s["seconds"] / s["calls"] if s["calls"] else 0.0
+            lines.append(
+                f"   - tier {tier} {spec}: {s['calls']}회 (에스컬레이션 {s['escalated_to']}회), 평균 {mean:.1f}초, 추정 ${s['cost']:.4f}"
+            )
+        return "\n".join(lines)
+
+    # ---------- 모델 호출 ----------
+    def _next_attempt(self, tier: int, response: Any, has_response_format: bool) -> Optional[tuple[int, str]]:
+        """이 응답으로 끝낼지, 더 강한 단계로 다시 호출할지"""
+        if tier >= self.top:
+            return None
+        if _structured_output_failed(response, has_response_format):
+            return self.top, "structured_output"
+        if self.retry_low_confidence and _low_confidence(response):
+            return tier + 1, "low_confidence"
+        return None
+
+    def wrap_model_call(self, request, handler):
+        has_format = request.response_format is not None
+        tier, reason = self.choose_tier(request.messages, has_format)
+        while True:
+            start = time.perf_counter()
+            try:
+                response = handler(request.override(model=self._model(tier)))
+            except Exception as e:
+                self._record(tier, reason, time.perf_counter() - start, None, f"error: {type(e).__name__}")
+                if tier >= self.top:
+                    raise
+                tier, reason = (self.top, "structured_output") if isinstance(e, StructuredOutputError) else (tier + 1, "error")
+                continue
+            retry = self._next_attempt(tier, response, has_format)
+            self._record(tier, reason, time.perf_counter() - start, response, self._outcome(retry, response))
+            if retry is None:
+                return response
+            tier, reason = retry
+
+    @staticmethod
+    def _outcome(retry: Optional[tuple[int, str]], response: Any) -> str:
+        if retry:
+            return "retry"
+        # 다시 호출하지 않는 에이전트도 자신 없는 답변 비율은 로그로 볼 수 있게 남김
+        return "low_confidence" if _low_confidence(response) else "ok"
+
+    async def awrap_model_call(self, request, handler):
+        has_format = request.response_format is not None
+        tier, reason = self.choose_tier(request.messages, has_format)
+        while True:
+            start = time.perf_counter()
+            try:
+                response = await handler(request.override(model=self._model(tier)))
+            except Exception as e:
+                self._record(tier, reason, time.perf_counter() - start, None, f"error: {type(e).__name__}")
+                if tier >= self.top:
+                    raise
+                tier, reason = (self.top, "structured_output") if isinstance(e, StructuredOutputError) else (tier + 1, "error")
+                continue
+            retry = self._next_attempt(tier, response, has_format)
+            self._record(tier, reason, time.perf_counter() - start, response, self._outcome(retry, response))
+            if retry is None:
+                return response
+            tier, reason = retry
+
+
+def routing_summary() -> str:
+    """지금까지 만들어진 모든 라우팅 미들웨어의 단계별 호출 요약"""
+    summaries = [m.summary() for m in list(_instances) if any(s["calls"] for s in m.stats.values())]
+    return "\n".join(summaries) or "🧭 [Routing] 아직 라우팅된 모델 호출이 없습니다."
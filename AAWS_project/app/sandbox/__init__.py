@@ -0,0 +1,29 @@
+from app.sandbox.pool import (
+    SandboxPool,
+    RunResult,
+    run_script,
+    run_cold,
+    warm_up,
+)
+from app.sandbox.output import (
+    ExecutionOutput,
+    log_path_for,
+    tool_progress_dispatcher,
+)
+from app.sandbox.preflight import (
+    PreflightReport,
+    PreflightStats,
+    preflight_check,
+    preflight_file,
+)
+from app.sandbox.limits import ResourceLimits
+from app.sandbox.manager import (
+    BackgroundRun,
+    ExecutionManager,
+    get_manager,
+)
+from app.sandbox.workspace import (
+    WorkspaceManager,
+    WorkspaceQuotaError,
+    current_thread_id,
+)
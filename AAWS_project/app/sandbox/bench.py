@@ -0,0 +1,81 @@
+import os
+import time
+import argparse
+import statistics
+import tempfile
+
+from app.sandbox.pool import SandboxPool, run_cold
+
+# =========================================================
+# ⏱️ 디버깅 1회 반복 지연 비교: 콜드 subprocess.run vs 워밍 zygote
+#   python -m app.sandbox.bench --iterations 20
+# =========================================================
+
+# Coder가 만드는 전형적인 크롤러 스크립트의 import 구성
+BENCH_SCRIPT = """
+import json
+import requests
+import httpx
+from bs4 import BeautifulSoup
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+html = "<ul>" + "".join(f"<li class='item'><a href='/n/{i}'>뉴스 {i}</a></li>" for i in range(200)) + "</ul>"
+items = [a.get_text() for a in BeautifulSoup(html, "html.parser").select("li.item a")]
+print(json.dumps({"items": len(items), "pandas": pd is not None, "playwright": sync_playwright is not None}))
+"""
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean": statistics.mean(samples),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+
+
+def bench(iterations: int = 20) -> dict:
+    workdir = tempfile.mkdtemp(prefix="aaws_sandbox_bench_")
+    with open(os.path.join(workdir, "bench_script.py"), "w", encoding="utf-8") as f:
+        f.write(BENCH_SCRIPT)
+
+    cold = []
+    for _ in range(iterations):
+        result = run_cold("bench_script.py", cwd=workdir)
+        assert result.returncode == 0, result.stderr
+        cold.append(result.elapsed)
+
+    start = time.perf_counter()
+    pool = SandboxPool()
+    pool.wait_ready()
+    startup = time.perf_counter() - start
+    warm = []
+    try:
+        for _ in range(iterations):
+            result = pool.run(os.path.join(workdir, "bench_script.py"), cwd=workdir)
+            assert result.returncode == 0, result.stderr
+            warm.append(result.elapsed)
+    finally:
+        pool.close()
+
+    return {"cold": _summary(cold), "warm": _summary(warm), "startup": startup, "preloaded": pool.preloaded}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="콜드 실행 vs 워밍 zygote 실행 지연 비교")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    r = bench(args.iterations)
+    print(f"🔥 zygote 준비: {r['startup']:.2f}초 (미리 import: {', '.join(r['preloaded'])})")
+    for name in ("cold", "warm"):
+        s = r[name]
+        print(f"   {name:>4}: 평균 {s['mean'] * 1000:.0f}ms / p50 {s['p50'] * 1000:.0f}ms / p95 {s['p95'] * 1000:.0f}ms")
+    print(f"⚡ 반복 1회당 {r['cold']['mean'] / r['warm']['mean']:.1f}배 빠름")
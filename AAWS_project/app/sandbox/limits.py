@@ -0,0 +1,226 @@
+import os
+import signal
+import itertools
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+# ==========================================
+# 🧱 Per-run Resource Limits
+# ==========================================
+# 생성된 크롤러 하나가 공유 서버의 메모리를 다 먹거나, 디스크를 가득 채우지 않도록 실행마다 한도를 둡니다.
+#   - CPU 시간  : RLIMIT_CPU (초과 시 SIGXCPU로 종료)
+#   - 파일 크기 : RLIMIT_FSIZE (초과하는 write는 OSError: File too large)
+#   - 메모리    : cgroup v2를 쓸 수 있으면 memory.max, 아니면 프로세스 트리 전체 RSS를 주기적으로 재서 초과 시 종료
+#                 (Playwright의 Chromium은 자기 프로세스 그룹으로 떨어져 나가므로 그룹이 아니라 부모-자식 관계로 셉니다.)
+#                 (RLIMIT_AS는 가상 주소 공간을 크게 잡는 Chromium을 바로 죽이므로 쓰지 않습니다.)
+# 한도는 스크립트가 띄운 브라우저 등 하위 프로세스에도 그대로 적용됩니다.
+#
+# 환경 변수로 기본값을 바꿀 수 있습니다. (0이면 해당 한도 없음)
+#   AAWS_RUN_CPU_SECONDS=600  AAWS_RUN_MEMORY_MB=2048  AAWS_RUN_FILE_MB=1024
+#   AAWS_CGROUP_PARENT=/sys/fs/cgroup/aaws  (쓰기 권한이 위임된 cgroup v2 디렉토리)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class ResourceLimits:
+    cpu_seconds: int = int(os.getenv("AAWS_RUN_CPU_SECONDS", "600"))
+    memory_mb: int = int(os.getenv("AAWS_RUN_MEMORY_MB", "2048"))
+    file_size_mb: int = int(os.getenv("AAWS_RUN_FILE_MB", "1024"))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> Optional["ResourceLimits"]:
+        return cls(**data) if data else None
+
+    def describe(self) -> str:
+        parts = [
+            f"CPU {self.cpu_seconds}초" if self.cpu_seconds else None,
+            f"메모리 {self.memory_mb}MB" if self.memory_mb else None,
+            f"파일 {self.file_size_mb}MB" if self.file_size_mb else None,
+        ]
+        return ", ".join(p for p in parts if p) or "제한 없음"
+
+
+def apply_rlimits(limits: Optional[ResourceLimits]):
+    """현재 프로세스(와 이후 하위 프로세스)에 CPU/파일 크기 한도를 겁니다. 실행 직전 자식 프로세스에서 호출합니다."""
+    if resource is None or limits is None:
+        return
+    if limits.cpu_seconds:
+        # soft 한도에서 SIGXCPU, 그래도 안 끝나면 1초 뒤 hard 한도에서 SIGKILL
+        _set(resource.RLIMIT_CPU, limits.cpu_seconds, limits.cpu_seconds + 1)
+    if limits.file_size_mb:
+        _set(resource.RLIMIT_FSIZE, limits.file_size_mb * 1024 * 1024)
+
+
+def _set(kind: int, soft: int, hard: Optional[int] = None):
+    current_soft, current_hard = resource.getrlimit(kind)
+    hard = soft if hard is None else hard
+    if current_hard != resource.RLIM_INFINITY:
+        soft, hard = min(soft, current_hard), min(hard, current_hard)
+    try:
+        resource.setrlimit(kind, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def killed_by_limit(returncode: Optional[int]) -> Optional[str]:
+    """종료 코드가 한도 초과 신호이면 그 이름 ("cpu" / "file_size")"""
+    if returncode is None or returncode >= 0:
+        return None
+    sig = -returncode
+    if sig == getattr(signal, "SIGXCPU", None):
+        return "cpu"
+    if sig == getattr(signal, "SIGXFSZ", None):
+        return "file_size"
+    return None
+
+
+# =========================================================
+# 메모리 한도: cgroup v2 → 없으면 RSS 감시
+# =========================================================
+_cgroup_ids = itertools.count(1)
+
+
+class MemoryGuard:
+    """setsid로 만든 세션 하나(와 그 하위 프로세스 전체)의 메모리를 제한합니다.
+
+    사용 예)
+        guard = MemoryGuard(limits, pgid=pid)
+        while running:
+            if guard.exceeded():
+                kill_process_tree(pid)
+        guard.close()
+    """
+
+    def __init__(self, limits: Optional[ResourceLimits], pgid: int, check_interval: float = 0.5):
+        self.limit_bytes = (limits.memory_mb * 1024 * 1024) if limits and limits.memory_mb else 0
+        self.pgid = pgid
+        self.check_interval = check_interval
+        self.peak_bytes = 0
+        self._last_check = 0.0
+        self._cgroup: Optional[str] = None
+        if self.limit_bytes:
+            self._cgroup = _join_cgroup(pgid, self.limit_bytes)
+
+    @property
+    def mode(self) -> str:
+        if not self.limit_bytes:
+            return "off"
+        return "cgroup" if self._cgroup else "rss"
+
+    def exceeded(self, now: float) -> bool:
+        if not self.limit_bytes or now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        if self._cgroup:
+            # 커널이 memory.max에서 직접 OOM 처리하므로 여기서는 OOM 발생 여부만 봅니다.
+            return _cgroup_oom_killed(self._cgroup)
+        rss = process_tree_rss(self.pgid)
+        self.peak_bytes = max(self.peak_bytes, rss)
+        return rss > self.limit_bytes
+
+    def close(self):
+        if self._cgroup:
+            try:
+                os.rmdir(self._cgroup)
+            except OSError:
+                pass
+            self._cgroup = None
+
+
+def _process_table() -> dict[int, tuple[int, int, int]]:
+    """/proc의 모든 프로세스 → (ppid, pgid, RSS 페이지 수). /proc이 없으면 빈 dict."""
+    if not os.path.isdir("/proc"):
+        return {}
+    table = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm에 공백/괄호가 들어갈 수 있어 마지막 ')' 뒤부터 나눕니다.
+        fields = stat[stat.rfind(b")") + 2:].split()
+        if len(fields) > 21:
+            table[int(entry)] = (int(fields[1]), int(fields[2]), int(fields[21]))
+    return table
+
+
+def process_tree_pids(pgid: int, table: Optional[dict] = None) -> set[int]:
+    """프로세스 그룹 pgid에 속하거나 그 프로세스들의 자손인 모든 pid (자기 그룹을 새로 만든 Chromium 포함)"""
+    table = _process_table() if table is None else table
+    children: dict[int, list[int]] = {}
+    for pid, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    found = {pid for pid, (_, group, _) in table.items() if group == pgid}
+    stack = list(found)
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            if child not in found:
+                found.add(child)
+                stack.append(child)
+    return found
+
+
+def process_tree_rss(pgid: int) -> int:
+    """프로세스 트리 전체의 RSS 합(바이트). /proc이 없으면 0."""
+    table = _process_table()
+    page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    return sum(table[pid][2] for pid in process_tree_pids(pgid, table)) * page_size
+
+
+def kill_process_tree(pgid: int):
+    """프로세스 그룹과, 다른 그룹으로 떨어져 나간 자손까지 모두 SIGKILL합니다.
+    그룹을 먼저 죽이면 자손이 init으로 넘어가 부모 관계가 끊기므로, 대상을 먼저 모읍니다.
+    """
+    pids = process_tree_pids(pgid)
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _join_cgroup(pid: int, limit_bytes: int) -> Optional[str]:
+    parent = os.getenv("AAWS_CGROUP_PARENT")
+    if not parent or not os.access(parent, os.W_OK):
+        return None
+    path = os.path.join(parent, f"aaws-run-{os.getpid()}-{next(_cgroup_ids)}")
+    try:
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "memory.max"), "w") as f:
+            f.write(str(limit_bytes))
+        with open(os.path.join(path, "memory.swap.max"), "w") as f:
+            f.write("0")
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(path, "cgroup.procs"), "w") as f:
+            f.write(str(pid))
+        return path
+    except OSError:
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+        return None
+
+
+def _cgroup_oom_killed(path: str) -> bool:
+    try:
+        with open(os.path.join(path, "memory.events")) as f:
+            return any(line.startswith("oom_kill ") and int(line.split()[1]) > 0 for line in f)
+    except OSError:
+        return False
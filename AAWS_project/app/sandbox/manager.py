@@ -0,0 +1,297 @@
+import os
+import time
+import itertools
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Callable, Optional, Sequence
+
+from app.sandbox.limits import ResourceLimits
+from app.sandbox.output import ExecutionOutput, log_path_for
+from app.sandbox.pool import OutputCallback, RunResult, run_script
+
+# ==========================================
+# 🚦 Execution Manager (동시 실행 + 한도 + 백그라운드)
+# ==========================================
+# 기존 Coder 도구는 스크립트를 한 번에 하나씩, 30초 제한으로만 돌릴 수 있었습니다.
+# 실행 관리자는
+#   - 실행마다 CPU/메모리/파일 크기 한도(ResourceLimits)를 걸고
+#   - 서버 전체에서 동시에 도는 스크립트 수를 max_concurrent로 제한하며 (넘으면 대기열에서 기다림)
+#   - 몇 분~몇 시간 걸리는 크롤링은 백그라운드로 실행해 run_id로 상태를 조회/취소할 수 있게 합니다.
+#
+# 사용 예)
+#     manager = get_manager()
+#     result = manager.run("test.py", cwd=ARTIFACT_DIR, timeout=30)          # 포그라운드 (기존처럼 기다림)
+#     run = manager.start("crawler.py", cwd=ARTIFACT_DIR, log_dir=ARTIFACT_DIR, owner=thread_id)  # 백그라운드
+#     print(manager.get(run.run_id, owner=thread_id).describe())
+# 백그라운드 실행은 시작한 대화(owner=thread_id)에서만 조회/취소할 수 있습니다. (run_id는 순번이라 추측 가능)
+
+DEFAULT_MAX_CONCURRENT = int(os.getenv("AAWS_MAX_CONCURRENT_RUNS", "4"))
+# 포그라운드 실행 기본/최대 제한 시간(초)
+DEFAULT_TIMEOUT = int(os.getenv("AAWS_RUN_TIMEOUT", "30"))
+MAX_FOREGROUND_TIMEOUT = int(os.getenv("AAWS_MAX_RUN_TIMEOUT", "600"))
+# 백그라운드 실행 제한 시간(초)
+BACKGROUND_TIMEOUT = int(os.getenv("AAWS_BACKGROUND_TIMEOUT", "21600"))
+# 조회용으로 남겨 두는 끝난 백그라운드 실행 수
+KEEP_FINISHED_RUNS = 50
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+
+
+@dataclass
+class BackgroundRun:
+    run_id: str
+    script: str
+    args: list[str]
+    timeout: float
+    output: ExecutionOutput
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[RunResult] = None
+    error: Optional[str] = None
+    limits: Optional[ResourceLimits] = None
+    cwd: Optional[str] = None
+    owner: Optional[str] = None  # 실행을 시작한 대화의 thread_id
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (FINISHED, FAILED)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def feed(self, stream: str, text: str):
+        with self._lock:
+            self.output.feed(stream, text)
+
+    def describe(self, limits: Optional[ResourceLimits] = None) -> str:
+        """LLM에게 돌려줄 상태 요약 (실행 중이면 최근 출력, 끝났으면 앞/뒷부분 요약)"""
+        head = f"[run_id={self.run_id}] '{self.script}'"
+        if self.status == QUEUED:
+            return f"⏳ {head} 대기 중 (동시 실행 한도로 순서를 기다리는 중)"
+        with self._lock:
+            lines = self.output.stdout.total_lines
+            if not self.done:
+                recent = (self.output.stdout.tail or self.output.stdout.head).splitlines()[-5:]
+                return (
+                    f"🔄 {head} 실행 중 - {self.elapsed:.0f}초 경과, 출력 {lines}줄 (전체 로그: {self.output.log_name})\n"
+                    + ("[최근 출력]\n" + "\n".join(recent) if recent else "")
+                )
+            stdout_text, stderr_text = self.output.render()
+
+        if self.error:
+            return f"❌ {head} 실행 실패: {self.error}"
+        result = self.result
+        problem = kill_message(result, self.timeout, self.limits or limits)
+        if problem:
+            status = f"⛔ {head} {problem}"
+        elif result.returncode:
+            status = f"❌ {head} 종료 코드 {result.returncode}로 끝났습니다."
+        else:
+            status = f"✅ {head} 정상 종료"
+        text = f"{status} ({self.elapsed:.0f}초, 출력 {lines}줄, 전체 로그: {self.output.log_name})\n{stdout_text}"
+        if stderr_text:
+            text += f"\n[Error Output]\n{stderr_text}"
+        return text
+
+
+def kill_message(result: Optional[RunResult], timeout: float, limits: Optional[ResourceLimits] = None) -> Optional[str]:
+    """강제 종료된 실행이면 사유 설명, 아니면 None"""
+    if result is None or not result.killed_reason:
+        return None
+    limits = limits or ResourceLimits()
+    return {
+        "timeout": f"실행 시간({timeout:.0f}초)을 초과해 종료되었습니다.",
+        "memory": f"메모리 한도({limits.memory_mb}MB)를 초과해 종료되었습니다. 결과를 리스트에 쌓지 말고 Sink로 바로 저장하세요.",
+        "cpu": f"CPU 시간 한도({limits.cpu_seconds}초)를 초과해 종료되었습니다.",
+        "file_size": f"파일 크기 한도({limits.file_size_mb}MB)를 초과해 종료되었습니다.",
+        "cancelled": "요청에 따라 취소되었습니다.",
+    }.get(result.killed_reason, f"강제 종료되었습니다. ({result.killed_reason})")
+
+
+class ExecutionManager:
+    """스크립트 실행에 한도를 걸고, 동시 실행 수를 제한하고, 백그라운드 실행을 관리합니다."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, limits: Optional[ResourceLimits] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.limits = limits or ResourceLimits()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._active = 0
+        self._ids = itertools.count(1)
+        self._runs: dict[str, BackgroundRun] = {}
+        self._lock = threading.Lock()
+        # 실행 중인(대기 포함) 스크립트의 작업 디렉토리 → 개수 (작업 공간 GC가 지우지 않도록)
+        self._busy: dict[str, int] = {}
+
+    @property
+    def active_count(self) -> int:
+        return self._active
+
+    def _acquire(self, wait: Optional[float], cancel: Optional[threading.Event]) -> bool:
+        deadline = None if wait is None else time.monotonic() + wait
+        if not self._slots.acquire(blocking=False):
+            print(f"⏳ [Executor] 동시 실행 한도({self.max_concurrent}개)에 도달해 빈 자리를 기다립니다...")
+            while not self._slots.acquire(timeout=0.5):
+                if cancel is not None and cancel.is_set():
+                    return False
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+        with self._lock:
+            self._active += 1
+        return True
+
+    def _release(self):
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    def run(
+        self,
+        script: str,
+        args: Sequence[str] = (),
+        cwd: Optional[str] = None,
+        env: Optional[dict] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        on_output: Optional[OutputCallback] = None,
+        limits: Optional[ResourceLimits] = None,
+        cancel: Optional[threading.Event] = None,
+        queue_timeout: Optional[float] = None,
+    ) -> RunResult:
+        """빈 실행 자리를 기다렸다가 한도를 건 채로 실행합니다. (queue_timeout 안에 자리가 안 나면 RuntimeError)"""
+        with self._using(cwd):
+            if not self._acquire(timeout if queue_timeout is None else queue_timeout, cancel):
+                if cancel is not None and cancel.is_set():
+                    return RunResult(None, "", "", 0.0, killed_reason="cancelled")
+                raise RuntimeError(f"동시 실행 한도({self.max_concurrent}개)가 가득 차 실행하지 못했습니다. 잠시 후 다시 시도하세요.")
+            try:
+                return run_script(
+                    script, args, cwd=cwd, timeout=timeout, env=env, on_output=on_output,
+                    limits=limits or self.limits, cancel=cancel,
+                )
+            finally:
+                self._release()
+
+    @contextmanager
+    def _using(self, cwd: Optional[str]):
+        key = os.path.abspath(cwd or os.getcwd())
+        with self._lock:
+            self._busy[key] = self._busy.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._busy[key] -= 1
+                if not self._busy[key]:
+                    del self._busy[key]
+
+    def busy_dirs(self) -> set[str]:
+        """지금 스크립트가 대기/실행 중인 작업 디렉토리 (절대 경로)"""
+        with self._lock:
+            return set(self._busy)
+
+    # ---------- 백그라운드 ----------
+    def start(
+        self,
+        script: str,
+        args: Sequence[str] = (),
+        cwd: Optional[str] = None,
+        env: Optional[dict] = None,
+        timeout: float = BACKGROUND_TIMEOUT,
+        log_dir: Optional[str] = None,
+        limits: Optional[ResourceLimits] = None,
+        on_finish: Optional[Callable[[BackgroundRun], None]] = None,
+        owner: Optional[str] = None,
+    ) -> BackgroundRun:
+        """스크립트를 백그라운드 스레드에서 실행하고 바로 돌아옵니다. 출력은 run_log_<파일명>_<run_id>.log에 저장됩니다.
+        owner(대화 thread_id)를 주면 get/runs/cancel에 같은 owner를 줄 때만 보입니다.
+        """
+        run_id = str(next(self._ids))
+        stem = os.path.splitext(os.path.basename(script))[0]
+        log_path = log_path_for(log_dir or cwd or os.getcwd(), f"{stem}_{run_id}")
+        run = BackgroundRun(run_id=run_id, script=script, args=list(args), timeout=timeout, output=ExecutionOutput(log_path))
+        limits = limits or self.limits
+        if limits.cpu_seconds:
+            # 오래 도는 크롤링이 기본 CPU 한도에 걸리지 않도록 제한 시간만큼은 CPU를 쓸 수 있게 합니다.
+            limits = replace(limits, cpu_seconds=max(limits.cpu_seconds, int(timeout)))
+        run.limits = limits
+        run.cwd = cwd
+        run.owner = owner
+        with self._lock:
+            self._runs[run_id] = run
+            self._prune()
+
+        def target():
+            with self._using(cwd):
+                run_in_slot()
+
+        def run_in_slot():
+            try:
+                if not self._acquire(None, run.cancel_event):
+                    run.result = RunResult(None, "", "", 0.0, killed_reason="cancelled")
+                    return
+                run.status = RUNNING
+                run.started_at = time.time()
+                try:
+                    run.result = run_script(
+                        script, args, cwd=cwd, timeout=timeout, env=env, on_output=run.feed,
+                        limits=limits, cancel=run.cancel_event,
+                    )
+                finally:
+                    self._release()
+            except Exception as e:
+                run.error = str(e)
+            finally:
+                run.finished_at = time.time()
+                with run._lock:
+                    run.output.close()
+                run.status = FAILED if run.error else FINISHED
+                print(f"🏁 [Executor] 백그라운드 실행 종료: {run.describe(self.limits).splitlines()[0]}")
+                if on_finish is not None:
+                    on_finish(run)
+
+        threading.Thread(target=target, name=f"aaws-run-{run_id}", daemon=True).start()
+        return run
+
+    def get(self, run_id: str, owner: Optional[str] = None) -> Optional[BackgroundRun]:
+        """owner가 시작한 실행만 돌려줍니다. (다른 대화의 실행은 없는 것으로 봄)"""
+        run = self._runs.get(str(run_id))
+        return run if run is not None and run.owner == owner else None
+
+    def runs(self, owner: Optional[str] = None) -> list[BackgroundRun]:
+        with self._lock:
+            return [run for run in self._runs.values() if run.owner == owner]
+
+    def cancel(self, run_id: str, owner: Optional[str] = None) -> bool:
+        run = self.get(run_id, owner)
+        if run is None or run.done:
+            return False
+        run.cancel_event.set()
+        return True
+
+    def _prune(self):
+        finished = [r for r in self._runs.values() if r.done]
+        for run in finished[:-KEEP_FINISHED_RUNS] if len(finished) > KEEP_FINISHED_RUNS else []:
+            self._runs.pop(run.run_id, None)
+
+
+_manager: Optional[ExecutionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> ExecutionManager:
+    """프로세스 전체에서 공유하는 실행 관리자 (동시 실행 한도가 모든 에이전트에 함께 적용됨)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ExecutionManager()
+        return _manager
@@ -0,0 +1,204 @@
+import os
+import re
+import time
+from collections import deque
+from typing import Callable, Optional
+
+# ==========================================
+# 📜 Bounded Execution Output
+# ==========================================
+# 크롤러가 레코드를 수천 줄 print하면, 그 출력이 전부 LLM 컨텍스트로 들어가 토큰을 낭비하고
+# 이후 모든 턴이 느려집니다. 실행 출력은
+#   - 실행 중에 조각(chunk) 단위로 받아서
+#   - 전체는 로그 파일(code_artifacts/run_log_<파일명>.log)에 그대로 저장하고
+#   - LLM에게는 앞부분(head) + 뒷부분(tail)만 토큰 예산 안에서 돌려줍니다.
+# 잘린 부분은 에이전트가 read_code_file로 줄 번호를 지정해 나눠 읽을 수 있습니다.
+
+# 도구 결과 하나에 허용하는 대략적인 토큰 수 (stdout + stderr 합계)
+DEFAULT_OUTPUT_TOKENS = int(os.getenv("AAWS_TOOL_OUTPUT_TOKENS", "1500"))
+
+DEFAULT_READ_HINT = "read_code_file에 start_line/end_line을 지정해 나눠 읽으세요"
+
+# 토큰 → 글자 수 환산 (영문 약 4자, 한글 약 1.5자 / 토큰 → 보수적으로 3자)
+CHARS_PER_TOKEN = 3
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def estimate_tokens(text: str) -> int:
+    """영문은 4자, 그 밖의 문자(한글 등)는 1.5자를 1토큰으로 보는 대략적인 추정치"""
+    non_ascii = len(_NON_ASCII.findall(text))
+    return int((len(text) - non_ascii) / 4 + non_ascii / 1.5)
+
+
+def log_path_for(artifact_dir: str, script_name: str) -> str:
+    stem = os.path.splitext(os.path.basename(script_name))[0]
+    return os.path.join(artifact_dir, f"run_log_{stem}.log")
+
+
+class HeadTailBuffer:
+    """앞부분 head_chars와 마지막 tail_chars만 메모리에 남기는 버퍼 (중간은 버림)"""
+
+    def __init__(self, head_chars: int, tail_chars: int):
+        self.head_chars = head_chars
+        self.tail_chars = tail_chars
+        self.head = ""
+        self._tail: deque[str] = deque()
+        self._tail_size = 0
+        self.total_chars = 0
+        self.total_lines = 0
+
+    def feed(self, text: str):
+        self.total_chars += len(text)
+        self.total_lines += text.count("\n")
+        if len(self.head) < self.head_chars:
+            room = self.head_chars - len(self.head)
+            self.head += text[:room]
+            text = text[room:]
+        if not text:
+            return
+        self._tail.append(text)
+        self._tail_size += len(text)
+        while self._tail and self._tail_size - len(self._tail[0]) >= self.tail_chars:
+            self._tail_size -= len(self._tail.popleft())
+
+    @property
+    def tail(self) -> str:
+        text = "".join(self._tail)
+        return text[-self.tail_chars:] if len(text) > self.tail_chars else text
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_chars > len(self.head) + len(self.tail)
+
+    def render(self, max_chars: int, log_name: Optional[str] = None, read_hint: str = "") -> str:
+        """max_chars 안에서 앞 30% / 뒤 70%를 줄 단위로 잘라 보여줍니다. (에러 traceback은 보통 끝에 있음)"""
+        if not self.truncated and len(self.head) + len(self.tail) <= max_chars:
+            return self.head + self.tail
+
+        head = self.head[: int(max_chars * 0.3)]
+        if "\n" in head:
+            head = head[: head.rfind("\n") + 1]
+        tail = self.tail[-int(max_chars * 0.7):]
+        if "\n" in tail[:-1]:
+            tail = tail[tail.find("\n") + 1:]
+
+        omitted_chars = self.total_chars - len(head) - len(tail)
+        omitted_lines = max(0, self.total_lines - head.count("\n") - tail.count("\n"))
+        where = f" → 전체 로그: '{log_name}'" + (f" ({read_hint})" if read_hint else "") if log_name else ""
+        marker = f"\n... [중간 약 {omitted_lines}줄 / {omitted_chars}자 생략{where}] ...\n"
+        return head + marker + tail
+
+
+class ExecutionOutput:
+    """실행 중 stdout/stderr 조각을 받아 전체 로그 파일 기록 + 크기 제한 요약 + 진행 상황 알림을 처리합니다.
+
+    사용 예)
+        output = ExecutionOutput(log_path_for(ARTIFACT_DIR, "crawler.py"), on_progress=print)
+        result = run_script("crawler.py", cwd=ARTIFACT_DIR, on_output=output.feed)
+        output.close()
+        stdout_text, stderr_text = output.render()
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[str] = None,
+        max_tokens: int = DEFAULT_OUTPUT_TOKENS,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        progress_interval: float = 1.0,
+        read_hint: str = DEFAULT_READ_HINT,
+    ):
+        self.log_path = log_path
+        self.read_hint = read_hint
+        self.max_tokens = max_tokens
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        cap = max_tokens * CHARS_PER_TOKEN
+        self.stdout = HeadTailBuffer(head_chars=cap, tail_chars=cap)
+        self.stderr = HeadTailBuffer(head_chars=cap, tail_chars=cap)
+        self._log = open(log_path, "w", encoding="utf-8") if log_path else None
+        self._line_start = {"stdout": True, "stderr": True}
+        self._started = time.monotonic()
+        self._last_progress = 0.0
+        self._closed = False
+
+    def feed(self, stream: str, text: str):
+        (self.stderr if stream == "stderr" else self.stdout).feed(text)
+        if self._log is not None:
+            if stream == "stderr":
+                # 로그 파일에서 stderr 줄을 구분할 수 있도록 접두어를 붙입니다.
+                lines = text.splitlines(keepends=True)
+                prefixed = []
+                for line in lines:
+                    prefixed.append(("[stderr] " if self._line_start["stderr"] else "") + line)
+                    self._line_start["stderr"] = line.endswith("\n")
+                text = "".join(prefixed)
+            self._log.write(text)
+        self._maybe_progress()
+
+    def _maybe_progress(self, force: bool = False):
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        last_lines = (self.stdout.tail or self.stdout.head).splitlines()[-3:]
+        try:
+            self.on_progress({
+                "elapsed": round(now - self._started, 1),
+                "stdout_lines": self.stdout.total_lines,
+                "stderr_lines": self.stderr.total_lines,
+                "last_lines": last_lines,
+            })
+        except Exception:
+            pass
+
+    @property
+    def truncated(self) -> bool:
+        budget = self.max_tokens * CHARS_PER_TOKEN
+        return self.stdout.total_chars + self.stderr.total_chars > budget
+
+    @property
+    def log_name(self) -> Optional[str]:
+        return os.path.basename(self.log_path) if self.log_path else None
+
+    def render(self) -> tuple[str, str]:
+        """토큰 예산을 stdout/stderr에 나눠 (stdout 요약, stderr 요약)을 돌려줍니다.
+        stderr(에러)가 있으면 최대 예산의 절반까지 우선 배정합니다.
+        """
+        budget = self.max_tokens * CHARS_PER_TOKEN
+        stderr_size = self.stderr.total_chars
+        stderr_budget = min(stderr_size, budget // 2) if self.stdout.total_chars else min(stderr_size, budget)
+        stdout_budget = budget - stderr_budget
+        return (
+            self.stdout.render(stdout_budget, self.log_name, self.read_hint),
+            self.stderr.render(stderr_budget, self.log_name, self.read_hint) if stderr_size else "",
+        )
+
+    def close(self):
+        """마지막 진행 상황을 한 번 보내고 로그 파일을 닫습니다. (여러 번 불러도 한 번만 처리)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._maybe_progress(force=True)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def tool_progress_dispatcher(tool_name: str, script: str) -> Callable[[dict], None]:
+    """도구 실행 중 진행 상황을 LangChain custom event('tool_progress')로 내보내는 콜백을 만듭니다.
+    서버의 astream_events 스트림에서 on_custom_event로 받아 클라이언트에 전달됩니다.
+    """
+
+    def dispatch(progress: dict):
+        from langchain_core.callbacks.manager import dispatch_custom_event
+
+        try:
+            dispatch_custom_event("tool_progress", {"tool": tool_name, "script": script, **progress})
+        except RuntimeError:
+            # 에이전트 실행 밖(직접 호출 등)에서는 부모 run이 없어 보낼 곳이 없습니다.
+            pass
+
+    return dispatch
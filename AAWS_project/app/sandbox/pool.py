@@ -0,0 +1,630 @@
+import os
+import sys
+import json
+import time
+import queue
+import codecs
+import select
+import atexit
+import itertools
+import tempfile
+import threading
+import subprocess
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from app.sandbox.limits import MemoryGuard, ResourceLimits, apply_rlimits, kill_process_tree, killed_by_limit
+
+# ==========================================
+# 🔥 Warm Python Sandbox (fork server)
+# ==========================================
+# Coder 에이전트는 디버깅 한 번마다 `python script.py`를 새로 띄우는데,
+# 그때마다 playwright / bs4 / pandas / requests를 처음부터 import하느라 매번 시간을 버립니다.
+#
+# fork 서버(zygote) 방식으로
+#   1) 자주 쓰는 크롤링 라이브러리를 미리 import해 둔 파이썬 프로세스(zygote)를 하나 띄워 두고
+#   2) 실행 요청이 올 때마다 zygote를 fork한 1회용 작업자에서 스크립트를 돌립니다.
+#      (import가 끝난 메모리를 그대로 물려받으므로 시작 비용이 fork 한 번으로 줄어듦)
+# 각 실행은 새 전역 네임스페이스(runpy.run_path), 지정한 작업 디렉토리, 새 세션(프로세스 그룹)에서 돌고,
+# stdout/stderr는 파일 디스크립터 단위로 임시 파일에 받아서 subprocess.run과 같은 결과를 돌려줍니다.
+# 시간 초과 시에는 프로세스 그룹 전체(스크립트가 띄운 브라우저 포함)를 종료합니다.
+# fork를 쓸 수 없는 환경(Windows)이나 zygote 오류 시에는 기존처럼 subprocess.run으로 실행합니다.
+
+DEFAULT_PRELOAD = [
+    "json",
+    "re",
+    "csv",
+    "asyncio",
+    "requests",
+    "httpx",
+    "bs4",
+    "lxml.html",
+    "pandas",
+    "playwright.sync_api",
+    "playwright.async_api",
+]
+
+# AAWS_SANDBOX_POOL=0 이면 zygote를 쓰지 않고 항상 새 프로세스로 실행
+POOL_ENABLED = os.getenv("AAWS_SANDBOX_POOL", "1") != "0"
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@dataclass
+class RunResult:
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    elapsed: float
+    timed_out: bool = False
+    mode: str = "cold"  # "warm" (zygote fork) / "cold" (subprocess.run)
+    # 강제 종료 사유: "timeout" / "memory" / "cpu" / "file_size" / "cancelled" (정상 종료면 None)
+    killed_reason: Optional[str] = None
+
+
+# 스크립트 실행 직전에 작업자 안에서 호출할 함수들 ("모듈:함수", 쉼표로 구분)
+# 예) 네트워크 기록/재생 훅 "app.crawler.replay:install"
+STARTUP_ENV = "AAWS_SANDBOX_STARTUP"
+
+# on_output(stream, text): stream은 "stdout" 또는 "stderr". 실행 중 출력 조각이 생길 때마다 호출됩니다.
+OutputCallback = Callable[[str, str], None]
+
+# 출력 스트리밍 시 새 출력을 확인하는 간격(초)
+_POLL_INTERVAL = 0.2
+
+
+# ==========================================
+# zygote 프로세스 쪽 코드
+# ==========================================
+def _run_startup_hooks():
+    """STARTUP_ENV에 지정된 훅을 실행합니다. 실패해도 스크립트 실행은 계속합니다."""
+    import importlib
+
+    for spec in filter(None, os.environ.get(STARTUP_ENV, "").split(",")):
+        module_name, _, func_name = spec.strip().partition(":")
+        try:
+            getattr(importlib.import_module(module_name), func_name or "install")()
+        except Exception as e:
+            print(f"⚠️ [Sandbox] 시작 훅 '{spec}' 실행 실패: {e}", file=sys.stderr)
+
+
+def _exec_script(script: str) -> int:
+    """`python script.py`처럼 __main__으로 실행하고 종료 코드를 돌려줍니다."""
+    import runpy
+    import traceback
+
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException as e:
+        # runpy 내부 프레임은 빼고, `python script.py`와 같은 모양의 traceback을 남깁니다.
+        tb = e.__traceback__
+        while tb is not None and os.path.abspath(tb.tb_frame.f_code.co_filename) != script:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        return 1
+    return 0
+
+
+def _cold_main():
+    """시작 훅이 있는 콜드 실행의 진입점: python -c "..._cold_main()" script.py args..."""
+    script = os.path.abspath(sys.argv[1])
+    sys.argv = sys.argv[1:]
+    sys.path[0] = os.path.dirname(script)
+    _run_startup_hooks()
+    code = _exec_script(script)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(code)
+
+
+def _run_job(job: dict):
+    """fork된 작업자 안에서 스크립트 하나를 실행하고 종료 코드로 프로세스를 끝냅니다."""
+    os.setsid()
+    apply_rlimits(ResourceLimits.from_dict(job.get("limits")))
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    # print뿐 아니라 C 확장/하위 프로세스 출력까지 받도록 fd 1, 2 자체를 파일로 바꿉니다.
+    for fd, path in ((1, job["stdout"]), (2, job["stderr"])):
+        out = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.dup2(out, fd)
+        os.close(out)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", encoding="utf-8", errors="replace", closefd=False, buffering=1)
+    sys.stderr = open(2, "w", encoding="utf-8", errors="replace", closefd=False, buffering=1)
+
+    os.chdir(job["cwd"])
+    for key in job.get("unset") or ():
+        os.environ.pop(key, None)
+    os.environ.update(job.get("env") or {})
+    script = os.path.abspath(job["script"])
+    sys.argv = [job.get("argv0") or script, *job["args"]]
+    # `python script.py`처럼 스크립트 폴더를 import 경로 맨 앞에 둡니다.
+    sys.path[:0] = [os.path.dirname(script), *job.get("sys_path", [])]
+
+    code = 1
+    try:
+        _run_startup_hooks()
+        code = _exec_script(script)
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _zygote_main(preload: Sequence[str]):
+    """라이브러리를 미리 import한 뒤, stdin으로 받은 작업마다 fork해서 실행합니다. (단일 스레드)"""
+    # 프로토콜 전용 fd를 따로 두고, 라이브러리가 찍는 출력은 stderr로 보냅니다.
+    proto = os.dup(1)
+    os.dup2(2, 1)
+
+    loaded = []
+    for name in preload:
+        try:
+            __import__(name)
+            loaded.append(name)
+        except Exception:
+            pass
+
+    def send(message: dict):
+        os.write(proto, (json.dumps(message) + "\n").encode("utf-8"))
+
+    # 작업자는 이 환경을 물려받으므로, 부모는 실행마다 이 환경과의 차이만 보냅니다.
+    send({"ready": True, "preloaded": loaded, "environ": dict(os.environ)})
+
+    running: dict[int, str] = {}
+    buffer = b""
+    stdin_open = True
+    while stdin_open or running:
+        readable, _, _ = select.select([0] if stdin_open else [], [], [], 0.02)
+        if readable:
+            chunk = os.read(0, 65536)
+            if not chunk:
+                stdin_open = False
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                job = json.loads(line)
+                pid = os.fork()
+                if pid == 0:
+                    os.close(proto)
+                    _run_job(job)
+                running[pid] = job["id"]
+                send({"id": job["id"], "pid": pid})
+
+        while running:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            job_id = running.pop(pid, None)
+            if job_id is not None:
+                send({"id": job_id, "returncode": os.waitstatus_to_exitcode(status)})
+
+
+# ==========================================
+# 부모(에이전트) 쪽: zygote 관리
+# ==========================================
+class _Job:
+    def __init__(self):
+        self.started = threading.Event()
+        self.finished = threading.Event()
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+
+
+class SandboxPool:
+    """라이브러리를 미리 import한 zygote 하나를 띄워 두고, 실행마다 fork한 1회용 작업자를 씁니다.
+
+    사용 예)
+        pool = SandboxPool()
+        result = pool.run("crawler.py", cwd=ARTIFACT_DIR, timeout=30)
+        print(result.stdout, result.stderr)
+    """
+
+    def __init__(self, preload: Sequence[str] = DEFAULT_PRELOAD, startup_timeout: float = 60):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("이 환경에서는 fork를 사용할 수 없습니다.")
+        self.preload = list(preload)
+        self.startup_timeout = startup_timeout
+        self.preloaded: list[str] = []
+        self.environ: dict[str, str] = {}
+        self._ids = itertools.count(1)
+        self._jobs: dict[str, _Job] = {}
+        self._send_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._tmpdir = tempfile.mkdtemp(prefix="aaws_sandbox_")
+
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [_APP_ROOT, os.environ.get("PYTHONPATH")]))}
+        self._process = subprocess.Popen(
+            [sys.executable, "-c", f"from app.sandbox.pool import _zygote_main; _zygote_main({self.preload!r})"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            cwd=_APP_ROOT,
+        )
+        threading.Thread(target=self._read_loop, daemon=True).start()
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def _read_loop(self):
+        for line in self._process.stdout:
+            message = json.loads(line)
+            if message.get("ready"):
+                self.preloaded = message["preloaded"]
+                self.environ = message.get("environ", {})
+                self._ready.set()
+                continue
+            job = self._jobs.get(message["id"])
+            if job is None:
+                continue
+            if "pid" in message:
+                job.pid = message["pid"]
+                job.started.set()
+            if "returncode" in message:
+                job.returncode = message["returncode"]
+                job.finished.set()
+        # zygote가 죽으면 기다리던 작업을 모두 깨웁니다.
+        for job in list(self._jobs.values()):
+            job.started.set()
+            job.finished.set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(self.startup_timeout if timeout is None else timeout)
+
+    def env_diff(self, env: dict) -> tuple[dict, list[str]]:
+        """워밍업 때 zygote가 가진 환경 → env로 바꾸는 데 필요한 (덮어쓸 값, 지울 키)
+        PYTHONPATH는 zygote가 app 패키지를 찾으려고 붙인 것이라 지우지 않습니다.
+        """
+        overrides = {k: v for k, v in env.items() if self.environ.get(k) != v}
+        unset = [k for k in self.environ if k not in env and k != "PYTHONPATH"]
+        return overrides, unset
+
+    def run(
+        self,
+        script: str,
+        args: Sequence[str] = (),
+        cwd: Optional[str] = None,
+        timeout: float = 30,
+        env: Optional[dict] = None,
+        sys_path: Sequence[str] = (),
+        argv0: Optional[str] = None,
+        on_output: Optional[OutputCallback] = None,
+        limits: Optional[ResourceLimits] = None,
+        cancel: Optional[threading.Event] = None,
+        unset: Sequence[str] = (),
+    ) -> RunResult:
+        """env는 zygote 환경에 덮어쓸 값, unset은 작업자에서 지울 환경 변수입니다. (env_diff 참고)
+        on_output을 주면 출력을 실행 중에 조각 단위로 넘기고, RunResult의 stdout/stderr는 비워서 돌려줍니다.
+        limits는 작업자에 CPU/파일 크기/메모리 한도를 걸고, cancel이 set되면 작업자를 종료합니다.
+        """
+        start = time.perf_counter()
+        if not self.wait_ready() or not self.alive:
+            raise RuntimeError("sandbox zygote가 준비되지 않았습니다.")
+
+        job_id = str(next(self._ids))
+        job = self._jobs[job_id] = _Job()
+        stdout_path = os.path.join(self._tmpdir, f"{job_id}.out")
+        stderr_path = os.path.join(self._tmpdir, f"{job_id}.err")
+        message = {
+            "id": job_id,
+            "script": script,
+            "argv0": argv0,
+            "args": list(args),
+            "cwd": cwd or os.getcwd(),
+            "env": env or {},
+            "unset": list(unset),
+            "sys_path": list(sys_path),
+            "stdout": stdout_path,
+            "stderr": stderr_path,
+            "limits": limits.to_dict() if limits else None,
+        }
+        try:
+            with self._send_lock:
+                self._process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+                self._process.stdin.flush()
+
+            job.started.wait(10)
+            if job.pid is None:
+                raise RuntimeError("sandbox zygote가 작업을 시작하지 못했습니다.")
+            guard = MemoryGuard(limits, job.pid)
+            tails = [_FileTail(stdout_path, "stdout"), _FileTail(stderr_path, "stderr")] if on_output else []
+            # 출력 스트리밍 / 메모리 감시 / 취소 확인이 필요하면 짧은 간격으로 깨어납니다.
+            polling = bool(tails) or guard.mode != "off" or cancel is not None
+            deadline = start + timeout
+            killed_reason = None
+            while True:
+                remaining = max(0.0, deadline - time.perf_counter())
+                if job.finished.wait(min(_POLL_INTERVAL, remaining) if polling else remaining):
+                    break
+                for tail in tails:
+                    tail.pump(on_output)
+                now = time.perf_counter()
+                killed_reason = _stop_reason(now, deadline, guard, cancel)
+                if killed_reason:
+                    break
+            if killed_reason:
+                kill_process_tree(job.pid)
+                job.finished.wait(5)
+            guard.close()
+            for tail in tails:
+                tail.pump(on_output, final=True)
+                tail.close()
+
+            returncode = None if killed_reason else job.returncode
+            return RunResult(
+                returncode=returncode,
+                stdout="" if tails else _read(stdout_path),
+                stderr="" if tails else _read(stderr_path),
+                elapsed=time.perf_counter() - start,
+                timed_out=killed_reason == "timeout",
+                mode="warm",
+                killed_reason=killed_reason or killed_by_limit(returncode),
+            )
+        finally:
+            self._jobs.pop(job_id, None)
+            for path in (stdout_path, stderr_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def close(self):
+        if self.alive:
+            try:
+                self._process.stdin.close()
+                self._process.wait(5)
+            except Exception:
+                self._process.kill()
+
+
+def _stop_reason(now: float, deadline: float, guard: MemoryGuard, cancel: Optional[threading.Event]) -> Optional[str]:
+    if cancel is not None and cancel.is_set():
+        return "cancelled"
+    if guard.exceeded(now):
+        return "memory"
+    if now >= deadline:
+        return "timeout"
+    return None
+
+
+def _read(path: str) -> str:
+    if not os.path.exists(path):
+        return ""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+class _FileTail:
+    """작업자가 쓰고 있는 출력 파일에서 새로 추가된 부분만 읽어 콜백으로 넘깁니다."""
+
+    def __init__(self, path: str, stream: str):
+        self.path = path
+        self.stream = stream
+        self._file = None
+        # 여러 바이트로 된 한글 문자가 조각 경계에서 잘려도 깨지지 않도록 점진적으로 디코딩합니다.
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def pump(self, on_output: OutputCallback, final: bool = False):
+        if self._file is None:
+            if not os.path.exists(self.path):
+                return
+            self._file = open(self.path, "rb")
+        while True:
+            data = self._file.read(65536)
+            text = self._decoder.decode(data, final=final and not data)
+            if text:
+                on_output(self.stream, text)
+            if not data:
+                return
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+# ==========================================
+# 공용 진입점
+# ==========================================
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+_pool_failed = False
+
+
+def get_pool() -> Optional[SandboxPool]:
+    """프로세스 전체에서 공유하는 zygote. 만들 수 없는 환경이면 None. 죽었으면 다시 띄웁니다."""
+    global _pool, _pool_failed
+    if not POOL_ENABLED or _pool_failed:
+        return None
+    with _pool_lock:
+        if _pool is not None and not _pool.alive:
+            _pool = None
+        if _pool is None:
+            try:
+                _pool = SandboxPool()
+                atexit.register(_pool.close)
+            except Exception as e:
+                print(f"⚠️ [Sandbox] 워밍 풀을 만들 수 없어 일반 실행으로 대체합니다: {e}")
+                _pool_failed = True
+        return _pool
+
+
+def warm_up():
+    """에이전트 생성 시점에 zygote를 미리 띄워, 첫 실행에서 import를 기다리지 않게 합니다. (백그라운드 진행)"""
+    get_pool()
+
+
+def run_cold(
+    script: str,
+    args: Sequence[str] = (),
+    cwd: Optional[str] = None,
+    timeout: float = 30,
+    env: Optional[dict] = None,
+    on_output: Optional[OutputCallback] = None,
+    limits: Optional[ResourceLimits] = None,
+    cancel: Optional[threading.Event] = None,
+) -> RunResult:
+    """기존 방식: 매번 새 파이썬 인터프리터를 띄워 실행합니다."""
+    if on_output is not None or limits is not None or cancel is not None:
+        return _run_cold_streaming(script, args, cwd, timeout, env, on_output, limits, cancel)
+    start = time.perf_counter()
+    command, env = _cold_command(script, args, env)
+    try:
+        result = subprocess.run(
+            command,
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=timeout,
+        )
+        return RunResult(result.returncode, result.stdout, result.stderr, time.perf_counter() - start)
+    except subprocess.TimeoutExpired as e:
+        return RunResult(None, _decoded(e.stdout), _decoded(e.stderr), time.perf_counter() - start, timed_out=True)
+
+
+def _cold_command(script: str, args: Sequence[str], env: Optional[dict]) -> tuple[list[str], Optional[dict]]:
+    """시작 훅이 있으면 훅을 먼저 실행하는 진입점으로 감쌉니다. (app 패키지를 찾도록 PYTHONPATH 보강)"""
+    base = env if env is not None else os.environ
+    if not base.get(STARTUP_ENV):
+        return [sys.executable, script, *args], env
+    paths = [p for p in base.get("PYTHONPATH", "").split(os.pathsep) if p]
+    env = {**base, "PYTHONPATH": os.pathsep.join(paths if _APP_ROOT in paths else [_APP_ROOT, *paths])}
+    return [sys.executable, "-c", "from app.sandbox.pool import _cold_main; _cold_main()", script, *args], env
+
+
+def _run_cold_streaming(script, args, cwd, timeout, env, on_output, limits=None, cancel=None) -> RunResult:
+    """새 프로세스 출력을 파이프로 읽어 실행 중에 on_output으로 넘깁니다. (콜백은 호출한 스레드에서 실행)
+    on_output이 없으면 출력을 모아 RunResult의 stdout/stderr로 돌려줍니다.
+    """
+    start = time.perf_counter()
+    collected = {"stdout": [], "stderr": []}
+    if on_output is None:
+        on_output = lambda stream, text: collected[stream].append(text)  # noqa: E731
+    command, env = _cold_command(script, args, env)
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=hasattr(os, "setsid"),
+        preexec_fn=(lambda: apply_rlimits(limits)) if limits and hasattr(os, "setsid") else None,
+    )
+    guard = MemoryGuard(limits, process.pid)
+    chunks: queue.Queue = queue.Queue()
+
+    def reader(pipe, stream):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for data in iter(lambda: pipe.read1(65536), b""):
+            chunks.put((stream, decoder.decode(data)))
+        chunks.put((stream, decoder.decode(b"", final=True)))
+        chunks.put((stream, None))
+
+    for pipe, stream in ((process.stdout, "stdout"), (process.stderr, "stderr")):
+        threading.Thread(target=reader, args=(pipe, stream), daemon=True).start()
+
+    open_streams = 2
+    killed_reason = None
+    deadline = start + timeout
+    while open_streams:
+        now = time.perf_counter()
+        killed_reason = _stop_reason(now, deadline, guard, cancel)
+        if killed_reason:
+            _kill_tree(process)
+            break
+        remaining = deadline - now
+        try:
+            stream, text = chunks.get(timeout=min(_POLL_INTERVAL, remaining))
+        except queue.Empty:
+            continue
+        if text is None:
+            open_streams -= 1
+        elif text:
+            on_output(stream, text)
+
+    try:
+        process.wait(max(0.1, deadline - time.perf_counter()))
+    except subprocess.TimeoutExpired:
+        killed_reason = killed_reason or "timeout"
+        _kill_tree(process)
+        process.wait()
+    guard.close()
+    returncode = None if killed_reason else process.returncode
+    return RunResult(
+        returncode,
+        "".join(collected["stdout"]),
+        "".join(collected["stderr"]),
+        time.perf_counter() - start,
+        timed_out=killed_reason == "timeout",
+        killed_reason=killed_reason or killed_by_limit(returncode),
+    )
+
+
+def _kill_tree(process: subprocess.Popen):
+    if hasattr(os, "killpg"):
+        kill_process_tree(process.pid)
+        return
+    try:
+        process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _decoded(data) -> str:
+    if data is None:
+        return ""
+    return data.decode("utf-8", errors="replace") if isinstance(data, bytes) else data
+
+
+def run_script(
+    script: str,
+    args: Sequence[str] = (),
+    cwd: Optional[str] = None,
+    timeout: float = 30,
+    env: Optional[dict] = None,
+    on_output: Optional[OutputCallback] = None,
+    limits: Optional[ResourceLimits] = None,
+    cancel: Optional[threading.Event] = None,
+) -> RunResult:
+    """워밍된 zygote에서 스크립트를 실행하고, 쓸 수 없으면 subprocess.run으로 실행합니다.
+
+    Args:
+        script: 실행할 파이썬 파일 (cwd 기준 상대 경로 가능)
+        args: 커맨드라인 인자
+        cwd: 작업 디렉토리
+        timeout: 최대 실행 시간(초)
+        env: 스크립트의 환경 변수 전체 (None이면 현재 환경). 워밍 실행 시에는 zygote가 워밍업 때 가진 환경과의
+             차이(바뀐 값, 없어진 키)만 보내고, PYTHONPATH는 import 경로에 추가합니다.
+        on_output: 주면 출력을 실행 중에 (stream, text) 조각으로 넘기고, 결과의 stdout/stderr는 비워 둡니다.
+        limits: CPU/메모리/파일 크기 한도 (None이면 한도 없음)
+        cancel: set되면 실행 중인 스크립트(프로세스 그룹 전체)를 종료합니다.
+    """
+    pool = get_pool()
+    if pool is not None:
+        script_path = os.path.join(cwd or os.getcwd(), script)
+        try:
+            pool.wait_ready()
+            overrides, unset = pool.env_diff(dict(os.environ) if env is None else env)
+            sys_path = [p for p in overrides.get("PYTHONPATH", "").split(os.pathsep) if p]
+            return pool.run(
+                script_path, args, cwd=cwd, timeout=timeout, env=overrides, sys_path=sys_path, argv0=script,
+                on_output=on_output, limits=limits, cancel=cancel, unset=unset,
+            )
+        except Exception as e:
+            print(f"⚠️ [Sandbox] 워밍 실행 실패, 일반 실행으로 대체합니다: {e}")
+    return run_cold(script, args, cwd=cwd, timeout=timeout, env=env, on_output=on_output, limits=limits, cancel=cancel)
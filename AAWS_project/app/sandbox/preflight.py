@@ -0,0 +1,452 @@
+import os
+import ast
+import json
+import time
+import difflib
+import builtins
+import importlib.util
+import importlib.machinery
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Sequence
+
+# ==========================================
+# 🧪 Pre-flight Check (실행 전 정적 점검)
+# ==========================================
+# Coder의 디버깅 반복 중 상당수는 문법 오류, 오타 난 변수명, 빠뜨린 import 때문에 실패합니다.
+# 이런 오류도 매번 프로세스를 띄워 실행해 봐야 알 수 있었는데, 아래 점검은 코드를 실행하지 않고
+# 같은 프로세스 안에서 수 ms 만에 끝납니다.
+#   1) syntax         : ast.parse + compile (줄/열 번호 포함)
+#   2) undefined-name : 파일 어디에서도 정의(대입/import/def/인자 등)되지 않은 이름 사용
+#   3) import         : 설치되어 있지 않거나 찾을 수 없는 모듈 (try/except ImportError 안은 제외)
+#   4) selector       : BeautifulSoup select()/select_one()의 CSS 선택자 문법 (soupsieve로 검사)
+#                       Playwright/Scrapy 선택자는 자체 확장 문법이 있어 경고로만 알려 줍니다.
+# 이름 검사는 스코프 순서를 따지지 않는 보수적인 방식이라, 실제로는 문제없는 코드를 막는 일은 없습니다.
+# 2), 3)은 실행하면 반드시 거치는 모듈 최상위 코드(if __name__ == "__main__": 블록, with 블록 포함)에 있을 때만
+# error로 막고, 함수 본문 / if TYPE_CHECKING: 같은 조건문 / 반복문 / except 블록 안은 warning으로만 알려 줍니다.
+
+# AAWS_PREFLIGHT=0 이면 점검을 건너뜀
+PREFLIGHT_ENABLED = os.getenv("AAWS_PREFLIGHT", "1") != "0"
+
+PREFLIGHT_STATS_FILENAME = "preflight_stats.json"
+
+SYNTAX = "syntax"
+UNDEFINED_NAME = "undefined-name"
+IMPORT = "import"
+SELECTOR = "selector"
+
+# 모듈 전역에서 항상 쓸 수 있는 이름
+_MODULE_NAMES = {
+    "__file__", "__name__", "__doc__", "__spec__", "__loader__", "__package__",
+    "__builtins__", "__annotations__", "__path__", "__cached__", "__dict__",
+}
+_BUILTIN_NAMES = set(dir(builtins)) | _MODULE_NAMES
+
+# 이 함수들을 쓰는 코드는 이름이 동적으로 만들어질 수 있어 이름 검사를 하지 않음
+_DYNAMIC_SCOPE_CALLS = {"exec", "eval", "globals", "locals", "vars", "__import__"}
+
+# BeautifulSoup (soupsieve) 선택자 → 문법 오류는 실행 시 반드시 예외가 나므로 error
+_BS4_SELECTOR_METHODS = {"select", "select_one", "css_select"}
+# Playwright / Scrapy / parsel 선택자 → 자체 확장 문법(text=, >>, ::text 등)이 있어 warning
+_OTHER_SELECTOR_METHODS = {
+    "query_selector", "query_selector_all", "wait_for_selector", "locator",
+    "eval_on_selector", "eval_on_selector_all", "css",
+}
+_PLAYWRIGHT_ENGINES = ("text=", "xpath=", "id=", "role=", "data-testid=", "internal:", "nth=", "//", "..")
+_PLAYWRIGHT_PSEUDOS = (":has-text(", ":text(", ":text-is(", ":text-matches(", ":visible", ":nth-match(",
+                       ":left-of(", ":right-of(", ":above(", ":below(", ":near(")
+_IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError", "Exception", "BaseException"}
+# try 본문을 "반드시 실패"로 보지 않을 예외 (이름/import 오류를 잡으면 실행은 계속됨)
+_GUARD_ERRORS = _IMPORT_ERRORS | {"NameError"}
+
+
+@dataclass
+class Diagnostic:
+    line: int
+    col: int
+    kind: str
+    message: str
+    severity: str = "error"  # "error" (실행하면 반드시 실패) / "warning" (참고)
+
+    def format(self, source_lines: Sequence[str]) -> str:
+        text = f"  - L{self.line}:{self.col} [{self.kind}] {self.message}"
+        if 1 <= self.line <= len(source_lines):
+            text += f"\n      {self.line} | {source_lines[self.line - 1].rstrip()}"
+        return text
+
+
+@dataclass
+class PreflightReport:
+    filename: str
+    diagnostics: list[Diagnostic] = field(default_factory=list)
+    elapsed: float = 0.0
+    source: str = ""
+
+    @property
+    def errors(self) -> list[Diagnostic]:
+        return [d for d in self.diagnostics if d.severity == "error"]
+
+    @property
+    def warnings(self) -> list[Diagnostic]:
+        return [d for d in self.diagnostics if d.severity == "warning"]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def format(self) -> str:
+        """LLM에게 돌려줄 줄 번호 포함 진단 메시지. 문제가 없으면 빈 문자열."""
+        if not self.diagnostics:
+            return ""
+        lines = self.source.splitlines()
+        header = f"[Preflight] '{self.filename}' 정적 점검 결과: 오류 {len(self.errors)}건, 경고 {len(self.warnings)}건"
+        body = [d.format(lines) for d in sorted(self.diagnostics, key=lambda d: (d.line, d.col))]
+        return "\n".join([header, *body])
+
+
+# =========================================================
+# 1. 진입점
+# =========================================================
+def preflight_check(code: str, filename: str = "<script>", search_paths: Sequence[str] = ()) -> PreflightReport:
+    """코드를 실행하지 않고 문법 / 정의되지 않은 이름 / import / CSS 선택자를 점검합니다.
+
+    Args:
+        code: 점검할 파이썬 소스
+        filename: 진단 메시지에 표시할 파일명
+        search_paths: import 해석 시 추가로 찾아볼 경로 (스크립트 작업 디렉토리, PYTHONPATH 등)
+    """
+    started = time.perf_counter()
+    report = PreflightReport(filename=filename, source=code)
+
+    try:
+        tree = ast.parse(code, filename=filename)
+        compile(tree, filename, "exec")
+    except SyntaxError as e:
+        report.diagnostics.append(Diagnostic(e.lineno or 1, e.offset or 0, SYNTAX, e.msg))
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    certain = _reached_nodes(tree)
+    report.diagnostics += _check_names(tree, certain)
+    report.diagnostics += _check_imports(tree, tuple(search_paths), certain)
+    report.diagnostics += _check_selectors(tree)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def preflight_file(path: str, search_paths: Sequence[str] = ()) -> Optional[PreflightReport]:
+    """.py 파일이면 점검 결과를, 파이썬 파일이 아니거나 점검이 꺼져 있으면 None을 돌려줍니다."""
+    if not PREFLIGHT_ENABLED or not path.endswith(".py") or not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        code = f.read()
+    return preflight_check(code, os.path.basename(path), search_paths)
+
+
+# =========================================================
+# 2. 반드시 실행되는 코드 구분
+# =========================================================
+def _is_main_guard(test: ast.AST) -> bool:
+    """if __name__ == "__main__": (스크립트로 실행하므로 항상 참)"""
+    return (
+        isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "__name__"
+        and len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq)
+        and isinstance(test.comparators[0], ast.Constant) and test.comparators[0].value == "__main__"
+    )
+
+
+def _child_reach(node: ast.AST, certain: bool) -> list[tuple[ast.AST, bool]]:
+    """자식 노드와, 부모가 실행될 때 그 자식도 반드시 실행되는지.
+    같은 노드가 두 번 나올 수 있는데, 한 번이라도 반드시 실행되면 그쪽으로 봅니다.
+    """
+    def mark(children, flag):
+        return [(c, certain and flag) for c in children if c is not None]
+
+    rest = list(ast.iter_child_nodes(node))
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+        # 데코레이터와 기본값은 정의할 때 평가, 본문/주석은 호출될 때만
+        evaluated = getattr(node, "decorator_list", []) + node.args.defaults + node.args.kw_defaults
+        return mark(evaluated, True) + mark(rest, False)
+    if isinstance(node, ast.If):
+        return mark([node.test], True) + mark(node.body, _is_main_guard(node.test)) + mark(node.orelse, False)
+    if isinstance(node, ast.While):
+        return mark([node.test], True) + mark(node.body + node.orelse, False)
+    if isinstance(node, (ast.For, ast.AsyncFor)):
+        return mark([node.iter], True) + mark([node.target] + node.body + node.orelse, False)
+    if isinstance(node, ast.Try) or type(node).__name__ == "TryStar":
+        caught = any(_catches(h, _GUARD_ERRORS) for h in node.handlers)
+        return mark(node.body, not caught) + mark(node.handlers + node.orelse, False) + mark(node.finalbody, True)
+    if isinstance(node, ast.Match):
+        return mark([node.subject], True) + mark(node.cases, False)
+    if isinstance(node, ast.BoolOp):
+        return mark(node.values[:1], True) + mark(node.values[1:], False)
+    if isinstance(node, ast.IfExp):
+        return mark([node.test], True) + mark([node.body, node.orelse], False)
+    if isinstance(node, ast.Assert):
+        return mark([node.test], True) + mark([node.msg], False)
+    if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+        # 첫 번째 iterable만 바로 평가, 나머지는 원소가 있을 때만
+        return mark([node.generators[0].iter], True) + mark(rest, False)
+    return mark(rest, True)
+
+
+def _reached_nodes(tree: ast.AST) -> set[int]:
+    """스크립트를 실행하면 (앞에서 예외가 나지 않는 한) 반드시 평가되는 노드들의 id"""
+    reached: dict[int, bool] = {}
+    stack = [(tree, True)]
+    while stack:
+        node, flag = stack.pop()
+        # 이미 본 노드는 "조건부 → 반드시"로 바뀔 때만 다시 내려감
+        if id(node) in reached and (reached[id(node)] or not flag):
+            continue
+        reached[id(node)] = flag
+        stack.extend(_child_reach(node, flag))
+    return {key for key, flag in reached.items() if flag}
+
+
+def _severity(node: ast.AST, certain: set[int]) -> str:
+    return "error" if id(node) in certain else "warning"
+
+
+# =========================================================
+# 3. 정의되지 않은 이름
+# =========================================================
+def _bound_names(tree: ast.AST) -> set[str]:
+    """파일 안 어디에서든(스코프 무관) 정의되는 이름을 모읍니다."""
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                names.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+        elif type(node).__name__ in ("TypeVar", "ParamSpec", "TypeVarTuple"):
+            names.add(node.name)
+    return names
+
+
+def _check_names(tree: ast.AST, certain: set[int]) -> list[Diagnostic]:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and any(alias.name == "*" for alias in node.names):
+            return []
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _DYNAMIC_SCOPE_CALLS:
+            return []
+
+    known = _bound_names(tree) | _BUILTIN_NAMES
+    # 이름마다 하나만 보고 (반드시 실행되는 위치가 있으면 그곳을 error로, 없으면 첫 위치를 warning으로)
+    first: dict[str, ast.Name] = {}
+    loads = [n for n in ast.walk(tree) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)]
+    for node in sorted(loads, key=lambda n: (n.lineno, n.col_offset)):
+        if node.id in known:
+            continue
+        if node.id not in first or (id(node) in certain and id(first[node.id]) not in certain):
+            first[node.id] = node
+
+    diagnostics = []
+    for node in first.values():
+        message = f"'{node.id}' 이름이 정의되지 않았습니다."
+        if _find_module(node.id, ()):
+            message += f" (`import {node.id}`가 빠졌나요?)"
+        else:
+            close = difflib.get_close_matches(node.id, known, n=1, cutoff=0.8)
+            if close:
+                message += f" (혹시 '{close[0]}'?)"
+        severity = _severity(node, certain)
+        if severity == "warning":
+            message += " (함수 본문/조건문 안이라 실행 경로에 따라 NameError가 날 수 있습니다)"
+        diagnostics.append(Diagnostic(node.lineno, node.col_offset + 1, UNDEFINED_NAME, message, severity))
+    return diagnostics
+
+
+# =========================================================
+# 4. import 해석
+# =========================================================
+# 찾은 모듈만 기억합니다. 못 찾은 결과까지 캐시하면 작업 공간에 helper.py를 만든 뒤에도 계속 막히므로,
+# 못 찾은 이름은 매번 파인더 캐시를 비우고 다시 찾습니다. (실패는 드물고, 실패하면 실행을 막으므로 정확해야 함)
+_FOUND_MODULES: set[tuple[str, tuple[str, ...]]] = set()
+
+
+def _find_module(name: str, search_paths: tuple[str, ...]) -> bool:
+    """최상위 모듈 이름만 찾아봅니다. (find_spec은 최상위 모듈을 import/실행하지 않음)"""
+    if name in _stdlib_names() or (name, search_paths) in _FOUND_MODULES:
+        return True
+    for attempt in range(2):
+        if attempt:
+            importlib.invalidate_caches()
+        if _locate_module(name, search_paths):
+            _FOUND_MODULES.add((name, search_paths))
+            return True
+    return False
+
+
+def _locate_module(name: str, search_paths: tuple[str, ...]) -> bool:
+    if search_paths and importlib.machinery.PathFinder.find_spec(name, list(search_paths)) is not None:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def _stdlib_names() -> frozenset:
+    import sys
+
+    return frozenset(getattr(sys, "stdlib_module_names", ())) | frozenset(sys.builtin_module_names)
+
+
+def _catches(handler: ast.ExceptHandler, errors: set[str]) -> bool:
+    if handler.type is None:
+        return True
+    types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+    return any(isinstance(t, ast.Name) and t.id in errors for t in types)
+
+
+def _check_imports(tree: ast.AST, search_paths: tuple[str, ...], certain: set[int]) -> list[Diagnostic]:
+    diagnostics = []
+
+    def visit(node: ast.AST, guarded: bool):
+        if isinstance(node, ast.Try) or type(node).__name__ == "TryStar":
+            body_guarded = guarded or any(_catches(h, _IMPORT_ERRORS) for h in node.handlers)
+            for child in node.body:
+                visit(child, body_guarded)
+            for child in node.handlers + node.orelse + node.finalbody:
+                visit(child, guarded)
+            return
+        if not guarded:
+            modules = []
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules = [node.module]
+            for module in modules:
+                top = module.split(".")[0]
+                if not _find_module(top, search_paths):
+                    severity = _severity(node, certain)
+                    diagnostics.append(Diagnostic(
+                        node.lineno, node.col_offset + 1, IMPORT,
+                        f"'{top}' 모듈을 찾을 수 없습니다. (설치되지 않았거나 이름이 틀렸습니다)"
+                        + (" 함수 본문/조건문 안이라 실행을 막지는 않습니다." if severity == "warning" else ""),
+                        severity,
+                    ))
+        for child in ast.iter_child_nodes(node):
+            visit(child, guarded)
+
+    visit(tree, False)
+    return diagnostics
+
+
+# =========================================================
+# 5. CSS 선택자
+# =========================================================
+def _check_selectors(tree: ast.AST) -> list[Diagnostic]:
+    try:
+        import soupsieve
+    except ImportError:
+        return []
+
+    diagnostics = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.args):
+            continue
+        method = node.func.attr
+        if method not in _BS4_SELECTOR_METHODS and method not in _OTHER_SELECTOR_METHODS:
+            continue
+        arg = node.args[0]
+        if not (isinstance(arg, ast.Constant) and isinstance(arg.value, str)):
+            continue
+
+        selector = arg.value
+        strict = method in _BS4_SELECTOR_METHODS
+        if not strict:
+            selector = _as_plain_css(selector)
+            if selector is None:
+                continue
+        try:
+            soupsieve.compile(selector)
+        except soupsieve.SelectorSyntaxError as e:
+            reason = str(e).splitlines()[0]
+            diagnostics.append(Diagnostic(
+                arg.lineno, arg.col_offset + 1, SELECTOR,
+                f".{method}({arg.value!r}) CSS 선택자 문법 오류: {reason}",
+                severity="error" if strict else "warning",
+            ))
+        except Exception:
+            # 네임스페이스 등 soupsieve가 문맥 없이는 판단할 수 없는 선택자
+            continue
+    return diagnostics
+
+
+def _as_plain_css(selector: str) -> Optional[str]:
+    """Playwright/Scrapy 확장 문법을 걷어낸 순수 CSS. 확장 문법이라 검사할 수 없으면 None."""
+    selector = selector.strip()
+    if selector.startswith("css="):
+        selector = selector[len("css="):]
+    if not selector or ">>" in selector or selector.startswith(_PLAYWRIGHT_ENGINES):
+        return None
+    if any(p in selector for p in _PLAYWRIGHT_PSEUDOS):
+        return None
+    if "::" in selector:
+        # Scrapy/parsel의 ::text, ::attr(href) 의사 요소
+        selector = selector.split("::")[0].strip()
+    return selector or None
+
+
+# =========================================================
+# 6. 절약한 실행 횟수 통계
+# =========================================================
+class PreflightStats:
+    """점검 횟수와, 점검 덕분에 실행하지 않고 돌려보낸 횟수(= 절약한 실행 왕복)를 JSON 파일에 누적합니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"checks": 0, "flagged": 0, "blocked_runs": 0, "check_seconds": 0.0, "by_kind": {}, "by_tool": {}}
+
+    def record(self, tool_name: str, report: PreflightReport, blocked: bool = False) -> dict:
+        stats = self.load()
+        stats["checks"] += 1
+        stats["check_seconds"] = round(stats["check_seconds"] + report.elapsed, 4)
+        tool = stats["by_tool"].setdefault(tool_name, {"checks": 0, "flagged": 0, "blocked_runs": 0})
+        tool["checks"] += 1
+        if report.errors:
+            stats["flagged"] += 1
+            tool["flagged"] += 1
+            for d in report.errors:
+                stats["by_kind"][d.kind] = stats["by_kind"].get(d.kind, 0) + 1
+        if blocked:
+            stats["blocked_runs"] += 1
+            tool["blocked_runs"] += 1
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(stats, f, ensure_ascii=False, indent=2)
+        except OSError:
+            pass
+        return stats
+
+    def summary(self) -> str:
+        stats = self.load()
+        avg_ms = stats["check_seconds"] / stats["checks"] * 1000 if stats["checks"] else 0.0
+        kinds = ", ".join(f"{k} {v}" for k, v in sorted(stats["by_kind"].items())) or "-"
+        return (
+            f"🧪 [Preflight] 점검 {stats['checks']}회 (평균 {avg_ms:.1f}ms), 문제 발견 {stats['flagged']}회, "
+            f"실행 없이 돌려보낸 왕복 {stats['blocked_runs']}회 | 오류 종류: {kinds}"
+        )
@@ -0,0 +1,221 @@
+import os
+import re
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+# ==========================================
+# 🗂️ Per-thread Workspaces
+# ==========================================
+# 모든 Coder 세션이 code_artifacts/ 하나에 `generated_script.py` 같은 같은 이름으로 쓰면
+# 동시에 돌던 세션끼리 파일을 덮어쓰고, 파일 검색도 점점 쌓이는 옛 파일을 전부 뒤지게 됩니다.
+#
+# 대화 스레드(thread_id)마다 code_artifacts/workspaces/<thread>/ 작업 공간을 따로 씁니다.
+#   - 쓰기/실행/검색은 현재 스레드의 작업 공간 안에서만 (파일명은 기존처럼 basename만 사용)
+#   - 읽기는 작업 공간에 없으면 공용 code_artifacts/에서 찾음 (Navigator가 저장한 Blueprint 등)
+#   - 작업 공간마다 용량 한도, 오래 안 쓴 작업 공간은 자동 정리(GC), 전체 용량이 넘으면 한동안 안 쓴 것부터 정리
+#     (스크립트가 대기/실행 중인 작업 공간은 어느 경우에도 지우지 않음)
+#   - 백그라운드 실행도 시작한 스레드에서만 조회/취소 (ExecutionManager.start(owner=thread_id))
+#
+# 환경 변수 (0이면 해당 제한 없음)
+#   AAWS_WORKSPACE_QUOTA_MB=500  AAWS_WORKSPACE_MAX_AGE_HOURS=72  AAWS_WORKSPACES_MAX_TOTAL_MB=5000
+
+WORKSPACES_DIRNAME = "workspaces"
+DEFAULT_WORKSPACE = "default"
+
+DEFAULT_QUOTA_MB = int(os.getenv("AAWS_WORKSPACE_QUOTA_MB", "500"))
+DEFAULT_MAX_AGE_HOURS = float(os.getenv("AAWS_WORKSPACE_MAX_AGE_HOURS", "72"))
+DEFAULT_MAX_TOTAL_MB = int(os.getenv("AAWS_WORKSPACES_MAX_TOTAL_MB", "5000"))
+# GC는 작업 공간을 열 때 이 간격(초)보다 자주 돌지 않음
+GC_INTERVAL = 600
+# 전체 용량 초과로 지울 때도 최소 이 시간(초) 동안 안 쓴 작업 공간만 지움 (진행 중인 대화의 파일 보호)
+GC_MIN_IDLE_SECONDS = 3600
+
+_SAFE_ID = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class WorkspaceQuotaError(Exception):
+    """작업 공간 용량 한도를 넘는 쓰기"""
+
+
+def current_thread_id() -> Optional[str]:
+    """에이전트 실행 중이면 현재 대화의 thread_id (도구 안에서 호출). 그 밖에서는 None."""
+    try:
+        from langgraph.config import get_config
+
+        return (get_config().get("configurable") or {}).get("thread_id")
+    except (ImportError, RuntimeError):
+        return None
+
+
+def workspace_id_for(key: Optional[str]) -> str:
+    """thread_id 등 임의의 문자열을 디렉토리 이름으로 쓸 수 있게 바꿉니다. (경로 조작 문자 제거)"""
+    if not key:
+        return DEFAULT_WORKSPACE
+    key = str(key)
+    safe = _SAFE_ID.sub("_", key).strip("_")[:48]
+    if safe != key or not safe:
+        # 바뀐 이름끼리 겹치지 않도록 원래 값의 해시를 붙입니다.
+        safe = f"{safe or 'ws'}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}"
+    return safe
+
+
+class WorkspaceManager:
+    """thread_id별 작업 공간을 만들고, 용량 한도와 GC를 관리합니다.
+
+    사용 예)
+        workspaces = WorkspaceManager(ARTIFACT_DIR)
+        path = workspaces.resolve_write("crawler.py")   # 현재 스레드의 작업 공간 안 경로
+        workspaces.check_quota(len(content))
+    """
+
+    def __init__(
+        self,
+        shared_dir: str,
+        quota_mb: int = DEFAULT_QUOTA_MB,
+        max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+        max_total_mb: int = DEFAULT_MAX_TOTAL_MB,
+    ):
+        self.shared_dir = shared_dir
+        self.root = os.path.join(shared_dir, WORKSPACES_DIRNAME)
+        self.quota_bytes = quota_mb * 1024 * 1024
+        self.max_age_seconds = max_age_hours * 3600
+        self.max_total_bytes = max_total_mb * 1024 * 1024
+        self._last_gc = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    # ---------- 경로 ----------
+    def path_for(self, workspace_id: Optional[str] = None) -> str:
+        """작업 공간 디렉토리 (없으면 생성). workspace_id를 비우면 현재 스레드의 작업 공간."""
+        workspace_id = workspace_id_for(workspace_id or current_thread_id())
+        path = os.path.join(self.root, workspace_id)
+        os.makedirs(path, exist_ok=True)
+        self.maybe_gc(keep=path)
+        return path
+
+    def current(self) -> str:
+        return self.path_for()
+
+    def resolve_write(self, filename: str, workspace: Optional[str] = None) -> str:
+        """쓰기용 경로: 항상 작업 공간 안 (파일명만 사용)"""
+        return os.path.join(workspace or self.current(), os.path.basename(filename))
+
+    def resolve_read(self, filename: str, workspace: Optional[str] = None) -> str:
+        """읽기용 경로: 작업 공간에 있으면 그 파일, 없고 공용 폴더에 있으면 공용 파일, 둘 다 없으면 작업 공간 경로"""
+        name = os.path.basename(filename)
+        local = os.path.join(workspace or self.current(), name)
+        shared = os.path.join(self.shared_dir, name)
+        if not os.path.exists(local) and os.path.isfile(shared):
+            return shared
+        return local
+
+    # ---------- 용량 ----------
+    def usage(self, workspace: Optional[str] = None) -> int:
+        return _dir_stats(workspace or self.current())[0]
+
+    def check_quota(self, incoming_bytes: int = 0, workspace: Optional[str] = None):
+        """incoming_bytes를 더 쓰면 한도를 넘는 경우 WorkspaceQuotaError"""
+        if not self.quota_bytes:
+            return
+        used = self.usage(workspace)
+        if used + incoming_bytes > self.quota_bytes:
+            raise WorkspaceQuotaError(
+                f"작업 공간 용량 한도({self.quota_bytes // 1024 // 1024}MB)를 넘습니다. "
+                f"(현재 {used / 1024 / 1024:.1f}MB) 필요 없는 결과/로그 파일을 정리하세요."
+            )
+
+    def over_quota(self, workspace: Optional[str] = None) -> bool:
+        return bool(self.quota_bytes) and self.usage(workspace) > self.quota_bytes
+
+    # ---------- GC ----------
+    def maybe_gc(self, keep: Optional[str] = None):
+        if time.monotonic() - self._last_gc < GC_INTERVAL:
+            return
+        self.gc(keep=keep)
+
+    def gc(self, keep: Optional[str] = None, now: Optional[float] = None) -> list[str]:
+        """오래 쓰지 않은 작업 공간을 지우고, 전체 용량이 넘으면 한동안 안 쓴 것부터 더 지웁니다. 지운 목록을 돌려줍니다.
+        스크립트가 대기/실행 중인 작업 공간(백그라운드 실행 포함)은 건너뜁니다.
+        """
+        with self._lock:
+            self._last_gc = time.monotonic()
+            now = now or time.time()
+            keep = os.path.abspath(keep) if keep else None
+            busy = _busy_dirs()
+            entries = []
+            total = _dir_stats(keep)[0] if keep else 0
+            for name in os.listdir(self.root):
+                path = os.path.abspath(os.path.join(self.root, name))
+                if not os.path.isdir(path) or path == keep:
+                    continue
+                size, last_used = _dir_stats(path)
+                total += size
+                if path not in busy:
+                    entries.append((last_used, size, path))
+
+            removed = []
+            for last_used, size, path in sorted(entries):
+                idle = now - last_used
+                expired = self.max_age_seconds and idle > self.max_age_seconds
+                over_total = self.max_total_bytes and total > self.max_total_bytes and idle > GC_MIN_IDLE_SECONDS
+                if not (expired or over_total):
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                removed.append(path)
+            if removed:
+                print(f"🧹 [Workspace] 오래되었거나 용량을 넘은 작업 공간 {len(removed)}개를 정리했습니다.")
+            return removed
+
+
+def _busy_dirs() -> set[str]:
+    """실행 관리자에서 스크립트가 대기/실행 중인 디렉토리"""
+    from app.sandbox.manager import get_manager
+
+    return get_manager().busy_dirs()
+
+
+def _dir_stats(path: str) -> tuple[int, float]:
+    """(전체 크기, 마지막 수정 시각). 실행 중인 스크립트가 파일을 쓰고 있으면 수정 시각이 계속 갱신됩니다."""
+    total = 0
+    last = os.path.getmtime(path) if os.path.exists(path) else 0.0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                stat = os.stat(os.path.join(dirpath, filename))
+            except OSError:
+                continue
+            total += stat.st_size
+            last = max(last, stat.st_mtime)
+    return total, last
+
+
+# =========================================================
+# 현재 작업 공간만 검색하는 파일 검색 미들웨어
+# =========================================================
+try:
+    from langchain.agents.middleware import FilesystemFileSearchMiddleware
+except ImportError:  # 샌드박스 작업자 등 langchain 없이 import되는 경우
+    FilesystemFileSearchMiddleware = None
+
+if FilesystemFileSearchMiddleware is not None:
+
+    class WorkspaceFileSearchMiddleware(FilesystemFileSearchMiddleware):
+        """glob/grep 검색 범위를 code_artifacts/ 전체가 아니라 현재 스레드의 작업 공간으로 한정합니다."""
+
+        def __init__(self, workspaces: WorkspaceManager, **kwargs):
+            self.workspaces = workspaces
+            super().__init__(root_path=workspaces.root, **kwargs)
+
+        @property
+        def root_path(self) -> Path:
+            return Path(self.workspaces.current()).resolve()
+
+        @root_path.setter
+        def root_path(self, value):
+            # 부모 __init__의 root_path 대입은 무시합니다. (실제 경로는 호출 시점의 스레드로 결정)
+            pass
@@ -31,6 +31,7 @@ else:
 import logging
 import json
 import traceback
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional, Dict, Any
 
 from fastapi import FastAPI, APIRouter, HTTPException
@@ -79,6 +80,10 @@ def create_agent_router(agent_executor, prefix: str, tags: list = None) -> APIRo
                 if kind == "on_tool_start":
                     yield f"data: {json.dumps({'type': 'tool_start', 'name': event['name'], 'input': event['data'].get('input')})}\n\n"
                 
+                # Tool Progress (오래 걸리는 코드 실행 등에서 도구가 보내는 진행 상황)
+                elif kind == "on_custom_event":
+                    yield f"data: {json.dumps({'type': 'progress', 'name': event['name'], 'data': event['data']}, ensure_ascii=False, default=str)}\n\n"
+                
                 # Token Streaming (Chat Model)
                 elif kind == "on_chat_model_stream":
                     # 내부 로직(예: Self-Query 구성 등)에서 발생하는 중간 단계의 토큰은 제외합니다.
@@ -140,10 +145,23 @@ def create_agent_router(agent_executor, prefix: str, tags: list = None) -> APIRo
     return router
 
 # --- App Initialization ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 모든 에이전트/도구가 함께 쓰던 모델 클라이언트의 연결 풀을 정리
+    from app.llm import aclose_all, get_embedding_store, get_registry, get_store, routing_summary
+
+    logger.info(get_registry().summary())
+    logger.info(get_store().summary())
+    logger.info(get_embedding_store().summary())
+    logger.info(routing_summary())
+    await aclose_all()
+
 app = FastAPI(
     title="LLMOps Class Agent Server", 
     version="1.0",
-    description="Unified Server for Multiple Agents"
+    description="Unified Server for Multiple Agents",
+    lifespan=lifespan,
 )
 
 # --- Dynamic Agent Loading & Router Registration ---
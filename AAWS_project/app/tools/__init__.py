@@ -7,7 +7,9 @@ from app.tools.browser_user_tool import (
     browse_web_keep_alive
 )
 from app.tools.coder_tool import (
-    execute_python_code
+    execute_python_code,
+    check_python_run,
+    cancel_python_run
 )
 
 # Export Tool Lists for Agents
@@ -1,7 +1,9 @@
-from browser_use import Browser, Agent, ChatGoogle
+from browser_use import Browser, Agent
 from langchain_core.tools import tool
 import os
 
+from app.llm import get_browser_use_llm
+
 # DISPLAY 환경변수 확인
 print(f"✅ DISPLAY: {os.environ.get('DISPLAY', 'NOT SET')}")
 
@@ -32,8 +34,8 @@ async def browse_web_keep_alive(instruction: str) -> str:
     """
     print(f"\n🌐 [Browser Tool - Keep Alive] 행동 개시: {instruction}")
     
-    bu_llm = ChatGoogle(model="gemini-flash-latest")
-    #bu_llm = ChatOpenAI(model="gpt-5-mini-2025-08-07")
+    bu_llm = get_browser_use_llm("gemini-flash-latest")
+    #bu_llm = get_browser_use_llm("gpt-5-mini-2025-08-07", provider="openai")
     
     # 공유 브라우저를 전달해서 세션을 유지합니다.
     agent = Agent(task=instruction, llm=bu_llm, browser=shared_browser)
@@ -1,7 +1,11 @@
 import os
-import subprocess
 from langchain_core.tools import tool
 
+from app.sandbox.manager import DEFAULT_TIMEOUT, MAX_FOREGROUND_TIMEOUT, get_manager, kill_message
+from app.sandbox.output import ExecutionOutput, log_path_for, tool_progress_dispatcher
+from app.sandbox.preflight import PREFLIGHT_STATS_FILENAME, PreflightStats, preflight_file
+from app.sandbox.workspace import WorkspaceManager, WorkspaceQuotaError, current_thread_id
+
 # ==========================================
 # 🛠️ 파이썬 코드 실행 도구
 # ==========================================
@@ -10,45 +14,142 @@ from langchain_core.tools import tool
 ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "code_artifacts")
 os.makedirs(ARTIFACT_DIR, exist_ok=True)
 
+# 생성된 스크립트에서도 `from app.crawler.sinks import open_sink` 처럼 프로젝트 모듈을 쓸 수 있도록 PYTHONPATH에 추가
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPT_ENV = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [APP_ROOT, os.environ.get("PYTHONPATH")]))}
+
+# 대화(thread_id)별 작업 공간: code_artifacts/workspaces/<thread>/ (용량 한도 + 오래된 작업 공간 자동 정리)
+WORKSPACES = WorkspaceManager(ARTIFACT_DIR)
+
+# 실행 전 정적 점검 통계 (모든 작업 공간 공용)
+PREFLIGHT_STATS = PreflightStats(os.path.join(ARTIFACT_DIR, PREFLIGHT_STATS_FILENAME))
+
 @tool(parse_docstring=True)
-def execute_python_code(code: str, filename: str = "generated_script.py") -> str:
+def execute_python_code(
+    code: str,
+    filename: str = "generated_script.py",
+    timeout: int = DEFAULT_TIMEOUT,
+    background: bool = False,
+) -> str:
     """주어진 파이썬 코드를 파일로 저장하고 실행한 뒤, 그 결과(표준 출력 및 에러)를 반환합니다.
     코드가 정상 작동하는지 테스트하고 디버깅할 때 사용하세요.
+    출력이 길면 앞/뒷부분만 반환되며, 전체 출력은 run_log_<파일명>.log에 저장됩니다.
+    수 분 이상 걸리는 작업은 background=True로 실행한 뒤 check_python_run으로 진행 상황을 확인하세요.
     
     Args:
         code: 실행할 완전한 파이썬 스크립트 코드 내용 (모든 import 포함 필수).
         filename: 코드를 저장할 파이썬 파일명 (기본값: 'generated_script.py').
+        timeout: 결과를 기다릴 최대 시간(초). 기본 30초, 최대 600초 (background=False일 때만 적용)
+        background: True면 기다리지 않고 백그라운드로 실행한 뒤 run_id를 바로 반환
     """
-    # ✅ 항상 code_artifacts 경로 내부로 저장되도록 경로 강제 처리
+    # ✅ 항상 현재 대화의 작업 공간(code_artifacts/workspaces/<thread>/) 내부로 저장되도록 경로 강제 처리
     safe_filename = os.path.basename(filename)
-    filepath = os.path.join(ARTIFACT_DIR, safe_filename)
+    workspace = WORKSPACES.current()
+    filepath = os.path.join(workspace, safe_filename)
     
     print(f"\n🐍 [Coder Tool] '{filepath}' 파일 생성 및 실행 중...")
     
+    execution_output = None
     try:
-        # 코드를 파일로 저장 (무조건 덮어쓰기)
+        # 코드를 파일로 저장 (무조건 덮어쓰기, 작업 공간 용량 한도 확인)
+        existing = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+        WORKSPACES.check_quota(len(code.encode("utf-8")) - existing, workspace=workspace)
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(code)
+        
+        # ✅ 문법 오류 / 정의되지 않은 이름 / 없는 모듈 / 잘못된 선택자는 실행하지 않고 바로 돌려보냄
+        report = preflight_file(filepath, [workspace, APP_ROOT])
+        if report is not None:
+            PREFLIGHT_STATS.record("execute_python_code", report, blocked=not report.ok)
+            if not report.ok:
+                print(PREFLIGHT_STATS.summary())
+                return f"[Error] 실행 전 정적 점검에서 반드시 실패할 문제가 발견되어 실행하지 않았습니다.\n{report.format()}"
             
-        # 파이썬 실행 (작업 디렉토리를 ARTIFACT_DIR 내부로 한정)
-        result = subprocess.run(
-            ["python", safe_filename], 
-            cwd=ARTIFACT_DIR,  # ✅ 작업 디렉토리 지정!
-            capture_output=True, 
-            text=True, 
-            timeout=30  # 무한 루프 등 시간끌기 방지
+        # 파이썬 실행 (작업 디렉토리를 작업 공간 내부로 한정)
+        # ✅ 라이브러리를 미리 import해 둔 워밍 샌드박스에서 실행 (불가능한 환경이면 새 프로세스로 실행)
+        # ✅ 실행 관리자가 CPU/메모리/파일 크기 한도와 서버 전체 동시 실행 수 제한을 적용
+        manager = get_manager()
+        if background:
+            run = manager.start(safe_filename, cwd=workspace, env=SCRIPT_ENV, log_dir=workspace, owner=current_thread_id())
+            print(f"\n🚀 [Coder Tool] '{safe_filename}' 백그라운드 실행 시작 (run_id={run.run_id})")
+            return (
+                f"[Started] '{safe_filename}'을(를) 백그라운드에서 실행했습니다. run_id={run.run_id} "
+                f"(한도: {manager.limits.describe()}, 전체 로그: {run.output.log_name})\n"
+                "check_python_run으로 진행 상황과 결과를 확인하고, 필요하면 cancel_python_run으로 중단하세요."
+            )
+
+        timeout = max(1, min(timeout, MAX_FOREGROUND_TIMEOUT))  # 무한 루프 등 시간끌기 방지
+        # ✅ 출력은 실행 중에 받아서 전체는 로그 파일에, LLM에게는 토큰 예산 안의 앞/뒷부분만 전달
+        execution_output = ExecutionOutput(
+            log_path_for(workspace, safe_filename),
+            on_progress=tool_progress_dispatcher("execute_python_code", safe_filename),
+            read_hint="파일 검색 도구(grep)로 필요한 부분을 찾으세요",
+        )
+        result = manager.run(
+            safe_filename,
+            cwd=workspace,  # ✅ 작업 디렉토리 지정!
+            env=SCRIPT_ENV,  # ✅ app.crawler.sinks 등 프로젝트 모듈 import 허용
+            timeout=timeout,
+            on_output=execution_output.feed,
         )
+        execution_output.close()
+        stdout_text, stderr_text = execution_output.render()
+        last_output = f"\n[마지막 출력]\n{stdout_text}" if stdout_text.strip() else ""
+        if result.timed_out:
+            return (
+                f"[Error] 실행 시간({timeout}초)을 초과했습니다. 무한 루프 수정을 시도하세요. "
+                "정상적으로 오래 걸리는 작업이라면 timeout을 늘리거나 background=True로 실행하세요." + last_output
+            )
+        if result.killed_reason:
+            return f"[Error] {kill_message(result, timeout, manager.limits)}" + last_output
         
-        output = result.stdout
-        if result.stderr:
-            output += f"\n[Error Output]\n{result.stderr}"
+        output = stdout_text
+        if stderr_text:
+            output += f"\n[Error Output]\n{stderr_text}"
             
         if not output.strip():
             output = "[System] 코드가 에러 없이 실행되었으나 출력된 내용이 없습니다."
             
         return output
         
-    except subprocess.TimeoutExpired:
-        return "[Error] 실행 시간(30초)을 초과했습니다. 무한 루프 수정을 시도하세요."
+    except WorkspaceQuotaError as e:
+        return f"[Error] {e}"
     except Exception as e:
         return f"[System Error] 코드 실행 오류 발생: {str(e)}"
+    finally:
+        if execution_output is not None:
+            execution_output.close()
+
+
+@tool(parse_docstring=True)
+def check_python_run(run_id: str = "") -> str:
+    """background=True로 실행한 코드의 진행 상황(경과 시간, 최근 출력) 또는 최종 결과를 확인합니다.
+
+    Args:
+        run_id: execute_python_code가 돌려준 run_id (비우면 전체 백그라운드 실행 목록)
+    """
+    # ✅ 이 대화에서 시작한 실행만 조회
+    manager = get_manager()
+    owner = current_thread_id()
+    if not run_id:
+        runs = manager.runs(owner)
+        if not runs:
+            return "[System] 백그라운드 실행 기록이 없습니다."
+        return "\n".join(run.describe(manager.limits).splitlines()[0] for run in runs)
+
+    run = manager.get(run_id, owner)
+    if run is None:
+        return f"[Error] run_id={run_id} 실행을 찾을 수 없습니다. check_python_run()으로 목록을 확인하세요."
+    return run.describe(manager.limits)
+
+
+@tool(parse_docstring=True)
+def cancel_python_run(run_id: str) -> str:
+    """백그라운드로 실행 중인 코드를 중단합니다. (코드가 띄운 브라우저 등 하위 프로세스 포함)
+
+    Args:
+        run_id: 중단할 실행의 run_id
+    """
+    if get_manager().cancel(run_id, current_thread_id()):
+        return f"[Success] run_id={run_id} 실행에 중단을 요청했습니다. check_python_run으로 종료를 확인하세요."
+    return f"[Error] run_id={run_id}는 없거나 이미 끝난 실행입니다."
@@ -3,9 +3,10 @@ import base64
 import json
 import mimetypes
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
+from app.llm import get_chat_model
+
 @tool
 def read_image_and_analyze(image_path: str, query_hint: str = "이 이미지의 내용을 상세히 설명해줘.") -> str:
     """
@@ -27,7 +28,7 @@ def read_image_and_analyze(image_path: str, query_hint: str = "이 이미지의
         with open(image_path, "rb") as image_file:
             encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
 
-        vision_llm = ChatOpenAI(model="gpt-4o", temperature=0)
+        vision_llm = get_chat_model("openai:gpt-4o", temperature=0)
 
         messages = [
             HumanMessage(
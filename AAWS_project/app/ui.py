@@ -99,6 +99,7 @@ if prompt := st.chat_input("메시지를 입력하세요..."):
     # 3. Agent Response (Streaming)
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
+        progress_placeholder = st.empty()
         full_response = ""
         
         # Streamlit은 스트리밍 중에 이미지를 중간중간 띄우기 까다로우므로
@@ -117,11 +118,19 @@ if prompt := st.chat_input("메시지를 입력하세요..."):
                     with st.status(f"🛠️ 도구 사용 중: {chunk['name']}", expanded=False) as status:
                         st.write(f"Input: {chunk.get('input')}")
                         status.update(state="complete")
+                elif chunk["type"] == "progress":
+                    # 코드 실행 같은 긴 도구 호출 중 진행 상황 (마지막 출력 몇 줄)
+                    data = chunk.get("data") or {}
+                    progress_placeholder.caption(
+                        f"⏳ {data.get('script', chunk.get('name'))} 실행 중... {data.get('elapsed', 0)}초, "
+                        f"출력 {data.get('stdout_lines', 0)}줄\n\n" + "\n".join(data.get("last_lines") or [])
+                    )
                 elif chunk["type"] == "error":
                     st.error(f"Error: {chunk.get('content')}")
         
         # B. 완료 후 최종 렌더링 (이미지 태그 처리)
         message_placeholder.empty() # 기존 스트리밍 텍스트 지움 (Clean up)
+        progress_placeholder.empty()
         render_message_content(full_response) # 파싱 및 이미지 렌더링 (Parsing & Rendering)
         
         # Add Assistant Message to History
@@ -1,13 +1,19 @@
 import os
 import os
+import json
+import time
+import threading
+from collections import OrderedDict
 from typing import List, Optional
 
 from dotenv import load_dotenv
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_core.documents import Document
 from langchain_classic.retrievers.self_query.base import SelfQueryRetriever
 from langchain_classic.chains.query_constructor.schema import AttributeInfo
 
+from app.llm import get_chat_model, get_embeddings
+
 
 # 환경 변수 로드
 load_dotenv(override=True)
@@ -17,6 +23,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 DATA_DIR = os.path.join(BASE_DIR, "data")
 CHROMA_DB_DIR = os.path.join(DATA_DIR, "chroma_db")
 PDF_SOURCE_DIR = os.path.join(DATA_DIR, "bok_major_industry_reports")
+# 적재(app/utils/ingest.py)와 검색이 같은 임베딩 모델을 써야 함
+EMBEDDING_MODEL = "openai:text-embedding-3-large"
 
 # 전역 변수로 Retriever 관리 (Lazy Loading)
 _retrievers = {
@@ -25,13 +33,139 @@ _retrievers = {
     "multimodal": None
 }
 
+# ==========================================
+# 🗂️ 검색 결과 캐시 (컬렉션 적재 버전으로 무효화)
+# ==========================================
+# 평가/채팅에서 같은 질문이 반복되면 질의 임베딩(app.llm.embedding_cache)과 Chroma 검색을 매번 다시 합니다.
+# (컬렉션, 질의, 필터, k)를 키로 검색 결과를 메모리 LRU에 두고, 키에 컬렉션의 적재 버전을 넣어
+# PDF를 다시 적재해 버전이 오르면 (ingest_versions.json) 이전 결과는 자동으로 쓰이지 않게 합니다.
+# Self-Query는 LLM이 만든 질의/필터로 검색하므로 그 결과도 같은 키로 캐시됩니다.
+#
+# 환경 변수: AAWS_RETRIEVAL_CACHE=0 (끄기)  AAWS_RETRIEVAL_CACHE_SIZE=512
+INGEST_VERSIONS_FILE = os.path.join(CHROMA_DB_DIR, "ingest_versions.json")
+RETRIEVAL_CACHE_ENABLED = os.getenv("AAWS_RETRIEVAL_CACHE", "1").lower() not in ("0", "false", "off")
+RETRIEVAL_CACHE_SIZE = int(os.getenv("AAWS_RETRIEVAL_CACHE_SIZE", "512"))
+
+_versions = {"mtime": None, "data": {}}
+_versions_lock = threading.Lock()
+
+
+def _read_versions() -> dict:
+    """ingest_versions.json을 파일이 바뀌었을 때만 다시 읽습니다. (질의마다 stat 한 번)"""
+    try:
+        mtime = os.stat(INGEST_VERSIONS_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    with _versions_lock:
+        if _versions["mtime"] != mtime:
+            try:
+                with open(INGEST_VERSIONS_FILE, "r", encoding="utf-8") as f:
+                    _versions["data"] = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return _versions["data"]
+            _versions["mtime"] = mtime
+        return _versions["data"]
+
+
+def get_collection_version(collection_name: str) -> int:
+    """컬렉션의 적재 버전 (한 번도 기록된 적이 없으면 0)"""
+    return int((_read_versions().get(collection_name) or {}).get("version", 0))
+
+
+def bump_collection_version(collection_name: str, **info) -> int:
+    """컬렉션 내용이 바뀌었음을 기록합니다. (적재 파이프라인이 upsert/삭제 후 호출) 새 버전을 돌려줍니다."""
+    os.makedirs(CHROMA_DB_DIR, exist_ok=True)
+    with _versions_lock:
+        try:
+            with open(INGEST_VERSIONS_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        entry = data.get(collection_name) or {}
+        version = int(entry.get("version", 0)) + 1
+        data[collection_name] = {**entry, **info, "version": version, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        tmp_path = INGEST_VERSIONS_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, INGEST_VERSIONS_FILE)
+    # 같은 프로세스의 오래된 결과는 바로 비움 (다른 프로세스는 버전이 달라 자동으로 놓침)
+    _retrieval_cache.clear(collection_name)
+    return version
+
+
+class RetrievalCache:
+    """(컬렉션, 적재 버전, 질의, 필터, k) → 검색 결과 문서 목록 (메모리 LRU)"""
+
+    def __init__(self, max_items: int = RETRIEVAL_CACHE_SIZE):
+        self.max_items = max_items
+        self._items: OrderedDict[tuple, list[Document]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(collection_name: str, query: str, filter: Optional[dict], k: int, extra: Optional[dict] = None) -> tuple:
+        frozen = json.dumps([filter, extra or {}], sort_keys=True, ensure_ascii=False, default=str)
+        return (collection_name, get_collection_version(collection_name), " ".join(query.split()), frozen, k)
+
+    def get(self, key: tuple) -> Optional[list[Document]]:
+        with self._lock:
+            docs = self._items.get(key)
+            if docs is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+        # 호출한 쪽이 metadata를 고쳐도 캐시가 오염되지 않도록 복사본을 돌려줌
+        return [doc.model_copy(deep=True) for doc in docs]
+
+    def put(self, key: tuple, docs: list[Document]):
+        with self._lock:
+            self._items[key] = [doc.model_copy(deep=True) for doc in docs]
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self, collection_name: Optional[str] = None):
+        with self._lock:
+            for key in [key for key in self._items if collection_name is None or key[0] == collection_name]:
+                del self._items[key]
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"🗂️ [Retrieval Cache] 적중률 {rate:.0%} (적중 {self.hits} / 실패 {self.misses}, 저장 {len(self._items)}개)"
+
+
+_retrieval_cache = RetrievalCache()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    return _retrieval_cache
+
+
+class CachedChroma(Chroma):
+    """similarity_search 결과를 RetrievalCache에 두는 Chroma (basic/Self-Query Retriever 모두 이 경로로 검색)"""
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs) -> list[Document]:
+        if not RETRIEVAL_CACHE_ENABLED:
+            return super().similarity_search(query, k=k, filter=filter, **kwargs)
+        key = RetrievalCache.key(self._collection_name, query, filter, k, kwargs)
+        docs = _retrieval_cache.get(key)
+        if docs is None:
+            docs = super().similarity_search(query, k=k, filter=filter, **kwargs)
+            _retrieval_cache.put(key, docs)
+        return docs
+
+
 def _get_embedding_model():
-    return OpenAIEmbeddings(model="text-embedding-3-large")
+    # 같은 질의는 메모리 → 디스크(code_artifacts/embedding_cache.db) 순으로 찾아 다시 임베딩하지 않음
+    return get_embeddings(EMBEDDING_MODEL, cache_site="retrieval")
 
 def _initialize_vectorstore(collection_name: str) -> Chroma:
     """
     지정된 Collection Name으로 Chroma VectorStore를 로드하거나 생성합니다.
-    (실습 환경에서는 이미 생성되었다고 가정하거나, 없으면 로드 시도)
+    (컬렉션은 python -m app.utils.ingest 로 PDF에서 만들어 둡니다)
     """
     embedding_model = _get_embedding_model()
     
@@ -40,7 +174,7 @@ def _initialize_vectorstore(collection_name: str) -> Chroma:
         os.makedirs(CHROMA_DB_DIR, exist_ok=True)
 
     print(f"📂 [DataLoader] Loading VectorStore: {collection_name}")
-    vectorstore = Chroma(
+    vectorstore = CachedChroma(
         persist_directory=CHROMA_DB_DIR,
         embedding_function=embedding_model,
         collection_name=collection_name
@@ -76,7 +210,8 @@ def _create_self_query_retriever(collection_name: str):
     document_content_description = "Bank of Korea Industry Reports"
     
     # Self-Query를 위한 LLM (구조화된 쿼리 생성용)
-    llm = ChatOpenAI(model="gpt-4o", temperature=0).with_config({"tags": ["exclude_from_stream"]})
+    # 같은 질문이면 질의 생성 결과를 디스크 캐시에서 재사용
+    llm = get_chat_model("openai:gpt-4o", temperature=0, cache_site="self_query").with_config({"tags": ["exclude_from_stream"]})
     
     retriever = SelfQueryRetriever.from_llm(
         llm,
@@ -15,9 +15,10 @@ except ImportError:
     print("Warning: 'pdf2image' not installed. Please install it and 'poppler-utils'.")
     convert_from_path = None
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
+from app.llm import get_chat_model
+
 def encode_image(image):
     """PIL Image를 Base64 문자열로 인코딩"""
     buffered = io.BytesIO()
@@ -55,7 +56,7 @@ def generate_golden_dataset(
 
     generated_examples = []
     # 강력한 성능을 위해 gpt-4o 사용
-    llm = ChatOpenAI(model="gpt-4o", temperature=0.7)
+    llm = get_chat_model("openai:gpt-4o", temperature=0.7)
 
     # num_samples를 채울 때까지 반복 (한 번에 3개씩(Simple, Reasoning, Visual) 생성되므로 Loop 횟수 조정)
     # 넉넉하게 Loop를 돌고 나중에 자릅니다.
@@ -1,7 +1,9 @@
 import json
 import pandas as pd
 from datasets import Dataset
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
+
+from app.llm import get_embedding_store, get_embeddings, get_response_cache, get_store
 
 # RAGAS Imports
 from ragas import evaluate as ragas_evaluate
@@ -104,9 +106,11 @@ async def run_ragas_evaluation(
     ragas_dataset = Dataset.from_dict(data_dict)
     
     # 4. 평가 모델 설정
-    judge_llm = JSONCleanLLM(model="gpt-4o", temperature=0)
+    # 판정 LLM(temperature 0)은 같은 질문/답변/문맥이면 같은 판정을 재사용
+    judge_llm = JSONCleanLLM(model="gpt-4o", temperature=0, cache=get_response_cache("ragas_judge"))
     creative_llm = JSONCleanLLM(model="gpt-4o", temperature=0.7)
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
+    # AnswerRelevancy가 임베딩하는 질문/생성 질문도 평가를 다시 돌릴 때 재사용
+    embeddings = get_embeddings("openai:text-embedding-3-large", cache_site="ragas")
     
     metrics = [
         Faithfulness(llm=judge_llm),
@@ -128,5 +132,7 @@ async def run_ragas_evaluation(
     df_result = results.to_pandas()
     df_result.to_csv(output_file, index=False, encoding='utf-8-sig')
     print(f"✅ 평가 완료! 결과 저장됨: {output_file}")
+    print(get_store().summary())
+    print(get_embedding_store().summary())
     
     return results
@@ -0,0 +1,393 @@
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+from app.crawler.registry import ARTIFACT_DIR
+from app.utils.data_loader import (
+    CHROMA_DB_DIR,
+    DATA_DIR,
+    EMBEDDING_MODEL,
+    PDF_SOURCE_DIR,
+    bump_collection_version,
+)
+
+# ==========================================
+# 📥 PDF → Chroma 적재 파이프라인 (증분 + 병렬)
+# ==========================================
+# data_loader.py는 data/chroma_db에 basic_rag / self_query / multimodal 컬렉션이 이미 있다고 가정합니다.
+# 이 모듈은 bok_major_industry_reports의 PDF로 그 컬렉션들을 만들고, PDF가 추가/변경되면 그것만 다시 적재합니다.
+#
+#   1) PDF 내용 해시를 manifest(data/chroma_db/ingest_manifest.json)와 비교해 바뀐 PDF만 고르고
+#   2) PyMuPDF4LLMLoader 파싱을 프로세스 풀에서 PDF 단위로 병렬 실행 (텍스트 파싱은 basic_rag/self_query가 함께 씀)
+#   3) 파일 이름(없으면 첫 페이지)에서 year/quarter를 뽑아 메타데이터로 붙이고 (Self-Query 필터용 정수)
+#   4) 텍스트 크기 상한을 지키는 배치로 나눠 동시에 임베딩 (실패하면 지수 백오프로 재시도)
+#   5) PDF 해시 + 페이지 번호로 만든 고정 ID로 upsert한 뒤, 바뀐 PDF의 새 ID에 없는 이전 페이지를 지움
+#      (새 페이지가 들어가기 전에는 이전 페이지가 그대로 검색되므로 적재 중에도 결과가 비지 않음)
+#   6) 컬렉션 적재 버전을 올려 검색 결과 캐시를 무효화하고, 단계별 시간과 페이지/초를 보고합니다.
+# 임베딩은 app.llm.embedding_cache를 거치므로 중간에 실패해 다시 돌려도 이미 임베딩한 페이지는 API를 다시 부르지 않습니다.
+#
+# 사용 예)
+#     python -m app.utils.ingest                          # 세 컬렉션 모두, 바뀐 PDF만
+#     python -m app.utils.ingest --collections self_query --force
+#
+# 환경 변수
+#   AAWS_INGEST_WORKERS=4             파싱 프로세스 수
+#   AAWS_INGEST_EMBED_CONCURRENCY=4   동시에 보낼 임베딩 배치 수
+#   AAWS_INGEST_BATCH_CHARS=60000     임베딩 배치 하나의 최대 글자 수
+#   AAWS_INGEST_BATCH_SIZE=64         임베딩 배치 하나의 최대 페이지 수
+
+DEFAULT_WORKERS = int(os.getenv("AAWS_INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+DEFAULT_EMBED_CONCURRENCY = int(os.getenv("AAWS_INGEST_EMBED_CONCURRENCY", "4"))
+DEFAULT_BATCH_CHARS = int(os.getenv("AAWS_INGEST_BATCH_CHARS", "60000"))
+DEFAULT_BATCH_SIZE = int(os.getenv("AAWS_INGEST_BATCH_SIZE", "64"))
+MAX_RETRIES = 4
+
+MANIFEST_FILE = os.path.join(CHROMA_DB_DIR, "ingest_manifest.json")
+REPORT_FILE = os.path.join(ARTIFACT_DIR, "ingest_report.json")
+IMAGE_DIR = os.path.join(DATA_DIR, "extracted_images")
+# 멀티모달 컬렉션에서 PDF 속 이미지를 설명 텍스트로 바꿀 VLM (같은 이미지는 응답 캐시 재사용)
+CAPTION_MODEL = "openai:gpt-4o-mini"
+
+# 파싱 방식: 텍스트만 / 이미지 추출 + VLM 설명
+TEXT = "text"
+IMAGES = "images"
+# 컬렉션 → 파싱 방식
+COLLECTIONS = {
+    "basic_rag": TEXT,
+    "self_query": TEXT,
+    "multimodal": IMAGES,
+}
+
+# 파일 이름/표지에서 연도·분기 찾기 (예: "2024년 1분기", "2024_Q1", "1Q2024", "2024년 1/4분기", "2024.03")
+_PERIOD_PATTERNS = [
+    (re.compile(r"(20\d{2})\s*년?\s*[._\-\s]?\s*([1-4])\s*(?:/\s*4\s*)?(?:분기|Q)", re.I), ("year", "quarter")),
+    (re.compile(r"(20\d{2})\s*[._\-\s]?\s*Q\s*([1-4])", re.I), ("year", "quarter")),
+    (re.compile(r"([1-4])\s*Q\s*[._\-\s]?\s*(20\d{2})", re.I), ("quarter", "year")),
+    (re.compile(r"(20\d{2})\s*(?:년\s*|[._\-])\s*(0?[1-9]|1[0-2])\s*월?(?!\d)"), ("year", "month")),
+]
+_YEAR = re.compile(r"(20\d{2})")
+
+
+def parse_period(text: str) -> dict:
+    """문자열에서 {"year": 2024, "quarter": 1}을 찾습니다. 분기를 못 찾으면 year만, 둘 다 없으면 빈 dict"""
+    for pattern, names in _PERIOD_PATTERNS:
+        match = pattern.search(text)
+        if match is None:
+            continue
+        values = dict(zip(names, (int(v) for v in match.groups())))
+        if "month" in values:
+            values["quarter"] = (values.pop("month") - 1) // 3 + 1
+        return values
+    match = _YEAR.search(text)
+    return {"year": int(match.group(1))} if match else {}
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest: dict):
+    os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+    tmp_path = MANIFEST_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+
+# ==========================================
+# 1. 파싱 (프로세스 풀)
+# ==========================================
+def _clean_metadata(metadata: dict) -> dict:
+    """Chroma는 str/int/float/bool 메타데이터만 받으므로 리스트(toc_items 등)와 None은 뺍니다."""
+    return {k: v for k, v in metadata.items() if isinstance(v, (str, int, float, bool))}
+
+
+def _parse_pdf(path: str, mode: str) -> dict:
+    """(워커 프로세스) PDF 하나를 페이지 단위로 파싱합니다. 결과는 프로세스 간에 넘길 수 있게 dict로"""
+    from app.utils.pymupdf4llm_loader import PyMuPDF4LLMLoader
+
+    start = time.perf_counter()
+    if mode == IMAGES:
+        from app.llm import get_chat_model
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        loader = PyMuPDF4LLMLoader(
+            path,
+            extract_images=True,
+            model=get_chat_model(CAPTION_MODEL, temperature=0, cache_site="pdf_captions"),
+            image_output_dir=os.path.join(IMAGE_DIR, stem),
+        )
+    else:
+        loader = PyMuPDF4LLMLoader(path)
+    pages = [(doc.page_content, _clean_metadata(doc.metadata)) for doc in loader.lazy_load()]
+    return {"path": path, "mode": mode, "pages": pages, "seconds": time.perf_counter() - start}
+
+
+def parse_pdfs(jobs: list[tuple[str, str]], workers: int) -> tuple[dict[tuple[str, str], dict], list[dict]]:
+    """(경로, 파싱 방식) 목록을 병렬로 파싱합니다. 실패한 PDF는 errors로 돌려주고 나머지는 계속 진행합니다."""
+    results, errors = {}, []
+    if not jobs:
+        return results, errors
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as pool:
+        futures = {pool.submit(_parse_pdf, path, mode): (path, mode) for path, mode in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            path, mode = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                errors.append({"path": path, "mode": mode, "error": f"{type(e).__name__}: {e}"})
+                print(f"   ❌ [Ingest] 파싱 실패 ({done}/{len(jobs)}): {os.path.basename(path)} ({e})")
+                continue
+            results[(path, mode)] = result
+            print(f"   📄 [Ingest] 파싱 ({done}/{len(jobs)}): {os.path.basename(path)} [{mode}] "
+                  f"{len(result['pages'])}페이지, {result['seconds']:.1f}초")
+    return results, errors
+
+
+# ==========================================
+# 2. 임베딩 + upsert
+# ==========================================
+def make_batches(items: list[dict], max_chars: int = DEFAULT_BATCH_CHARS, max_size: int = DEFAULT_BATCH_SIZE) -> list[list[dict]]:
+    """글자 수/개수 상한을 넘지 않게 나눕니다. (상한보다 긴 페이지 하나는 단독 배치)"""
+    batches, current, chars = [], [], 0
+    for item in items:
+        size = len(item["text"])
+        if current and (chars + size > max_chars or len(current) >= max_size):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(item)
+        chars += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _embed_with_retry(embeddings, texts: list[str]) -> list[list[float]]:
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await embeddings.aembed_documents(texts)
+        except Exception as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            delay = 2 ** attempt + random.random()
+            print(f"   ⚠️ [Ingest] 임베딩 재시도 {attempt + 1}/{MAX_RETRIES - 1} ({delay:.1f}초 후): {e}")
+            await asyncio.sleep(delay)
+
+
+async def embed_and_upsert(collection, embeddings, items: list[dict], concurrency: int = DEFAULT_EMBED_CONCURRENCY) -> dict:
+    """배치를 최대 concurrency개 동시에 임베딩하고, 끝나는 대로 컬렉션에 upsert합니다."""
+    batches = make_batches(items)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    stats = {"batches": len(batches), "upserted": 0, "failed_batches": 0}
+
+    async def run(batch):
+        async with semaphore:
+            try:
+                vectors = await _embed_with_retry(embeddings, [item["text"] for item in batch])
+            except Exception as e:
+                stats["failed_batches"] += 1
+                print(f"   ❌ [Ingest] 임베딩 실패 ({len(batch)}페이지): {e}")
+                return
+        collection.upsert(
+            ids=[item["id"] for item in batch],
+            embeddings=vectors,
+            documents=[item["text"] for item in batch],
+            metadatas=[item["metadata"] for item in batch],
+        )
+        stats["upserted"] += len(batch)
+
+    await asyncio.gather(*(run(batch) for batch in batches))
+    return stats
+
+
+# ==========================================
+# 3. 전체 실행
+# ==========================================
+def _page_items(path: str, digest: str, parsed: dict) -> list[dict]:
+    """파싱 결과 → upsert할 항목 (고정 ID + year/quarter 메타데이터)"""
+    pages = parsed["pages"]
+    period = parse_period(os.path.basename(path)) or (parse_period(pages[0][0][:2000]) if pages else {})
+    items = []
+    for index, (text, metadata) in enumerate(pages):
+        if not text.strip():
+            continue
+        page = metadata.get("page", index + 1)
+        items.append({
+            "id": f"{digest[:16]}-p{page}",
+            "text": text,
+            "metadata": {**metadata, **period, "source": path, "file_name": os.path.basename(path), "content_hash": digest},
+        })
+    return items
+
+
+def _delete_stale_pages(collection, paths: list[str], new_ids: set[str]):
+    """다시 적재한 PDF의 페이지 중 이번에 upsert한 ID에 없는 것(이전 해시의 페이지, 줄어든 페이지)을 지웁니다."""
+    for path in paths:
+        stored = collection.get(where={"file_name": os.path.basename(path)}, include=[])["ids"]
+        stale = [page_id for page_id in stored if page_id not in new_ids]
+        if stale:
+            collection.delete(ids=stale)
+
+
+async def aingest(
+    collections: Optional[list[str]] = None,
+    source_dir: str = PDF_SOURCE_DIR,
+    workers: int = DEFAULT_WORKERS,
+    embed_concurrency: int = DEFAULT_EMBED_CONCURRENCY,
+    force: bool = False,
+) -> dict:
+    """source_dir의 PDF를 컬렉션들에 적재합니다. 바뀌지 않은 PDF는 건너뛰고, 사라진 PDF의 페이지는 지웁니다.
+
+    Args:
+        collections: 적재할 컬렉션 (기본: basic_rag, self_query, multimodal)
+        source_dir: PDF 폴더
+        workers: 파싱 프로세스 수
+        embed_concurrency: 동시에 보낼 임베딩 배치 수
+        force: True면 manifest를 무시하고 모든 PDF를 다시 적재 (사라진 PDF는 컬렉션에 저장된 file_name으로 찾아 지움)
+    """
+    import chromadb
+
+    from app.llm import get_embeddings
+
+    collections = collections or list(COLLECTIONS)
+    unknown = [name for name in collections if name not in COLLECTIONS]
+    if unknown:
+        raise ValueError(f"알 수 없는 컬렉션입니다: {unknown} (가능: {list(COLLECTIONS)})")
+
+    start = time.perf_counter()
+    pdfs = sorted(
+        os.path.join(source_dir, name) for name in os.listdir(source_dir) if name.lower().endswith(".pdf")
+    ) if os.path.isdir(source_dir) else []
+    print(f"📥 [Ingest] PDF {len(pdfs)}개, 컬렉션 {collections} ({source_dir})")
+    hashes = {path: file_hash(path) for path in pdfs}
+    manifest = {} if force else load_manifest()
+
+    # 컬렉션별로 바뀐 PDF를 고르고, 같은 파싱 방식은 한 번만 파싱
+    todo = {
+        name: [path for path in pdfs if (manifest.get(name) or {}).get(os.path.basename(path), {}).get("hash") != hashes[path]]
+        for name in collections
+    }
+    jobs = sorted({(path, COLLECTIONS[name]) for name, paths in todo.items() for path in paths})
+    for name in collections:
+        print(f"   - {name}: 바뀐 PDF {len(todo[name])}개 / 건너뜀 {len(pdfs) - len(todo[name])}개")
+
+    parse_start = time.perf_counter()
+    parsed, errors = await asyncio.get_running_loop().run_in_executor(None, parse_pdfs, jobs, workers)
+    parse_seconds = time.perf_counter() - parse_start
+    parsed_pages = sum(len(result["pages"]) for result in parsed.values())
+
+    client = chromadb.PersistentClient(path=CHROMA_DB_DIR)
+    embeddings = get_embeddings(EMBEDDING_MODEL, cache_site="ingest")
+    report = {"pdfs": len(pdfs), "parse_errors": errors, "collections": {}}
+    embed_seconds = 0.0
+    for name in collections:
+        # langchain_chroma.Chroma와 같은 설정으로 열어 data_loader가 그대로 읽을 수 있게 함 (임베딩은 여기서 직접 계산)
+        collection = client.get_or_create_collection(name, embedding_function=None)
+        entries = manifest.setdefault(name, {})
+        items, changed = [], []
+        for path in todo[name]:
+            result = parsed.get((path, COLLECTIONS[name]))
+            if result is None:
+                continue
+            items.extend(_page_items(path, hashes[path], result))
+            changed.append(path)
+        current = {os.path.basename(path) for path in pdfs}
+        known = set(entries)
+        if force:
+            # --force는 manifest를 비우고 시작하므로, 사라진 PDF는 컬렉션에 저장된 file_name과 비교해 찾음
+            known |= {meta.get("file_name") for meta in collection.get(include=["metadatas"])["metadatas"] if meta}
+        removed = sorted(file_name for file_name in known if file_name and file_name not in current)
+        for file_name in removed:
+            collection.delete(where={"file_name": file_name})
+            entries.pop(file_name, None)
+
+        embed_start = time.perf_counter()
+        stats = await embed_and_upsert(collection, embeddings, items, embed_concurrency)
+        seconds = time.perf_counter() - embed_start
+        embed_seconds += seconds
+        # 임베딩이 하나라도 실패하면 이전 페이지를 남겨 두고 manifest에도 올리지 않아 다음 실행에서 다시 시도
+        failed = stats["upserted"] < len(items)
+        if not failed:
+            _delete_stale_pages(collection, changed, {item["id"] for item in items})
+        for path in changed:
+            if not failed:
+                entries[os.path.basename(path)] = {
+                    "hash": hashes[path],
+                    "pages": len(parsed[(path, COLLECTIONS[name])]["pages"]),
+                    "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+        save_manifest(manifest)
+        if changed or removed:
+            version = bump_collection_version(name, pdfs=len(entries), documents=collection.count())
+        else:
+            version = None
+        report["collections"][name] = {
+            **stats,
+            "changed_pdfs": len(changed),
+            "removed_pdfs": len(removed),
+            "skipped_pdfs": len(pdfs) - len(todo[name]),
+            "pages": len(items),
+            "documents": collection.count(),
+            "embed_seconds": round(seconds, 3),
+            "version": version,
+        }
+        print(f"   ✅ [{name}] PDF {len(changed)}개 적재 (삭제 {len(removed)}개), 페이지 {stats['upserted']}/{len(items)}개, "
+              f"배치 {stats['batches']}개, {seconds:.1f}초")
+
+    total = time.perf_counter() - start
+    report.update(
+        parsed_pages=parsed_pages,
+        parse_seconds=round(parse_seconds, 3),
+        embed_seconds=round(embed_seconds, 3),
+        total_seconds=round(total, 3),
+        parse_pages_per_second=round(parsed_pages / parse_seconds, 2) if parse_seconds > 0 and parsed_pages else 0.0,
+        pages_per_second=round(parsed_pages / total, 2) if total > 0 and parsed_pages else 0.0,
+    )
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(
+        f"🏁 [Ingest] 파싱 {parsed_pages}페이지 ({parse_seconds:.1f}초, {report['parse_pages_per_second']}페이지/초), "
+        f"임베딩+upsert {embed_seconds:.1f}초, 전체 {total:.1f}초 → {report['pages_per_second']}페이지/초"
+    )
+    return report
+
+
+def ingest(*args, **kwargs) -> dict:
+    """aingest의 동기 버전 (CLI/노트북 밖 스크립트용)"""
+    return asyncio.run(aingest(*args, **kwargs))
+
+
+# =========================================================
+# 🚀 직접 실행 시: python -m app.utils.ingest
+# =========================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="bok_major_industry_reports PDF → Chroma 컬렉션 증분 적재")
+    parser.add_argument("--collections", nargs="+", choices=list(COLLECTIONS), default=list(COLLECTIONS))
+    parser.add_argument("--source", default=PDF_SOURCE_DIR, help="PDF 폴더")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="파싱 프로세스 수")
+    parser.add_argument("--embed-concurrency", type=int, default=DEFAULT_EMBED_CONCURRENCY)
+    parser.add_argument("--force", action="store_true", help="바뀌지 않은 PDF도 모두 다시 적재")
+    args = parser.parse_args()
+
+    ingest(args.collections, args.source, args.workers, args.embed_concurrency, args.force)
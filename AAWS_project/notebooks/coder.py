@@ -1,19 +1,64 @@
 import os
-import subprocess
+import json
 from dataclasses import dataclass
-from langchain.chat_models import init_chat_model
 from langchain.agents import create_agent
-from langchain.agents.middleware import FilesystemFileSearchMiddleware
 from langgraph.checkpoint.memory import InMemorySaver
 from langchain.tools import tool
 from dotenv import load_dotenv
 
+from app.llm import ModelRoutingMiddleware, TokenBudgetMiddleware, get_chat_model
+from app.sandbox.pool import warm_up
+from app.sandbox.manager import DEFAULT_TIMEOUT, MAX_FOREGROUND_TIMEOUT, get_manager, kill_message
+from app.sandbox.output import ExecutionOutput, log_path_for, tool_progress_dispatcher
+from app.sandbox.preflight import PREFLIGHT_STATS_FILENAME, PreflightStats, preflight_file
+from app.sandbox.workspace import WorkspaceFileSearchMiddleware, WorkspaceManager, WorkspaceQuotaError, current_thread_id
+from app.crawler.replay import LIVE, REPLAY_DIRNAME, archive_dir_for, describe_run, prepare_run, resolve_mode
+
 load_dotenv(override=True)
 
 # 작업 파일들이 모일 디렉토리
 ARTIFACT_DIR = os.path.join(os.getenv("PROJECT_ROOT", os.getcwd()), "code_artifacts")
 os.makedirs(ARTIFACT_DIR, exist_ok=True)
 
+# 생성된 스크립트에서도 `from app.crawler.sinks import open_sink` 처럼 프로젝트 모듈을 쓸 수 있도록 PYTHONPATH에 추가
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_ENV = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [APP_ROOT, os.environ.get("PYTHONPATH")]))}
+
+# 대화(thread_id)마다 code_artifacts/workspaces/<thread>/ 작업 공간을 따로 써서 동시 세션끼리 파일을 덮어쓰지 않음
+WORKSPACES = WorkspaceManager(ARTIFACT_DIR)
+
+# 실행 전 정적 점검 통계는 모든 작업 공간이 함께 씀
+PREFLIGHT_STATS = PreflightStats(os.path.join(ARTIFACT_DIR, PREFLIGHT_STATS_FILENAME))
+
+
+def _preflight_paths(workspace: str) -> list[str]:
+    """import는 스크립트와 같은 기준(작업 디렉토리 + PYTHONPATH)으로 해석"""
+    return [workspace, APP_ROOT]
+
+
+def _write_file(filepath: str, content: str) -> str:
+    """현재 작업 공간에 용량 한도를 확인한 뒤 저장하고 저장된 경로를 돌려줍니다. (한도를 넘으면 WorkspaceQuotaError)"""
+    safe_filepath = WORKSPACES.resolve_write(filepath)
+    existing = os.path.getsize(safe_filepath) if os.path.exists(safe_filepath) else 0
+    WORKSPACES.check_quota(len(content.encode("utf-8")) - existing, workspace=os.path.dirname(safe_filepath))
+    with open(safe_filepath, "w", encoding="utf-8") as f:
+        f.write(content)
+    return safe_filepath
+
+
+def _preflight_notice(safe_filepath: str, tool_name: str) -> str:
+    """파일을 저장한 직후 정적 점검 결과를 도구 응답에 덧붙일 문자열로 만듭니다. (문제가 없으면 빈 문자열)"""
+    report = preflight_file(safe_filepath, _preflight_paths(os.path.dirname(safe_filepath)))
+    if report is None:
+        return ""
+    PREFLIGHT_STATS.record(tool_name, report)
+    if not report.diagnostics:
+        return ""
+    notice = "\n" + report.format()
+    if not report.ok:
+        notice += "\n[Action Required] 실행하기 전에 위 줄 번호의 문제를 edit_code_file로 먼저 고치세요."
+    return notice
+
 # =========================================================
 # 🛠️ 1. 코드 에이전트용 특화 컴포넌트 도구 (Tools)
 # =========================================================
@@ -24,11 +69,11 @@ def read_code_file(filepath: str, start_line: int = 1, end_line: int = None) ->
     코드를 수정하기 전, 정확히 몇 번째 줄을 수정해야 할지 파악하기 위해 반드시 먼저 사용하세요.
     
     Args:
-        filepath: 읽을 파일의 경로 (파일명만 입력하면 code_artifacts 폴더 안에서 찾습니다)
+        filepath: 읽을 파일의 경로 (파일명만 입력하면 현재 작업 공간에서, 없으면 code_artifacts 폴더에서 찾습니다)
         start_line: 읽기 시작할 줄 번호 (기본값: 1)
         end_line: 읽기를 끝낼 줄 번호 (입력하지 않으면 끝까지 읽음)
     """
-    safe_filepath = os.path.join(ARTIFACT_DIR, os.path.basename(filepath))
+    safe_filepath = WORKSPACES.resolve_read(filepath)
     if not os.path.exists(safe_filepath):
         return f"[Error] 파일이 존재하지 않습니다: {safe_filepath}"
         
@@ -59,11 +104,13 @@ def edit_code_file(filepath: str, start_line: int, end_line: int, new_content: s
         end_line: 교체를 끝낼 기존 줄 번호 (이 줄까지 덮어써짐)
         new_content: 해당 구간에 통째로 새로 들어갈 코드 내용
     """
-    safe_filepath = os.path.join(ARTIFACT_DIR, os.path.basename(filepath))
-    if not os.path.exists(safe_filepath):
+    # 공용 폴더의 파일(Navigator Blueprint 등)을 고치면 작업 공간에 사본을 만들어 수정
+    source_path = WORKSPACES.resolve_read(filepath)
+    safe_filepath = WORKSPACES.resolve_write(filepath)
+    if not os.path.exists(source_path):
         return f"[Error] 파일이 존재하지 않습니다. create_new_file을 먼저 사용해서 빈 파일을 만드세요: {safe_filepath}"
         
-    with open(safe_filepath, "r", encoding="utf-8") as f:
+    with open(source_path, "r", encoding="utf-8") as f:
         lines = f.readlines()
         
     if start_line < 1 or end_line > len(lines) or start_line > end_line:
@@ -75,10 +122,12 @@ def edit_code_file(filepath: str, start_line: int, end_line: int, new_content: s
     # 리스트 슬라이싱으로 기존 구간을 도려내고 새 코드를 삽입
     updated_lines = lines[:start_line-1] + new_lines + lines[end_line:]
     
-    with open(safe_filepath, "w", encoding="utf-8") as f:
-        f.writelines(updated_lines)
+    try:
+        _write_file(safe_filepath, "".join(updated_lines))
+    except WorkspaceQuotaError as e:
+        return f"[Error] {e}"
         
-    return f"[Success] {filepath} 파일의 {start_line}~{end_line} 라인이 성공적으로 교체되었습니다."
+    return f"[Success] {filepath} 파일의 {start_line}~{end_line} 라인이 성공적으로 교체되었습니다." + _preflight_notice(safe_filepath, "edit_code_file")
 
 
 @tool(parse_docstring=True)
@@ -90,57 +139,150 @@ def create_new_file(filepath: str, content: str) -> str:
         filepath: 생성할 파일명 (예: main.py)
         content: 파일에 들어갈 초기 파이썬 코드 전체 스크립트
     """
-    safe_filepath = os.path.join(ARTIFACT_DIR, os.path.basename(filepath))
-    
-    with open(safe_filepath, "w", encoding="utf-8") as f:
-        f.write(content)
+    try:
+        safe_filepath = _write_file(filepath, content)
+    except WorkspaceQuotaError as e:
+        return f"[Error] {e}"
         
-    return f"[Success] '{filepath}' 파일이 성공적으로 생성되었습니다."
+    return f"[Success] '{filepath}' 파일이 성공적으로 생성되었습니다." + _preflight_notice(safe_filepath, "create_new_file")
 
 
 @tool(parse_docstring=True)
-def run_python_script(filepath: str, script_args: str = "") -> str:
+def run_python_script(
+    filepath: str,
+    script_args: str = "",
+    timeout: int = DEFAULT_TIMEOUT,
+    background: bool = False,
+    network: str = "auto",
+) -> str:
     """저장된 파이썬 스크립트를 즉시 독립된 프로세스에서 실행하고 그 결과(출력 및 에러 로그)를 반환합니다.
     코드를 생성하거나 수정한 직후에는 반드시 이 툴을 호출하여 에러 없이 의도대로 돌아가는지 검증하세요.
+    출력이 길면 앞/뒷부분만 반환되며, 전체 출력은 run_log_<파일명>.log에 저장됩니다.
+    수 분 이상 걸리는 전체 크롤링은 background=True로 실행한 뒤 check_script_run으로 진행 상황을 확인하세요.
     
     Args:
         filepath: 실행할 파이썬 파일명 (예: main.py)
         script_args: 실행 시 덧붙일 커맨드라인 인자 (선택사항)
+        timeout: 결과를 기다릴 최대 시간(초). 기본 30초, 최대 600초 (background=False일 때만 적용)
+        background: True면 기다리지 않고 백그라운드로 실행한 뒤 run_id를 바로 반환
+        network: auto(첫 실행은 응답 저장, 이후엔 저장된 응답 재생) / record(새로 저장) / replay / live(실제 사이트, 최종 확인용). 백그라운드 실행의 auto는 live
     """
     safe_filename = os.path.basename(filepath)
-    full_path = os.path.join(ARTIFACT_DIR, safe_filename)
+    workspace = WORKSPACES.current()
+    full_path = os.path.join(workspace, safe_filename)
     
     if not os.path.exists(full_path):
          return f"[Error] 실행할 파일이 존재하지 않습니다: {safe_filename}"
+    
+    # 문법 오류 / 정의되지 않은 이름 / 없는 모듈 / 잘못된 선택자는 프로세스를 띄우기 전에 돌려보냄
+    report = preflight_file(full_path, _preflight_paths(workspace))
+    if report is not None:
+        PREFLIGHT_STATS.record("run_python_script", report, blocked=not report.ok)
+        if not report.ok:
+            print(PREFLIGHT_STATS.summary())
+            return (
+                f"[Error] 실행 전 정적 점검에서 반드시 실패할 문제가 발견되어 실행하지 않았습니다.\n{report.format()}\n"
+                "[Action Required] read_code_file과 edit_code_file로 위 줄 번호의 문제를 고친 뒤 다시 실행하세요."
+            )
          
-    command = ["python", safe_filename]
-    if script_args:
-        command.extend(script_args.split())
-        
-    print(f"\n🚀 [Coder Run] '{safe_filename}' 실행 중...")
+    manager = get_manager()
+    args = script_args.split() if script_args else ()
+    # 디버깅 실행은 응답을 기록/재생해 실제 사이트에 반복 접속하지 않음 (requests / httpx / Playwright)
+    archive_dir = archive_dir_for(safe_filename, root=os.path.join(workspace, REPLAY_DIRNAME))
+    try:
+        mode = LIVE if background and network == "auto" else resolve_mode(network, archive_dir)
+    except ValueError as e:
+        return f"[Error] {e}"
+    env = {**SCRIPT_ENV, **prepare_run(mode, archive_dir)}
+    if background:
+        run = manager.start(safe_filename, args, cwd=workspace, env=env, log_dir=workspace, owner=current_thread_id())
+        print(f"\n🚀 [Coder Run] '{safe_filename}' 백그라운드 실행 시작 (run_id={run.run_id})")
+        return (
+            f"[Started] '{safe_filename}'을(를) 백그라운드에서 실행했습니다. run_id={run.run_id} "
+            f"(한도: {manager.limits.describe()}, 전체 로그: {run.output.log_name})\n"
+            "check_script_run으로 진행 상황과 결과를 확인하고, 필요하면 cancel_script_run으로 중단하세요."
+        )
+    
+    timeout = max(1, min(timeout, MAX_FOREGROUND_TIMEOUT))
+    print(f"\n🚀 [Coder Run] '{safe_filename}' 실행 중... (network={mode})")
     
+    # 출력은 실행 중에 받아서 전체는 로그 파일에, LLM에게는 토큰 예산 안의 앞/뒷부분만 돌려줌
+    execution_output = ExecutionOutput(
+        log_path_for(workspace, safe_filename),
+        on_progress=tool_progress_dispatcher("run_python_script", safe_filename),
+    )
     try:
-        result = subprocess.run(
-            command, 
-            cwd=ARTIFACT_DIR,
-            capture_output=True, 
-            text=True, 
-            timeout=30 
+        # 미리 라이브러리를 import해 둔 워밍 샌드박스에서 CPU/메모리/파일 크기 한도를 걸고 실행
+        # (동시 실행 한도가 차 있으면 빈 자리를 기다림)
+        result = manager.run(
+            safe_filename,
+            args,
+            cwd=workspace,
+            env=env,
+            timeout=timeout,
+            on_output=execution_output.feed,
         )
+        execution_output.close()
+        stdout_text, stderr_text = execution_output.render()
+        last_output = f"\n[마지막 출력]\n{stdout_text}" if stdout_text.strip() else ""
+        if result.timed_out:
+            return (
+                f"[Error] 실행 시간({timeout}초)을 초과했습니다. 무한 루프(while True 등)나 블로킹 처리를 확인하고 수정하세요. "
+                "정상적으로 오래 걸리는 작업이라면 timeout을 늘리거나 background=True로 실행하세요." + last_output
+            )
+        if result.killed_reason:
+            return f"[Error] {kill_message(result, timeout, manager.limits)}" + last_output
         
-        output = result.stdout
-        if result.stderr:
-            output += f"\n[Error Output]\n{result.stderr}\n[Action Required] 에러 로그의 줄 번호를 확인하고, read_code_file과 edit_code_file로 위 에러를 해결하세요."
+        output = stdout_text
+        if stderr_text:
+            output += f"\n[Error Output]\n{stderr_text}\n[Action Required] 에러 로그의 줄 번호를 확인하고, read_code_file과 edit_code_file로 위 에러를 해결하세요."
             
         if not output.strip():
             output = "[System] 코드가 에러 없이 정상 실행되었으나, 터미널에 출력(print)된 내용이 없습니다."
             
+        output += "\n" + describe_run(mode, archive_dir)
+        if WORKSPACES.over_quota(workspace):
+            output += "\n[Warning] 작업 공간 용량 한도를 넘었습니다. 다음 파일 저장이 거부되니 필요 없는 결과/로그 파일은 지우거나 덮어쓰세요."
         return output
         
-    except subprocess.TimeoutExpired:
-        return "[Error] 실행 시간(30초)을 초과했습니다. 무한 루프(while True 등)나 블로킹 처리를 확인하고 수정하세요."
     except Exception as e:
         return f"[System Error] 코드 실행 오류 발생: {str(e)}"
+    finally:
+        execution_output.close()
+
+
+@tool(parse_docstring=True)
+def check_script_run(run_id: str = "") -> str:
+    """background=True로 실행한 스크립트의 진행 상황(경과 시간, 최근 출력) 또는 최종 결과를 확인합니다.
+
+    Args:
+        run_id: run_python_script가 돌려준 run_id (비우면 전체 백그라운드 실행 목록)
+    """
+    # ✅ 이 대화에서 시작한 실행만 조회
+    manager = get_manager()
+    owner = current_thread_id()
+    if not run_id:
+        runs = manager.runs(owner)
+        if not runs:
+            return "[System] 백그라운드 실행 기록이 없습니다."
+        return "\n".join(run.describe(manager.limits).splitlines()[0] for run in runs)
+
+    run = manager.get(run_id, owner)
+    if run is None:
+        return f"[Error] run_id={run_id} 실행을 찾을 수 없습니다. check_script_run()으로 목록을 확인하세요."
+    return run.describe(manager.limits)
+
+
+@tool(parse_docstring=True)
+def cancel_script_run(run_id: str) -> str:
+    """백그라운드로 실행 중인 스크립트를 중단합니다. (스크립트가 띄운 브라우저 등 하위 프로세스 포함)
+
+    Args:
+        run_id: 중단할 실행의 run_id
+    """
+    if get_manager().cancel(run_id, current_thread_id()):
+        return f"[Success] run_id={run_id} 실행에 중단을 요청했습니다. check_script_run으로 종료를 확인하세요."
+    return f"[Error] run_id={run_id}는 없거나 이미 끝난 실행입니다."
 
 
 @tool(parse_docstring=True)
@@ -152,14 +294,88 @@ def write_text_file(filepath: str, content: str) -> str:
         filepath: 저장할 파일명 (예: config.json, README.md, output.csv)
         content: 저장할 텍스트 전체 내용
     """
-    safe_filepath = os.path.join(ARTIFACT_DIR, os.path.basename(filepath))
-
-    with open(safe_filepath, "w", encoding="utf-8") as f:
-        f.write(content)
+    try:
+        safe_filepath = _write_file(filepath, content)
+    except WorkspaceQuotaError as e:
+        return f"[Error] {e}"
 
     return f"[Success] '{filepath}' 파일이 성공적으로 저장되었습니다. (경로: {safe_filepath})"
 
 
+@tool(parse_docstring=True)
+async def crawl_with_blueprint(blueprint_file: str, output_file: str = "crawl_result.jsonl", max_pages: int = 5, incremental: bool = False, resume: bool = True) -> str:
+    """Blueprint JSON 파일을 코드 작성 없이 내장 크롤링 엔진으로 바로 실행하고, 수집되는 대로 결과 파일에 저장합니다.
+    Blueprint가 주어지면 크롤러 코드를 직접 짜기 전에 이 도구를 먼저 사용하세요.
+
+    Args:
+        blueprint_file: 실행할 Blueprint JSON 파일명 (현재 작업 공간, 없으면 code_artifacts 폴더 기준)
+        output_file: 수집 결과를 저장할 파일명 (확장자로 형식 결정: .jsonl / .json / .csv / .parquet)
+        max_pages: 목록 계층에서 따라갈 최대 페이지 수
+        incremental: True면 이전 수집 이후 새로 생기거나 바뀐 상세 페이지의 레코드만 수집 (정기 재수집용)
+        resume: True면 진행 상황을 저장하고, 같은 Blueprint/결과 파일로 중단된 실행이 있으면 그 지점부터 이어서 수집
+    """
+    from app.crawler.engine import BlueprintExecutor, _as_dict
+    from app.crawler.diagnose import diagnose_run, format_failures
+    from app.crawler.checkpoint import CRAWL_STATE_FILENAME, CrawlStateStore, crawl_id_for
+    from app.crawler.incremental import RecrawlStore
+    from app.crawler.sinks import open_sink
+
+    workspace = WORKSPACES.current()
+    blueprint_path = WORKSPACES.resolve_read(blueprint_file, workspace=workspace)
+    if not os.path.exists(blueprint_path):
+        return f"[Error] Blueprint 파일이 존재하지 않습니다: {blueprint_file}"
+
+    output_path = WORKSPACES.resolve_write(output_file, workspace=workspace)
+    try:
+        WORKSPACES.check_quota(workspace=workspace)
+        sink = open_sink(output_path)
+    except (ValueError, ImportError, WorkspaceQuotaError) as e:
+        return f"[Error] {e}"
+
+    blueprint = _as_dict(blueprint_path)
+    store = RecrawlStore() if incremental else None
+    checkpoint = (
+        CrawlStateStore(
+            crawl_id_for(blueprint, os.path.basename(output_file)),
+            db_path=os.path.join(workspace, CRAWL_STATE_FILENAME),
+        )
+        if resume
+        else None
+    )
+    if checkpoint is not None:
+        checkpoint.attach_sink("output", sink)
+    executor = BlueprintExecutor(blueprint, max_pages=max_pages, incremental=store, checkpoint=checkpoint)
+    samples = []
+    try:
+        with sink:
+            async for record in executor.stream():
+                sink.write(record)
+                if len(samples) < 3:
+                    samples.append(record)
+    except Exception as e:
+        return f"[Error] 엔진 실행 실패: {e} (그때까지 {sink.records_written}개는 '{output_file}'에 저장됨, 다시 호출하면 이어서 수집)\n→ 직접 크롤러 코드를 작성하세요."
+    finally:
+        if store is not None:
+            store.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    stats = executor.stats
+    preview = json.dumps(samples, ensure_ascii=False, indent=2)
+    incremental_note = f"증분 수집: {store.summary()}\n" if store is not None else ""
+    saved_files = ", ".join(os.path.basename(f) for f in sink.files) or output_file
+    # 실패한 계층/셀렉터를 짚어 주면 전체를 다시 짜지 않고 그 계층 셀렉터만 고쳐 다시 실행할 수 있음
+    failures = diagnose_run(blueprint, stats)
+    diagnosis = f"{format_failures(failures)}\n→ 해당 계층의 셀렉터만 고쳐 Blueprint 파일을 수정한 뒤 다시 실행하세요.\n" if failures else ""
+    return (
+        f"[Success] {sink.records_written}개 레코드 수집 → '{saved_files}'\n"
+        f"계층별 페이지 수: {stats['pages']} / 빈 페이지: {stats['empty_pages']} / 오류: {len(stats['errors'])}건\n"
+        f"{incremental_note}"
+        f"{diagnosis}"
+        f"[샘플]\n{preview}"
+    )
+
+
 # =========================================================
 # 🤖 2. 시니어 Coder 에이전트 인스턴스 조립 (Agent)
 # =========================================================
@@ -185,6 +401,7 @@ CODER_SYSTEM_PROMPT = """
 3. 검증 없는 코딩은 없다 (Test-Driven):
    - 코드를 생성했거나 특정 라인을 수정(edit)했다면, 머리로 생각한 대로 돌아갈 것이라 오만하게 확신하지 마세요.
    - 반드시 그 직후에 `run_python_script` 툴을 써서 파이썬 파일을 터미널에서 실행해봐야 합니다.
+   - 파일을 저장하거나 실행할 때 [Preflight] 정적 점검 결과(문법 오류, 정의되지 않은 이름, 없는 모듈, 잘못된 CSS 선택자)가 붙으면 실행 전에 먼저 고치세요.
    - 실행 결과에 붉은색 [Error Output]이 잡히거나 무한 루프에 빠진다면, 당황하지 말고 에러 메시지와 줄 번호(Line number)를 분석하여 위 2번 지침(수술적 수정) 과정을 즉시 반복하여 디버깅하세요.
 
 4. 젠틀한 소통:
@@ -194,7 +411,20 @@ CODER_SYSTEM_PROMPT = """
    - 작성하는 모든 파이썬 코드는 PEP 8 스타일(들여쓰기 4칸, 변수명 snake_case 등)을 준수하세요.
    - 모든 함수와 클래스에는 반드시 한 줄 docstring을 작성하세요. (예: 함수 첫 줄에 기능을 한 문장으로 설명하는 문자열 리터럴)
 
-6. 한계 인정 및 에스컬레이션 (Error Escalation):
+6. Blueprint 우선 실행:
+   - Navigator의 Blueprint JSON 파일이 주어지면, 코드를 작성하기 전에 먼저 `crawl_with_blueprint`로 내장 엔진 실행을 시도하세요.
+   - 결과가 비었거나 엔진이 처리하지 못하는 상호작용(로그인, 복잡한 클릭 흐름 등)이 필요할 때만 직접 크롤러 코드를 작성하세요.
+   - 크롤러를 직접 작성할 때는 결과를 리스트에 모았다가 마지막에 저장하지 말고, `from app.crawler.sinks import open_sink`로
+     Sink를 열어 `sink.write(item)`으로 수집 즉시 저장하세요. (예: `with open_sink("result.jsonl") as sink:` / .csv / .parquet)
+   - 코드 검증은 작은 범위(몇 페이지)로 빠르게 실행하고, 검증이 끝난 전체 크롤링은 `run_python_script(..., background=True)`로
+     실행한 뒤 `check_script_run`으로 진행 상황을 확인하세요. 실행마다 CPU/메모리/파일 크기 한도가 걸려 있습니다.
+   - 디버깅 실행(run_python_script 기본값 network="auto")은 첫 실행의 HTTP 응답을 저장해 두고 이후 실행에서 재생하므로,
+     같은 페이지로 빠르고 결과가 일정하게 반복 테스트할 수 있습니다. 코드가 완성되면 network="live"로 실제 사이트에서 최종 확인하세요.
+   - 파일은 대화마다 분리된 작업 공간에 저장되며 작업 공간마다 용량 한도가 있습니다. 파일 검색(glob/grep)도 현재 작업 공간 안에서만 동작합니다.
+   - 수백 페이지 이상 도는 크롤러는 `from app.crawler.checkpoint import CrawlStateStore`로 방문할 URL과 완료 URL을 기록해,
+     실행 시간 초과로 끊겨도 다시 실행하면 남은 URL부터 이어서 돌도록 작성하세요.
+
+7. 한계 인정 및 에스컬레이션 (Error Escalation):
    - 동일한 에러가 3회 이상 반복되면 스스로 고치려는 시도를 즉시 중단하세요.
    - 대신 다음 내용을 유저에게 명확히 보고하세요:
      1) 발생한 에러 메시지 원문
@@ -204,25 +434,35 @@ CODER_SYSTEM_PROMPT = """
 
 def create_senior_coder(model_name: str = "google_genai:gemini-flash-latest", temperature: float = 0.2):
     """도구가 분리되고 편집 능력이 향상된 시니어 Coder 에이전트를 초기화합니다."""
-    model = init_chat_model(model_name, temperature=temperature)
+    model = get_chat_model(model_name, temperature=temperature)
     checkpointer = InMemorySaver()
 
-    # 5가지 도구: Python 파일 + 텍스트 파일(JSON/MD/CSV 등)
+    # 첫 run_python_script 전에 샌드박스가 라이브러리를 미리 import해 두도록 백그라운드로 띄워 둠
+    warm_up()
+
+    # 8가지 도구: Python 파일 + 텍스트 파일(JSON/MD/CSV 등) + 백그라운드 실행 관리 + Blueprint 직접 실행
     tools = [
         read_code_file,
         edit_code_file,
         create_new_file,
         write_text_file,
         run_python_script,
+        check_script_run,
+        cancel_script_run,
+        crawl_with_blueprint,
     ]
 
-    # FilesystemFileSearchMiddleware: code_artifacts/ 내 파일 검색·열람 능력 추가
+    # WorkspaceFileSearchMiddleware: 현재 대화의 작업 공간(code_artifacts/workspaces/<thread>/) 내 파일 검색·열람 능력 추가
     middleware = [
-        FilesystemFileSearchMiddleware(
-            root_path=ARTIFACT_DIR,
+        WorkspaceFileSearchMiddleware(
+            WORKSPACES,
             use_ripgrep=True,
             max_file_size_mb=10,
-        )
+        ),
+        # 디버깅이 길어져도 매 턴 보내는 프롬프트가 예산을 넘지 않도록 오래된 실행 로그는 줄이고 오래된 턴은 요약
+        TokenBudgetMiddleware(name="Coder"),
+        # 쉬운 단계는 같은 계열의 싼 모델로, 실행 오류가 반복되거나 답이 불확실하면 model_name으로 올림
+        ModelRoutingMiddleware.for_model(model_name, model_kwargs={"temperature": temperature}, name="Coder", retry_low_confidence=True),
     ]
 
     agent = create_agent(
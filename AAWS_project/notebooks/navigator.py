@@ -3,17 +3,28 @@ import sys
 import json
 import re
 from typing import Optional, Any
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator, ValidationInfo
 from dataclasses import dataclass
 
 from dotenv import load_dotenv
-from langchain.chat_models import init_chat_model
 from langchain.tools import tool, ToolRuntime
 from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage
 from langchain.agents.structured_output import ToolStrategy
 from langgraph.checkpoint.memory import InMemorySaver
-from browser_use import Agent, Browser, ChatGoogle
+from browser_use import Agent, Browser
+
+from app.crawler.registry import BlueprintRegistry
+from app.crawler.layer_stream import get_stream
+from app.crawler.repair import REPAIR_STATS, BlueprintRepairError, repair_blueprint_collection, repair_layer
+from app.sandbox.workspace import current_thread_id
+from app.llm import (
+    ModelRoutingMiddleware,
+    TokenBudgetMiddleware,
+    ToolConcurrencyMiddleware,
+    get_browser_use_llm,
+    get_chat_model,
+)
 
 # 초기 설정
 load_dotenv(override=True)
@@ -22,6 +33,9 @@ load_dotenv(override=True)
 ARTIFACT_DIR = os.path.join(os.getenv("PROJECT_ROOT", os.getcwd()), "code_artifacts")
 os.makedirs(ARTIFACT_DIR, exist_ok=True)
 
+# 한 번 설계한 Blueprint를 재사용하기 위한 저장소 (code_artifacts/blueprint_registry.json)
+blueprint_registry = BlueprintRegistry(ARTIFACT_DIR)
+
 
 
 # ==========================================
@@ -46,6 +60,10 @@ class PageLayer(BaseModel):
         default=None,
         description="페이지네이션 방식 (URL파라미터 / AJAX버튼 / 무한스크롤 / None)"
     )
+    more_button: Optional[str] = Field(
+        default=None,
+        description="AJAX버튼 방식일 때 클릭할 '더보기' 버튼의 CSS 셀렉터. 그 외에는 None."
+    )
 
     @field_validator("selectors", mode="before")
     @classmethod
@@ -57,7 +75,7 @@ class PageLayer(BaseModel):
                 pass
         return v
 
-    @field_validator("navigate_to_next", "pagination_method", mode="before")
+    @field_validator("navigate_to_next", "pagination_method", "more_button", mode="before")
     @classmethod
     def parse_none_string(cls, v):
         """LLM이 None을 문자열 "None"으로 반환하는 경우를 처리합니다."""
@@ -100,6 +118,28 @@ class NavigatorBlueprintCollection(BaseModel):
         )
     )
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def repair_before_validation(cls, data, handler, info: ValidationInfo):
+        """검증 전에 로컬 수리(JSON/개수/CSS 문법)를 먼저 하고, 그래도 안 될 때만 LLM에게 다시 요청합니다.
+        Registry에서 불러온 것처럼 모델 출력이 아닌 입력(context={"from_model": False})은 수리 통계에 세지 않습니다.
+        """
+        if isinstance(data, cls) or not isinstance(data, (dict, str)):
+            return handler(data)
+        if info.context and not info.context.get("from_model", True):
+            return handler(data)
+        try:
+            data, fixes = repair_blueprint_collection(data)
+            collection = handler(data)
+        except (BlueprintRepairError, ValidationError):
+            REPAIR_STATS.record("retried")
+            print(f"   ↩️ Blueprint 검증 실패 → LLM 재요청\n   {REPAIR_STATS.summary()}")
+            raise
+        REPAIR_STATS.record("repaired" if fixes else "clean", len(fixes))
+        if fixes:
+            print(f"   🩹 Blueprint 로컬 수리 {len(fixes)}건: " + "; ".join(fixes[:5]) + (" ..." if len(fixes) > 5 else ""))
+        return collection
+
 @dataclass
 class NavigatorContext:
     shared_browser: Any  # Browser 인스턴스를 Context로 주입
@@ -121,6 +161,23 @@ def save_blueprints(collection: NavigatorBlueprintCollection, prefix: str):
     return saved_paths
 
 
+async def register_blueprints(collection: NavigatorBlueprintCollection, scraping_goal: str):
+    """완성된 Blueprint들을 구조 지문과 함께 Registry에 등록 (다음 요청 때 재사용)"""
+    return [await blueprint_registry.register(bp, scraping_goal) for bp in collection.blueprints]
+
+
+async def find_registered_blueprints(url: str, scraping_goal: str) -> Optional[NavigatorBlueprintCollection]:
+    """Registry에서 구조가 바뀌지 않은 Blueprint를 찾으면 Navigator 실행 없이 바로 반환합니다.
+    찾지 못하면 None → Navigator 에이전트를 실행하세요.
+    """
+    blueprint = await blueprint_registry.lookup(url, scraping_goal)
+    if blueprint is None:
+        return None
+    return NavigatorBlueprintCollection.model_validate(
+        {"total_jobs": 1, "blueprints": [blueprint]}, context={"from_model": False}
+    )
+
+
 # ==========================================
 # 도구 1: get_page_structure
 # ==========================================
@@ -134,7 +191,6 @@ async def get_page_structure(url: str, scraping_goal: str) -> str:
         scraping_goal: 수집하려는 데이터 설명. 예) "기사 제목과 링크 URL", "상품명과 가격"
     """
     from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
-    from langchain.chat_models import init_chat_model
     from langchain_core.messages import HumanMessage
     import re
 
@@ -170,7 +226,8 @@ async def get_page_structure(url: str, scraping_goal: str) -> str:
     if not structured_html.strip():
         return "[Warning] HTML이 비어 있습니다. JS 렌더링 실패 가능성.\n→ browse_web을 사용하세요."
 
-    analysis_llm = init_chat_model("google_genai:gemini-flash-latest", temperature=0)
+    # 호출마다 새로 만들지 않고 프로세스 공용 클라이언트(연결 풀)를 재사용, 같은 HTML/목표면 저장된 분석 결과를 재사용
+    analysis_llm = get_chat_model("google_genai:gemini-flash-latest", temperature=0, cache_site="get_page_structure")
 
     analysis_prompt = f"""아래 HTML에서 "{scraping_goal}"에 해당하는 요소의 CSS 셀렉터를 찾고 JSON으로만 응답하세요.
     [분석할 HTML]
@@ -305,7 +362,7 @@ async def browse_web(runtime: ToolRuntime[NavigatorContext], url: str, instructi
     """
     print(f"\n🌐 [browse_web] {'→ ' + url if url else '현재 페이지 이어서'}")
     print(f"   📋 작업: {instruction}")
-    bu_llm = ChatGoogle(model="gemini-flash-latest")
+    bu_llm = get_browser_use_llm("gemini-flash-latest")
     
     if url:
         nav_prefix = (
@@ -339,6 +396,35 @@ async def browse_web(runtime: ToolRuntime[NavigatorContext], url: str, instructi
     return result
 
 
+# ==========================================
+# 도구 4: publish_verified_layer
+# ==========================================
+@tool(parse_docstring=True)
+async def publish_verified_layer(layer_index: int, layer_json: str, entry_urls: list[str], rendering_type: str) -> str:
+    """셀렉터 검증이 끝난 계층 하나를 즉시 확정해 하류 크롤링이 바로 시작되게 합니다.
+    다음 계층을 분석하기 전에, 방금 검증을 마친 계층을 이 도구로 먼저 발행하세요. 발행한 계층은 바꿀 수 없습니다.
+
+    Args:
+        layer_index: 계층 번호 (0부터, layers 리스트의 순서와 동일)
+        layer_json: PageLayer 하나의 JSON 문자열 (layer_name, url_pattern, selectors, navigate_to_next, pagination_method)
+        entry_urls: 크롤링을 시작할 URL 목록 (Blueprint의 entry_urls와 동일)
+        rendering_type: Static SSR 또는 Dynamic CSR/JS
+    """
+    stream = get_stream(current_thread_id())
+    if stream is None:
+        return "[System] 계층 스트리밍을 쓰지 않는 실행입니다. 발행 없이 계속 진행해 최종 Blueprint에 포함하세요."
+    if layer_index != stream.next_expected():
+        return f"[Error] 계층은 순서대로 발행해야 합니다. 다음으로 발행할 계층 번호는 {stream.next_expected()}입니다."
+    try:
+        layer, fixes = repair_layer(layer_json)
+        layer = PageLayer.model_validate(layer).model_dump()
+    except (BlueprintRepairError, ValidationError) as e:
+        return f"[Error] 계층을 발행하지 못했습니다. 고쳐서 다시 호출하세요.\n{e}"
+    stream.publish(layer_index, layer, entry_urls=entry_urls, rendering_type=rendering_type)
+    print(f"\n📡 [publish_verified_layer] L{layer_index + 1} '{layer['layer_name']}' 발행 (수리 {len(fixes)}건)")
+    return f"[Success] L{layer_index + 1} 계층을 발행했습니다. 하류 크롤링이 시작됩니다. 다음 계층 분석을 이어가세요."
+
+
 # ==========================================
 # Navigator 에이전트 생성
 # ==========================================
@@ -370,6 +456,16 @@ NAVIGATOR_SYSTEM_PROMPT = """
     (2) 동적 페이지에서 특정 상호작용 후 데이터가 로드되는지 확인할 때
     (3) 팝업, 캡차, 로그인 창 등의 Anti-Bot 요소가 가로막고 있는지 검증할 때
 
+■ 동시 호출
+  - 서로 결과에 의존하지 않는 호출(여러 entry_urls 각각의 get_page_structure, 여러 셀렉터 후보의 verify_selectors_with_samples)은
+    한 번에 나눠 부르지 말고 같은 턴에 함께 호출하세요. 동시에 실행되어 훨씬 빨리 끝납니다.
+  - browse_web은 하나의 브라우저 세션을 공유하므로 한 번에 하나씩만 실행됩니다.
+
+■ publish_verified_layer(layer_index, layer_json, entry_urls, rendering_type)
+  - 한 계층의 셀렉터를 verify_selectors_with_samples로 검증해 확정했다면, 다음 계층으로 넘어가기 전에 바로 발행하세요.
+  - 발행된 계층은 그 즉시 크롤링이 시작되므로 (예: 목록을 먼저 수집) 전체 Blueprint 완성까지 기다리지 않아도 됩니다.
+  - 계층은 0번부터 순서대로 발행하고, 최종 Blueprint에도 같은 계층을 그대로 포함하세요.
+
 ────────────────
 [Blueprint 핵심 판단 가이드: Coder에게 넘겨줄 필수 정보]
 **아래 항목들은 Coder가 코드를 짜는 핵심 기준이 되므로 매우 정확하게 판단해야 합니다.**
@@ -380,7 +476,7 @@ NAVIGATOR_SYSTEM_PROMPT = """
 
 2. pagination_method (페이지 이동 방식)
    - "URL파라미터": 2페이지 이동 시 ?page=2 처럼 URL이 변경됨
-   - "AJAX버튼": URL 변경 없이 '더보기' 버튼 등으로 목록이 추가됨
+   - "AJAX버튼": URL 변경 없이 '더보기' 버튼 등으로 목록이 추가됨 (버튼 셀렉터는 more_button에 적으세요)
    - "무한스크롤": 마우스 스크롤을 내리면 자동 로드됨
    - "None": 페이징 없음
 
@@ -400,14 +496,91 @@ NAVIGATOR_SYSTEM_PROMPT = """
 - 확신이 들 때까지 도구를 사용해 검증하고 꼼꼼하게 작성하세요.
 """
 
-nav_model = init_chat_model("google_genai:gemini-flash-latest", temperature=0.1)
+nav_model = get_chat_model("google_genai:gemini-flash-latest", temperature=0.1)
 nav_checkpointer = InMemorySaver()
 
 navigator_agent = create_agent(
     model=nav_model,
     system_prompt=NAVIGATOR_SYSTEM_PROMPT,
     context_schema=NavigatorContext,
-    tools=[get_page_structure, verify_selectors_with_samples, browse_web],
+    tools=[get_page_structure, verify_selectors_with_samples, browse_web, publish_verified_layer],
+    # 검증 샘플/페이지 구조 분석 결과가 쌓여도 프롬프트가 예산을 넘지 않도록 오래된 출력은 줄이고 오래된 턴은 요약
+    middleware=[
+        TokenBudgetMiddleware(name="Navigator"),
+        # 평소엔 flash-lite, Blueprint 구조화 출력 검증 실패나 반복 도구 오류에서만 flash
+        ModelRoutingMiddleware.for_model("google_genai:gemini-flash-latest", model_kwargs={"temperature": 0.1}, name="Navigator", retry_low_confidence=True),
+        # 한 턴의 독립적인 도구 호출은 동시에 실행 (헤드리스 브라우저는 프로세스 전체 슬롯 안에서, 공유 브라우저를 쓰는 browse_web은 1개씩)
+        ToolConcurrencyMiddleware(
+            tool_resources={
+                "get_page_structure": "browser",
+                "verify_selectors_with_samples": "browser",
+                "browse_web": "browser",
+            },
+            tool_limits={"browse_web": 1},
+            name="Navigator",
+        ),
+    ],
     checkpointer=nav_checkpointer,
     response_format=ToolStrategy(NavigatorBlueprintCollection),
 )
+
+
+# ==========================================
+# 실패한 계층만 다시 검증 (Layer Repair)
+# ==========================================
+# 크롤링이 실패했을 때 Navigator 전체를 다시 돌리면 이미 잘 되는 앞 계층까지 다시 분석/검증합니다.
+# app.crawler.diagnose가 짚어 준 계층 하나만 이 에이전트로 다시 분석해 PageLayer 하나를 돌려받습니다.
+LAYER_REPAIR_SYSTEM_PROMPT = """
+당신은 크롤링 Blueprint의 계층 하나를 고치는 'Layer Repair' 담당입니다.
+Blueprint의 다른 계층은 이미 검증이 끝나 정상 동작하므로 절대 건드리지 않습니다.
+
+[작업 순서]
+1. 실패 보고서의 예시 URL에 get_page_structure를 호출해 현재 페이지 구조를 확인합니다.
+2. 실패한 셀렉터(필드 또는 navigate_to_next)를 고친 후보를 verify_selectors_with_samples로 검증합니다.
+   - 샘플이 비어 있거나 "None"이면 실패입니다. 다른 후보로 다시 검증하세요.
+3. 실패하지 않은 필드의 셀렉터는 그대로 두고, 검증된 셀렉터로 바꾼 PageLayer 하나를 최종 응답으로 돌려주세요.
+   - layer_name, url_pattern, pagination_method는 특별한 이유가 없으면 기존 값을 유지합니다.
+"""
+
+layer_repair_agent = create_agent(
+    model=nav_model,
+    system_prompt=LAYER_REPAIR_SYSTEM_PROMPT,
+    tools=[get_page_structure, verify_selectors_with_samples],
+    middleware=[
+        TokenBudgetMiddleware(name="LayerRepair"),
+        ModelRoutingMiddleware.for_model("google_genai:gemini-flash-latest", model_kwargs={"temperature": 0.1}, name="LayerRepair", retry_low_confidence=True),
+        ToolConcurrencyMiddleware(
+            tool_resources={"get_page_structure": "browser", "verify_selectors_with_samples": "browser"},
+            name="LayerRepair",
+        ),
+    ],
+    response_format=ToolStrategy(PageLayer),
+)
+
+
+async def repair_failed_layer(blueprint: dict, failure, scraping_goal: str) -> Optional[dict]:
+    """diagnose_run()이 찾은 실패(LayerFailure) 계층 하나만 다시 분석/검증해 고친 PageLayer dict를 돌려줍니다.
+    고치지 못하면 None (notebooks/pipeline.py의 layer_repairer로 그대로 넘길 수 있음)
+    """
+    from app.crawler.diagnose import format_failures
+
+    layers = blueprint.get("layers") or []
+    index = failure.layer_index
+    layer = layers[index]
+    # 앞/뒤 계층은 참고용으로만 보여 줌 (어떤 링크로 이 계층에 들어오는지, 이 계층 링크가 어디로 가야 하는지)
+    neighbours = {
+        f"L{i + 1}": layers[i] for i in (index - 1, index + 1) if 0 <= i < len(layers)
+    }
+    print(f"\n🩹 [repair_failed_layer] L{index + 1} '{layer.get('layer_name')}' 다시 검증 ({failure.kind})")
+    response = await layer_repair_agent.ainvoke(
+        {"messages": [HumanMessage(
+            f"수집 목표: {scraping_goal}\n\n"
+            f"{format_failures([failure])}\n\n"
+            f"[고칠 계층 L{index + 1}]\n{json.dumps(layer, ensure_ascii=False, indent=2)}\n\n"
+            f"[참고: 이웃 계층 (수정 금지)]\n{json.dumps(neighbours, ensure_ascii=False, indent=2)}"
+        )]},
+    )
+    repaired = response.get("structured_response")
+    if repaired is None:
+        return None
+    return repaired.model_dump()
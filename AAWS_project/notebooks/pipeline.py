@@ -0,0 +1,531 @@
+import os
+import json
+import asyncio
+import time
+import uuid
+import operator
+from typing import Annotated, Any, Optional
+
+from typing_extensions import TypedDict
+from langchain_core.messages import HumanMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+
+from app.crawler.diagnose import diagnose_run, format_failures
+from app.crawler.engine import BlueprintExecutor, _as_dict
+from app.crawler.layer_stream import discard_stream, open_stream
+from app.crawler.sinks import open_sink
+from app.llm.concurrency import SlotPool
+
+# ==========================================
+# 🔀 Navigator → Coder Map-Reduce 파이프라인
+# ==========================================
+# 노트북의 PipelineState 그래프는 Navigator 노드 하나 → Coder 노드 하나로 URL 하나만 처리하고,
+# thread_id가 "nav_pipeline"/"coder_pipeline"으로 고정되어 있어 파이프라인 두 개를 동시에 돌릴 수 없습니다.
+#
+# 이 그래프는
+#   1) navigator: Blueprint 모음(NavigatorBlueprintCollection)을 만들고
+#   2) fan-out: Blueprint × entry_url마다 브랜치 하나씩 Send로 나눠 (브랜치 Blueprint는 entry_urls가 1개)
+#   3) branch: 동시에 최대 max_parallel개까지 Coder(또는 내장 엔진)로 수집하고
+#   4) reduce: 브랜치 결과 파일을 merged.jsonl 하나로 합친 뒤, 실제 걸린 시간과 순차 실행 시간(합계)을 비교해 보고합니다.
+# mode="stream"이면 Navigator가 publish_verified_layer로 발행하는 계층을 받아 Navigator가 끝나기 전에 크롤링을 시작하고
+# (1계층 목록 레코드가 먼저 나오고, 다음 계층이 발행되면 보관해 둔 링크부터 이어서 방문), 나머지 Blueprint는 엔진 브랜치로 나눕니다.
+# Navigator가 끝나면 진행 중인 스트림 수집은 stream 브랜치로 넘어가 다른 엔진 브랜치와 동시에 끝까지 진행됩니다.
+# layer_repairer를 주면 엔진 수집(engine/stream) 후 diagnose_run()으로 실패한 계층을 찾아 그 계층만 다시 검증하고,
+# 앞 계층에서 모은 링크(executor.spawned[k])를 seeds로 넘겨 실패한 계층부터만 다시 수집합니다. (앞 계층은 다시 받지 않음)
+# 실행마다 run_id가 새로 붙고 Navigator/브랜치마다 thread_id가 달라서 (작업 공간도 분리) 여러 파이프라인을 동시에 돌릴 수 있습니다.
+#
+# 사용 예)
+#     pipeline = build_pipeline(navigator_agent, coder_agent, navigator_context=NavigatorContext(shared_browser=browser))
+#     result = await pipeline.ainvoke(new_run("정치 섹션 기사 제목과 URL 수집", "https://news.naver.com/section/100"))
+#     print(result["report"])
+#
+# 환경 변수: AAWS_PIPELINE_MAX_PARALLEL=3
+
+DEFAULT_MAX_PARALLEL = int(os.getenv("AAWS_PIPELINE_MAX_PARALLEL", "3"))
+PIPELINE_DIRNAME = "pipeline"
+BRANCH_OUTPUT = "result.jsonl"
+MERGED_OUTPUT = "merged.jsonl"
+
+# 브랜치 실행 방식
+CODER = "coder"    # Coder 에이전트가 Blueprint로 크롤러를 실행/디버깅
+ENGINE = "engine"  # LLM 없이 내장 엔진(BlueprintExecutor)으로 바로 수집
+STREAM = "stream"  # Navigator가 발행하는 계층을 받아 바로 엔진으로 수집 (나머지 Blueprint는 engine 브랜치)
+STREAM_OUTPUT = "streamed.jsonl"
+
+
+class PipelineState(TypedDict, total=False):
+    """Navigator와 브랜치들이 공유하는 파이프라인 상태"""
+    user_goal: str  # 사용자의 수집 목표
+    url: str  # Navigator가 분석할 시작 URL
+    run_id: str  # 실행마다 고유한 ID (thread_id, 결과 폴더 이름에 사용)
+    started_at: float  # 파이프라인 시작 시각 (time.time)
+    blueprints: list[dict]  # Navigator가 만든 Blueprint 목록
+    navigator_seconds: float
+    reused_blueprint: bool  # 저장소의 Blueprint를 재사용해 Navigator를 건너뛰었는지
+    branch_results: Annotated[list[dict], operator.add]  # 브랜치마다 하나씩 추가됨
+    report: dict  # reduce 단계의 최종 보고
+
+
+class BranchState(TypedDict):
+    """브랜치 하나(Blueprint 하나 × entry_url 하나)의 입력"""
+    user_goal: str
+    run_id: str
+    branch: int
+    blueprint: dict
+
+
+def new_run(user_goal: str, url: str, run_id: Optional[str] = None) -> PipelineState:
+    """파이프라인 입력 상태. run_id를 비우면 새로 만듭니다."""
+    return {
+        "user_goal": user_goal,
+        "url": url,
+        "run_id": run_id or f"pipeline-{uuid.uuid4().hex[:8]}",
+        "started_at": time.time(),
+        "branch_results": [],
+    }
+
+
+def split_branches(blueprints: list[dict]) -> list[dict]:
+    """Blueprint × entry_url 조합마다 entry_urls가 1개인 Blueprint를 만듭니다."""
+    branches = []
+    for blueprint in blueprints:
+        for url in blueprint.get("entry_urls") or []:
+            branches.append({**blueprint, "entry_urls": [url]})
+    return branches
+
+
+def read_records(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+    return records
+
+
+def count_records(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def build_pipeline(
+    navigator_agent,
+    coder_agent=None,
+    navigator_context: Any = None,
+    coder_context: Any = None,
+    mode: str = CODER,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+    artifact_dir: Optional[str] = None,
+    workspaces=None,
+    max_pages: int = 5,
+    layer_repairer=None,
+    repair_rounds: int = 1,
+    registry=None,
+    reuse_blueprints: bool = True,
+):
+    """Navigator → (Blueprint × entry_url 브랜치) → reduce 그래프를 만들어 컴파일합니다.
+
+    Args:
+        navigator_agent: structured_response로 NavigatorBlueprintCollection을 돌려주는 Navigator 에이전트
+        coder_agent: mode="coder"일 때 브랜치를 처리할 Coder 에이전트 (create_senior_coder())
+        navigator_context / coder_context: 각 에이전트 호출에 넘길 context
+        mode: "coder"(Coder가 크롤러 실행/디버깅), "engine"(LLM 없이 내장 엔진으로 수집),
+            "stream"(Navigator가 발행하는 계층마다 바로 엔진으로 수집)
+        max_parallel: 동시에 실행할 브랜치 수
+        artifact_dir: 결과를 모을 폴더 (기본: code_artifacts). 실행마다 <artifact_dir>/pipeline/<run_id>/
+        workspaces: Coder 작업 공간 관리자 (mode="coder"일 때 브랜치 결과 파일 위치를 찾는 데 사용)
+        max_pages: 엔진으로 수집할 때 목록 계층에서 따라갈 최대 페이지 수
+        layer_repairer: async (blueprint, LayerFailure, user_goal) -> 고친 PageLayer dict (또는 None).
+            주면 엔진 수집이 실패한 계층만 다시 검증/수집합니다. (예: notebooks.navigator.repair_failed_layer)
+        repair_rounds: 실패한 계층을 고쳐 다시 수집하는 최대 횟수
+        registry: Blueprint 저장소 (기본: <artifact_dir>/blueprint_registry.json).
+            Navigator 전에 (도메인, URL 패턴, 목표)로 찾아 구조 지문이 그대로면 Navigator를 건너뛰고, 새로 만든 Blueprint는 등록합니다.
+        reuse_blueprints: False면 저장소를 보지 않고 항상 Navigator를 실행합니다.
+    """
+    if mode not in (CODER, ENGINE, STREAM):
+        raise ValueError(f"지원하지 않는 mode입니다: {mode} (가능: {CODER}, {ENGINE}, {STREAM})")
+    if mode == CODER and coder_agent is None:
+        raise ValueError("mode='coder'에는 coder_agent가 필요합니다.")
+    if artifact_dir is None:
+        from app.crawler.registry import ARTIFACT_DIR
+
+        artifact_dir = ARTIFACT_DIR
+    if mode == CODER and workspaces is None:
+        from app.sandbox.workspace import WorkspaceManager
+
+        workspaces = WorkspaceManager(artifact_dir)
+    if reuse_blueprints and registry is None:
+        from app.crawler.registry import BlueprintRegistry
+
+        registry = BlueprintRegistry(artifact_dir)
+
+    # 같은 그래프로 동시에 돌리는 파이프라인들도 이 한도를 함께 씀 (이벤트 루프에 묶이지 않는 슬롯)
+    branch_slots = SlotPool("pipeline", max_parallel)
+
+    # run_id → Navigator와 함께 시작한 스트림 수집 태스크 (stream 브랜치가 이어받아 기다림)
+    stream_tasks: dict[str, asyncio.Task] = {}
+
+    def run_dir(run_id: str) -> str:
+        path = os.path.join(artifact_dir, PIPELINE_DIRNAME, run_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    # ---------- 1. Navigator ----------
+    async def find_registered(state: PipelineState) -> Optional[dict]:
+        if not reuse_blueprints:
+            return None
+        try:
+            return await registry.lookup(state["url"], state["user_goal"])
+        except Exception as e:
+            print(f"   ⚠️ [Pipeline {state['run_id']}] Blueprint 저장소 조회 실패 ({e}) → Navigator로 분석합니다.")
+            return None
+
+    async def register_blueprints(state: PipelineState, blueprints: list[dict]):
+        if not reuse_blueprints:
+            return
+        for blueprint in blueprints:
+            try:
+                await registry.register(blueprint, state["user_goal"])
+            except Exception as e:
+                print(f"   ⚠️ [Pipeline {state['run_id']}] Blueprint 등록 실패 ({e})")
+
+    async def navigator_node(state: PipelineState) -> dict:
+        start = time.perf_counter()
+        registered = await find_registered(state)
+        if registered is not None:
+            # 구조가 그대로인 사이트는 Navigator(LLM) 없이 저장된 Blueprint로 바로 브랜치를 나눔
+            seconds = time.perf_counter() - start
+            print(f"♻️ [Pipeline {state['run_id']}] 저장된 Blueprint 재사용 - Navigator 생략 ({seconds:.1f}초)")
+            return {"navigator_seconds": seconds, "blueprints": [registered], "reused_blueprint": True}
+
+        print(f"🔍 [Pipeline {state['run_id']}] Navigator 시작: {state['user_goal']} ({state['url']})")
+        thread_id = f"{state['run_id']}-nav"
+        stream = open_stream(thread_id) if mode == STREAM else None
+        crawl_task = asyncio.create_task(stream_crawl(state, stream)) if stream is not None else None
+        blueprints = []
+        produced = []  # 저장소에 등록할 Navigator 결과 (스트림으로 닫은 Blueprint 포함)
+        try:
+            response = await navigator_agent.ainvoke(
+                {"messages": [HumanMessage(
+                    f"목표: {state['user_goal']}\n"
+                    f"URL: {state['url']}\n\n"
+                    f"이 페이지를 분석하고 데이터 수집 Blueprint을 생성해주세요."
+                )]},
+                config={"configurable": {"thread_id": thread_id}},
+                context=navigator_context,
+            )
+            collection = response.get("structured_response")
+            blueprints = [_as_dict(bp) for bp in collection.blueprints] if collection is not None else []
+            produced = list(blueprints)
+        except BaseException:
+            # Navigator가 실패하면 먼저 시작한 스트림 수집도 정리 (기다리지 않으면 태스크가 남아 계속 수집함)
+            if crawl_task is not None:
+                crawl_task.cancel()
+                await asyncio.gather(crawl_task, return_exceptions=True)
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            if stream is not None:
+                # 발행된 계층과 같은 시작 URL의 Blueprint로 스트림을 닫고 (발행 안 된 나머지 계층은 거기서 채움), 그 외는 브랜치로
+                streamed = next((bp for bp in blueprints if bp.get("entry_urls") == stream.entry_urls), blueprints[0] if blueprints else None)
+                stream.close(streamed)
+                blueprints = [bp for bp in blueprints if bp is not streamed]
+                discard_stream(thread_id)
+        if crawl_task is not None:
+            changed = stream.changed_layers()
+            if changed:
+                print(f"   ⚠️ [Pipeline {state['run_id']}] 발행 후 최종 Blueprint에서 바뀐 계층: {[i + 1 for i in changed]} (발행된 셀렉터로 수집)")
+            # 여기서 기다리면 나머지 브랜치가 스트림 수집이 끝난 뒤에야 시작하므로, stream 브랜치에서 기다림
+            stream_tasks[state["run_id"]] = crawl_task
+
+        await register_blueprints(state, produced)
+        directory = run_dir(state["run_id"])
+        for i, blueprint in enumerate(blueprints):
+            with open(os.path.join(directory, f"blueprint_{i + 1}.json"), "w", encoding="utf-8") as f:
+                json.dump(blueprint, f, ensure_ascii=False, indent=2)
+        print(f"✅ [Pipeline {state['run_id']}] Navigator 완료 - Blueprint {len(blueprints)}개 ({seconds:.1f}초)")
+        return {"navigator_seconds": seconds, "blueprints": blueprints}
+
+    async def stream_crawl(state: PipelineState, stream) -> dict:
+        """발행되는 계층을 받아 이어 붙이며 수집합니다. (Navigator와 동시에 실행)"""
+        output = os.path.join(run_dir(state["run_id"]), STREAM_OUTPUT)
+        result = {"branch": 0, "entry_url": "", "wait": 0.0, "output": output, "records": 0, "partial_records": 0}
+        start = time.perf_counter()
+        layers = stream.layers()
+        feeder = None
+        try:
+            first = await anext(layers, None)
+            if first is None:
+                result.update(status="ok", seconds=0.0)
+                return result
+            result["entry_url"] = ", ".join(stream.entry_urls)
+            print(f"📡 [Pipeline {state['run_id']}] L1 계층을 받아 Navigator보다 먼저 수집을 시작합니다.")
+            blueprint = {"entry_urls": stream.entry_urls, "rendering_type": stream.rendering_type, "layers": [first[1]]}
+            executor = BlueprintExecutor(blueprint, max_pages=max_pages, open_layers=True)
+
+            async def feed_layers():
+                try:
+                    async for _, layer in layers:
+                        executor.add_layer(layer)
+                finally:
+                    executor.finish_layers()
+
+            feeder = asyncio.create_task(feed_layers())
+            with open_sink(output) as sink:
+                async for record in executor.stream():
+                    if not result["records"]:
+                        result["first_record_seconds"] = round(time.time() - state["started_at"], 3)
+                        print(f"🥇 [Pipeline {state['run_id']}] 첫 레코드 수집 ({result['first_record_seconds']:.1f}초)")
+                    sink.write(record)
+                    result["records"] += 1
+                    result["partial_records"] += bool(record.get("_partial"))
+            await feeder
+            blueprint = {**blueprint, "layers": list(executor.layers)}
+            await repair_failed_layers(state, blueprint, executor, output, result)
+            result["status"] = "ok"
+        except Exception as e:
+            result.update(status="error", error=f"{type(e).__name__}: {e}")
+        finally:
+            if feeder is not None and not feeder.done():
+                feeder.cancel()
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    # ---------- 실패한 계층만 다시 검증/수집 ----------
+    async def repair_failed_layers(state: dict, blueprint: dict, executor: BlueprintExecutor, output: str, result: dict):
+        """진단 결과를 result에 남기고, layer_repairer가 있으면 실패한 계층만 고쳐 그 계층부터 다시 수집합니다."""
+        failures = diagnose_run(blueprint, executor.stats)
+        result["failures"] = [f.to_dict() for f in failures]
+        if not failures:
+            return
+        print(format_failures(failures))
+        if layer_repairer is None:
+            return
+        repairs = result.setdefault("repairs", [])
+        for _ in range(repair_rounds):
+            failure = failures[0]
+            k = failure.layer_index
+            seeds = [(k, url, context) for url, context in executor.spawned[k]]
+            if not seeds:
+                break
+            layer = await layer_repairer(blueprint, failure, state["user_goal"])
+            if not layer:
+                print(f"   ⚠️ [Pipeline {state['run_id']}] L{k + 1} 계층을 고치지 못했습니다.")
+                break
+            blueprint = {**blueprint, "layers": [*blueprint["layers"][:k], layer, *blueprint["layers"][k + 1:]]}
+            start = time.perf_counter()
+            rerun = BlueprintExecutor(blueprint, max_pages=max_pages, seeds=seeds)
+            # 실패한 계층보다 앞에서 나온 부분 레코드(stream 모드의 _layer)만 남기고, 나머지는 다시 수집한 레코드로 바꿈
+            kept = [r for r in read_records(output) if r.get("_layer", k) < k]
+            with open_sink(output) as sink:
+                for record in kept:
+                    sink.write(record)
+                records = 0
+                async for record in rerun.stream():
+                    sink.write(record)
+                    records += 1
+            failures = diagnose_run(blueprint, rerun.stats)
+            repairs.append({
+                "layer": k,
+                "kind": failure.kind,
+                "selector": failure.selector,
+                "seeds": len(seeds),
+                "reused_layers": k,
+                "pages_refetched": sum(rerun.stats["pages"]),
+                "records": len(kept) + records,
+                "seconds": round(time.perf_counter() - start, 3),
+                "fixed": not any(f.layer_index == k for f in failures),
+            })
+            print(
+                f"🩹 [Pipeline {state['run_id']}] L{k + 1}부터 다시 수집: 시작 URL {len(seeds)}개, "
+                f"다시 받은 페이지 {sum(rerun.stats['pages'])}개 (앞 계층 {k}개 재사용), 레코드 {len(kept) + records}개"
+            )
+            executor = rerun
+            if not failures:
+                break
+        result["failures"] = [f.to_dict() for f in failures]
+        with open(os.path.join(run_dir(state["run_id"]), f"blueprint_{result['branch']}_repaired.json"), "w", encoding="utf-8") as f:
+            json.dump(blueprint, f, ensure_ascii=False, indent=2)
+
+    # ---------- 2. Fan-out ----------
+    def fan_out(state: PipelineState):
+        branches = split_branches(state.get("blueprints") or [])
+        sends = [
+            Send("branch", {"user_goal": state["user_goal"], "run_id": state["run_id"], "branch": i, "blueprint": bp})
+            for i, bp in enumerate(branches, 1)
+        ]
+        if state["run_id"] in stream_tasks:
+            sends.append(Send("stream", {"run_id": state["run_id"]}))
+        if not sends:
+            return "reduce"
+        print(f"🔀 [Pipeline {state['run_id']}] 브랜치 {len(branches)}개 (동시 최대 {max_parallel}개)"
+              + (" + 진행 중인 스트림 수집" if len(sends) > len(branches) else ""))
+        return sends
+
+    # ---------- 3. 브랜치 ----------
+    async def run_with_coder(state: BranchState, directory: str, result: dict) -> str:
+        thread_id = f"{state['run_id']}-coder-{state['branch']}"
+        # 브랜치 Blueprint는 그 브랜치 Coder의 작업 공간에 둠 (다른 브랜치/파이프라인과 파일이 겹치지 않음)
+        workspace = workspaces.path_for(thread_id)
+        blueprint_file = f"blueprint_{state['branch']}.json"
+        with open(os.path.join(workspace, blueprint_file), "w", encoding="utf-8") as f:
+            json.dump(state["blueprint"], f, ensure_ascii=False, indent=2)
+        await coder_agent.ainvoke(
+            {"messages": [HumanMessage(
+                f"Blueprint 파일 '{blueprint_file}'을 기반으로 '{state['user_goal']}' 데이터를 수집해주세요.\n"
+                f"먼저 crawl_with_blueprint로 실행해 보고, 안 되면 크롤러 코드를 직접 작성해 실행하세요.\n"
+                f"결과는 반드시 '{BRANCH_OUTPUT}' (JSON Lines, 한 줄에 레코드 하나)로 저장하세요."
+            )]},
+            config={"configurable": {"thread_id": thread_id}},
+            context=coder_context,
+        )
+        return os.path.join(workspace, BRANCH_OUTPUT)
+
+    async def run_with_engine(state: BranchState, directory: str, result: dict) -> str:
+        output = os.path.join(directory, f"branch_{state['branch']}.jsonl")
+        executor = BlueprintExecutor(state["blueprint"], max_pages=max_pages)
+        with open_sink(output) as sink:
+            async for record in executor.stream():
+                sink.write(record)
+        await repair_failed_layers(state, state["blueprint"], executor, output, result)
+        return output
+
+    async def branch_node(state: BranchState) -> dict:
+        entry_url = state["blueprint"]["entry_urls"][0]
+        directory = run_dir(state["run_id"])
+        queued = time.perf_counter()
+        async with branch_slots.ahold():
+            start = time.perf_counter()
+            print(f"💻 [Pipeline {state['run_id']}] 브랜치 {state['branch']} 시작: {entry_url}")
+            result = {"branch": state["branch"], "entry_url": entry_url, "wait": round(start - queued, 3)}
+            try:
+                runner = run_with_coder if mode == CODER else run_with_engine
+                output = await runner(state, directory, result)
+                result.update(status="ok", output=output, records=count_records(output))
+            except Exception as e:
+                result.update(status="error", error=f"{type(e).__name__}: {e}", output=None, records=0)
+            result["seconds"] = round(time.perf_counter() - start, 3)
+        icon = "✅" if result["status"] == "ok" else "❌"
+        print(f"{icon} [Pipeline {state['run_id']}] 브랜치 {state['branch']} 종료: {result['records']}개 ({result['seconds']:.1f}초)")
+        return {"branch_results": [result]}
+
+    async def stream_node(state: PipelineState) -> dict:
+        """Navigator와 함께 시작한 스트림 수집이 끝나길 기다립니다. (엔진 브랜치와 동시에 진행)"""
+        task = stream_tasks.pop(state["run_id"])
+        return {"branch_results": [await task]}
+
+    # ---------- 4. Reduce ----------
+    def reduce_node(state: PipelineState) -> dict:
+        directory = run_dir(state["run_id"])
+        results = sorted(state.get("branch_results") or [], key=lambda r: r["branch"])
+        merged_path = os.path.join(directory, MERGED_OUTPUT)
+        merged = 0
+        with open(merged_path, "w", encoding="utf-8") as out:
+            for result in results:
+                if not result.get("output") or not os.path.exists(result["output"]):
+                    continue
+                records = read_records(result["output"])
+                # 스트림 수집이 다음 계층을 받기 전에 먼저 내보낸 목록 레코드(_partial)는
+                # 최종 계층 레코드가 있으면 빼고, 다음 계층이 끝내 없었을 때만 결과로 남깁니다.
+                if any(not r.get("_partial") for r in records):
+                    records = [r for r in records if not r.get("_partial")]
+                for record in records:
+                    record = {**record, "_branch": result["branch"], "_entry_url": result["entry_url"]}
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    merged += 1
+
+        wall = time.time() - state["started_at"]
+        navigator_seconds = state.get("navigator_seconds", 0.0)
+        # 기존 그래프처럼 브랜치를 하나씩 돌렸다면 걸렸을 시간의 추정치 (Navigator + 브랜치 실행 시간 합계)
+        # 실제로 max_parallel=1로 돌린 값이 아니라, 동시 실행 중 서로 느려진 만큼 실제 순차 실행보다 클 수 있음
+        sequential = navigator_seconds + sum(r["seconds"] for r in results)
+        report = {
+            "run_id": state["run_id"],
+            "branches": len(results),
+            "failed": [r["branch"] for r in results if r["status"] != "ok"],
+            # 진단으로 찾은 실패 계층이 남은 브랜치, 계층만 다시 검증/수집한 내역
+            "layer_failures": {r["branch"]: r["failures"] for r in results if r.get("failures")},
+            "layer_repairs": {r["branch"]: r["repairs"] for r in results if r.get("repairs")},
+            "records": merged,
+            "merged_output": merged_path,
+            "navigator_seconds": round(navigator_seconds, 3),
+            "reused_blueprint": bool(state.get("reused_blueprint")),
+            "wall_seconds": round(wall, 3),
+            "sequential_estimate_seconds": round(sequential, 3),
+            "speedup": round(sequential / wall, 2) if wall > 0 else 1.0,
+            "first_record_seconds": min((r["first_record_seconds"] for r in results if "first_record_seconds" in r), default=None),
+            "branch_results": results,
+        }
+        with open(os.path.join(directory, "report.json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(
+            f"🏁 [Pipeline {state['run_id']}] 브랜치 {len(results)}개 (실패 {len(report['failed'])}개), 레코드 {merged}개 → {merged_path}\n"
+            f"   ⏱️ 실제 {wall:.1f}초 / 순차 실행 추정 {sequential:.1f}초 (추정 x{report['speedup']})"
+        )
+        for branch, repairs in report["layer_repairs"].items():
+            for repair in repairs:
+                print(f"   🩹 브랜치 {branch}: L{repair['layer'] + 1} 다시 검증 ({repair['kind']}) → 페이지 {repair['pages_refetched']}개만 다시 수집")
+        if report["first_record_seconds"] is not None:
+            print(f"   🥇 첫 레코드 {report['first_record_seconds']:.1f}초 (Navigator 완료 {navigator_seconds:.1f}초)")
+        return {"report": report}
+
+    graph = StateGraph(PipelineState)
+    graph.add_node("navigator", navigator_node)
+    graph.add_node("branch", branch_node)
+    graph.add_node("stream", stream_node)
+    graph.add_node("reduce", reduce_node)
+    graph.add_edge(START, "navigator")
+    graph.add_conditional_edges("navigator", fan_out, ["branch", "stream", "reduce"])
+    graph.add_edge("branch", "reduce")
+    graph.add_edge("stream", "reduce")
+    graph.add_edge("reduce", END)
+    return graph.compile()
+
+
+# =========================================================
+# 🚀 직접 실행 시: python -m notebooks.pipeline --goal ... --url ...
+# =========================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Navigator → Coder map-reduce 파이프라인")
+    parser.add_argument("--goal", required=True, help="수집 목표")
+    parser.add_argument("--url", required=True, help="Navigator가 분석할 시작 URL")
+    parser.add_argument("--mode", choices=[CODER, ENGINE, STREAM], default=CODER)
+    parser.add_argument("--max-parallel", type=int, default=DEFAULT_MAX_PARALLEL)
+    parser.add_argument("--repair-rounds", type=int, default=1, help="엔진 수집이 실패한 계층만 다시 검증하는 최대 횟수 (0이면 진단만)")
+    parser.add_argument("--no-reuse", action="store_true", help="저장된 Blueprint를 재사용하지 않고 항상 Navigator로 분석")
+    args = parser.parse_args()
+
+    async def main():
+        from notebooks.navigator import Browser, NavigatorContext, blueprint_registry, navigator_agent, repair_failed_layer
+        from notebooks.coder import ARTIFACT_DIR, WORKSPACES, SeniorCoderContext, create_senior_coder
+
+        browser = Browser(headless=True, keep_alive=True)
+        pipeline = build_pipeline(
+            navigator_agent,
+            create_senior_coder() if args.mode == CODER else None,
+            navigator_context=NavigatorContext(shared_browser=browser),
+            coder_context=SeniorCoderContext(),
+            mode=args.mode,
+            max_parallel=args.max_parallel,
+            artifact_dir=ARTIFACT_DIR,
+            workspaces=WORKSPACES,
+            layer_repairer=repair_failed_layer if args.repair_rounds > 0 else None,
+            repair_rounds=args.repair_rounds,
+            registry=blueprint_registry,
+            reuse_blueprints=not args.no_reuse,
+        )
+        result = await pipeline.ainvoke(new_run(args.goal, args.url))
+        print(json.dumps({k: v for k, v in result["report"].items() if k != "branch_results"}, ensure_ascii=False, indent=2))
+
+    asyncio.run(main())
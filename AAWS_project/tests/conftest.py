@@ -0,0 +1,5 @@
+import os
+import sys
+
+# tests/ 밖의 app, notebooks 패키지를 import할 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
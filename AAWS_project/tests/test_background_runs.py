@@ -0,0 +1,39 @@
+from app.sandbox.manager import FINISHED, BackgroundRun, ExecutionManager
+from app.sandbox.output import ExecutionOutput
+
+
+def add_run(manager: ExecutionManager, tmp_path, owner, status="running") -> BackgroundRun:
+    run_id = str(len(manager._runs) + 1)
+    run = BackgroundRun(
+        run_id=run_id, script="crawl.py", args=[], timeout=60,
+        output=ExecutionOutput(str(tmp_path / f"run_{run_id}.log")), status=status, owner=owner,
+    )
+    manager._runs[run_id] = run
+    return run
+
+
+def test_runs_are_visible_only_to_their_thread(tmp_path):
+    manager = ExecutionManager()
+    mine = add_run(manager, tmp_path, "thread-a")
+    other = add_run(manager, tmp_path, "thread-b")
+
+    assert manager.runs("thread-a") == [mine]
+    assert manager.get(mine.run_id, "thread-a") is mine
+    assert manager.get(other.run_id, "thread-a") is None
+    assert manager.get(mine.run_id) is None
+
+
+def test_cancel_other_threads_run_is_refused(tmp_path):
+    manager = ExecutionManager()
+    other = add_run(manager, tmp_path, "thread-b")
+
+    assert not manager.cancel(other.run_id, "thread-a")
+    assert not other.cancel_event.is_set()
+    assert manager.cancel(other.run_id, "thread-b")
+    assert other.cancel_event.is_set()
+
+
+def test_finished_run_cannot_be_cancelled(tmp_path):
+    manager = ExecutionManager()
+    run = add_run(manager, tmp_path, "thread-a", status=FINISHED)
+    assert not manager.cancel(run.run_id, "thread-a")
@@ -0,0 +1,61 @@
+from app.crawler.diagnose import diagnose_run, format_failures
+
+BLUEPRINT = {
+    "entry_urls": ["https://example.com/list"],
+    "layers": [
+        {"layer_name": "목록", "selectors": {"title": "a.t"}, "navigate_to_next": "a.t"},
+        {"layer_name": "상세", "selectors": {"title": "h1", "body": "#body"}, "navigate_to_next": None},
+    ],
+}
+
+
+def stats(**overrides):
+    base = {
+        "pages": [1, 10],
+        "links": [10, 0],
+        "empty_pages": [0, 0],
+        "empty_urls": [[], []],
+        "sample_urls": [["https://example.com/list"], ["https://example.com/d/1"]],
+        "fields": [{"title": (10, 10)}, {"title": (10, 10), "body": (10, 10)}],
+        "errors": [],
+    }
+    return {**base, **overrides}
+
+
+def kinds(failures):
+    return [(f.layer_index, f.kind) for f in failures]
+
+
+def test_healthy_run_has_no_failures():
+    assert diagnose_run(BLUEPRINT, stats()) == []
+    assert "없습니다" in format_failures([])
+
+
+def test_no_links_points_at_navigate_to_next():
+    [failure] = diagnose_run(BLUEPRINT, stats(pages=[1, 0], links=[0, 0]))
+    assert (failure.layer_index, failure.kind, failure.selector) == (0, "no_links", "a.t")
+    assert failure.sample_url == "https://example.com/list"
+
+
+def test_no_pages_blames_the_previous_layer():
+    failures = diagnose_run(BLUEPRINT, stats(pages=[1, 0], links=[10, 0]))
+    assert kinds(failures) == [(0, "no_pages")]
+
+
+def test_empty_pages_on_the_last_layer():
+    failures = diagnose_run(BLUEPRINT, stats(empty_pages=[0, 8], empty_urls=[[], ["https://example.com/d/3"]]))
+    assert kinds(failures) == [(1, "empty_pages")]
+    assert failures[0].sample_url == "https://example.com/d/3"
+
+
+def test_weakest_field_is_reported():
+    fields = [{"title": (10, 10)}, {"title": (10, 10), "body": (1, 10)}]
+    [failure] = diagnose_run(BLUEPRINT, stats(fields=fields))
+    assert (failure.layer_index, failure.kind, failure.field, failure.selector) == (1, "empty_field", "body", "#body")
+    assert "L2 '상세' [empty_field]" in format_failures([failure])
+
+
+def test_request_errors_take_precedence():
+    errors = [{"layer": 1, "url": f"https://example.com/d/{i}", "error": "HTTP 500"} for i in range(6)]
+    failures = diagnose_run(BLUEPRINT, stats(errors=errors, empty_pages=[0, 10]))
+    assert kinds(failures) == [(1, "errors")]
@@ -0,0 +1,81 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from app.crawler.incremental import CHANGED, NEW, NOT_MODIFIED, UNCHANGED, RecrawlStore
+
+
+def response(status=200, html="<p>a</p>", etag=None):
+    headers = {"ETag": etag} if etag else {}
+    return SimpleNamespace(status=status, html=html, headers=headers, elapsed=0.1)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "recrawl.db")
+
+
+def test_check_states_and_conditional_headers(db_path):
+    with RecrawlStore(db_path) as store:
+        url = "https://example.com/a"
+        assert store.check(url, response(etag='"v1"')) == NEW
+        assert store.conditional_headers(url) == {}  # commit 전에는 기록되지 않음
+        store.commit(url)
+        assert store.conditional_headers(url) == {"If-None-Match": '"v1"'}
+        assert store.check(url, response()) == UNCHANGED
+        assert store.check(url, response(html="<p>b</p>")) == CHANGED
+        assert store.check(url, response(status=304)) == NOT_MODIFIED
+
+
+def test_non_success_and_unknown_304_are_rejected(db_path):
+    with RecrawlStore(db_path) as store:
+        with pytest.raises(ValueError):
+            store.check("https://example.com/new", response(status=304))
+        with pytest.raises(ValueError):
+            store.check("https://example.com/err", response(status=500))
+        assert len(store) == 0
+
+
+def test_rollback_restores_flushed_rows(db_path):
+    url = "https://example.com/a"
+    with RecrawlStore(db_path) as store:
+        store.check(url, response(html="<p>old</p>"))
+        store.commit(url)
+        store.flush()
+
+    with RecrawlStore(db_path) as store:
+        store.check(url, response(html="<p>new</p>"))
+        store.commit(url)
+        store.check("https://example.com/b", response())
+        store.commit("https://example.com/b")
+        store.rollback()
+        assert len(store) == 1
+        assert store.check(url, response(html="<p>old</p>")) == UNCHANGED
+
+
+def test_rollback_discards_staged_rows(db_path):
+    with RecrawlStore(db_path) as store:
+        store.check("https://example.com/a", response())
+        store.rollback()
+        store.commit("https://example.com/a")
+        assert len(store) == 0
+
+
+def test_rollback_of_large_crawl_stays_under_sqlite_variable_limit(db_path):
+    urls = [f"https://example.com/p/{i}" for i in range(2500)]
+    with RecrawlStore(db_path) as store:
+        for url in urls[:10]:
+            store.check(url, response(html=url))
+            store.commit(url)
+        store.flush()
+
+    with RecrawlStore(db_path) as store:
+        # 빌드마다 다른 한도를 옛 기본값(999)으로 낮춰 청크 조회를 확인
+        store._conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        for url in urls:
+            store.check(url, response(html="changed " + url))
+            store.commit(url)
+        store.rollback()
+        assert len(store) == 10
+        assert store.check(urls[0], response(html=urls[0])) == UNCHANGED
@@ -0,0 +1,38 @@
+import pytest
+
+ingest = pytest.importorskip("app.utils.ingest")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2024년 1분기 산업동향.pdf", {"year": 2024, "quarter": 1}),
+        ("2024년 3/4분기 주요산업", {"year": 2024, "quarter": 3}),
+        ("report_2024_Q3.pdf", {"year": 2024, "quarter": 3}),
+        ("2Q2023_industry.pdf", {"year": 2023, "quarter": 2}),
+        ("2024.11 보고서", {"year": 2024, "quarter": 4}),  # 월 → 분기
+        ("2024-05-12", {"year": 2024, "quarter": 2}),
+        ("주요산업동향 2022", {"year": 2022}),
+        ("no date here", {}),
+    ],
+)
+def test_parse_period(text, expected):
+    assert ingest.parse_period(text) == expected
+
+
+class FakeCollection:
+    def __init__(self, pages):
+        self.pages = dict(pages)  # id → file_name
+
+    def get(self, where=None, include=None):
+        return {"ids": [i for i, name in self.pages.items() if name == where["file_name"]]}
+
+    def delete(self, ids):
+        for page_id in ids:
+            del self.pages[page_id]
+
+
+def test_delete_stale_pages_keeps_new_ids():
+    collection = FakeCollection({"old-p1": "a.pdf", "old-p2": "a.pdf", "new-p1": "a.pdf", "x-p1": "b.pdf"})
+    ingest._delete_stale_pages(collection, ["data/a.pdf"], {"new-p1"})
+    assert collection.pages == {"new-p1": "a.pdf", "x-p1": "b.pdf"}
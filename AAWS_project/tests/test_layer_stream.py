@@ -0,0 +1,55 @@
+import asyncio
+
+from app.crawler.layer_stream import LayerStream
+
+
+def layer(name, selectors=None):
+    return {"layer_name": name, "selectors": selectors or {"title": "a.t"}, "navigate_to_next": None}
+
+
+async def collect(stream: LayerStream) -> list[tuple[int, str]]:
+    return [(index, item["layer_name"]) async for index, item in stream.layers()]
+
+
+def test_layers_wait_for_gaps_and_keep_order():
+    async def main():
+        stream = LayerStream("t")
+        consumer = asyncio.create_task(collect(stream))
+        stream.publish(1, layer("상세"))  # 0번이 발행되기 전에는 내보내지 않음
+        await asyncio.sleep(0)
+        assert not consumer.done()
+        stream.publish(0, layer("목록"), entry_urls=["https://example.com/list"])
+        await asyncio.sleep(0)
+        stream.close()
+        return await asyncio.wait_for(consumer, 1), stream
+
+    received, stream = asyncio.run(main())
+    assert received == [(0, "목록"), (1, "상세")]
+    assert stream.entry_urls == ["https://example.com/list"]
+
+
+def test_close_fills_unpublished_layers_from_final_blueprint():
+    async def main():
+        stream = LayerStream("t")
+        stream.publish(0, layer("목록"))
+        final = {
+            "entry_urls": ["https://example.com/list"],
+            "rendering_type": "Static SSR",
+            "layers": [layer("목록", {"title": "a.title"}), layer("상세"), layer("댓글")],
+        }
+        stream.close(final)
+        return await collect(stream), stream
+
+    received, stream = asyncio.run(main())
+    assert received == [(0, "목록"), (1, "상세"), (2, "댓글")]
+    assert stream.rendering_type == "Static SSR"
+    assert stream.changed_layers() == [0]  # 발행 후 Navigator가 셀렉터를 고친 계층
+
+
+def test_republish_and_publish_after_close_are_ignored():
+    stream = LayerStream("t")
+    assert stream.publish(0, layer("목록"))
+    assert not stream.publish(0, layer("다른 목록"))
+    stream.close()
+    assert not stream.publish(1, layer("상세"))
+    assert asyncio.run(collect(stream)) == [(0, "목록")]
@@ -0,0 +1,116 @@
+import pytest
+
+from app.sandbox.preflight import IMPORT, SELECTOR, SYNTAX, UNDEFINED_NAME, preflight_check
+
+MISSING = "aaws_missing_module_xyz"
+
+
+def kinds(report, severity):
+    return [d.kind for d in report.diagnostics if d.severity == severity]
+
+
+def test_clean_script_passes():
+    report = preflight_check("import os\nprint(os.getcwd())\n")
+    assert report.ok
+    assert report.diagnostics == []
+    assert report.format() == ""
+
+
+def test_syntax_error_has_line_number():
+    report = preflight_check("x = (1,\nprint(x)\n")
+    assert not report.ok
+    assert report.errors[0].kind == SYNTAX
+
+
+@pytest.mark.parametrize("code", [
+    f"import {MISSING}\n",
+    f"from {MISSING}.sub import thing\n",
+    f"with open(__file__) as f:\n    import {MISSING}\n",
+    f"if __name__ == '__main__':\n    import {MISSING}\n",
+])
+def test_unconditional_missing_import_blocks(code):
+    report = preflight_check(code)
+    assert not report.ok
+    assert kinds(report, "error") == [IMPORT]
+
+
+@pytest.mark.parametrize("code", [
+    f"from typing import TYPE_CHECKING\nif TYPE_CHECKING:\n    import {MISSING}\n",
+    f"def never_called():\n    import {MISSING}\n",
+    f"import sys\nif sys.platform == 'win32':\n    import {MISSING}\n",
+    f"for _ in range(0):\n    import {MISSING}\n",
+])
+def test_nested_missing_import_only_warns(code):
+    report = preflight_check(code)
+    assert report.ok
+    assert kinds(report, "warning") == [IMPORT]
+
+
+def test_import_guarded_by_import_error_is_ignored():
+    code = f"try:\n    import {MISSING}\nexcept ImportError:\n    {MISSING} = None\n"
+    assert preflight_check(code).diagnostics == []
+
+
+def test_found_in_search_path(tmp_path):
+    (tmp_path / "helper_mod.py").write_text("VALUE = 1\n")
+    assert preflight_check("import helper_mod\n", search_paths=[str(tmp_path)]).ok
+
+
+def test_module_created_after_failed_check_is_found(tmp_path):
+    code = "import late_helper_mod\n"
+    assert not preflight_check(code, search_paths=[str(tmp_path)]).ok
+    (tmp_path / "late_helper_mod.py").write_text("VALUE = 1\n")
+    assert preflight_check(code, search_paths=[str(tmp_path)]).ok
+
+
+@pytest.mark.parametrize("code", [
+    "x = undefined_thing\n",
+    "@undefined_decorator\ndef f():\n    pass\n",
+    "def f(x=undefined_default):\n    return x\n",
+    "if __name__ == '__main__':\n    print(undefined_thing)\n",
+])
+def test_unconditional_undefined_name_blocks(code):
+    report = preflight_check(code)
+    assert not report.ok
+    assert kinds(report, "error") == [UNDEFINED_NAME]
+
+
+@pytest.mark.parametrize("code", [
+    "def f():\n    return undefined_thing\n",
+    "import sys\nif len(sys.argv) > 5:\n    print(undefined_thing)\n",
+    "items = []\nvalues = [undefined_thing for _ in items]\n",
+    "flag = False\nresult = flag and undefined_thing\n",
+    "try:\n    value = undefined_thing\nexcept NameError:\n    value = None\n",
+])
+def test_conditional_undefined_name_only_warns(code):
+    report = preflight_check(code)
+    assert report.ok
+    assert kinds(report, "warning") == [UNDEFINED_NAME]
+
+
+def test_name_defined_anywhere_is_not_reported():
+    code = "def f():\n    return later\nlater = 1\nprint(f())\n"
+    assert preflight_check(code).diagnostics == []
+
+
+def test_dynamic_scope_disables_name_check():
+    assert preflight_check("exec('y = 1')\nprint(y)\n").ok
+
+
+def test_name_reported_once_as_error_when_also_used_at_top_level():
+    code = "def f():\n    return undefined_thing\nprint(undefined_thing)\n"
+    report = preflight_check(code)
+    assert [(d.kind, d.severity, d.line) for d in report.diagnostics] == [(UNDEFINED_NAME, "error", 3)]
+
+
+def test_missing_import_hint():
+    report = preflight_check("print(json.dumps({}))\n")
+    assert "import json" in report.errors[0].message
+
+
+def test_selector_syntax():
+    pytest.importorskip("soupsieve")
+    report = preflight_check("soup = None\nsoup.select('div[')\n")
+    assert kinds(report, "error") == [SELECTOR]
+    report = preflight_check("page = None\npage.locator('text=Login >> div[')\n")
+    assert report.diagnostics == []
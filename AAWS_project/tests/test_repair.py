@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from app.crawler.repair import BlueprintRepairError, repair_blueprint_collection
+
+
+def layer(**overrides):
+    return {
+        "layer_name": "목록",
+        "url_pattern": "/list",
+        "selectors": {"title": "a.t"},
+        "navigate_to_next": None,
+        "pagination_method": None,
+        **overrides,
+    }
+
+
+def blueprint(**overrides):
+    return {
+        "blueprint_name": "news",
+        "entry_urls": ["https://example.com/list"],
+        "rendering_type": "Static SSR",
+        "total_layers": 1,
+        "anti_bot_notes": "없음",
+        "layers": [layer()],
+        **overrides,
+    }
+
+
+def test_clean_collection_needs_no_fixes():
+    data = {"total_jobs": 1, "blueprints": [blueprint()]}
+    repaired, fixes = repair_blueprint_collection(data)
+    assert fixes == []
+    assert repaired == data
+
+
+def test_loose_json_and_counts_are_repaired():
+    body = json.dumps({"total_jobs": 3, "blueprints": [blueprint(total_layers=5)]})
+    raw = "```json\n" + body[:-1] + ",}\n```"  # 코드 블록 + 뒤쪽 쉼표
+    repaired, fixes = repair_blueprint_collection(raw)
+    assert repaired["total_jobs"] == 1
+    assert repaired["blueprints"][0]["total_layers"] == 1
+    assert fixes
+
+
+def test_selectors_are_unwrapped_and_none_strings_dropped():
+    bp = blueprint(
+        entry_urls="https://example.com/a, https://example.com/b",
+        anti_bot_notes="null",
+        layers=[
+            layer(selectors='{"title": "`a.t`", "date": "None"}', navigate_to_next="'a.t'", pagination_method="none"),
+            layer(layer_name="상세", selectors={"body": "#body"}, navigate_to_next="a.more"),
+        ],
+    )
+    repaired, _ = repair_blueprint_collection({"blueprints": bp})
+    first, last = repaired["blueprints"][0]["layers"]
+    assert repaired["blueprints"][0]["entry_urls"] == ["https://example.com/a", "https://example.com/b"]
+    assert repaired["blueprints"][0]["anti_bot_notes"] == "없음"
+    assert first["selectors"] == {"title": "a.t"}
+    assert first["navigate_to_next"] == "a.t"
+    assert first["pagination_method"] is None
+    assert last["navigate_to_next"] is None  # 마지막 계층
+
+
+def test_more_button_is_normalised_and_checked():
+    repaired, _ = repair_blueprint_collection({"blueprints": [blueprint(layers=[layer(more_button="없음")])]})
+    assert repaired["blueprints"][0]["layers"][0]["more_button"] is None
+
+    repaired, _ = repair_blueprint_collection({"blueprints": [blueprint(layers=[layer(more_button='"button.more"')])]})
+    assert repaired["blueprints"][0]["layers"][0]["more_button"] == "button.more"
+
+    with pytest.raises(BlueprintRepairError, match="more_button"):
+        repair_blueprint_collection({"blueprints": [blueprint(layers=[layer(more_button="button[")])]})
+
+
+def test_unfixable_problems_raise():
+    with pytest.raises(BlueprintRepairError, match="CSS"):
+        repair_blueprint_collection({"blueprints": [blueprint(layers=[layer(selectors={"title": "a..t"})])]})
+    with pytest.raises(BlueprintRepairError, match="layers"):
+        repair_blueprint_collection({"blueprints": [blueprint(layers=[])]})
+    with pytest.raises(BlueprintRepairError):
+        repair_blueprint_collection("not json at all {")
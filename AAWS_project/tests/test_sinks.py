@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.crawler.sinks import ParquetSink  # noqa: E402
+
+
+def read_rows(paths):
+    return [row for path in paths for row in pq.read_table(path).to_pylist()]
+
+
+def test_checkpoints_do_not_split_parquet_parts(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    sink = ParquetSink(path, batch_size=2)
+    for i in range(10):
+        sink.write({"id": i})
+        sink.state()  # 체크포인트마다 part가 닫히면 안 됨
+    sink.close()
+    assert sink.files == [path]
+    assert [r["id"] for r in read_rows(sink.files)] == list(range(10))
+    assert not os.path.exists(path + ".spool.jsonl")
+
+
+def test_parts_roll_at_row_threshold_with_uniform_names(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ParquetSink(path, batch_size=2, max_rows=4) as sink:
+        sink.write_many({"id": i} for i in range(10))
+    assert [os.path.basename(p) for p in sink.files] == ["out-0001.parquet", "out-0002.parquet", "out-0003.parquet"]
+    assert [r["id"] for r in read_rows(sink.files)] == list(range(10))
+
+
+def test_restore_truncates_to_committed_rows(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    sink = ParquetSink(path, batch_size=2, max_rows=4)
+    sink.write_many({"id": i} for i in range(6))
+    state = sink.state()
+    sink.write_many({"id": i} for i in range(100, 104))  # 체크포인트 뒤에 쓰였다가 중단된 레코드
+    del sink
+
+    resumed = ParquetSink(path, batch_size=2, max_rows=4)
+    resumed.restore(state)
+    resumed.write_many({"id": i} for i in range(6, 10))
+    resumed.close()
+    assert [r["id"] for r in read_rows(resumed.files)] == list(range(10))
+    assert resumed.records_written == 10
+
+
+def test_mixed_type_first_batch_falls_back_to_string(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ParquetSink(path) as sink:
+        sink.write_many([{"price": 1000, "title": "a"}, {"price": "문의", "title": "b"}])
+    rows = read_rows(sink.files)
+    assert [r["price"] for r in rows] == ["1000", "문의"]
+    assert [r["title"] for r in rows] == ["a", "b"]